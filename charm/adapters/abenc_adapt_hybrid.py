@@ -3,8 +3,14 @@ from charm.toolbox.ABEnc import ABEnc
 from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
 from charm.toolbox.pairinggroup import PairingGroup,GT
 from charm.toolbox.symcrypto import AuthenticatedCryptoAbstraction
+from charm.toolbox.kem import elementKey, sealEnvelope, openEnvelope
 from charm.core.math.pairing import hashPair as sha2
+from charm.core.engine.util import serializeObject,deserializeObject
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
 from math import ceil
+import inspect, os, pickle
 
 debug = False
 class HybridABEnc(ABEnc):
@@ -48,6 +54,154 @@ class HybridABEnc(ABEnc):
             raise Exception("failed to decrypt!")
         cipher = AuthenticatedCryptoAbstraction(sha2(key))
         return cipher.decrypt(c2)
+
+    def encapsulate(self, pk, object):
+        """returns a fresh 32-byte symmetric key and its ABE encapsulation under the
+        policy (or attributes) in object."""
+        key = self.group.random(GT)
+        return elementKey(self.group, key), abenc.encrypt(pk, key, object)
+
+    def decapsulate(self, pk, sk, c1):
+        """recovers the symmetric key from an encapsulation."""
+        key = abenc.decrypt(pk, sk, c1)
+        if key is False:
+            raise Exception("failed to decrypt!")
+        return elementKey(self.group, key)
+
+    def encrypt_envelope(self, pk, M, object):
+        """encrypts M into a binary envelope (see charm.toolbox.kem), avoiding the
+        JSON and hex encodings of encrypt().
+
+        >>> group = PairingGroup("SS512")
+        >>> hyb_abe = HybridABEnc(CPabe_BSW07(group), group)
+        >>> (pk, mk) = hyb_abe.setup()
+        >>> sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO'])
+        >>> data = hyb_abe.encrypt_envelope(pk, b'hello', 'one and two')
+        >>> hyb_abe.decrypt_envelope(pk, sk, data)
+        b'hello'
+        """
+        (key, c1) = self.encapsulate(pk, object)
+        return sealEnvelope(self.group, c1, key, M)
+
+    def decrypt_envelope(self, pk, sk, data):
+        return openEnvelope(self.group, data, lambda c1: self.decapsulate(pk, sk, c1))
+
+    def encrypt_stream(self, pk, source, object, chunk_size=65536):
+        """encrypts a file-like object or an iterable of byte strings under the
+        policy (or attributes) in object. Returns the ABE ciphertext of the session
+        key and a generator of the encrypted stream, see
+        SymmetricCryptoAbstraction.encrypt_stream."""
+        key = self.group.random(GT)
+        c1 = abenc.encrypt(pk, key, object)
+        cipher = AuthenticatedCryptoAbstraction(sha2(key))
+        return c1, cipher.encrypt_stream(source, chunk_size)
+
+    def decrypt_stream(self, pk, sk, c1, source, max_chunk_size=65536):
+        """recovers the session key from c1 and returns a generator of the
+        plaintext chunks of the encrypted stream read from source. Streams
+        written with a chunk_size above max_chunk_size are rejected."""
+        key = abenc.decrypt(pk, sk, c1)
+        if key is False:
+            raise Exception("failed to decrypt!")
+        cipher = AuthenticatedCryptoAbstraction(sha2(key))
+        return cipher.decrypt_stream(source, max_chunk_size=max_chunk_size)
+
+    def decrypt_many(self, pk, sk, cts, workers=None, chunksize=16, scheme_factory=None):
+        """decrypts an iterable of ciphertexts and yields the plaintexts in order.
+
+        Ciphertexts are read in bounded windows so that memory stays flat on long
+        queues. Within a window they are grouped by policy, so each worker sees
+        runs of the same policy and parses it once through its policy cache.
+        The chunks are spread over a process pool of the given number of workers
+        (all CPUs by default). Group elements travel between processes through
+        group.serialize. Every worker rebuilds the scheme with
+        scheme_factory(PairingGroup(group.param)), a picklable callable such as
+        functools.partial(AC17CPABE, assump_size=3); by default the scheme's class
+        is called with the constructor arguments it keeps as attributes of the same
+        name (see _schemeFactory). With workers=1 everything runs in the calling
+        process. A ciphertext that fails to decrypt raises as in decrypt.
+
+        >>> group = PairingGroup("SS512")
+        >>> hyb_abe = HybridABEnc(CPabe_BSW07(group), group)
+        >>> (pk, mk) = hyb_abe.setup()
+        >>> sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO'])
+        >>> cts = [hyb_abe.encrypt(pk, m, p) for m, p in [(b'a', 'one'), (b'b', 'one and two'), (b'c', 'one')]]
+        >>> list(hyb_abe.decrypt_many(pk, sk, cts, workers=1))
+        [b'a', b'b', b'c']
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return (self.decrypt(pk, sk, ct) for ct in cts)
+        # built here rather than in the generator, so unsupported schemes fail at the call
+        state = _schemeFactory(abenc, scheme_factory) + (self.group.param, serializeObject(pk, self.group), serializeObject(sk, self.group))
+        return self._decryptMany(state, iter(cts), workers, chunksize)
+
+    def _decryptMany(self, state, cts, workers, chunksize):
+        window = workers * chunksize
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=state) as pool:
+            # keep the next window in flight while the current one is drained
+            pending = deque()
+            for batch in iter(lambda: list(islice(cts, window)), []):
+                pending.append(self._submit_window(pool, batch, chunksize))
+                if len(pending) > 1:
+                    yield from self._collect(*pending.popleft())
+            while pending:
+                yield from self._collect(*pending.popleft())
+
+    def _submit_window(self, pool, batch, chunksize):
+        by_policy = {}
+        for i, ct in enumerate(batch):
+            by_policy.setdefault(str(ct['c1'].get('policy')), []).append(i)
+        futures = []
+        for indices in by_policy.values():
+            for j in range(0, len(indices), chunksize):
+                chunk = indices[j:j+chunksize]
+                payload = [(serializeObject(batch[i]['c1'], self.group), batch[i]['c2']) for i in chunk]
+                futures.append((chunk, pool.submit(_decrypt_chunk, payload)))
+        return len(batch), futures
+
+    def _collect(self, size, futures):
+        results = [None] * size
+        for indices, future in futures:
+            for i, msg in zip(indices, future.result()):
+                results[i] = msg
+        return results
+
+def _schemeFactory(scheme, scheme_factory=None):
+    """returns a picklable (factory, kwargs) pair with which a worker process
+    rebuilds scheme as factory(group, **kwargs). Without scheme_factory, the
+    constructor arguments after the group are read from the scheme's attributes of
+    the same name (e.g. assump_size), and optional ones it does not keep take their
+    defaults. Raises ValueError when a required argument cannot be recovered or the
+    factory cannot be sent to another process."""
+    kwargs = {}
+    if scheme_factory is None:
+        scheme_factory = type(scheme)
+        params = list(inspect.signature(scheme_factory.__init__).parameters.values())[2:]
+        for param in params:
+            if hasattr(scheme, param.name) and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                kwargs[param.name] = getattr(scheme, param.name)
+            elif param.default is param.empty:
+                raise ValueError("cannot rebuild %s in worker processes: constructor argument '%s' is not kept by the scheme, pass scheme_factory"
+                                 % (scheme_factory.__name__, param.name))
+    try:
+        pickle.dumps((scheme_factory, kwargs))
+    except Exception as err:
+        raise ValueError("cannot send the %s factory to worker processes: %s" % (type(scheme).__name__, err))
+    return scheme_factory, kwargs
+
+# per-process state of the decrypt_many workers
+_worker = None
+
+def _init_worker(scheme_factory, kwargs, param, pk, sk):
+    global _worker
+    group = PairingGroup(param)
+    hybrid = HybridABEnc(scheme_factory(group, **kwargs), group)
+    _worker = (hybrid, deserializeObject(pk, group), deserializeObject(sk, group))
+
+def _decrypt_chunk(payload):
+    hybrid, pk, sk = _worker
+    return [hybrid.decrypt(pk, sk, { 'c1':deserializeObject(c1, hybrid.group), 'c2':c2 }) for c1, c2 in payload]
     
 def main():
     groupObj = PairingGroup('SS512')
@@ -0,0 +1,214 @@
+'''
+Process-pool key generation for attribute authorities.
+
+KeygenExecutor issues the user keys of CPabe_BSW07, Dabe (dabe_aw11) and
+MaabeRW15 over a pool of worker processes. The per-attribute components of a
+key do not depend on each other, so the attribute lists are cut into chunks
+and the chunks of one or several users make up a task. The master key material
+is serialized once and handed to every worker when it starts; a task only
+carries attribute names and, per user, the few values the attributes share
+(g2^r for BSW07, the global identifier for the multi-authority schemes). The
+keys are returned in the format of the scheme's own keygen.
+
+Global parameters holding hash oracles (the 'H' and 'F' functions of Dabe and
+MaabeRW15) cannot be pickled: workers take the oracles from their own setup(),
+which defines them in terms of the group only.
+'''
+from charm.toolbox.pairinggroup import PairingGroup,GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.schemes.abenc.dabe_aw11 import Dabe
+from charm.schemes.abenc.abenc_maabe_rw15 import MaabeRW15
+from charm.adapters.abenc_adapt_hybrid import _schemeFactory
+from charm.core.engine.util import serializeObject,deserializeObject
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import os, time
+
+class _BSW07Keygen(object):
+    # jobs are attribute lists, material is (pk, mk)
+    @staticmethod
+    def begin(scheme, material, job):
+        D, g_r = scheme.keygen_base(*material)
+        return { 'D':D, 'Dj':{}, 'Djp':{}, 'S':job }, g_r, list(job)
+
+    @staticmethod
+    def work(scheme, material, g_r, attributes):
+        D_j, D_j_pr = scheme.keygen_attributes(material[0], g_r, attributes)
+        return { 'Dj':D_j, 'Djp':D_j_pr }
+
+    @staticmethod
+    def merge(key, part):
+        key['Dj'].update(part['Dj'])
+        key['Djp'].update(part['Djp'])
+
+class _DabeKeygen(object):
+    # jobs are (gid, attributes), material is (gp, sk)
+    @staticmethod
+    def begin(scheme, material, job):
+        gid, attributes = job
+        return { 'gid':gid }, gid, list(attributes)
+
+    @staticmethod
+    def work(scheme, material, gid, attributes):
+        gp, sk = material
+        part = {}
+        for i in attributes:
+            scheme.keygen(gp, sk, i, gid, part)
+        part.pop('gid', None)
+        return part
+
+    @staticmethod
+    def merge(key, part):
+        key.update(part)
+
+class _RW15Keygen(_DabeKeygen):
+    # jobs are (gid, attributes), material is (gp, sk)
+    @staticmethod
+    def begin(scheme, material, job):
+        gid, attributes = job
+        return {}, gid, list(attributes)
+
+    @staticmethod
+    def work(scheme, material, gid, attributes):
+        gp, sk = material
+        return { a:scheme.keygen(gp, sk, gid, a) for a in attributes }
+
+_strategies = { CPabe_BSW07:_BSW07Keygen, Dabe:_DabeKeygen, MaabeRW15:_RW15Keygen }
+
+def _strategy(scheme_class):
+    return next((_strategies[c] for c in scheme_class.__mro__ if c in _strategies), None)
+
+class KeygenExecutor(object):
+    """
+    Issues keys for many users with the master key material of one authority.
+
+    material is what the scheme's keygen takes besides the user: (pk, mk) for
+    CPabe_BSW07 and (gp, sk) for Dabe and MaabeRW15. The pool starts with the
+    first keygen_many call and lives until close() (or the end of a with
+    block), so several batches share the workers. With workers=1 everything
+    runs in the calling process. Workers rebuild the scheme as in
+    HybridABEnc.decrypt_many, with scheme_factory or from the constructor
+    arguments the scheme keeps. After every batch, stats holds the number of
+    keys and attributes issued, the time taken and the keys per second.
+
+    >>> group = PairingGroup('SS512')
+    >>> cpabe = CPabe_BSW07(group)
+    >>> (pk, mk) = cpabe.setup()
+    >>> with KeygenExecutor(cpabe, group, (pk, mk), workers=2, chunksize=2) as executor:
+    ...     keys = list(executor.keygen_many([['ONE', 'TWO', 'THREE'], ['FOUR']]))
+    >>> sorted(keys[0]['Dj']), keys[1]['S'], executor.stats['keys']
+    (['ONE', 'THREE', 'TWO'], ['FOUR'], 2)
+    >>> ct = cpabe.encrypt(pk, group.random(GT), 'one and three')
+    >>> cpabe.decrypt(pk, keys[0], ct) == cpabe.decrypt(pk, cpabe.keygen(pk, mk, ['ONE', 'THREE']), ct)
+    True
+    """
+    def __init__(self, scheme, group, material, workers=None, chunksize=32, scheme_factory=None):
+        self._strategy = _strategy(type(scheme))
+        if self._strategy is None:
+            raise ValueError("no parallel key generation for %s" % type(scheme).__name__)
+        self.scheme, self.group, self.material = scheme, group, tuple(material)
+        self.workers = workers or os.cpu_count() or 1
+        self._factory = _schemeFactory(scheme, scheme_factory) if self.workers > 1 else None
+        self.chunksize = chunksize
+        self.stats = { 'keys':0, 'attributes':0, 'seconds':0.0, 'keys_per_second':0.0 }
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """shuts the worker processes down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _start(self):
+        if self._pool is None:
+            material, oracles = [], []
+            for (n, m) in enumerate(self.material):
+                if type(m) == dict:
+                    oracles += [(n, k) for k in m if callable(m[k])]
+                    m = { k:v for k, v in m.items() if not callable(v) }
+                material.append(m)
+            state = self._factory + (type(self.scheme), self.group.param, serializeObject(material, self.group), oracles)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=state)
+        return self._pool
+
+    def keygen_many(self, jobs):
+        """yields one key per job, in order: jobs are attribute lists for
+        CPabe_BSW07 and (gid, attributes) pairs for Dabe and MaabeRW15. Jobs are
+        read in bounded windows, so a long iterable of users is fine."""
+        strategy, keys, attributes, start = self._strategy, 0, 0, time.time()
+        jobs = iter(jobs)
+        try:
+            if self.workers == 1:
+                for job in jobs:
+                    key, shared, names = strategy.begin(self.scheme, self.material, job)
+                    strategy.merge(key, strategy.work(self.scheme, self.material, shared, names))
+                    keys, attributes = keys + 1, attributes + len(names)
+                    yield key
+                return
+            pool = self._start()
+            # keep the next window in flight while the current one is drained
+            pending = deque()
+            for batch in iter(lambda: list(islice(jobs, self.workers * 4)), []):
+                pending.append(self._submit(pool, batch))
+                if len(pending) > 1:
+                    for key, count in self._collect(*pending.popleft()):
+                        keys, attributes = keys + 1, attributes + count
+                        yield key
+            while pending:
+                for key, count in self._collect(*pending.popleft()):
+                    keys, attributes = keys + 1, attributes + count
+                    yield key
+        finally:
+            seconds = time.time() - start
+            self.stats = { 'keys':keys, 'attributes':attributes, 'seconds':seconds,
+                           'keys_per_second':keys / seconds if seconds > 0 else 0.0 }
+
+    def _submit(self, pool, batch):
+        # cut every user's attributes into chunks and pack the chunks into tasks of
+        # about chunksize attributes, so users with few attributes share a task
+        started, futures, task, size = [], [], [], 0
+        for (i, job) in enumerate(batch):
+            key, shared, names = self._strategy.begin(self.scheme, self.material, job)
+            started.append((key, len(names)))
+            shared = serializeObject(shared, self.group)
+            for j in range(0, max(len(names), 1), self.chunksize):
+                task.append((i, shared, names[j:j+self.chunksize]))
+                size += len(task[-1][2])
+                if size >= self.chunksize:
+                    futures.append((task, pool.submit(_keygen_task, task)))
+                    task, size = [], 0
+        if task:
+            futures.append((task, pool.submit(_keygen_task, task)))
+        return started, futures
+
+    def _collect(self, started, futures):
+        for task, future in futures:
+            for (i, _, _), part in zip(task, future.result()):
+                self._strategy.merge(started[i][0], deserializeObject(part, self.group))
+        return started
+
+# per-process state of the keygen workers
+_worker = None
+
+def _init_worker(scheme_factory, kwargs, scheme_class, param, material, oracles):
+    global _worker
+    group = PairingGroup(param)
+    scheme = scheme_factory(group, **kwargs)
+    material = deserializeObject(material, group)
+    if oracles:
+        fresh = scheme.setup()
+        for (n, k) in oracles:
+            material[n][k] = fresh[k]
+    _worker = (scheme, group, tuple(material), _strategy(scheme_class))
+
+def _keygen_task(task):
+    scheme, group, material, strategy = _worker
+    return [serializeObject(strategy.work(scheme, material, deserializeObject(shared, group), names), group)
+            for (_, shared, names) in task]
@@ -1,6 +1,7 @@
 from charm.toolbox.symcrypto import AuthenticatedCryptoAbstraction
 from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair
 from charm.core.math.pairing import hashPair as sha2
+from charm.toolbox.kem import elementKey, sealEnvelope, openEnvelope
 from charm.adapters.ibenc_adapt_identityhash import HashIDAdapter
 from charm.toolbox.IBEnc import IBEnc
 from charm.core.crypto.cryptobase import *
@@ -48,4 +49,20 @@ class HybridIBEnc(IBEnc):
         key = ibenc.decrypt(pk, ID, c1)        
         cipher = AuthenticatedCryptoAbstraction(sha2(key))
         return cipher.decrypt(c2)
+
+    def encapsulate(self, pk, ID):
+        """returns a fresh 32-byte symmetric key and its encapsulation for ID."""
+        key = group.random(GT)
+        return elementKey(group, key), ibenc.encrypt(pk, ID, key)
+
+    def decapsulate(self, pk, sk, c1):
+        return elementKey(group, ibenc.decrypt(pk, sk, c1))
+
+    def encrypt_envelope(self, pk, ID, M):
+        """encrypts M for ID into a binary envelope, see charm.toolbox.kem."""
+        (key, c1) = self.encapsulate(pk, ID)
+        return sealEnvelope(group, c1, key, M)
+
+    def decrypt_envelope(self, pk, sk, data):
+        return openEnvelope(group, data, lambda c1: self.decapsulate(pk, sk, c1))
     
@@ -1,6 +1,7 @@
 
 from charm.toolbox.pairinggroup import PairingGroup,GT,extract_key
 from charm.toolbox.symcrypto import AuthenticatedCryptoAbstraction
+from charm.toolbox.kem import elementKey, sealEnvelope, openEnvelope
 from charm.toolbox.ABEnc import ABEnc
 from charm.schemes.abenc.abenc_lsw08 import KPabe
 
@@ -47,6 +48,23 @@ class HybridABEnc(ABEnc):
         key = abenc.decrypt(c1, sk)
         cipher = AuthenticatedCryptoAbstraction(extract_key(key))
         return cipher.decrypt(c2)
+
+    def encapsulate(self, pk, object):
+        """returns a fresh 32-byte symmetric key and its ABE encapsulation under the
+        attributes in object."""
+        key = self.group.random(GT)
+        return elementKey(self.group, key), abenc.encrypt(pk, key, object)
+
+    def decapsulate(self, c1, sk):
+        return elementKey(self.group, abenc.decrypt(c1, sk))
+
+    def encrypt_envelope(self, pk, M, object):
+        """encrypts M into a binary envelope, see charm.toolbox.kem."""
+        (key, c1) = self.encapsulate(pk, object)
+        return sealEnvelope(self.group, c1, key, M)
+
+    def decrypt_envelope(self, data, sk):
+        return openEnvelope(self.group, data, lambda c1: self.decapsulate(c1, sk))
     
 def main():
     groupObj = PairingGroup('SS512')
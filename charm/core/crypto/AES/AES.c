@@ -24,8 +24,10 @@
  * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
  */
 
+#define PY_SSIZE_T_CLEAN
 #include <assert.h>
 #include <stdlib.h>
+#include <string.h>
 #include <Python.h>
 //#include "base64.h"
 
@@ -41,10 +43,28 @@ typedef unsigned char	u8;
 typedef unsigned short	u16;	
 typedef unsigned int	u32;
 
+/*
+ * AES-NI: on x86 builds with GCC or clang the AES and PCLMULQDQ instructions
+ * are used when the CPU reports them at runtime; everything else falls back to
+ * the table-based code below. Define CHARM_NO_AESNI to build the portable code only.
+ */
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__)) && !defined(CHARM_NO_AESNI)
+#define AES_NI 1
+#include <cpuid.h>
+#include <immintrin.h>
+#define AESNI_TARGET	__attribute__((target("sse2,ssse3,aes,pclmul")))
+#endif
+
 typedef struct {
 	u32 ek[ 4*(MAXNR+1) ]; 
 	u32 dk[ 4*(MAXNR+1) ];
 	int rounds;
+#ifdef AES_NI
+	/* round keys as AES-NI expects them, dk already passed through AESIMC */
+	u8 ni_ek[ 16*(MAXNR+1) ];
+	u8 ni_dk[ 16*(MAXNR+1) ];
+	int hw;
+#endif
 } block_state;
 
 static void rijndaelEncrypt(u32 rk[/*4*(Nr + 1)*/], int Nr, const u8 pt[16], u8 ct[16]);
@@ -1427,6 +1447,227 @@ static void rijndaelDecryptRound(const u32 rk[/*4*(Nr + 1)*/], int Nr, u8 block[
 
 #endif /* INTERMEDIATE_VALUE_KAT */
 
+#ifdef AES_NI
+
+#define CPU_AES		(1 << 0)
+#define CPU_PCLMUL	(1 << 1)
+
+/* returns the CPU_* features usable on this machine, detected once */
+static int aes_cpu_features(void)
+{
+	static int features = -1;
+	unsigned int a, b, c, d;
+
+	if (features < 0) {
+		features = 0;
+		/* CPUID.1:ECX bit 9 SSSE3, bit 25 AES, bit 1 PCLMULQDQ */
+		if (__get_cpuid(1, &a, &b, &c, &d) && (c & (1 << 9))) {
+			if (c & (1 << 25)) features |= CPU_AES;
+			if (c & (1 << 1)) features |= CPU_PCLMUL;
+		}
+	}
+	return features;
+}
+
+AESNI_TARGET
+static void aesni_key_setup(block_state *state)
+{
+	int i, Nr = state->rounds;
+
+	for (i = 0; i < 4*(Nr+1); i++)
+		PUTU32(state->ni_ek + 4*i, state->ek[i]);
+	/* equivalent inverse cipher: reversed schedule, InvMixColumns on the inner keys */
+	memcpy(state->ni_dk, state->ni_ek + 16*Nr, 16);
+	for (i = 1; i < Nr; i++)
+		_mm_storeu_si128((__m128i *) (state->ni_dk + 16*i),
+			_mm_aesimc_si128(_mm_loadu_si128((const __m128i *) (state->ni_ek + 16*(Nr-i)))));
+	memcpy(state->ni_dk + 16*Nr, state->ni_ek, 16);
+}
+
+AESNI_TARGET
+static void aesni_encrypt(const block_state *self, const u8 *in, u8 *out)
+{
+	const __m128i *rk = (const __m128i *) self->ni_ek;
+	__m128i b = _mm_xor_si128(_mm_loadu_si128((const __m128i *) in), _mm_loadu_si128(rk));
+	int i;
+
+	for (i = 1; i < self->rounds; i++)
+		b = _mm_aesenc_si128(b, _mm_loadu_si128(rk + i));
+	_mm_storeu_si128((__m128i *) out, _mm_aesenclast_si128(b, _mm_loadu_si128(rk + i)));
+}
+
+AESNI_TARGET
+static void aesni_decrypt(const block_state *self, const u8 *in, u8 *out)
+{
+	const __m128i *rk = (const __m128i *) self->ni_dk;
+	__m128i b = _mm_xor_si128(_mm_loadu_si128((const __m128i *) in), _mm_loadu_si128(rk));
+	int i;
+
+	for (i = 1; i < self->rounds; i++)
+		b = _mm_aesdec_si128(b, _mm_loadu_si128(rk + i));
+	_mm_storeu_si128((__m128i *) out, _mm_aesdeclast_si128(b, _mm_loadu_si128(rk + i)));
+}
+
+/* CTR keystream with a 32-bit big-endian counter in the last word of counter,
+ * XORed into blocks*16 bytes of input. The counter is kept byte-reversed in a
+ * register, where the 32-bit increment is a single lane addition, and eight
+ * independent blocks are kept in flight to hide the AESENC latency. */
+#define AESNI_ROUND8(op, k) \
+	b0 = op(b0, k); b1 = op(b1, k); b2 = op(b2, k); b3 = op(b3, k); \
+	b4 = op(b4, k); b5 = op(b5, k); b6 = op(b6, k); b7 = op(b7, k)
+#define AESNI_CTR_OUT(n, b) \
+	_mm_storeu_si128((__m128i *) out + n, _mm_xor_si128(b, _mm_loadu_si128((const __m128i *) in + n)))
+
+AESNI_TARGET
+static void aesni_ctr32(const block_state *self, u8 counter[16], const u8 *in, u8 *out, size_t blocks)
+{
+	const __m128i bswap = _mm_set_epi8(0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15);
+	const __m128i one = _mm_set_epi32(0, 0, 0, 1);
+	__m128i rk[MAXNR+1], c, b0, b1, b2, b3, b4, b5, b6, b7;
+	int i, Nr = self->rounds;
+
+	for (i = 0; i <= Nr; i++)
+		rk[i] = _mm_loadu_si128((const __m128i *) self->ni_ek + i);
+	c = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) counter), bswap);
+	for (; blocks >= 8; blocks -= 8, in += 128, out += 128) {
+		b0 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b1 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b2 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b3 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b4 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b5 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b6 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		b7 = _mm_shuffle_epi8(c, bswap); c = _mm_add_epi32(c, one);
+		AESNI_ROUND8(_mm_xor_si128, rk[0]);
+		for (i = 1; i < Nr; i++) {
+			AESNI_ROUND8(_mm_aesenc_si128, rk[i]);
+		}
+		AESNI_ROUND8(_mm_aesenclast_si128, rk[Nr]);
+		AESNI_CTR_OUT(0, b0); AESNI_CTR_OUT(1, b1); AESNI_CTR_OUT(2, b2); AESNI_CTR_OUT(3, b3);
+		AESNI_CTR_OUT(4, b4); AESNI_CTR_OUT(5, b5); AESNI_CTR_OUT(6, b6); AESNI_CTR_OUT(7, b7);
+	}
+	for (; blocks > 0; blocks--, in += 16, out += 16) {
+		b0 = _mm_xor_si128(_mm_shuffle_epi8(c, bswap), rk[0]);
+		c = _mm_add_epi32(c, one);
+		for (i = 1; i < Nr; i++)
+			b0 = _mm_aesenc_si128(b0, rk[i]);
+		b0 = _mm_aesenclast_si128(b0, rk[Nr]);
+		AESNI_CTR_OUT(0, b0);
+	}
+	_mm_storeu_si128((__m128i *) counter, _mm_shuffle_epi8(c, bswap));
+}
+
+/* unreduced carry-less product of byte-reflected operands, as (*lo, *hi) */
+AESNI_TARGET
+static void ghash_clmul(__m128i a, __m128i b, __m128i *lo, __m128i *hi)
+{
+	__m128i mid = _mm_xor_si128(_mm_clmulepi64_si128(a, b, 0x10), _mm_clmulepi64_si128(a, b, 0x01));
+
+	*lo = _mm_xor_si128(_mm_clmulepi64_si128(a, b, 0x00), _mm_slli_si128(mid, 8));
+	*hi = _mm_xor_si128(_mm_clmulepi64_si128(a, b, 0x11), _mm_srli_si128(mid, 8));
+}
+
+/* shift-and-reduce step of Intel's carry-less multiplication white paper:
+ * the 256-bit product is shifted left by one (the operands are reflected) and
+ * reduced modulo x^128 + x^7 + x^2 + x + 1 */
+AESNI_TARGET
+static __m128i ghash_reduce(__m128i t3, __m128i t6)
+{
+	__m128i t4, t5, t7, t8, t9;
+
+	t7 = _mm_srli_epi32(t3, 31);
+	t8 = _mm_srli_epi32(t6, 31);
+	t3 = _mm_slli_epi32(t3, 1);
+	t6 = _mm_slli_epi32(t6, 1);
+	t9 = _mm_srli_si128(t7, 12);
+	t8 = _mm_slli_si128(t8, 4);
+	t7 = _mm_slli_si128(t7, 4);
+	t3 = _mm_or_si128(t3, t7);
+	t6 = _mm_or_si128(t6, t8);
+	t6 = _mm_or_si128(t6, t9);
+	t7 = _mm_slli_epi32(t3, 31);
+	t8 = _mm_slli_epi32(t3, 30);
+	t9 = _mm_slli_epi32(t3, 25);
+	t7 = _mm_xor_si128(t7, t8);
+	t7 = _mm_xor_si128(t7, t9);
+	t8 = _mm_srli_si128(t7, 4);
+	t7 = _mm_slli_si128(t7, 12);
+	t3 = _mm_xor_si128(t3, t7);
+	t4 = _mm_srli_epi32(t3, 1);
+	t5 = _mm_srli_epi32(t3, 2);
+	t9 = _mm_srli_epi32(t3, 7);
+	t4 = _mm_xor_si128(t4, t5);
+	t4 = _mm_xor_si128(t4, t9);
+	t4 = _mm_xor_si128(t4, t8);
+	t3 = _mm_xor_si128(t3, t4);
+	return _mm_xor_si128(t6, t3);
+}
+
+AESNI_TARGET
+static __m128i ghash_mul(__m128i a, __m128i b)
+{
+	__m128i lo, hi;
+
+	ghash_clmul(a, b, &lo, &hi);
+	return ghash_reduce(lo, hi);
+}
+
+/* four blocks are absorbed per reduction: X' = (X + C1)H^4 + C2 H^3 + C3 H^2 + C4 H */
+AESNI_TARGET
+static void pclmul_ghash(const u8 H[16], u8 X[16], const u8 *data, size_t blocks)
+{
+	const __m128i bswap = _mm_set_epi8(0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15);
+	__m128i h1 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) H), bswap);
+	__m128i x = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) X), bswap);
+	__m128i h2, h3, h4, lo, hi, l, h;
+
+	if (blocks >= 4) {
+		h2 = ghash_mul(h1, h1);
+		h3 = ghash_mul(h2, h1);
+		h4 = ghash_mul(h3, h1);
+		for (; blocks >= 4; blocks -= 4, data += 64) {
+			ghash_clmul(_mm_xor_si128(x, _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) data), bswap)), h4, &lo, &hi);
+			ghash_clmul(_mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) data + 1), bswap), h3, &l, &h);
+			lo = _mm_xor_si128(lo, l);
+			hi = _mm_xor_si128(hi, h);
+			ghash_clmul(_mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) data + 2), bswap), h2, &l, &h);
+			lo = _mm_xor_si128(lo, l);
+			hi = _mm_xor_si128(hi, h);
+			ghash_clmul(_mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) data + 3), bswap), h1, &l, &h);
+			x = ghash_reduce(_mm_xor_si128(lo, l), _mm_xor_si128(hi, h));
+		}
+	}
+	for (; blocks > 0; blocks--, data += 16)
+		x = ghash_mul(_mm_xor_si128(x, _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) data), bswap)), h1);
+	_mm_storeu_si128((__m128i *) X, _mm_shuffle_epi8(x, bswap));
+}
+
+/* hooks used by the GCM mode in block_template.c; they return 0 when the
+ * hardware is missing and the portable code has to do the work */
+static int block_ctr32(block_state *self, u8 counter[16], const u8 *in, u8 *out, size_t blocks)
+{
+	if (!self->hw) return 0;
+	aesni_ctr32(self, counter, in, out, blocks);
+	return 1;
+}
+
+static int block_ghash(const u8 H[16], u8 X[16], const u8 *data, size_t blocks)
+{
+	if (!(aes_cpu_features() & CPU_PCLMUL)) return 0;
+	pclmul_ghash(H, X, data, blocks);
+	return 1;
+}
+
+#define BLOCK_CTR32	block_ctr32
+#define BLOCK_GHASH	block_ghash
+#define BLOCK_HARDWARE	((aes_cpu_features() & CPU_AES) != 0)
+
+#endif /* AES_NI */
+
+#ifndef BLOCK_HARDWARE
+#define BLOCK_HARDWARE	0
+#endif
+
 static void block_init(block_state *state, unsigned char *key,
 		       int keylen)
 {
@@ -1445,15 +1686,31 @@ static void block_init(block_state *state, unsigned char *key,
 	state->rounds = Nr;
 	rijndaelKeySetupEnc(state->ek, key, keylen*8);
 	rijndaelKeySetupDec(state->dk, key, keylen*8);
+#ifdef AES_NI
+	state->hw = (aes_cpu_features() & CPU_AES) != 0;
+	if (state->hw) aesni_key_setup(state);
+#endif
 }
 
 static void block_encrypt(block_state *self, u8 *in, u8 *out)
 {
+#ifdef AES_NI
+	if (self->hw) {
+		aesni_encrypt(self, in, out);
+		return;
+	}
+#endif
 	rijndaelEncrypt(self->ek, self->rounds, in, out);
 }
 
 static void block_decrypt(block_state *self, u8 *in, u8 *out)
 {
+#ifdef AES_NI
+	if (self->hw) {
+		aesni_decrypt(self, in, out);
+		return;
+	}
+#endif
 	rijndaelDecrypt(self->dk, self->rounds, in, out);
 }
 
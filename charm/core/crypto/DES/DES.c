@@ -28,6 +28,8 @@
  * assert-like LTC_ARGCHK macro fails. */
 #define ARGTYPE 4
 
+#define PY_SSIZE_T_CLEAN
+
 /* Include the actial DES implementation */
 #include "libtom/tomcrypt_des.c"
 
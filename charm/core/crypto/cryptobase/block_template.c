@@ -49,13 +49,335 @@ ALGdealloc(PyObject *ptr)
 	memset(self->IV, 0, BLOCK_SIZE);
 	memset(self->oldCipher, 0, BLOCK_SIZE);
 	memset((char*)&(self->st), 0, sizeof(block_state));
+#if BLOCK_SIZE == 16
+	memset((char*)&(self->gcm), 0, sizeof(gcm_state));
+#endif
 	self->mode = self->count = self->segment_size = self->prf_mode = 0;
 	PyObject_Del(ptr);
 }
 
 
+#if BLOCK_SIZE == 16
+/*
+ * GCM mode. GHASH uses the hardware hooks of the cipher module when it defines
+ * them (BLOCK_GHASH, BLOCK_CTR32) and the hooks report the instructions are
+ * present; otherwise it falls back to Shoup's 4-bit table method, whose table
+ * lookups depend on the hash key.
+ */
+
+/* largest message GCM allows under one nonce: 2^39 - 256 bits */
+#define GCM_MAX_TEXT	((1ULL << 36) - 32)
+
+static const unsigned long long gcm_last4[16] =
+{
+	0x0000, 0x1c20, 0x3840, 0x2460, 0x7080, 0x6ca0, 0x48c0, 0x54e0,
+	0xe100, 0xfd20, 0xd940, 0xc560, 0x9180, 0x8da0, 0xa9c0, 0xb5e0
+};
+
+static unsigned long long gcm_get64(const unsigned char *p)
+{
+	unsigned long long v = 0;
+	int i;
+	for (i = 0; i < 8; i++) v = (v << 8) | p[i];
+	return v;
+}
+
+static void gcm_put64(unsigned char *p, unsigned long long v)
+{
+	int i;
+	for (i = 7; i >= 0; i--, v >>= 8) p[i] = (unsigned char) v;
+}
+
+/* HL/HH[i] hold the multiple of H by the 4-bit polynomial i (bit-reflected) */
+static void gcm_gen_table(gcm_state *g)
+{
+	unsigned long long vh = gcm_get64(g->H), vl = gcm_get64(g->H + 8), t;
+	int i, j;
+
+	g->HL[0] = g->HH[0] = 0;
+	g->HL[8] = vl;
+	g->HH[8] = vh;
+	for (i = 4; i > 0; i >>= 1) {
+		t = (vl & 1) * 0xe100000000000000ULL;
+		vl = (vh << 63) | (vl >> 1);
+		vh = (vh >> 1) ^ t;
+		g->HL[i] = vl;
+		g->HH[i] = vh;
+	}
+	for (i = 2; i <= 8; i *= 2) {
+		for (j = 1; j < i; j++) {
+			g->HH[i+j] = g->HH[i] ^ g->HH[j];
+			g->HL[i+j] = g->HL[i] ^ g->HL[j];
+		}
+	}
+}
+
+/* x = x * H */
+static void gcm_mult(const gcm_state *g, unsigned char x[16])
+{
+	unsigned long long zh, zl;
+	unsigned char lo, hi, rem;
+	int i;
+
+	lo = x[15] & 0xf;
+	zh = g->HH[lo];
+	zl = g->HL[lo];
+	for (i = 15; i >= 0; i--) {
+		lo = x[i] & 0xf;
+		hi = x[i] >> 4;
+		if (i != 15) {
+			rem = (unsigned char) zl & 0xf;
+			zl = (zh << 60) | (zl >> 4);
+			zh = (zh >> 4) ^ (gcm_last4[rem] << 48);
+			zh ^= g->HH[lo];
+			zl ^= g->HL[lo];
+		}
+		rem = (unsigned char) zl & 0xf;
+		zl = (zh << 60) | (zl >> 4);
+		zh = (zh >> 4) ^ (gcm_last4[rem] << 48);
+		zh ^= g->HH[hi];
+		zl ^= g->HL[hi];
+	}
+	gcm_put64(x, zh);
+	gcm_put64(x + 8, zl);
+}
+
+/* absorbs whole blocks into the GHASH accumulator */
+static void gcm_ghash(gcm_state *g, const unsigned char *data, size_t blocks)
+{
+	int i;
+
+#ifdef BLOCK_GHASH
+	if (blocks == 0 || BLOCK_GHASH(g->H, g->X, data, blocks)) return;
+#endif
+	for (; blocks > 0; blocks--, data += 16) {
+		for (i = 0; i < 16; i++) g->X[i] ^= data[i];
+		gcm_mult(g, g->X);
+	}
+}
+
+/* absorbs len bytes, keeping a trailing partial block in buf */
+static void gcm_absorb(gcm_state *g, const unsigned char *data, size_t len)
+{
+	size_t n;
+
+	if (g->buf_len > 0) {
+		n = 16 - g->buf_len;
+		if (n > len) n = len;
+		memcpy(g->buf + g->buf_len, data, n);
+		g->buf_len += (int) n;
+		data += n;
+		len -= n;
+		if (g->buf_len < 16) return;
+		gcm_ghash(g, g->buf, 1);
+		g->buf_len = 0;
+	}
+	gcm_ghash(g, data, len / 16);
+	g->buf_len = (int) (len % 16);
+	memcpy(g->buf, data + len - g->buf_len, g->buf_len);
+}
+
+/* zero-pads and absorbs the buffered partial block, if any */
+static void gcm_flush(gcm_state *g)
+{
+	if (g->buf_len > 0) {
+		memset(g->buf + g->buf_len, 0, 16 - g->buf_len);
+		gcm_ghash(g, g->buf, 1);
+		g->buf_len = 0;
+	}
+}
+
+static void gcm_inc32(unsigned char counter[16])
+{
+	int i;
+	for (i = 15; i >= 12; i--)
+		if (++counter[i] != 0) break;
+}
+
+static void gcm_init(ALGobject *self, unsigned char *IV, Py_ssize_t IVlen)
+{
+	gcm_state *g = &(self->gcm);
+	unsigned char lengths[16];
+
+	memset(g, 0, sizeof(gcm_state));
+	block_encrypt(&(self->st), g->H, g->H);
+	gcm_gen_table(g);
+	/* pre-counter block J0: nonce || 0^31 || 1 for 96-bit nonces, GHASH of the nonce otherwise */
+	if (IVlen == 12) {
+		memcpy(self->IV, IV, 12);
+		memset(self->IV + 12, 0, 3);
+		self->IV[15] = 1;
+	}
+	else {
+		gcm_absorb(g, IV, IVlen);
+		gcm_flush(g);
+		memset(lengths, 0, 8);
+		gcm_put64(lengths + 8, (unsigned long long) IVlen * 8);
+		gcm_ghash(g, lengths, 1);
+		memcpy(self->IV, g->X, 16);
+		memset(g->X, 0, 16);
+	}
+	block_encrypt(&(self->st), self->IV, g->EJ0);
+	gcm_inc32(self->IV);
+	self->count = BLOCK_SIZE;
+	g->phase = GCM_AAD;
+}
+
+/* XORs the keystream into len bytes, continuing the current keystream block */
+static void gcm_ctr(ALGobject *self, const unsigned char *str, unsigned char *out, size_t len)
+{
+	size_t i = 0, j, blocks;
+
+	for (; i < len && self->count < BLOCK_SIZE; i++, self->count++)
+		out[i] = str[i] ^ self->oldCipher[self->count];
+	blocks = (len - i) / BLOCK_SIZE;
+#ifdef BLOCK_CTR32
+	if (blocks > 0 && BLOCK_CTR32(&(self->st), self->IV, str + i, out + i, blocks)) {
+		i += blocks * BLOCK_SIZE;
+		blocks = 0;
+	}
+#endif
+	for (; blocks > 0; blocks--, i += BLOCK_SIZE) {
+		block_encrypt(&(self->st), self->IV, self->oldCipher);
+		gcm_inc32(self->IV);
+		for (j = 0; j < BLOCK_SIZE; j++)
+			out[i+j] = str[i+j] ^ self->oldCipher[j];
+	}
+	if (i < len) {
+		block_encrypt(&(self->st), self->IV, self->oldCipher);
+		gcm_inc32(self->IV);
+		for (self->count = 0; i < len; i++, self->count++)
+			out[i] = str[i] ^ self->oldCipher[self->count];
+	}
+}
+
+/* the tag of everything processed so far; the object itself is not finalized */
+static void gcm_tag(ALGobject *self, unsigned char tag[GCM_TAG_SIZE])
+{
+	gcm_state g = self->gcm;
+	unsigned char lengths[16];
+	int i;
+
+	gcm_flush(&g);
+	gcm_put64(lengths, g.aad_len * 8);
+	gcm_put64(lengths + 8, g.text_len * 8);
+	gcm_ghash(&g, lengths, 1);
+	for (i = 0; i < GCM_TAG_SIZE; i++)
+		tag[i] = g.X[i] ^ g.EJ0[i];
+	memset(&g, 0, sizeof(gcm_state));
+}
+
+static PyObject *
+ALG_GCM(ALGobject *self, PyObject *args, int phase)
+{
+	gcm_state *g = &(self->gcm);
+	unsigned char *buffer, *str;
+	Py_ssize_t len;
+	PyObject *result;
+
+	if (!PyArg_ParseTuple(args, "y#", &str, &len))
+		return NULL;
+	if (g->phase != GCM_AAD && g->phase != phase) {
+		PyErr_SetString(PyExc_ValueError,
+				"cannot mix encrypt and decrypt on a GCM object");
+		return NULL;
+	}
+	if ((unsigned long long) len > GCM_MAX_TEXT - g->text_len) {
+		PyErr_SetString(PyExc_OverflowError,
+				"message too long for a single GCM nonce");
+		return NULL;
+	}
+	/* the output is written straight into the result, large messages are not copied again */
+	result = PyBytes_FromStringAndSize(NULL, len);
+	if (result == NULL)
+		return NULL;
+	buffer = (unsigned char *) PyBytes_AS_STRING(result);
+	Py_BEGIN_ALLOW_THREADS;
+	if (g->phase == GCM_AAD) {
+		gcm_flush(g);
+		g->phase = phase;
+	}
+	if (phase == GCM_DECRYPT) gcm_absorb(g, str, len);
+	gcm_ctr(self, str, buffer, len);
+	if (phase == GCM_ENCRYPT) gcm_absorb(g, buffer, len);
+	g->text_len += len;
+	Py_END_ALLOW_THREADS;
+	return result;
+}
+
+static int
+ALG_CheckGCM(ALGobject *self, const char *method)
+{
+	if (self->mode != MODE_GCM) {
+		PyErr_Format(PyExc_ValueError,
+			     "%s() is only available in GCM mode", method);
+		return 0;
+	}
+	return 1;
+}
+
+static char ALG_Update__doc__[] =
+"update(data): GCM mode only, authenticate data as associated data. "
+"All associated data must be passed before the message.";
+
+static PyObject *
+ALG_Update(ALGobject *self, PyObject *args)
+{
+	unsigned char *str;
+	Py_ssize_t len;
+
+	if (!ALG_CheckGCM(self, "update") || !PyArg_ParseTuple(args, "y#", &str, &len))
+		return NULL;
+	if (self->gcm.phase != GCM_AAD) {
+		PyErr_SetString(PyExc_ValueError,
+				"associated data must be passed before the message");
+		return NULL;
+	}
+	gcm_absorb(&(self->gcm), str, len);
+	self->gcm.aad_len += len;
+	Py_RETURN_NONE;
+}
+
+static char ALG_Digest__doc__[] =
+"digest(): GCM mode only, return the 16-byte authentication tag of the "
+"associated data and message processed so far.";
+
+static PyObject *
+ALG_Digest(ALGobject *self, PyObject *args)
+{
+	unsigned char tag[GCM_TAG_SIZE];
+
+	if (!ALG_CheckGCM(self, "digest"))
+		return NULL;
+	gcm_tag(self, tag);
+	return PyBytes_FromStringAndSize((char *) tag, GCM_TAG_SIZE);
+}
+
+static char ALG_Verify__doc__[] =
+"verify(tag): GCM mode only, compare tag with digest() in constant time.";
+
+static PyObject *
+ALG_Verify(ALGobject *self, PyObject *args)
+{
+	unsigned char tag[GCM_TAG_SIZE], *str, diff = 0;
+	Py_ssize_t len;
+	int i;
+
+	if (!ALG_CheckGCM(self, "verify") || !PyArg_ParseTuple(args, "y#", &str, &len))
+		return NULL;
+	gcm_tag(self, tag);
+	if (len != GCM_TAG_SIZE)
+		Py_RETURN_FALSE;
+	for (i = 0; i < GCM_TAG_SIZE; i++)
+		diff |= tag[i] ^ str[i];
+	memset(tag, 0, GCM_TAG_SIZE);
+	return PyBool_FromLong(diff == 0);
+}
+#endif /* BLOCK_SIZE == 16 */
+
 static char ALGnew__doc__[] = 
-"new(key, [mode], [IV]): Return a new " _MODULE_STRING " encryption object.";
+"new(key, [mode], [IV]): Return a new " _MODULE_STRING " encryption object. "
+"In GCM mode IV is the nonce, 12 bytes recommended.";
 
 static char *kwlist[] = {"key", "mode", "IV", "counter", "segment_size",
 #ifdef PCT_ARC2_MODULE
@@ -68,7 +390,8 @@ ALGnew(PyObject *self, PyObject *args, PyObject *kwdict)
 {
 	unsigned char *key, *IV;
 	ALGobject * new=NULL;
-	int keylen, IVlen=0, mode=MODE_ECB, segment_size=0;
+	Py_ssize_t keylen, IVlen=0;
+	int mode=MODE_ECB, segment_size=0;
 	PyObject *counter = NULL;
 	int counter_shortcut = 0;
 #ifdef PCT_ARC2_MODULE
@@ -93,7 +416,7 @@ ALGnew(PyObject *self, PyObject *args, PyObject *kwdict)
 	if (KEY_SIZE!=0 && keylen!=KEY_SIZE)
 	{
 		PyErr_Format(PyExc_ValueError, 
-			     "Key must be %i bytes long, not %i",
+			     "Key must be %i bytes long, not %zd",
 			     KEY_SIZE, keylen);
 		return NULL;
 	}
@@ -103,13 +426,27 @@ ALGnew(PyObject *self, PyObject *args, PyObject *kwdict)
 				"Key cannot be the null string");
 		return NULL;
 	}
-	if (IVlen != BLOCK_SIZE && IVlen != 0)
+	if (mode == MODE_GCM)
+	{
+#if BLOCK_SIZE == 16
+		if (IVlen == 0) {
+			PyErr_SetString(PyExc_ValueError,
+					"GCM mode requires a nonce (IV)");
+			return NULL;
+		}
+#else
+		PyErr_SetString(PyExc_ValueError,
+				"GCM mode requires a 128-bit block cipher");
+		return NULL;
+#endif
+	}
+	else if (IVlen != BLOCK_SIZE && IVlen != 0)
 	{
 		PyErr_Format(PyExc_ValueError, 
 			     "IV must be %i bytes long", BLOCK_SIZE);
 		return NULL;
 	}
-	if (mode<MODE_ECB || mode>MODE_CTR) 
+	if (mode<MODE_ECB || mode>MODE_GCM) 
 	{
 		PyErr_Format(PyExc_ValueError, 
 			     "Unknown cipher feedback mode %i",
@@ -168,7 +505,7 @@ ALGnew(PyObject *self, PyObject *args, PyObject *kwdict)
         new->st.effective_keylen = effective_keylen;
 #endif
 
-	block_init(&(new->st), key, keylen);
+	block_init(&(new->st), key, (int) keylen);
 	if (PyErr_Occurred())
 	{
 		Py_XDECREF(counter);
@@ -177,8 +514,14 @@ ALGnew(PyObject *self, PyObject *args, PyObject *kwdict)
 	}
 	memset(new->IV, 0, BLOCK_SIZE);
 	memset(new->oldCipher, 0, BLOCK_SIZE);
-	memcpy(new->IV, IV, IVlen);
 	new->mode = mode;
+#if BLOCK_SIZE == 16
+	if (mode == MODE_GCM) {
+		gcm_init(new, IV, IVlen);
+		return new;
+	}
+#endif
+	memcpy(new->IV, IV, IVlen);
 	switch(mode) {
 	case MODE_PGP:
 	    new->count=8;
@@ -198,9 +541,13 @@ ALG_Encrypt(ALGobject *self, PyObject *args)
 {
 	unsigned char *buffer, *str;
 	unsigned char temp[BLOCK_SIZE];
-	int i, j, len;
+	Py_ssize_t i, j, len;
 	PyObject *result;
 
+#if BLOCK_SIZE == 16
+	if (self->mode == MODE_GCM)
+		return ALG_GCM(self, args, GCM_ENCRYPT);
+#endif
 #if PY_MAJOR_VERSION >= 3
 	if (!PyArg_ParseTuple(args, "y#", &str, &len))
 #else
@@ -457,7 +804,7 @@ ALG_Decrypt(ALGobject *self, PyObject *args)
 {
 	unsigned char *buffer, *str;
 	unsigned char temp[BLOCK_SIZE];
-	int i, j, len;
+	Py_ssize_t i, j, len;
 	PyObject *result;
 
 	if(self->prf_mode) {
@@ -466,6 +813,10 @@ ALG_Decrypt(ALGobject *self, PyObject *args)
 		return NULL;
 	}
 
+#if BLOCK_SIZE == 16
+	if (self->mode == MODE_GCM)
+		return ALG_GCM(self, args, GCM_DECRYPT);
+#endif
 	/* CTR mode decryption is identical to encryption */
 	if (self->mode == MODE_CTR)
 		return ALG_Encrypt(self, args);
@@ -697,6 +1048,11 @@ PyMethodDef ALGmethods[] =
  {"decrypt", (PyCFunction) ALG_Decrypt, METH_VARARGS, ALG_Decrypt__doc__},
  {"sync", (PyCFunction) ALG_Sync, METH_VARARGS, ALG_Sync__doc__},
  {"setMode", (PyCFunction) ALG_SetMode, METH_VARARGS, ALG_SetMode__doc__},
+#if BLOCK_SIZE == 16
+ {"update", (PyCFunction) ALG_Update, METH_VARARGS, ALG_Update__doc__},
+ {"digest", (PyCFunction) ALG_Digest, METH_NOARGS, ALG_Digest__doc__},
+ {"verify", (PyCFunction) ALG_Verify, METH_VARARGS, ALG_Verify__doc__},
+#endif
  {NULL, NULL}			/* sentinel */
 };
 
@@ -886,6 +1242,13 @@ void _MODULE_NAME(void) 		{
 	PyModule_AddIntConstant(m, "MODE_PGP", MODE_PGP);
 	PyModule_AddIntConstant(m, "MODE_OFB", MODE_OFB);
 	PyModule_AddIntConstant(m, "MODE_CTR", MODE_CTR);
+#if BLOCK_SIZE == 16
+	PyModule_AddIntConstant(m, "MODE_GCM", MODE_GCM);
+#endif
+#ifdef BLOCK_HARDWARE
+	/* true when the cipher runs on dedicated CPU instructions */
+	PyModule_AddIntConstant(m, "hardware", BLOCK_HARDWARE);
+#endif
 	PyModule_AddIntConstant(m, "block_size", BLOCK_SIZE);
 	PyModule_AddIntConstant(m, "key_size", KEY_SIZE);
 
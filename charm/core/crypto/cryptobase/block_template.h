@@ -26,6 +26,7 @@
 #define MODE_PGP 4
 #define MODE_OFB 5
 #define MODE_CTR 6
+#define MODE_GCM 7	/* 128-bit block ciphers only */
 
 #define _STR(x) #x
 #define _XSTR(x) _STR(x)
@@ -39,6 +40,26 @@
 #define _MODULE_NAME _PASTE2(init,MODULE_NAME)
 #endif
 
+#if BLOCK_SIZE == 16
+/* GCM (NIST SP 800-38D) state. The counter block is kept in IV, the current
+ * keystream block in oldCipher and the bytes of it already used in count. */
+typedef struct
+{
+	unsigned char H[16], EJ0[16];	/* hash key E(K, 0^128) and E(K, J0) */
+	unsigned char X[16];		/* GHASH accumulator */
+	unsigned char buf[16];		/* partial block not yet absorbed into X */
+	int buf_len;
+	int phase;			/* GCM_AAD, or GCM_ENCRYPT/GCM_DECRYPT once data was processed */
+	unsigned long long aad_len, text_len;
+	unsigned long long HL[16], HH[16];	/* 4-bit multiplication tables of H */
+} gcm_state;
+
+#define GCM_AAD		0
+#define GCM_ENCRYPT	1
+#define GCM_DECRYPT	2
+#define GCM_TAG_SIZE	16
+#endif
+
 typedef struct
 {
 	PyObject_HEAD
@@ -47,6 +68,9 @@ typedef struct
 	PyObject *counter;
 	int counter_shortcut;
 	block_state st;
+#if BLOCK_SIZE == 16
+	gcm_state gcm;
+#endif
 } ALGobject;
 
 // staticforward PyTypeObject ALGtype;
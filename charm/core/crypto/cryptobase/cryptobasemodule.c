@@ -1,5 +1,19 @@
 #include <Python.h>
 #include <structmember.h>
+#include <string.h>
+#include <openssl/evp.h>
+#include <openssl/crypto.h>
+
+#if OPENSSL_VERSION_NUMBER < 0x10100000L
+#define EVP_MD_CTX_new		EVP_MD_CTX_create
+#define EVP_MD_CTX_free		EVP_MD_CTX_destroy
+#endif
+
+#if PY_MAJOR_VERSION >= 3
+#define BUFFER_FMT	"y*"
+#else
+#define BUFFER_FMT	"s*"
+#endif
 
 static PyTypeObject BaseType;
 static PyObject *BaseError;
@@ -7,7 +21,7 @@ static PyObject *BaseError;
 #define TRUE	1
 #define FALSE	0
 #define PKG  "charm.core.crypto."
-enum MOP {NONE = 0, MODE_ECB, MODE_CBC, MODE_CFB, MODE_PGP, MODE_OFB, MODE_CTR};
+enum MOP {NONE = 0, MODE_ECB, MODE_CBC, MODE_CFB, MODE_PGP, MODE_OFB, MODE_CTR, MODE_GCM};
 enum ALG {AES, DES, DES3};
 
 typedef struct {
@@ -102,6 +116,365 @@ static PyObject *selectPRP(Base *self, PyObject *args) {
 //	return NULL;
 //}
 
+/*
+ * Incremental hash, HMAC and HKDF objects over OpenSSL's EVP digests.
+ *
+ * update() accepts any object supporting the buffer protocol (bytes, bytearray,
+ * memoryview, ...) and feeds it to the digest without copying, so large or
+ * composite messages can be authenticated piece by piece. digest() does not
+ * finalize the object: further updates continue the same computation.
+ *
+ * An HMAC keeps two digest contexts, the inner one already fed with key ^ ipad and
+ * the outer one with key ^ opad; a plain hash only uses the inner context. An HKDF
+ * object is an HMAC keyed with the salt whose input is the keying material
+ * (RFC 5869 extract); expand() derives output keying material from it.
+ */
+static PyTypeObject HashType, HMACType, HKDFType;
+
+typedef struct {
+	PyObject_HEAD
+	const EVP_MD *md;
+	EVP_MD_CTX *inner, *outer;
+} Digest;
+
+#define PyDigest_Check(obj) (PyObject_TypeCheck(obj, &HashType) || PyObject_TypeCheck(obj, &HMACType) || PyObject_TypeCheck(obj, &HKDFType))
+
+static int digest_set_key(Digest *d, const uint8_t *key, size_t key_len)
+{
+	uint8_t block[EVP_MAX_BLOCK_LENGTH > 144 ? EVP_MAX_BLOCK_LENGTH : 144], ipad[sizeof(block)];
+	unsigned int block_len = (unsigned int) EVP_MD_block_size(d->md), hash_len, i;
+	int ok;
+
+	if(block_len > sizeof(block)) return FALSE;
+	memset(block, 0, sizeof(block));
+	if(key_len > block_len) {
+		/* long keys are replaced by their hash */
+		if(!EVP_Digest(key, key_len, block, &hash_len, d->md, NULL)) return FALSE;
+	}
+	else if(key_len > 0) {
+		memcpy(block, key, key_len);
+	}
+	for(i = 0; i < block_len; i++) {
+		ipad[i] = block[i] ^ 0x36;
+		block[i] ^= 0x5c;
+	}
+	d->outer = EVP_MD_CTX_new();
+	ok = d->outer != NULL &&
+		 EVP_DigestInit_ex(d->inner, d->md, NULL) && EVP_DigestUpdate(d->inner, ipad, block_len) &&
+		 EVP_DigestInit_ex(d->outer, d->md, NULL) && EVP_DigestUpdate(d->outer, block, block_len);
+	OPENSSL_cleanse(block, sizeof(block));
+	OPENSSL_cleanse(ipad, sizeof(ipad));
+	return ok;
+}
+
+/* initializes d as a hash (key == NULL) or an HMAC under key */
+static int digest_init(Digest *d, const char *name, const uint8_t *key, size_t key_len)
+{
+	d->md = EVP_get_digestbyname(name);
+	if(d->md == NULL) {
+		PyErr_Format(PyExc_ValueError, "unsupported hash type %s", name);
+		return FALSE;
+	}
+	d->inner = EVP_MD_CTX_new();
+	if(d->inner == NULL) {
+		PyErr_NoMemory();
+		return FALSE;
+	}
+	if(key == NULL) {
+		if(EVP_DigestInit_ex(d->inner, d->md, NULL)) return TRUE;
+	}
+	else if(digest_set_key(d, key, key_len)) {
+		return TRUE;
+	}
+	PyErr_SetString(BaseError, "could not initialize digest.");
+	return FALSE;
+}
+
+static void digest_clear(Digest *d)
+{
+	if(d->inner != NULL) EVP_MD_CTX_free(d->inner);
+	if(d->outer != NULL) EVP_MD_CTX_free(d->outer);
+	d->inner = d->outer = NULL;
+}
+
+/* writes the current digest or MAC to out without finalizing d */
+static int digest_final(Digest *d, uint8_t *out, unsigned int *out_len)
+{
+	EVP_MD_CTX *tmp = EVP_MD_CTX_new();
+	int ok = tmp != NULL && EVP_MD_CTX_copy_ex(tmp, d->inner) && EVP_DigestFinal_ex(tmp, out, out_len);
+	if(ok && d->outer != NULL) {
+		ok = EVP_MD_CTX_copy_ex(tmp, d->outer) && EVP_DigestUpdate(tmp, out, *out_len) &&
+			 EVP_DigestFinal_ex(tmp, out, out_len);
+	}
+	if(tmp != NULL) EVP_MD_CTX_free(tmp);
+	return ok;
+}
+
+static void Digest_dealloc(Digest *self)
+{
+	digest_clear(self);
+	Py_TYPE(self)->tp_free((PyObject *) self);
+}
+
+static PyObject *Digest_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+	Digest *self = (Digest *) type->tp_alloc(type, 0);
+	if(self != NULL) {
+		self->md = NULL;
+		self->inner = self->outer = NULL;
+	}
+	return (PyObject *) self;
+}
+
+/* Hash(name='sha256', data=b'') */
+static int Hash_init(Digest *self, PyObject *args, PyObject *kwds)
+{
+	static char *kwlist[] = {"name", "data", NULL};
+	const char *name = "sha256";
+	Py_buffer data = {NULL, NULL};
+	int ok;
+
+	if(!PyArg_ParseTupleAndKeywords(args, kwds, "|s" BUFFER_FMT, kwlist, &name, &data))
+		return -1;
+	digest_clear(self);
+	ok = digest_init(self, name, NULL, 0) && (data.buf == NULL || EVP_DigestUpdate(self->inner, data.buf, data.len));
+	if(data.buf != NULL) PyBuffer_Release(&data);
+	return ok ? 0 : -1;
+}
+
+/* HMAC(key, name='sha256', data=b'') and HKDF(salt=b'', name='sha256') */
+static int HMAC_init(Digest *self, PyObject *args, PyObject *kwds)
+{
+	static char *kwlist[] = {"key", "name", "data", NULL};
+	const char *name = "sha256";
+	Py_buffer key, data = {NULL, NULL};
+	int ok;
+
+	if(!PyArg_ParseTupleAndKeywords(args, kwds, BUFFER_FMT "|s" BUFFER_FMT, kwlist, &key, &name, &data))
+		return -1;
+	digest_clear(self);
+	ok = digest_init(self, name, (const uint8_t *) key.buf, key.len) &&
+		 (data.buf == NULL || EVP_DigestUpdate(self->inner, data.buf, data.len));
+	PyBuffer_Release(&key);
+	if(data.buf != NULL) PyBuffer_Release(&data);
+	return ok ? 0 : -1;
+}
+
+static int HKDF_init(Digest *self, PyObject *args, PyObject *kwds)
+{
+	static char *kwlist[] = {"salt", "name", NULL};
+	const char *name = "sha256";
+	Py_buffer salt = {NULL, NULL};
+	int ok;
+
+	if(!PyArg_ParseTupleAndKeywords(args, kwds, "|" BUFFER_FMT "s", kwlist, &salt, &name))
+		return -1;
+	digest_clear(self);
+	/* an absent salt is HashLen zero bytes, which HMAC pads to the same key as no key */
+	ok = digest_init(self, name, salt.buf != NULL ? (const uint8_t *) salt.buf : (const uint8_t *) "", salt.buf != NULL ? salt.len : 0);
+	if(salt.buf != NULL) PyBuffer_Release(&salt);
+	return ok ? 0 : -1;
+}
+
+#define VERIFY_DIGEST(d) \
+	if((d)->inner == NULL) { PyErr_SetString(BaseError, "digest object not initialized."); return NULL; }
+
+static PyObject *Digest_update(Digest *self, PyObject *args)
+{
+	Py_buffer data;
+	int ok;
+
+	VERIFY_DIGEST(self);
+	if(!PyArg_ParseTuple(args, BUFFER_FMT, &data))
+		return NULL;
+	ok = EVP_DigestUpdate(self->inner, data.buf, data.len);
+	PyBuffer_Release(&data);
+	if(!ok) {
+		PyErr_SetString(BaseError, "digest update failed.");
+		return NULL;
+	}
+	Py_RETURN_NONE;
+}
+
+static PyObject *Digest_digest(Digest *self, PyObject *args)
+{
+	uint8_t out[EVP_MAX_MD_SIZE];
+	unsigned int out_len = 0;
+
+	VERIFY_DIGEST(self);
+	if(!digest_final(self, out, &out_len)) {
+		PyErr_SetString(BaseError, "digest computation failed.");
+		return NULL;
+	}
+	return PyBytes_FromStringAndSize((const char *) out, out_len);
+}
+
+static PyObject *Digest_hexdigest(Digest *self, PyObject *args)
+{
+	static const char hex[] = "0123456789abcdef";
+	uint8_t out[EVP_MAX_MD_SIZE];
+	char str[2 * EVP_MAX_MD_SIZE];
+	unsigned int out_len = 0, i;
+
+	VERIFY_DIGEST(self);
+	if(!digest_final(self, out, &out_len)) {
+		PyErr_SetString(BaseError, "digest computation failed.");
+		return NULL;
+	}
+	for(i = 0; i < out_len; i++) {
+		str[2 * i] = hex[out[i] >> 4];
+		str[2 * i + 1] = hex[out[i] & 0x0f];
+	}
+	return PyUnicode_FromStringAndSize(str, 2 * out_len);
+}
+
+/* verify(tag): constant time comparison of tag with the current digest */
+static PyObject *Digest_verify(Digest *self, PyObject *args)
+{
+	uint8_t out[EVP_MAX_MD_SIZE];
+	unsigned int out_len = 0;
+	Py_buffer tag;
+	int equal;
+
+	VERIFY_DIGEST(self);
+	if(!PyArg_ParseTuple(args, BUFFER_FMT, &tag))
+		return NULL;
+	if(!digest_final(self, out, &out_len)) {
+		PyBuffer_Release(&tag);
+		PyErr_SetString(BaseError, "digest computation failed.");
+		return NULL;
+	}
+	equal = (size_t) tag.len == out_len && CRYPTO_memcmp(out, tag.buf, out_len) == 0;
+	PyBuffer_Release(&tag);
+	return PyBool_FromLong(equal);
+}
+
+static PyObject *Digest_copy(Digest *self, PyObject *args)
+{
+	Digest *copy;
+
+	VERIFY_DIGEST(self);
+	copy = (Digest *) Digest_new(Py_TYPE(self), NULL, NULL);
+	if(copy == NULL) return NULL;
+	copy->md = self->md;
+	copy->inner = EVP_MD_CTX_new();
+	if(self->outer != NULL) copy->outer = EVP_MD_CTX_new();
+	if(copy->inner == NULL || !EVP_MD_CTX_copy_ex(copy->inner, self->inner) ||
+	  (self->outer != NULL && (copy->outer == NULL || !EVP_MD_CTX_copy_ex(copy->outer, self->outer)))) {
+		Py_DECREF(copy);
+		PyErr_SetString(BaseError, "could not copy digest.");
+		return NULL;
+	}
+	return (PyObject *) copy;
+}
+
+/* expand(length=32, info=b''): HKDF-Expand of the pseudo-random key extracted so far */
+static PyObject *HKDF_expand(Digest *self, PyObject *args, PyObject *kwds)
+{
+	static char *kwlist[] = {"length", "info", NULL};
+	Py_ssize_t length = 32, done = 0;
+	Py_buffer info = {NULL, NULL};
+	uint8_t prk[EVP_MAX_MD_SIZE], block[EVP_MAX_MD_SIZE], counter = 1;
+	unsigned int prk_len = 0, block_len = 0;
+	Digest t;
+	PyObject *result = NULL;
+	int ok = TRUE;
+
+	VERIFY_DIGEST(self);
+	if(!PyArg_ParseTupleAndKeywords(args, kwds, "|n" BUFFER_FMT, kwlist, &length, &info))
+		return NULL;
+	if(length <= 0 || length > 255 * EVP_MD_size(self->md)) {
+		if(info.buf != NULL) PyBuffer_Release(&info);
+		PyErr_SetString(PyExc_ValueError, "invalid output length.");
+		return NULL;
+	}
+	result = PyBytes_FromStringAndSize(NULL, length);
+	if(result == NULL || !digest_final(self, prk, &prk_len)) {
+		if(info.buf != NULL) PyBuffer_Release(&info);
+		Py_XDECREF(result);
+		if(!PyErr_Occurred()) PyErr_SetString(BaseError, "digest computation failed.");
+		return NULL;
+	}
+
+	/* T(i) = HMAC(prk, T(i-1) | info | i) */
+	t.md = self->md;
+	t.inner = t.outer = NULL;
+	while(ok && done < length) {
+		t.inner = EVP_MD_CTX_new();
+		ok = t.inner != NULL && digest_set_key(&t, prk, prk_len) &&
+			 EVP_DigestUpdate(t.inner, block, block_len) &&
+			 (info.buf == NULL || EVP_DigestUpdate(t.inner, info.buf, info.len)) &&
+			 EVP_DigestUpdate(t.inner, &counter, 1) &&
+			 digest_final(&t, block, &block_len);
+		digest_clear(&t);
+		if(ok) {
+			Py_ssize_t n = (length - done) < (Py_ssize_t) block_len ? (length - done) : (Py_ssize_t) block_len;
+			memcpy(PyBytes_AS_STRING(result) + done, block, n);
+			done += n;
+			counter++;
+		}
+	}
+	OPENSSL_cleanse(prk, sizeof(prk));
+	OPENSSL_cleanse(block, sizeof(block));
+	if(info.buf != NULL) PyBuffer_Release(&info);
+	if(!ok) {
+		Py_DECREF(result);
+		PyErr_SetString(BaseError, "key derivation failed.");
+		return NULL;
+	}
+	return result;
+}
+
+static PyObject *Digest_get_digest_size(Digest *self, void *closure)
+{
+	return PyLong_FromLong(self->md != NULL ? EVP_MD_size(self->md) : 0);
+}
+
+static PyObject *Digest_get_block_size(Digest *self, void *closure)
+{
+	return PyLong_FromLong(self->md != NULL ? EVP_MD_block_size(self->md) : 0);
+}
+
+static PyGetSetDef Digest_getset[] = {
+	{"digest_size", (getter) Digest_get_digest_size, NULL, "size of the digest in bytes", NULL},
+	{"block_size", (getter) Digest_get_block_size, NULL, "internal block size of the hash in bytes", NULL},
+	{NULL}
+};
+
+static PyMethodDef Digest_methods[] = {
+	{"update", (PyCFunction) Digest_update, METH_VARARGS, "feeds a bytes-like object to the digest."},
+	{"digest", (PyCFunction) Digest_digest, METH_NOARGS, "returns the digest of the data fed so far."},
+	{"hexdigest", (PyCFunction) Digest_hexdigest, METH_NOARGS, "returns the digest as a hex string."},
+	{"verify", (PyCFunction) Digest_verify, METH_VARARGS, "compares a tag with the digest in constant time."},
+	{"copy", (PyCFunction) Digest_copy, METH_NOARGS, "returns an independent copy of the digest state."},
+	{NULL}
+};
+
+static PyMethodDef HKDF_methods[] = {
+	{"update", (PyCFunction) Digest_update, METH_VARARGS, "feeds input keying material to the extract step."},
+	{"expand", (PyCFunction) HKDF_expand, METH_VARARGS | METH_KEYWORDS, "derives length bytes of output keying material bound to info."},
+	{"copy", (PyCFunction) Digest_copy, METH_NOARGS, "returns an independent copy of the extract state."},
+	{NULL}
+};
+
+#define DIGEST_TYPE(TYPE, NAME, INIT, METHODS, DOC) \
+static PyTypeObject TYPE = {						\
+	PyVarObject_HEAD_INIT(NULL, 0)					\
+	.tp_name = PKG "cryptobase." NAME,				\
+	.tp_basicsize = sizeof(Digest),					\
+	.tp_dealloc = (destructor) Digest_dealloc,		\
+	.tp_flags = Py_TPFLAGS_DEFAULT,					\
+	.tp_doc = DOC,									\
+	.tp_methods = METHODS,							\
+	.tp_getset = Digest_getset,						\
+	.tp_init = (initproc) INIT,						\
+	.tp_new = Digest_new,							\
+};
+
+DIGEST_TYPE(HashType, "Hash", Hash_init, Digest_methods, "Hash(name='sha256', data=b''): incremental hash.")
+DIGEST_TYPE(HMACType, "HMAC", HMAC_init, Digest_methods, "HMAC(key, name='sha256', data=b''): incremental HMAC.")
+DIGEST_TYPE(HKDFType, "HKDF", HKDF_init, HKDF_methods, "HKDF(salt=b'', name='sha256'): incremental HKDF (RFC 5869).")
+
 static PyTypeObject BaseType = {
 	PyVarObject_HEAD_INIT(NULL, 0)
     "crypto.Base",             /*tp_name*/
@@ -177,6 +550,7 @@ void initcryptobase(void) 		{
 #endif
 	PyObject *m;
     if(PyType_Ready(&BaseType) < 0) INITERROR;
+    if(PyType_Ready(&HashType) < 0 || PyType_Ready(&HMACType) < 0 || PyType_Ready(&HKDFType) < 0) INITERROR;
 
     // initialize module
 #if PY_MAJOR_VERSION >= 3
@@ -188,6 +562,12 @@ void initcryptobase(void) 		{
 	if(m == NULL) INITERROR;
 	Py_INCREF(&BaseType);
     PyModule_AddObject(m, "cryptobase", (PyObject *)&BaseType);
+    Py_INCREF(&HashType);
+    PyModule_AddObject(m, "Hash", (PyObject *)&HashType);
+    Py_INCREF(&HMACType);
+    PyModule_AddObject(m, "HMAC", (PyObject *)&HMACType);
+    Py_INCREF(&HKDFType);
+    PyModule_AddObject(m, "HKDF", (PyObject *)&HKDFType);
     // algorithms
     PyModule_AddIntConstant(m, "AES", AES);
     PyModule_AddIntConstant(m, "DES", DES);
@@ -200,6 +580,7 @@ void initcryptobase(void) 		{
 	PyModule_AddIntConstant(m, "MODE_PGP", MODE_PGP);
 	PyModule_AddIntConstant(m, "MODE_OFB", MODE_OFB);
 	PyModule_AddIntConstant(m, "MODE_CTR", MODE_CTR);
+	PyModule_AddIntConstant(m, "MODE_GCM", MODE_GCM);
 
 	// add integer error to module
 	struct module_state *st = GETSTATE(m);
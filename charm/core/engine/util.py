@@ -1,11 +1,13 @@
 """
 The serialization API supports the following datatypes: dict, list, str, bytes, int, float, and whatever is supported by group.serialize and group.deserialize
 
+objectToBytes/bytesToObject additionally handle tuple, bool and None and use a compact binary format (see COMPACT_MAGIC below).
+
 """
 
 from __future__ import print_function
 import io, pickle
-import json, zlib
+import json, zlib, re, struct, binascii
 from base64 import *
 from charm.toolbox.bitstring import *
 
@@ -121,15 +123,168 @@ def from_json(json_object):
             return tuple(json_object['__value__'])
     return json_object
 
+# Compact binary format used by objectToBytes() and bytesToObject().
+#
+#   MAGIC | version | flags | object
+#
+# Every object starts with a one byte tag, lengths and counts are unsigned
+# LEB128 varints. Group elements are stored as their raw bytes together with the
+# type prefix produced by group.serialize (ZR/G1/G2/GT for pairings, ZR/G for
+# elliptic curves); serializations that are not of the form 'type:base64' are
+# kept verbatim. The MAGIC prefix can never start the base64 text of the older
+# JSON+zlib+base64 format, which bytesToObject() still reads.
+COMPACT_MAGIC = b'\x00ch'
+COMPACT_VERSION = 1
+FLAG_UNCOMPRESSED = 0x01
+
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_BYTES = range(7)
+TAG_LIST, TAG_TUPLE, TAG_DICT, TAG_ELEMENT, TAG_RAW_ELEMENT = range(7, 12)
+
+_element_re = re.compile(b'(\\d+):([A-Za-z0-9+/=]*)\\Z')
+_double = struct.Struct('>d')
+
+def _writeVarint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _readVarint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80: return n, pos
+        shift += 7
+
+def _encodeCompact(out, obj, serialize):
+    _type = type(obj)
+    if _type == str:
+        raw = obj.encode('utf-8')
+        out.append(TAG_STR)
+        _writeVarint(out, len(raw))
+        out += raw
+    elif _type == bytes:
+        out.append(TAG_BYTES)
+        _writeVarint(out, len(obj))
+        out += obj
+    elif _type == int:
+        raw = obj.to_bytes((obj.bit_length() + 8) // 8, 'big', signed=True)
+        out.append(TAG_INT)
+        _writeVarint(out, len(raw))
+        out += raw
+    elif _type == dict:
+        out.append(TAG_DICT)
+        _writeVarint(out, len(obj))
+        for k, v in obj.items():
+            _encodeCompact(out, k, serialize)
+            _encodeCompact(out, v, serialize)
+    elif _type in [list, tuple]:
+        out.append(TAG_LIST if _type == list else TAG_TUPLE)
+        _writeVarint(out, len(obj))
+        for i in obj:
+            _encodeCompact(out, i, serialize)
+    elif _type == float:
+        out.append(TAG_FLOAT)
+        out += _double.pack(obj)
+    elif _type == bool:
+        out.append(TAG_TRUE if obj else TAG_FALSE)
+    elif obj is None:
+        out.append(TAG_NONE)
+    else:
+        ser = serialize(obj)
+        match = _element_re.match(ser)
+        try:
+            raw = match and b64decode(match.group(2), validate=True)
+        except binascii.Error:
+            raw = None
+        if raw and b64encode(raw) == match.group(2):
+            out.append(TAG_ELEMENT)
+            _writeVarint(out, int(match.group(1)))
+        else:
+            out.append(TAG_RAW_ELEMENT)
+            raw = ser
+        _writeVarint(out, len(raw))
+        out += raw
+
+def _decodeCompact(data, pos, deserialize):
+    tag = data[pos]
+    pos += 1
+    if tag in [TAG_STR, TAG_BYTES, TAG_INT, TAG_RAW_ELEMENT]:
+        n, pos = _readVarint(data, pos)
+        raw = bytes(data[pos:pos+n])
+        if tag == TAG_STR: return raw.decode('utf-8'), pos + n
+        elif tag == TAG_BYTES: return raw, pos + n
+        elif tag == TAG_INT: return int.from_bytes(raw, 'big', signed=True), pos + n
+        return deserialize(raw), pos + n
+    elif tag == TAG_ELEMENT:
+        _type, pos = _readVarint(data, pos)
+        n, pos = _readVarint(data, pos)
+        return deserialize(b'%d:' % _type + b64encode(data[pos:pos+n])), pos + n
+    elif tag == TAG_DICT:
+        n, pos = _readVarint(data, pos)
+        result = {}
+        for i in range(n):
+            k, pos = _decodeCompact(data, pos, deserialize)
+            result[k], pos = _decodeCompact(data, pos, deserialize)
+        return result, pos
+    elif tag in [TAG_LIST, TAG_TUPLE]:
+        n, pos = _readVarint(data, pos)
+        result = []
+        for i in range(n):
+            item, pos = _decodeCompact(data, pos, deserialize)
+            result.append(item)
+        return (result if tag == TAG_LIST else tuple(result)), pos
+    elif tag == TAG_FLOAT:
+        return _double.unpack_from(data, pos)[0], pos + _double.size
+    elif tag in [TAG_NONE, TAG_FALSE, TAG_TRUE]:
+        return [None, False, True][tag], pos
+    raise ValueError("invalid tag %d in serialized object" % tag)
+
 # Two new API calls to simplify serializing to a blob of bytes
 # objectToBytes() and bytesToObject()
-def objectToBytes(object, group):
+def objectToBytes(object, group, compression=True):
+    """serializes object, built from dict, list, tuple, str, bytes, int, float,
+    bool, None and elements of group, into the compact binary format.
+    compression=False stores uncompressed points (PairingGroup only), which are
+    larger but cheaper to deserialize."""
+    assert hasattr(group, 'serialize'), "group does not have serialize method"
+    if compression:
+        serialize, flags = group.serialize, 0
+    else:
+        serialize, flags = lambda obj: group.serialize(obj, compression=False), FLAG_UNCOMPRESSED
+    out = bytearray(COMPACT_MAGIC)
+    out.append(COMPACT_VERSION)
+    out.append(flags)
+    _encodeCompact(out, object, serialize)
+    return bytes(out)
+
+def bytesToObject(byteobject, group):
+    """inverse of objectToBytes(), also reads the JSON+zlib+base64 format
+    produced by earlier versions."""
+    assert hasattr(group, 'deserialize'), "group does not have deserialize method"
+    if type(byteobject) == str or not byteobject.startswith(COMPACT_MAGIC):
+        return legacyBytesToObject(byteobject, group)
+    header = len(COMPACT_MAGIC)
+    if byteobject[header] != COMPACT_VERSION:
+        raise ValueError("unsupported serialization version %d" % byteobject[header])
+    if byteobject[header + 1] & FLAG_UNCOMPRESSED:
+        deserialize = lambda obj: group.deserialize(obj, compression=False)
+    else:
+        deserialize = group.deserialize
+    result, pos = _decodeCompact(memoryview(byteobject), header + 2, deserialize)
+    if pos != len(byteobject):
+        raise ValueError("trailing data after serialized object")
+    return result
+
+def legacyObjectToBytes(object, group):
     object_ser = serializeObject(object, group)
     #result = pickleObject(object_ser)
     result = getBytes(json.dumps(object_ser, default=to_json))
     return b64encode(zlib.compress(result))
     
-def bytesToObject(byteobject, group):
+def legacyBytesToObject(byteobject, group):
     #unwrap_object = unpickleObject(byteobject)
     decoded = bytes.decode(zlib.decompress(b64decode(byteobject)))
     unwrap_object = json.loads(decoded, object_hook=from_json)
@@ -490,6 +490,69 @@ PyObject *ECE_random(ECElement *self, PyObject *args)
 	EXIT_IF(TRUE, "invalid argument.");
 }
 
+/*
+ * random_many(group, type, count[, seed]): returns a list of count random
+ * elements of ZR or G from one DRBG request. Scalars are reduced from integers
+ * DRBG_EXTRA_BYTES longer than the group order; points are multiples of the
+ * generator by such scalars, which uses the curve's precomputed generator table
+ * instead of a square root per point. Without a seed the calling thread's
+ * OS-seeded generator is used; with a seed (bytes) the output is reproducible.
+ */
+PyObject *ECE_random_many(ECElement *self, PyObject *args)
+{
+	GroupType type = NONE_G;
+	ECGroup *gobj = NULL;
+	PyObject *seed = NULL, *list = NULL;
+	Py_ssize_t count, i, chunk;
+	uint8_t *buf = NULL;
+	BIGNUM *k = NULL;
+	drbg_t local, *drbg = drbg_thread_state();
+
+	if(!PyArg_ParseTuple(args, "Oin|O", &gobj, &type, &count, &seed)) {
+		EXIT_IF(TRUE, "invalid argument.");
+	}
+	VERIFY_GROUP(gobj);
+	EXIT_IF(type != ZR && type != G, "invalid object type.");
+	EXIT_IF(count < 0, "count must be non-negative.");
+	if(seed != NULL && seed != Py_None) {
+		EXIT_IF(!PyBytes_Check(seed), "seed must be a bytes object.");
+		drbg_seed(&local, (uint8_t *) PyBytes_AS_STRING(seed), PyBytes_GET_SIZE(seed));
+		drbg = &local;
+	}
+
+	chunk = BN_num_bytes(gobj->order) + DRBG_EXTRA_BYTES;
+	buf = (uint8_t *) malloc(chunk * count + 1);
+	list = PyList_New(count);
+	k = BN_new();
+	if(buf == NULL || list == NULL || k == NULL || !drbg_generate(drbg, buf, chunk * count)) {
+		Py_XDECREF(list);
+		free(buf);
+		BN_free(k);
+		if(drbg == &local) drbg_cleanse(&local);
+		if(!PyErr_Occurred()) PyErr_SetString(PyECErrorObject, "random generator failed.");
+		return NULL;
+	}
+
+	for(i = 0; i < count; i++) {
+		ECElement *obj = createNewPoint(type, gobj);
+		BIGNUM *z = (type == ZR) ? obj->elemZ : k;
+		BN_bin2bn(buf + i * chunk, (int) chunk, z);
+		BN_mod(z, z, gobj->order, gobj->ctx);
+		if(type == G) {
+			/* k = 0 would give the point at infinity */
+			if(BN_is_zero(k)) BN_one(k);
+			EC_POINT_mul(gobj->ec_group, obj->P, k, NULL, NULL, gobj->ctx);
+		}
+		PyList_SET_ITEM(list, i, (PyObject *) obj);
+	}
+
+	BN_clear_free(k);
+	memset(buf, 0, chunk * count);
+	free(buf);
+	if(drbg == &local) drbg_cleanse(&local);
+	return list;
+}
+
 static PyObject *ECE_is_infinity(ECElement *self, PyObject *args) {
 
 	Point_Init(self);
@@ -635,6 +698,12 @@ static PyObject *ECE_mul(PyObject *o1, PyObject *o2) {
 	ECElement *lhs = NULL, *rhs = NULL, *ans = NULL;
 	int foundLHS = FALSE, foundRHS = FALSE;
 
+#if PY_MAJOR_VERSION >= 3
+	if(PyECVector_Check(o1) || PyECVector_Check(o2)) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+#endif
 	Check_Types2(o1, o2, lhs, rhs, foundLHS, foundRHS);
 
 	if(foundLHS) {
@@ -832,6 +901,12 @@ static PyObject *ECE_pow(PyObject *o1, PyObject *o2, PyObject *o3) {
 	ECElement *lhs = NULL, *rhs = NULL, *ans = NULL;
 	int foundLHS = FALSE, foundRHS = FALSE;
 
+#if PY_MAJOR_VERSION >= 3
+	if(PyECVector_Check(o2)) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+#endif
 	Check_Types2(o1, o2, lhs, rhs, foundLHS, foundRHS);
 
 	if(foundLHS) {
@@ -1435,6 +1510,103 @@ static PyObject *ECE_decode(ECElement *self, PyObject *args) {
 	EXIT_IF(TRUE, "invalid argument");
 }
 
+/*
+ * Computes the sum of points[i] * exps[i] with a single call to EC_POINTs_mul,
+ * which shares the doublings across all terms (interleaved wNAF).
+ */
+static PyObject *ECE_multiexp(ECElement *self, PyObject *args) {
+	ECGroup *gobj = NULL;
+	PyObject *listPoints = NULL, *listExps = NULL, *seqPoints = NULL, *seqExps = NULL, *tmp;
+	PyObject **itemPoints, **itemExps;
+	ECElement *ans = NULL, *obj;
+	const EC_POINT **points = NULL;
+	const BIGNUM **exps = NULL;
+	BIGNUM **owned = NULL;
+	Py_ssize_t i, n;
+	int owned_count = 0;
+	char *error = NULL;
+
+	if(!PyArg_ParseTuple(args, "OOO", &gobj, &listPoints, &listExps)) {
+		EXIT_IF(TRUE, "invalid arguments");
+	}
+	VERIFY_GROUP(gobj);
+	/* the fast sequences hold references to every item until they are released below,
+	 * so the EC_POINT and BIGNUM pointers stay valid through EC_POINTs_mul */
+	seqPoints = PySequence_Fast(listPoints, "points and exponents must be sequences.");
+	if(seqPoints == NULL) return NULL;
+	seqExps = PySequence_Fast(listExps, "points and exponents must be sequences.");
+	if(seqExps == NULL) {
+		Py_DECREF(seqPoints);
+		return NULL;
+	}
+	n = PySequence_Fast_GET_SIZE(seqPoints);
+	if(n != PySequence_Fast_GET_SIZE(seqExps))
+		error = "unequal number of points and exponents.";
+	else if(n <= 0)
+		error = "list is empty.";
+	else {
+		points = (const EC_POINT **) malloc(sizeof(EC_POINT *) * n);
+		exps = (const BIGNUM **) malloc(sizeof(BIGNUM *) * n);
+		owned = (BIGNUM **) malloc(sizeof(BIGNUM *) * n);
+	}
+	itemPoints = PySequence_Fast_ITEMS(seqPoints);
+	itemExps = PySequence_Fast_ITEMS(seqExps);
+	for(i = 0; i < n && error == NULL; i++) {
+		tmp = itemPoints[i];
+		obj = (ECElement *) tmp;
+		if(!PyEC_Check(tmp) || !obj->point_init || obj->type != G) {
+			error = "points must be initialized elements of G.";
+			break;
+		}
+		else if(obj->group->nid != gobj->nid) {
+			error = "mixing group elements from different curves.";
+			break;
+		}
+		points[i] = obj->P;
+
+		tmp = itemExps[i];
+		obj = (ECElement *) tmp;
+		if(PyEC_Check(tmp) && obj->point_init && obj->type == ZR) {
+			exps[i] = obj->elemZ;
+		}
+		else if(PyLongCheck(tmp)) {
+			BIGNUM *value = BN_new();
+			setBigNum((PyLongObject *) tmp, &value);
+			/* setBigNum only copies the magnitude */
+			BN_set_negative(value, Py_SIZE(tmp) < 0);
+			BN_nnmod(value, value, gobj->order, gobj->ctx);
+			owned[owned_count++] = value;
+			exps[i] = value;
+		}
+		else {
+			error = "exponents must be elements of ZR or integers.";
+		}
+	}
+
+	if(error == NULL) {
+		ans = createNewPoint(G, gobj);
+		if(!EC_POINTs_mul(gobj->ec_group, ans->P, NULL, n, points, exps, gobj->ctx)) {
+			Py_XDECREF(ans);
+			ans = NULL;
+			error = "multi-exponentiation failed.";
+		}
+#ifdef BENCHMARK_ENABLED
+		else {
+			UPDATE_BENCH(EXPONENTIATION, ans->type, ans->group);
+		}
+#endif
+	}
+	if(error != NULL) PyErr_SetString(PyECErrorObject, error);
+
+	for(i = 0; i < owned_count; i++) BN_free(owned[i]);
+	free(owned);
+	free(points);
+	free(exps);
+	Py_DECREF(seqPoints);
+	Py_DECREF(seqExps);
+	return (PyObject *) ans;
+}
+
 static PyObject *Serialize(ECElement *self, PyObject *args) {
 
 	ECElement *obj = NULL;
@@ -1528,6 +1700,498 @@ static PyObject *Deserialize(ECElement *self, PyObject *args)
 	EXIT_IF(TRUE, "invalid argument");
 }
 
+#if PY_MAJOR_VERSION >= 3
+/* ElementVector: a fixed-length array of ZR or G elements of one curve, the counterpart of
+ * pairing.ElementVector. Vectors are immutable, arithmetic returns new vectors, so the serialized
+ * form that is exported through the buffer protocol is computed at most once. The layout is the
+ * one of the pairing vectors: the fixed-length encodings of the elements back to back, the element
+ * type being passed to deserializeVector. Points are compressed with the point at infinity as all
+ * zeros, ZR elements are big-endian and padded to the length of the group order. */
+#define SAME_CURVE(a, b) ((a)->nid == (b)->nid)
+#define RETURN_NOT_IMPLEMENTED { Py_INCREF(Py_NotImplemented); return Py_NotImplemented; }
+
+static ECVector *createNewVector(GroupType type, ECGroup *gobj, Py_ssize_t length)
+{
+	Py_ssize_t i;
+	ECVector *vec = PyObject_New(ECVector, &ECVectorType);
+	if(vec == NULL)
+		return NULL;
+	vec->group = gobj;
+	Py_INCREF(gobj);
+	vec->type = type;
+	vec->length = 0;
+	vec->points = NULL;
+	vec->elemZ = NULL;
+	vec->buf = NULL;
+	vec->buf_len = 0;
+	if(type == G)
+		vec->points = (EC_POINT **) PyMem_Malloc(sizeof(EC_POINT *) * length);
+	else
+		vec->elemZ = (BIGNUM **) PyMem_Malloc(sizeof(BIGNUM *) * length);
+	for(i = 0; (vec->points != NULL || vec->elemZ != NULL) && i < length; i++) {
+		if(type == G && (vec->points[i] = EC_POINT_new(gobj->ec_group)) == NULL)
+			break;
+		if(type == ZR && (vec->elemZ[i] = BN_new()) == NULL)
+			break;
+		vec->length = i + 1;
+	}
+	if(vec->length != length) {
+		Py_DECREF(vec);
+		PyErr_NoMemory();
+		return NULL;
+	}
+	return vec;
+}
+
+void ECVector_dealloc(ECVector *self)
+{
+	Py_ssize_t i;
+	for(i = 0; i < self->length; i++) {
+		if(self->type == G) EC_POINT_free(self->points[i]);
+		else BN_free(self->elemZ[i]);
+	}
+	PyMem_Free(self->points);
+	PyMem_Free(self->elemZ);
+	PyMem_Free(self->buf);
+	Py_XDECREF(self->group);
+	Py_TYPE(self)->tp_free((PyObject *) self);
+}
+
+/* number of bytes of one element in the serialized form of a vector */
+static Py_ssize_t ECVector_elementLength(GroupType type, ECGroup *gobj)
+{
+	if(type == G)
+		return 1 + (EC_GROUP_get_degree(gobj->ec_group) + 7) / 8;
+	return BN_num_bytes(gobj->order);
+}
+
+/* vector(group, elements) copies a non-empty sequence of elements of one group into a vector. */
+static PyObject *ECVector_create(PyObject *self, PyObject *args)
+{
+	ECGroup *gobj = NULL;
+	PyObject *seq = NULL, *fast = NULL;
+	ECElement *item;
+	ECVector *vec = NULL;
+	Py_ssize_t i, n;
+	int type = -1;
+
+	if(!PyArg_ParseTuple(args, "OO:vector", &gobj, &seq))
+		return NULL;
+	VERIFY_GROUP(gobj);
+	fast = PySequence_Fast(seq, "elements must be a sequence.");
+	if(fast == NULL)
+		return NULL;
+
+	n = PySequence_Fast_GET_SIZE(fast);
+	for(i = 0; i < n; i++) {
+		item = (ECElement *) PySequence_Fast_GET_ITEM(fast, i);
+		if(!PyEC_Check(item) || !item->point_init || (type != -1 && item->type != type)
+				|| !SAME_CURVE(item->group, gobj)) {
+			Py_DECREF(fast);
+			EXIT_IF(TRUE, "elements must belong to the same group: ZR or G.");
+		}
+		type = item->type;
+	}
+	if(n == 0) {
+		Py_DECREF(fast);
+		EXIT_IF(TRUE, "vector is empty.");
+	}
+
+	vec = createNewVector(type, gobj, n);
+	for(i = 0; vec != NULL && i < n; i++) {
+		item = (ECElement *) PySequence_Fast_GET_ITEM(fast, i);
+		if(type == G) EC_POINT_copy(vec->points[i], item->P);
+		else BN_nnmod(vec->elemZ[i], item->elemZ, gobj->order, gobj->ctx);
+	}
+	Py_DECREF(fast);
+	return (PyObject *) vec;
+}
+
+static Py_ssize_t ECVector_length(ECVector *self)
+{
+	return self->length;
+}
+
+static PyObject *ECVector_item(ECVector *self, Py_ssize_t i)
+{
+	ECElement *newObject;
+	if(i < 0 || i >= self->length) {
+		PyErr_SetString(PyExc_IndexError, "vector index out of range.");
+		return NULL;
+	}
+	newObject = createNewPoint(self->type, self->group);
+	if(self->type == G) EC_POINT_copy(newObject->P, self->points[i]);
+	else BN_copy(newObject->elemZ, self->elemZ[i]);
+	return (PyObject *) newObject;
+}
+
+/* elementwise product of two vectors, or of a vector and a single element (broadcast). */
+static PyObject *ECVector_mul(PyObject *lhs, PyObject *rhs)
+{
+	ECVector *vec = NULL, *other = NULL, *rop = NULL;
+	ECElement *scalar = NULL;
+	BN_CTX *ctx;
+	Py_ssize_t i;
+	int ok = TRUE;
+
+	if(PyECVector_Check(lhs) && PyECVector_Check(rhs)) {
+		vec = (ECVector *) lhs;
+		other = (ECVector *) rhs;
+	}
+	else if(PyECVector_Check(lhs) && PyEC_Check(rhs)) {
+		vec = (ECVector *) lhs;
+		scalar = (ECElement *) rhs;
+	}
+	else if(PyEC_Check(lhs) && PyECVector_Check(rhs)) {
+		vec = (ECVector *) rhs;
+		scalar = (ECElement *) lhs;
+	}
+	else RETURN_NOT_IMPLEMENTED;
+
+	if(other != NULL) {
+		EXIT_IF(other->type != vec->type || !SAME_CURVE(other->group, vec->group), "vectors must belong to the same group.");
+		EXIT_IF(other->length != vec->length, "vectors must have the same length.");
+	}
+	else {
+		EXIT_IF(!scalar->point_init || scalar->type != vec->type || !SAME_CURVE(scalar->group, vec->group), "element and vector must belong to the same group.");
+	}
+
+	rop = createNewVector(vec->type, vec->group, vec->length);
+	if(rop == NULL)
+		return NULL;
+	/* the group's BN_CTX is only used while holding the GIL */
+	ctx = BN_CTX_new();
+	if(ctx == NULL) {
+		Py_DECREF(rop);
+		return PyErr_NoMemory();
+	}
+	Py_BEGIN_ALLOW_THREADS;
+	for(i = 0; ok && i < vec->length; i++) {
+		if(vec->type == G)
+			ok = EC_POINT_add(vec->group->ec_group, rop->points[i], vec->points[i], (other != NULL) ? other->points[i] : scalar->P, ctx);
+		else
+			ok = BN_mod_mul(rop->elemZ[i], vec->elemZ[i], (other != NULL) ? other->elemZ[i] : scalar->elemZ, vec->group->order, ctx);
+	}
+	Py_END_ALLOW_THREADS;
+	BN_CTX_free(ctx);
+	if(!ok) {
+		Py_DECREF(rop);
+		EXIT_IF(TRUE, "vector multiplication failed.");
+	}
+#ifdef BENCHMARK_ENABLED
+	UPDATE_BENCH(MULTIPLICATION, vec->type, vec->group);
+#endif
+	return (PyObject *) rop;
+}
+
+/* vector ** ZR vector (elementwise), vector ** ZR element or int (broadcast exponent) and
+ * element ** ZR vector (broadcast base). */
+static PyObject *ECVector_pow(PyObject *o1, PyObject *o2, PyObject *o3)
+{
+	ECVector *vec = NULL, *exps = NULL, *rop = NULL;
+	ECElement *base = NULL, *exp = NULL;
+	ECGroup *gobj;
+	BIGNUM *z = NULL;
+	const BIGNUM *e;
+	BN_CTX *ctx;
+	GroupType type;
+	Py_ssize_t i, n;
+	int ok = TRUE;
+
+	if(PyECVector_Check(o1)) {
+		vec = (ECVector *) o1;
+		if(PyECVector_Check(o2)) exps = (ECVector *) o2;
+		else if(PyEC_Check(o2)) exp = (ECElement *) o2;
+		else if(!PyLongCheck(o2)) RETURN_NOT_IMPLEMENTED;
+	}
+	else if(PyEC_Check(o1) && PyECVector_Check(o2)) {
+		base = (ECElement *) o1;
+		exps = (ECVector *) o2;
+	}
+	else RETURN_NOT_IMPLEMENTED;
+
+	gobj = (vec != NULL) ? vec->group : base->group;
+	EXIT_IF(base != NULL && !base->point_init, "base must be an initialized element.");
+	EXIT_IF(exps != NULL && (exps->type != ZR || !SAME_CURVE(exps->group, gobj)), "exponents must be ZR elements of the same group.");
+	EXIT_IF(exp != NULL && (!exp->point_init || exp->type != ZR || !SAME_CURVE(exp->group, gobj)), "exponent must be a ZR element of the same group.");
+	EXIT_IF(vec != NULL && exps != NULL && vec->length != exps->length, "vectors must have the same length.");
+
+	type = (vec != NULL) ? vec->type : base->type;
+	if(vec != NULL && exps == NULL && exp == NULL) {
+		z = BN_new();
+		if(z == NULL)
+			return PyErr_NoMemory();
+		setBigNum((PyLongObject *) o2, &z);
+		if(type == G) {
+			/* setBigNum only copies the magnitude */
+			BN_set_negative(z, Py_SIZE(o2) < 0);
+			BN_nnmod(z, z, gobj->order, gobj->ctx);
+		}
+		else if(Py_SIZE(o2) < 0) {
+			BN_free(z);
+			EXIT_IF(TRUE, "negative integer exponents are only supported for G.");
+		}
+	}
+
+	n = (vec != NULL) ? vec->length : exps->length;
+	rop = createNewVector(type, gobj, n);
+	ctx = (rop != NULL) ? BN_CTX_new() : NULL;
+	if(rop != NULL && ctx == NULL) {
+		Py_CLEAR(rop);
+		PyErr_NoMemory();
+	}
+	if(rop != NULL) {
+		Py_BEGIN_ALLOW_THREADS;
+		for(i = 0; ok && i < n; i++) {
+			e = (exps != NULL) ? exps->elemZ[i] : (exp != NULL) ? exp->elemZ : z;
+			if(type == G)
+				ok = EC_POINT_mul(gobj->ec_group, rop->points[i], NULL, (base != NULL) ? base->P : vec->points[i], e, ctx);
+			else
+				ok = BN_mod_exp(rop->elemZ[i], (base != NULL) ? base->elemZ : vec->elemZ[i], e, gobj->order, ctx);
+		}
+		Py_END_ALLOW_THREADS;
+		BN_CTX_free(ctx);
+		if(!ok) {
+			Py_CLEAR(rop);
+			PyErr_SetString(PyECErrorObject, "vector exponentiation failed.");
+		}
+#ifdef BENCHMARK_ENABLED
+		else {
+			UPDATE_BENCH(EXPONENTIATION, rop->type, gobj);
+		}
+#endif
+	}
+	BN_free(z);
+	return (PyObject *) rop;
+}
+
+static PyObject *ECVector_equals(PyObject *lhs, PyObject *rhs, int opid)
+{
+	ECVector *a, *b;
+	Py_ssize_t i;
+	int equal;
+
+	if(!PyECVector_Check(lhs) || !PyECVector_Check(rhs) || (opid != Py_EQ && opid != Py_NE))
+		RETURN_NOT_IMPLEMENTED;
+	a = (ECVector *) lhs;
+	b = (ECVector *) rhs;
+	equal = a->type == b->type && a->length == b->length && SAME_CURVE(a->group, b->group);
+	for(i = 0; equal && i < a->length; i++) {
+		if(a->type == G)
+			equal = EC_POINT_cmp(a->group->ec_group, a->points[i], b->points[i], a->group->ctx) == 0;
+		else
+			equal = BN_cmp(a->elemZ[i], b->elemZ[i]) == 0;
+	}
+	if(equal == (opid == Py_EQ))
+		Py_RETURN_TRUE;
+	Py_RETURN_FALSE;
+}
+
+/* v.multiexp(exps) computes prod_i v[i] ** exps[i] for a ZR vector or a sequence of ZR elements
+ * or ints with EC_POINTs_mul. Its running time depends on the exponents: public exponents only. */
+static PyObject *ECVector_multiexp(ECVector *self, PyObject *args)
+{
+	PyObject *obj = NULL, *fast = NULL, *tmp;
+	ECVector *vexps;
+	ECElement *ans = NULL, *item;
+	BIGNUM **exps;
+	Py_ssize_t i, n = self->length;
+	char *error = NULL;
+
+	if(!PyArg_ParseTuple(args, "O:multiexp", &obj))
+		return NULL;
+	EXIT_IF(self->type != G, "bases must be elements of G.");
+	exps = (BIGNUM **) PyMem_Malloc(sizeof(BIGNUM *) * n);
+	if(exps == NULL)
+		return PyErr_NoMemory();
+	for(i = 0; i < n; i++) {
+		if((exps[i] = BN_new()) == NULL)
+			error = "";
+	}
+
+	if(error != NULL) {
+		PyErr_NoMemory();
+	}
+	else if(PyECVector_Check(obj)) {
+		vexps = (ECVector *) obj;
+		if(vexps->type != ZR || vexps->length != n || !SAME_CURVE(vexps->group, self->group))
+			error = "exponents must be a ZR vector of the same length.";
+		for(i = 0; i < n && error == NULL; i++)
+			BN_copy(exps[i], vexps->elemZ[i]);
+	}
+	else if((fast = PySequence_Fast(obj, "exponents must be a sequence.")) != NULL) {
+		if(PySequence_Fast_GET_SIZE(fast) != n)
+			error = "unequal number of points and exponents.";
+		for(i = 0; i < n && error == NULL; i++) {
+			tmp = PySequence_Fast_GET_ITEM(fast, i);
+			item = (ECElement *) tmp;
+			if(PyEC_Check(tmp) && item->point_init && item->type == ZR && SAME_CURVE(item->group, self->group)) {
+				BN_copy(exps[i], item->elemZ);
+			}
+			else if(PyLongCheck(tmp)) {
+				setBigNum((PyLongObject *) tmp, &exps[i]);
+				/* setBigNum only copies the magnitude */
+				BN_set_negative(exps[i], Py_SIZE(tmp) < 0);
+				BN_nnmod(exps[i], exps[i], self->group->order, self->group->ctx);
+			}
+			else {
+				error = "exponents must be elements of ZR or integers.";
+			}
+		}
+		Py_DECREF(fast);
+	}
+	else {
+		error = ""; /* exception already set by PySequence_Fast */
+	}
+
+	if(error == NULL) {
+		ans = createNewPoint(G, self->group);
+		if(!EC_POINTs_mul(self->group->ec_group, ans->P, NULL, (size_t) n, (const EC_POINT **) self->points,
+				(const BIGNUM **) exps, self->group->ctx)) {
+			Py_CLEAR(ans);
+			error = "multi-exponentiation failed.";
+		}
+#ifdef BENCHMARK_ENABLED
+		else {
+			UPDATE_BENCH(EXPONENTIATION, ans->type, ans->group);
+		}
+#endif
+	}
+	if(error != NULL && error[0] != '\0')
+		PyErr_SetString(PyECErrorObject, error);
+
+	for(i = 0; i < n; i++)
+		BN_free(exps[i]);
+	PyMem_Free(exps);
+	return (PyObject *) ans;
+}
+
+/* v.prod() multiplies all elements of the vector together. */
+static PyObject *ECVector_prod(ECVector *self, PyObject *args)
+{
+	Py_ssize_t i;
+	int ok;
+	ECElement *ans = createNewPoint(self->type, self->group);
+
+	if(self->type == G) {
+		ok = EC_POINT_copy(ans->P, self->points[0]);
+		for(i = 1; ok && i < self->length; i++)
+			ok = EC_POINT_add(self->group->ec_group, ans->P, ans->P, self->points[i], self->group->ctx);
+	}
+	else {
+		ok = BN_copy(ans->elemZ, self->elemZ[0]) != NULL;
+		for(i = 1; ok && i < self->length; i++)
+			ok = BN_mod_mul(ans->elemZ, ans->elemZ, self->elemZ[i], self->group->order, self->group->ctx);
+	}
+	if(!ok) {
+		Py_DECREF(ans);
+		EXIT_IF(TRUE, "vector product failed.");
+	}
+	return (PyObject *) ans;
+}
+
+/* computes the contiguous serialized form (fixed-length encodings) once. */
+static int ECVector_fillBuffer(ECVector *self)
+{
+	Py_ssize_t i, elem_len, total;
+	uint8_t *buf, *p;
+	int ok = TRUE;
+
+	if(self->buf != NULL)
+		return 0;
+	elem_len = ECVector_elementLength(self->type, self->group);
+	total = elem_len * self->length;
+	buf = (uint8_t *) PyMem_Malloc(total);
+	if(buf == NULL) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	memset(buf, 0, total);
+	for(i = 0; ok && i < self->length; i++) {
+		p = buf + i * elem_len;
+		if(self->type == ZR)
+			ok = BN_bn2bin(self->elemZ[i], p + elem_len - BN_num_bytes(self->elemZ[i])) >= 0;
+		else if(!EC_POINT_is_at_infinity(self->group->ec_group, self->points[i]))
+			ok = EC_POINT_point2oct(self->group->ec_group, self->points[i], POINT_CONVERSION_COMPRESSED,
+					p, elem_len, self->group->ctx) == (size_t) elem_len;
+	}
+	if(!ok) {
+		PyMem_Free(buf);
+		PyErr_SetString(PyECErrorObject, "could not serialize vector.");
+		return -1;
+	}
+	self->buf = buf;
+	self->buf_len = total;
+	return 0;
+}
+
+static PyObject *ECVector_serialize(ECVector *self, PyObject *args)
+{
+	if(ECVector_fillBuffer(self) < 0)
+		return NULL;
+	return PyBytes_FromStringAndSize((const char *) self->buf, self->buf_len);
+}
+
+static int ECVector_getbuffer(ECVector *self, Py_buffer *view, int flags)
+{
+	if(ECVector_fillBuffer(self) < 0) {
+		view->obj = NULL;
+		return -1;
+	}
+	return PyBuffer_FillInfo(view, (PyObject *) self, self->buf, self->buf_len, 1, flags);
+}
+
+/* deserializeVector(group, type, data) is the inverse of ElementVector.serialize, data being
+ * any bytes-like object holding a whole number of encodings. */
+static PyObject *ECVector_deserialize(PyObject *self, PyObject *args)
+{
+	ECGroup *gobj = NULL;
+	ECVector *vec = NULL;
+	PyObject *data = NULL;
+	Py_buffer view;
+	Py_ssize_t i, j, elem_len;
+	const uint8_t *p;
+	int type, ok = TRUE;
+
+	if(!PyArg_ParseTuple(args, "OiO:deserializeVector", &gobj, &type, &data))
+		return NULL;
+	VERIFY_GROUP(gobj);
+	EXIT_IF(type != ZR && type != G, "invalid element type.");
+	if(PyObject_GetBuffer(data, &view, PyBUF_SIMPLE) < 0)
+		return NULL;
+
+	elem_len = ECVector_elementLength((GroupType) type, gobj);
+	if(view.len == 0 || view.len % elem_len != 0) {
+		PyBuffer_Release(&view);
+		EXIT_IF(TRUE, "buffer does not hold a whole number of elements.");
+	}
+	vec = createNewVector((GroupType) type, gobj, view.len / elem_len);
+	for(i = 0; vec != NULL && ok && i < vec->length; i++) {
+		p = (const uint8_t *) view.buf + i * elem_len;
+		if(type == ZR) {
+			ok = BN_bin2bn(p, (int) elem_len, vec->elemZ[i]) != NULL && BN_cmp(vec->elemZ[i], gobj->order) < 0;
+			continue;
+		}
+		for(j = 0; j < elem_len && p[j] == 0; j++) ;
+		if(j == elem_len)
+			ok = EC_POINT_set_to_infinity(gobj->ec_group, vec->points[i]);
+		else
+			ok = EC_POINT_oct2point(gobj->ec_group, vec->points[i], p, elem_len, gobj->ctx);
+	}
+	PyBuffer_Release(&view);
+	if(vec != NULL && !ok) {
+		Py_DECREF(vec);
+		EXIT_IF(TRUE, "invalid element encoding.");
+	}
+	return (PyObject *) vec;
+}
+
+static PyObject *ECVector_print(ECVector *self)
+{
+	return PyUnicode_FromFormat("<ElementVector type=%d length=%zd>", self->type, self->length);
+}
+#endif
+
 #ifdef BENCHMARK_ENABLED
 
 #define BenchmarkIdentifier 2
@@ -1640,6 +2304,71 @@ PyTypeObject ECType = {
 	0,                         /* tp_alloc */
 	ECElement_new,                 /* tp_new */
 };
+
+PySequenceMethods ecvector_sequence = {
+	(lenfunc)ECVector_length,        /* sq_length */
+	0,                         /* sq_concat */
+	0,                         /* sq_repeat */
+	(ssizeargfunc)ECVector_item,     /* sq_item */
+};
+
+PyNumberMethods ecvector_number = {
+	0,                         /* nb_add */
+	0,                         /* nb_subtract */
+	ECVector_mul,              /* nb_multiply */
+	0,                         /* nb_remainder */
+	0,                         /* nb_divmod */
+	ECVector_pow,              /* nb_power */
+};
+
+PyBufferProcs ecvector_buffer = {
+	(getbufferproc)ECVector_getbuffer, /* bf_getbuffer */
+	0,                         /* bf_releasebuffer */
+};
+
+PyMemberDef ECVector_members[] = {
+	{"type", T_INT, offsetof(ECVector, type), READONLY, "group type"},
+	{NULL}  /* Sentinel */
+};
+
+PyMethodDef ECVector_methods[] = {
+	{"multiexp", (PyCFunction)ECVector_multiexp, METH_VARARGS, "Sum of the points multiplied by a vector or sequence of exponents."},
+	{"prod", (PyCFunction)ECVector_prod, METH_NOARGS, "Product of all elements."},
+	{"serialize", (PyCFunction)ECVector_serialize, METH_NOARGS, "Contiguous fixed-length encoding of all elements."},
+	{NULL}  /* Sentinel */
+};
+
+PyTypeObject ECVectorType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"elliptic_curve.ElementVector", /*tp_name*/
+	sizeof(ECVector),          /*tp_basicsize*/
+	0,                         /*tp_itemsize*/
+	(destructor)ECVector_dealloc, /*tp_dealloc*/
+	0,                         /*tp_print*/
+	0,                         /*tp_getattr*/
+	0,                         /*tp_setattr*/
+	0,                         /*tp_reserved*/
+	(reprfunc)ECVector_print,  /*tp_repr*/
+	&ecvector_number,          /*tp_as_number*/
+	&ecvector_sequence,        /*tp_as_sequence*/
+	0,                         /*tp_as_mapping*/
+	0,                         /*tp_hash */
+	0,                         /*tp_call*/
+	0,                         /*tp_str*/
+	0,                         /*tp_getattro*/
+	0,                         /*tp_setattro*/
+	&ecvector_buffer,          /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+	"Vectors of elliptic curve elements", /* tp_doc */
+	0,                         /* tp_traverse */
+	0,                         /* tp_clear */
+	ECVector_equals,           /* tp_richcompare */
+	0,                         /* tp_weaklistoffset */
+	0,                         /* tp_iter */
+	0,                         /* tp_iternext */
+	ECVector_methods,          /* tp_methods */
+	ECVector_members,          /* tp_members */
+};
 #else
 /* python 2.x series */
 PyNumberMethods ec_number = {
@@ -1834,6 +2563,7 @@ static struct module_state _state;
 static PyMethodDef ec_methods[] = {
 		{"init", (PyCFunction)ECE_init, METH_VARARGS, "Create an element in a specific group G or ZR."},
 		{"random", (PyCFunction)ECE_random, METH_VARARGS, "Return a random element in a specific group G or ZR."},
+		{"random_many", (PyCFunction)ECE_random_many, METH_VARARGS, "Return a list of random elements in G or ZR, optionally from a fixed seed."},
 		{"order", (PyCFunction)ECE_getOrder, METH_O, "Return the order of a group."},
 		{"getGenerator", (PyCFunction)ECE_getGen, METH_O, "Get the generator of the group."},
 		{"bitsize", (PyCFunction)ECE_bitsize, METH_O, "Returns number of bytes to represent a message."},
@@ -1843,6 +2573,11 @@ static PyMethodDef ec_methods[] = {
 		{"encode", (PyCFunction)ECE_encode, METH_VARARGS, "Encode string as a group element of G"},
 		{"decode", (PyCFunction)ECE_decode, METH_VARARGS, "Decode group element to a string."},
 		{"getXY", (PyCFunction)ECE_convertToZR, METH_VARARGS, "Returns the x and/or y coordinates of point on an elliptic curve."},
+		{"multiexp", (PyCFunction)ECE_multiexp, METH_VARARGS, "Compute the sum of points of G multiplied by ZR exponents."},
+#if PY_MAJOR_VERSION >= 3
+		{"vector", (PyCFunction)ECVector_create, METH_VARARGS, "Create a vector from a sequence of elements of one group"},
+		{"deserializeVector", (PyCFunction)ECVector_deserialize, METH_VARARGS, "Create a vector from the output of ElementVector.serialize"},
+#endif
 #ifdef BENCHMARK_ENABLED
 		{"InitBenchmark", (PyCFunction)InitBenchmark, METH_VARARGS, "Initialize a benchmark object"},
 		{"StartBenchmark", (PyCFunction)StartBenchmark, METH_VARARGS, "Start a new benchmark with some options"},
@@ -1893,6 +2628,10 @@ void initelliptic_curve(void) 		{
 		CLEAN_EXIT;
     if(PyType_Ready(&ECType) < 0)
     	CLEAN_EXIT;
+#if PY_MAJOR_VERSION >= 3
+    if(PyType_Ready(&ECVectorType) < 0)
+    	CLEAN_EXIT;
+#endif
 #ifdef BENCHMARK_ENABLED
     if(import_benchmark() < 0)
         CLEAN_EXIT;
@@ -1921,6 +2660,11 @@ void initelliptic_curve(void) 		{
     Py_INCREF(&ECGroupType);
     if(PyModule_AddObject(m, "elliptic_curve", (PyObject *)&ECGroupType) != 0)
     	CLEAN_EXIT;
+#if PY_MAJOR_VERSION >= 3
+    Py_INCREF(&ECVectorType);
+    if(PyModule_AddObject(m, "ElementVector", (PyObject *)&ECVectorType) != 0)
+    	CLEAN_EXIT;
+#endif
 
 	PyModule_AddIntConstant(m, "G", G);
 	PyModule_AddIntConstant(m, "ZR", ZR);
@@ -37,6 +37,7 @@
 #include <gmp.h>
 #include "benchmarkmodule.h"
 #include "base64.h"
+#include "drbg.h"
 
 /* Openssl header files */
 #include <openssl/ec.h>
@@ -115,6 +116,20 @@ typedef struct {
 	int point_init;
 } ECElement;
 
+typedef struct {
+	PyObject_HEAD
+	ECGroup *group;
+	GroupType type;
+	Py_ssize_t length;
+	EC_POINT **points;	/* elements of G */
+	BIGNUM **elemZ;		/* elements of ZR, reduced modulo the group order */
+	uint8_t *buf;		/* serialized elements, filled on first serialize or buffer export */
+	Py_ssize_t buf_len;
+} ECVector;
+
+PyTypeObject ECVectorType;
+#define PyECVector_Check(obj) PyObject_TypeCheck(obj, &ECVectorType)
+
 #if PY_MAJOR_VERSION >= 3
 #define PyLong_ToUnsignedLong(o) PyLong_AsUnsignedLong(o)
 #define PyLongCheck(o) PyLong_Check(o)
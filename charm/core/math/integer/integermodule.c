@@ -905,7 +905,7 @@ static PyObject *Integer_pow(PyObject *o1, PyObject *o2, PyObject *o3) {
 			debug("exponent is positive\n");
 			int sgn = mpz_sgn(lhs->m);
 			if(sgn > 0)  {
-				if(mpz_odd_p(lhs->m) > 0) {
+				if(mpz_odd_p(lhs->m) > 0 && mpz_sgn(exponent) > 0) {
 //					mpz_t exp;
 // 					mpz_init(exp);
 //					longObjToMPZ(exp, o2);
@@ -915,6 +915,13 @@ static PyObject *Integer_pow(PyObject *o1, PyObject *o2, PyObject *o3) {
 					mpz_init_set(rop->m, lhs->m);
 					mpz_powm_sec(rop->e, lhs->e, exponent, rop->m);
 				 }
+				else {
+					// mpz_powm_sec is only defined for odd moduli and positive exponents
+					rop = createNewInteger();
+					mpz_init(rop->e);
+					mpz_init_set(rop->m, lhs->m);
+					mpz_powm(rop->e, lhs->e, exponent, rop->m);
+				}
 			}
 			else if(sgn == 0) { // no modulus
 				unsigned long int exp = PyLong_AsUnsignedLong(o2);
@@ -993,7 +1000,10 @@ static PyObject *Integer_pow(PyObject *o1, PyObject *o2, PyObject *o3) {
 			rop = createNewInteger();
 			mpz_init(rop->e);
 			mpz_init_set(rop->m, lhs->m);
-			mpz_powm_sec(rop->e, lhs->e, rhs->e, rop->m);
+			if(mpz_odd_p(rop->m) && mpz_sgn(rhs->e) > 0)
+				mpz_powm_sec(rop->e, lhs->e, rhs->e, rop->m);
+			else
+				mpz_powm(rop->e, lhs->e, rhs->e, rop->m);
 		}
 		// lhs is a reg int
 		else if (mpz_fits_ulong_p(lhs->e) && mpz_fits_ulong_p(rhs->e)) {
@@ -1438,6 +1448,72 @@ static PyObject *genRandom(PyObject *self, PyObject *args) {
 	EXIT_IF(TRUE, "invalid arguments.");
 }
 
+/*
+ * random_many(n, count[, seed]): returns a list of count random integers mod n,
+ * each reduced from DRBG_EXTRA_BYTES more bytes than n. Without a seed the calling
+ * thread's OS-seeded generator is used; with a seed (bytes) the output is
+ * reproducible.
+ */
+static PyObject *genRandomMany(PyObject *self, PyObject *args) {
+	PyObject *obj = NULL, *seed = NULL, *list = NULL;
+	Py_ssize_t count, i, chunk;
+	uint8_t *buf = NULL;
+	drbg_t local, *drbg = drbg_thread_state();
+	mpz_t N;
+
+	if (!PyArg_ParseTuple(args, "On|O", &obj, &count, &seed)) {
+		EXIT_IF(TRUE, "invalid arguments.");
+	}
+	EXIT_IF(count < 0, "count must be non-negative.");
+	if (_PyLong_Check(obj)) {
+		mpz_init(N);
+		longObjToMPZ(N, obj);
+	} else if (PyInteger_Check(obj)) {
+		mpz_init_set(N, ((Integer *) obj)->e);
+	} else {
+		EXIT_IF(TRUE, "invalid object type.");
+	}
+	if (mpz_sgn(N) <= 0) {
+		mpz_clear(N);
+		EXIT_IF(TRUE, "modulus must be positive.");
+	}
+	if (seed != NULL && seed != Py_None) {
+		if (!PyBytes_Check(seed)) {
+			mpz_clear(N);
+			EXIT_IF(TRUE, "seed must be a bytes object.");
+		}
+		drbg_seed(&local, (uint8_t *) PyBytes_AS_STRING(seed), PyBytes_GET_SIZE(seed));
+		drbg = &local;
+	}
+
+	chunk = (Py_ssize_t) (mpz_sizeinbase(N, 2) + 7) / 8 + DRBG_EXTRA_BYTES;
+	buf = (uint8_t *) malloc(chunk * count + 1);
+	list = PyList_New(count);
+	if (buf == NULL || list == NULL || !drbg_generate(drbg, buf, chunk * count)) {
+		Py_XDECREF(list);
+		free(buf);
+		mpz_clear(N);
+		if (drbg == &local) drbg_cleanse(&local);
+		if (!PyErr_Occurred()) PyErr_SetString(IntegerError, "random generator failed.");
+		return NULL;
+	}
+
+	for (i = 0; i < count; i++) {
+		Integer *rop = createNewInteger();
+		mpz_init(rop->e);
+		mpz_init_set(rop->m, N);
+		mpz_import(rop->e, chunk, 1, 1, 1, 0, buf + i * chunk);
+		mpz_mod(rop->e, rop->e, N);
+		PyList_SET_ITEM(list, i, (PyObject *) rop);
+	}
+
+	memset(buf, 0, chunk * count);
+	free(buf);
+	mpz_clear(N);
+	if (drbg == &local) drbg_cleanse(&local);
+	return list;
+}
+
 /* takes as input the number of bits and produces a prime number of that size. */
 static PyObject *genRandomPrime(PyObject *self, PyObject *args) {
 	int bits, safe = FALSE;
@@ -2053,6 +2129,323 @@ static PyObject *Integer_xor(PyObject *self, PyObject *other) {
 	EXIT_IF(TRUE, "objects not initialized properly.");
 }
 
+/* reads a charm integer or a python int into rop, returns FALSE on other types. */
+static int getExponent(mpz_t rop, PyObject *obj) {
+	if(PyInteger_Check(obj)) {
+		mpz_set(rop, ((Integer *) obj)->e);
+		return TRUE;
+	}
+	else if(_PyLong_Check(obj)) {
+		longObjToMPZ(rop, obj);
+		return TRUE;
+	}
+	return FALSE;
+}
+
+/* base ** exp with mpz_powm. Unlike the ** operator this path is not constant-time,
+ * it is meant for public exponents such as an RSA e, a Paillier n or the exponents
+ * of a signature verification equation. */
+static PyObject *Integer_powPublic(PyObject *self, PyObject *args) {
+	PyObject *baseObj = NULL, *expObj = NULL;
+	Integer *base = NULL, *rop = NULL;
+	mpz_t exponent;
+
+	EXIT_IF(!PyArg_ParseTuple(args, "OO", &baseObj, &expObj), "invalid arguments.");
+	EXIT_IF(!PyInteger_Check(baseObj), "base must be a charm integer type.");
+	base = (Integer *) baseObj;
+	EXIT_IF(mpz_sgn(base->m) <= 0, "cannot exponentiate integers without modulus.");
+
+	mpz_init(exponent);
+	if(!getExponent(exponent, expObj)) {
+		mpz_clear(exponent);
+		EXIT_IF(TRUE, "exponent must be an integer.");
+	}
+
+	rop = createNewInteger();
+	mpz_init(rop->e);
+	mpz_init_set(rop->m, base->m);
+	if(mpz_sgn(exponent) < 0) {
+		if(mpz_invert(rop->e, base->e, rop->m) == 0) {
+			mpz_clear(exponent);
+			Py_XDECREF(rop);
+			ErrorMsg("failed to find modular inverse.\n");
+		}
+		mpz_neg(exponent, exponent);
+		mpz_powm(rop->e, rop->e, exponent, rop->m);
+	}
+	else {
+		mpz_powm(rop->e, base->e, exponent, rop->m);
+	}
+	mpz_clear(exponent);
+	return (PyObject *) rop;
+}
+
+/* rop = t * R^-1 mod n for 0 <= t < n * R. rop must not alias t or tmp. */
+static void mont_redc(MontContext *ctx, mpz_t rop, mpz_t t, mpz_t tmp) {
+	mpz_tdiv_r_2exp(tmp, t, ctx->bits);
+	mpz_mul(tmp, tmp, ctx->nprime);
+	mpz_tdiv_r_2exp(tmp, tmp, ctx->bits);
+	mpz_mul(tmp, tmp, ctx->n);
+	mpz_add(rop, t, tmp);
+	mpz_tdiv_q_2exp(rop, rop, ctx->bits);
+	if(mpz_cmp(rop, ctx->n) >= 0)
+		mpz_sub(rop, rop, ctx->n);
+}
+
+/* rop = a * b * R^-1 mod n, rop may alias a or b. */
+static void mont_mul(MontContext *ctx, mpz_t rop, mpz_t a, mpz_t b, mpz_t t, mpz_t tmp) {
+	mpz_mul(t, a, b);
+	mont_redc(ctx, rop, t, tmp);
+}
+
+void MontContext_dealloc(MontContext *self) {
+	mpz_clear(self->n);
+	mpz_clear(self->nprime);
+	mpz_clear(self->r2);
+	mpz_clear(self->one);
+	Py_TYPE(self)->tp_free((PyObject *) self);
+}
+
+/* montgomery(n) creates the Montgomery context of an odd modulus n > 1. */
+static PyObject *MontContext_create(PyObject *self, PyObject *args) {
+	PyObject *obj = NULL;
+	MontContext *ctx = NULL;
+	mpz_t n, R;
+
+	EXIT_IF(!PyArg_ParseTuple(args, "O", &obj), "invalid arguments.");
+	mpz_init(n);
+	if(!getExponent(n, obj) || mpz_cmp_ui(n, 1) <= 0 || mpz_even_p(n)) {
+		mpz_clear(n);
+		EXIT_IF(TRUE, "modulus must be an odd integer greater than 1.");
+	}
+
+	ctx = PyObject_New(MontContext, &MontContextType);
+	EXIT_IF(ctx == NULL, "could not allocate montgomery context.");
+	ctx->bits = mpz_size(n) * GMP_NUMB_BITS;
+	mpz_init_set(ctx->n, n);
+	mpz_init(ctx->nprime);
+	mpz_init(ctx->r2);
+	mpz_init(ctx->one);
+	mpz_init(R);
+	mpz_setbit(R, ctx->bits);
+	mpz_invert(ctx->nprime, n, R);
+	mpz_sub(ctx->nprime, R, ctx->nprime);
+	mpz_mod(ctx->one, R, n);
+	mpz_mul(ctx->r2, ctx->one, ctx->one);
+	mpz_mod(ctx->r2, ctx->r2, n);
+	mpz_clear(R);
+	mpz_clear(n);
+	return (PyObject *) ctx;
+}
+
+void FixedBase_dealloc(FixedBase *self) {
+	int i;
+	if(self->table != NULL) {
+		for(i = 0; i < (1 << self->h); i++)
+			mpz_clear(self->table[i]);
+		PyMem_Free(self->table);
+	}
+	mpz_clear(self->g);
+	Py_XDECREF(self->ctx);
+	Py_TYPE(self)->tp_free((PyObject *) self);
+}
+
+/* ctx.precompute(g, bits, h=0) builds the comb table of g for exponents of up to bits bits.
+ * h is the number of rows (the table holds 2^h entries), 0 picks one from bits. */
+static PyObject *MontContext_precompute(MontContext *self, PyObject *args) {
+	PyObject *obj = NULL;
+	FixedBase *fb = NULL;
+	long bits = 0;
+	int h = 0, i, j;
+	mpz_t t, tmp;
+
+	EXIT_IF(!PyArg_ParseTuple(args, "Ol|i", &obj, &bits, &h), "invalid arguments.");
+	EXIT_IF(bits <= 0, "exponent size must be positive.");
+	if(h <= 0)
+		h = (bits >= 512) ? 8 : (bits >= 160) ? 6 : 4;
+	EXIT_IF(h > 12, "comb tables are limited to 2^12 entries.");
+
+	fb = PyObject_New(FixedBase, &FixedBaseType);
+	EXIT_IF(fb == NULL, "could not allocate fixed-base table.");
+	Py_INCREF(self);
+	fb->ctx = self;
+	fb->h = h;
+	fb->d = (bits + h - 1) / h;
+	fb->table = NULL;
+	mpz_init(fb->g);
+	if(!getExponent(fb->g, obj)) {
+		Py_DECREF(fb);
+		EXIT_IF(TRUE, "base must be an integer.");
+	}
+	mpz_mod(fb->g, fb->g, self->n);
+
+	fb->table = (mpz_t *) PyMem_Malloc(sizeof(mpz_t) * (1 << h));
+	if(fb->table == NULL) {
+		Py_DECREF(fb);
+		return PyErr_NoMemory();
+	}
+	for(i = 0; i < (1 << h); i++)
+		mpz_init(fb->table[i]);
+
+	mpz_init(t);
+	mpz_init(tmp);
+	// rows: table[2^j] = g^(2^(j*d))
+	mpz_set(fb->table[0], self->one);
+	mpz_mul(t, fb->g, self->r2);
+	mont_redc(self, fb->table[1], t, tmp);
+	for(j = 1; j < h; j++) {
+		mpz_set(fb->table[1 << j], fb->table[1 << (j - 1)]);
+		for(mp_bitcnt_t k = 0; k < fb->d; k++)
+			mont_mul(self, fb->table[1 << j], fb->table[1 << j], fb->table[1 << j], t, tmp);
+	}
+	// remaining entries are products of the rows selected by their bits
+	for(i = 3; i < (1 << h); i++) {
+		int low = i & -i;
+		if(low != i)
+			mont_mul(self, fb->table[i], fb->table[i ^ low], fb->table[low], t, tmp);
+	}
+	mpz_clear(t);
+	mpz_clear(tmp);
+	return (PyObject *) fb;
+}
+
+/* table.pow(exp) computes g ** exp mod n with d squarings and at most d multiplications.
+ * Exponents outside [0, 2^(h*d)) fall back to mpz_powm_sec. Table lookups and the skipped
+ * multiplications depend on the exponent bits, so this is variable-time and must only be
+ * used with public exponents. */
+static PyObject *FixedBase_pow(FixedBase *self, PyObject *args) {
+	PyObject *obj = NULL;
+	MontContext *ctx = self->ctx;
+	Integer *rop = NULL;
+	mpz_t exponent, acc, t, tmp;
+	int j;
+
+	EXIT_IF(!PyArg_ParseTuple(args, "O", &obj), "invalid arguments.");
+	mpz_init(exponent);
+	if(!getExponent(exponent, obj)) {
+		mpz_clear(exponent);
+		EXIT_IF(TRUE, "exponent must be an integer.");
+	}
+
+	rop = createNewInteger();
+	mpz_init(rop->e);
+	mpz_init_set(rop->m, ctx->n);
+	if(mpz_sgn(exponent) < 0 || mpz_sizeinbase(exponent, 2) > (size_t) self->h * self->d) {
+		if(mpz_sgn(exponent) < 0 && mpz_invert(rop->e, self->g, ctx->n) != 0) {
+			mpz_neg(exponent, exponent);
+			mpz_powm_sec(rop->e, rop->e, exponent, ctx->n);
+		}
+		else if(mpz_sgn(exponent) > 0) {
+			mpz_powm_sec(rop->e, self->g, exponent, ctx->n);
+		}
+		else {
+			mpz_clear(exponent);
+			Py_XDECREF(rop);
+			ErrorMsg("failed to find modular inverse.\n");
+		}
+		mpz_clear(exponent);
+		return (PyObject *) rop;
+	}
+
+	mpz_init_set(acc, ctx->one);
+	mpz_init(t);
+	mpz_init(tmp);
+	Py_BEGIN_ALLOW_THREADS;
+	for(mp_bitcnt_t k = self->d; k-- > 0; ) {
+		unsigned long idx = 0;
+		mont_mul(ctx, acc, acc, acc, t, tmp);
+		for(j = 0; j < self->h; j++)
+			idx |= (unsigned long) mpz_tstbit(exponent, j * self->d + k) << j;
+		if(idx)
+			mont_mul(ctx, acc, acc, self->table[idx], t, tmp);
+	}
+	mont_redc(ctx, rop->e, acc, tmp);
+	Py_END_ALLOW_THREADS;
+	mpz_clear(acc);
+	mpz_clear(t);
+	mpz_clear(tmp);
+	mpz_clear(exponent);
+	return (PyObject *) rop;
+}
+
+static PyObject *FixedBase_size(FixedBase *self, PyObject *args) {
+	// approximate memory held by the table in bytes
+	return Py_BuildValue("n", (Py_ssize_t) (1 << self->h) * mpz_size(self->ctx->n) * sizeof(mp_limb_t));
+}
+
+PyMethodDef MontContext_methods[] = {
+	{ "precompute", (PyCFunction) MontContext_precompute, METH_VARARGS, "build a fixed-base comb table for a base g and exponents of up to bits bits." },
+	{ NULL }
+};
+
+PyMethodDef FixedBase_methods[] = {
+	{ "pow", (PyCFunction) FixedBase_pow, METH_VARARGS, "raise the fixed base to an exponent using the comb table." },
+	{ "size", (PyCFunction) FixedBase_size, METH_NOARGS, "approximate size of the comb table in bytes." },
+	{ NULL }
+};
+
+PyTypeObject MontContextType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"integer.montgomery",      /*tp_name*/
+	sizeof(MontContext),       /*tp_basicsize*/
+	0,                         /*tp_itemsize*/
+	(destructor)MontContext_dealloc, /*tp_dealloc*/
+	0,                         /*tp_print*/
+	0,                         /*tp_getattr*/
+	0,                         /*tp_setattr*/
+	0,                         /*tp_reserved*/
+	0,                         /*tp_repr*/
+	0,                         /*tp_as_number*/
+	0,                         /*tp_as_sequence*/
+	0,                         /*tp_as_mapping*/
+	0,                         /*tp_hash */
+	0,                         /*tp_call*/
+	0,                         /*tp_str*/
+	0,                         /*tp_getattro*/
+	0,                         /*tp_setattro*/
+	0,                         /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+	"Montgomery context of an odd modulus", /* tp_doc */
+	0,                         /* tp_traverse */
+	0,                         /* tp_clear */
+	0,                         /* tp_richcompare */
+	0,                         /* tp_weaklistoffset */
+	0,                         /* tp_iter */
+	0,                         /* tp_iternext */
+	MontContext_methods,       /* tp_methods */
+};
+
+PyTypeObject FixedBaseType = {
+	PyVarObject_HEAD_INIT(NULL, 0)
+	"integer.fixedbase",       /*tp_name*/
+	sizeof(FixedBase),         /*tp_basicsize*/
+	0,                         /*tp_itemsize*/
+	(destructor)FixedBase_dealloc, /*tp_dealloc*/
+	0,                         /*tp_print*/
+	0,                         /*tp_getattr*/
+	0,                         /*tp_setattr*/
+	0,                         /*tp_reserved*/
+	0,                         /*tp_repr*/
+	0,                         /*tp_as_number*/
+	0,                         /*tp_as_sequence*/
+	0,                         /*tp_as_mapping*/
+	0,                         /*tp_hash */
+	0,                         /*tp_call*/
+	0,                         /*tp_str*/
+	0,                         /*tp_getattro*/
+	0,                         /*tp_setattro*/
+	0,                         /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+	"Fixed-base comb table",   /* tp_doc */
+	0,                         /* tp_traverse */
+	0,                         /* tp_clear */
+	0,                         /* tp_richcompare */
+	0,                         /* tp_weaklistoffset */
+	0,                         /* tp_iter */
+	0,                         /* tp_iternext */
+	FixedBase_methods,         /* tp_methods */
+};
+
 #ifdef BENCHMARK_ENABLED
 #define BenchmarkIdentifier 	3
 
@@ -2418,6 +2811,7 @@ PyTypeObject IntegerType = {
 PyMethodDef module_methods[] = {
 	{ "randomBits", (PyCFunction) genRandomBits, METH_VARARGS, "generate a random number of bits from 0 to 2^n-1." },
 	{ "random", (PyCFunction) genRandom, METH_VARARGS, "generate a random number in range of 0 to n-1 where n is large number." },
+	{ "random_many", (PyCFunction) genRandomMany, METH_VARARGS, "generate a list of random numbers in range of 0 to n-1, optionally from a fixed seed." },
 	{ "randomPrime", (PyCFunction) genRandomPrime, METH_VARARGS, "generate a probabilistic random prime number that is n-bits." },
 	{ "isPrime", (PyCFunction) testPrimality, METH_O, "probabilistic algorithm to whether a given integer is prime." },
 	{ "encode", (PyCFunction) encode_message, METH_VARARGS, "encode a message as a group element where p = 2*q + 1 only." },
@@ -2440,6 +2834,8 @@ PyMethodDef module_methods[] = {
 	{ "toInt", (PyCFunction) toInt, METH_O, "convert modular integer into an integer object."},
 	{ "getMod", (PyCFunction) getMod, METH_O, "get the modulus of a given modular integer object."},
 	{ "reduce", (PyCFunction) Integer_reduce, METH_O, "reduce a modular integer by its modulus. x = mod(y)"},
+	{ "powPublic", (PyCFunction) Integer_powPublic, METH_VARARGS, "variable-time modular exponentiation for public exponents."},
+	{ "montgomery", (PyCFunction) MontContext_create, METH_VARARGS, "create the Montgomery context of an odd modulus."},
 	{ NULL, NULL }
 };
 
@@ -2490,6 +2886,8 @@ void initinteger(void) {
 	PyObject *m=NULL;
 	if (PyType_Ready(&IntegerType) < 0)
 		CLEAN_EXIT;
+	if (PyType_Ready(&MontContextType) < 0 || PyType_Ready(&FixedBaseType) < 0)
+		CLEAN_EXIT;
 #ifdef BENCHMARK_ENABLED
     if(import_benchmark() < 0)
     	CLEAN_EXIT;
@@ -40,6 +40,7 @@
 #include <gmp.h>
 #include "benchmarkmodule.h"
 #include "base64.h"
+#include "drbg.h"
 /* used to initialize the RNG */
 #include <openssl/objects.h>
 #include <openssl/rand.h>
@@ -136,6 +137,8 @@
 PyTypeObject IntegerType;
 static PyObject *IntegerError;
 #define PyInteger_Check(obj) PyObject_TypeCheck(obj, &IntegerType)
+PyTypeObject MontContextType;
+PyTypeObject FixedBaseType;
 #define PyInteger_Init(obj1, obj2) obj1->initialized && obj2->initialized
 
 typedef struct {
@@ -145,6 +148,27 @@ typedef struct {
 	int initialized;
 } Integer;
 
+/* Montgomery arithmetic modulo an odd n with R = 2^bits, bits a multiple of the limb size.
+ * A context is immutable once created and may be shared by any number of fixed-base tables. */
+typedef struct {
+	PyObject_HEAD
+	mpz_t n;
+	mpz_t nprime;	/* -n^-1 mod R */
+	mpz_t r2;		/* R^2 mod n, converts into Montgomery form */
+	mpz_t one;		/* R mod n, i.e. 1 in Montgomery form */
+	mp_bitcnt_t bits;
+} MontContext;
+
+/* Lim-Lee comb table of a fixed base g: table[i] = prod_{j in i} g^(2^(j*d)) in Montgomery form. */
+typedef struct {
+	PyObject_HEAD
+	MontContext *ctx;
+	mpz_t g;
+	mpz_t *table;
+	int h;			/* rows of the comb, 2^h table entries */
+	mp_bitcnt_t d;	/* columns of the comb, exponents of up to h * d bits use the table */
+} FixedBase;
+
 PyMethodDef Integer_methods[];
 PyNumberMethods integer_number;
 
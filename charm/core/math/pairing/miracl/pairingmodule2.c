@@ -666,6 +666,12 @@ static PyObject *Element_mul(PyObject *lhs, PyObject *rhs)
 	signed long int z;
 	int found_int = FALSE;
 
+	// defer to the other operand (e.g. a vector of elements) for unsupported types
+	if(!(PyElement_Check(lhs) || _PyLong_Check(lhs)) || !(PyElement_Check(rhs) || _PyLong_Check(rhs))) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+
 	// lhs or rhs must be an element type
 	if(PyElement_Check(lhs)) {
 		self = (Element *) lhs;
@@ -854,6 +860,12 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 	int longFoundLHS = FALSE, longFoundRHS = FALSE;
 	mpz_t n;
 
+	// defer to the other operand (e.g. a vector of exponents) for unsupported types
+	if(!(PyElement_Check(o1) || _PyLong_Check(o1)) || !(PyElement_Check(o2) || _PyLong_Check(o2))) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+
 	Check_Types2(o1, o2, lhs_o1, rhs_o2, longFoundLHS, longFoundRHS);
 
 	if(longFoundLHS) {
@@ -894,12 +906,16 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 				longObjToMPZ(n, (PyLongObject *) o2);
 #endif
 				element_set_mpz(rhs_o2, n);
+				MIRACL_BEGIN_ALLOW_THREADS;
 				element_pow_zr(newObject, lhs_o1, rhs_o2);
+				MIRACL_END_ALLOW_THREADS;
 				mpz_clear(n);
 			}
 			else if(rhs >= 0 && rhs <= INT_MAX) {
 				// if less than int for given architecture
+				MIRACL_BEGIN_ALLOW_THREADS;
 				element_pow_int(newObject, lhs_o1, rhs);
+				MIRACL_END_ALLOW_THREADS;
 			}
 			else { // anything larger: convert to an MPZ type then raise to EXP value
 				mpz_init(n);
@@ -911,7 +927,9 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 				longObjToMPZ(n, (PyLongObject *) o2);
 #endif
 				element_set_mpz(rhs_o2, n);
+				MIRACL_BEGIN_ALLOW_THREADS;
 				element_pow_zr(newObject, lhs_o1, rhs_o2);
+				MIRACL_END_ALLOW_THREADS;
 				mpz_clear(n);
 			}
 			Py_DECREF(rhs_o2);
@@ -933,7 +951,9 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 		if(rhs_o2->element_type == pyZR_t) {
 
 			newObject = createNewElement(NONE_G, lhs_o1->pairing);
+			MIRACL_BEGIN_ALLOW_THREADS;
 			element_pow_zr(newObject, lhs_o1, rhs_o2);
+			MIRACL_END_ALLOW_THREADS;
 
 		}
 	}
@@ -1080,7 +1100,9 @@ PyObject *multi_pairing_asymmetric(Pairing *groupObj, PyObject *listG1, PyObject
 		Element *newObject = NULL;
 		if(l == r) {
 			newObject = createNewElement(pyGT_t, groupObj);
+			MIRACL_BEGIN_ALLOW_THREADS;
 			element_prod_pairing(newObject, &g1, &g2, l); // pairing product calculation
+			MIRACL_END_ALLOW_THREADS;
 		}
 		else {
 			PyErr_SetString(ElementError, "invalid pairing element types in list.");
@@ -1123,12 +1145,14 @@ PyObject *Apply_pairing(Element *self, PyObject *args)
 
 		if(Check_Elements(lhs, rhs) && pair_rule(lhs->element_type, rhs->element_type) == TRUE) {
 			newObject = createNewElement(NONE_G, lhs->pairing);
+			MIRACL_BEGIN_ALLOW_THREADS;
 			if(lhs->element_type == pyG1_t) {
 				pairing_apply(newObject, lhs, rhs);
 			}
 			else if(lhs->element_type == pyG2_t) {
 				pairing_apply(newObject, rhs, lhs);
 			}
+			MIRACL_END_ALLOW_THREADS;
 #ifdef BENCHMARK_ENABLED
 			UPDATE_BENCHMARK(PAIRINGS, newObject->pairing->dBench);
 #endif
@@ -1471,7 +1495,9 @@ static PyObject *Serialize_cmp(Element *o1, PyObject *args) {
 		}
 
 		// write to char buffer
+		MIRACL_BEGIN_ALLOW_THREADS;
 		bytes_written = element_to_bytes(data_buf, self);
+		MIRACL_END_ALLOW_THREADS;
 		if(elem_len != bytes_written) {
 			PyErr_SetString(ElementError, "serialization failed. try again.");
 			free(data_buf);
@@ -1511,7 +1537,9 @@ static PyObject *Deserialize_cmp(Element *self, PyObject *args) {
 //				printf_buffer_as_hex(binary_buf, deserialized_len);
 				origObject = createNewElement(NONE_G, group);
 				origObject->element_type = type;
+				MIRACL_BEGIN_ALLOW_THREADS;
 				element_from_bytes(origObject, base64_buf);
+				MIRACL_END_ALLOW_THREADS;
 
 				return (PyObject *) origObject;
 			}
@@ -1931,6 +1959,8 @@ PyMemberDef Element_members[] = {
 		"group type"},
     {"initialized", T_INT, offsetof(Element, elem_initialized), 0,
 		"determine initialization status"},
+    {"preproc", T_INT, offsetof(Element, elem_initPP), READONLY,
+		"determine pre-processing status"},
     {NULL}  /* Sentinel */
 };
 
@@ -66,6 +66,21 @@
 #define HASH_LEN 	20
 #define ID_LEN		8
 
+/* MIRACL keeps its working state in a global instance (mip) unless the library was
+ * built for multi-threading (MR_UNIX_MT, MR_WINDOWS_MT or MR_OPENMP_MT), in which
+ * case every thread has its own. Only then may other Python threads run while the
+ * library computes. Hashing is never released: its state lives on the group object.
+ * The build options are recorded in mirdef.h, installed with the MIRACL headers by
+ * compile_miracl.sh; its default (mirdef.hpp) configuration is single-threaded. */
+#include "mirdef.h"
+#if defined(MR_UNIX_MT) || defined(MR_WINDOWS_MT) || defined(MR_OPENMP_MT)
+#define MIRACL_BEGIN_ALLOW_THREADS	Py_BEGIN_ALLOW_THREADS
+#define MIRACL_END_ALLOW_THREADS	Py_END_ALLOW_THREADS
+#else
+#define MIRACL_BEGIN_ALLOW_THREADS	{
+#define MIRACL_END_ALLOW_THREADS	}
+#endif
+
 /* Index numbers for different hash functions.  These are all implemented as SHA1(index || message).	*/
 #define HASH_FUNCTION_STR_TO_Zr_CRH		0
 #define HASH_FUNCTION_Zr_TO_G1_ROM		1
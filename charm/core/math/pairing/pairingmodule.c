@@ -780,6 +780,87 @@ static PyObject *Element_random(Element* self, PyObject* args)
 	return (PyObject *) retObject;
 }
 
+/*
+ * random_many(group, type, count[, seed]): returns a list of count random
+ * elements of ZR, G1 or G2 derived from one DRBG request. ZR elements are
+ * reduced from integers DRBG_EXTRA_BYTES longer than the group order, points are
+ * hashed from DRBG_POINT_BYTES bytes each. Without a seed the calling thread's
+ * OS-seeded generator is used; with a seed (bytes) the output is reproducible.
+ */
+static PyObject *Element_random_many(Element *self, PyObject *args)
+{
+	Pairing *group = NULL;
+	int type;
+	Py_ssize_t count, i, chunk;
+	PyObject *seed = NULL, *list = NULL;
+	element_ptr *targets = NULL;
+	uint8_t *buf = NULL;
+	drbg_t local, *drbg = drbg_thread_state();
+	int ok;
+
+	if(!PyArg_ParseTuple(args, "Oin|O", &group, &type, &count, &seed))
+		return NULL;
+
+	VERIFY_GROUP(group);
+	EXIT_IF(type == GT, "cannot generate random elements in GT.");
+	EXIT_IF(type != ZR && type != G1 && type != G2, "unrecognized group type.");
+	EXIT_IF(count < 0, "count must be non-negative.");
+	if(seed != NULL && seed != Py_None) {
+		EXIT_IF(!PyBytes_Check(seed), "seed must be a bytes object.");
+		drbg_seed(&local, (uint8_t *) PyBytes_AS_STRING(seed), PyBytes_GET_SIZE(seed));
+		drbg = &local;
+	}
+
+	chunk = (type == ZR) ? (Py_ssize_t) (mpz_sizeinbase(group->pair_obj->r, 2) + 7) / BYTE + DRBG_EXTRA_BYTES
+						 : DRBG_POINT_BYTES;
+	list = PyList_New(count);
+	targets = (element_ptr *) malloc(sizeof(element_ptr) * (count + 1));
+	buf = (uint8_t *) malloc(chunk * count + 1);
+	if(list == NULL || targets == NULL || buf == NULL) {
+		Py_XDECREF(list);
+		free(targets);
+		free(buf);
+		return PyErr_NoMemory();
+	}
+
+	for(i = 0; i < count; i++) {
+		Element *newObject = createNewElement(type, group);
+		targets[i] = newObject->e;
+		PyList_SET_ITEM(list, i, (PyObject *) newObject);
+	}
+
+	Py_BEGIN_ALLOW_THREADS;
+	ok = drbg_generate(drbg, buf, chunk * count);
+	if(ok) {
+		if(type == ZR) {
+			mpz_t z;
+			mpz_init(z);
+			for(i = 0; i < count; i++) {
+				mpz_import(z, chunk, 1, 1, 1, 0, buf + i * chunk);
+				mpz_mod(z, z, group->pair_obj->r);
+				element_set_mpz(targets[i], z);
+			}
+			mpz_clear(z);
+		}
+		else {
+			for(i = 0; i < count; i++)
+				element_from_hash(targets[i], buf + i * chunk, (int) chunk);
+		}
+	}
+	memset(buf, 0, chunk * count);
+	Py_END_ALLOW_THREADS;
+
+	if(drbg == &local) drbg_cleanse(&local);
+	free(targets);
+	free(buf);
+	if(!ok) {
+		Py_DECREF(list);
+		PyErr_SetString(ElementError, "random generator failed.");
+		return NULL;
+	}
+	return list;
+}
+
 static PyObject *Element_add(Element *self, Element *other)
 {
 	Element *newObject;
@@ -838,6 +919,12 @@ static PyObject *Element_mul(PyObject *lhs, PyObject *rhs)
 	signed long int z;
 	int found_int = FALSE;
 
+#if PY_MAJOR_VERSION >= 3
+	if(PyElementVector_Check(lhs) || PyElementVector_Check(rhs)) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+#endif
 	// lhs or rhs must be an element type
 	if(PyElement_Check(lhs)) {
 		self = (Element *) lhs;		
@@ -1005,6 +1092,12 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 	int longFoundLHS = FALSE, longFoundRHS = FALSE;
 	mpz_t n;
 
+#if PY_MAJOR_VERSION >= 3
+	if(PyElementVector_Check(o2)) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+#endif
 	Check_Types2(o1, o2, lhs_o1, rhs_o2, longFoundLHS, longFoundRHS);
 
 	if(longFoundLHS) {
@@ -1017,7 +1110,9 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 			lhs_o1 = convertToZR(o1, o2);
 			newObject = createNewElement(rhs_o2->element_type, rhs_o2->pairing);
 			// both must be ZR, no need for pp check
+			Py_BEGIN_ALLOW_THREADS;
 			element_pow_mpz(newObject->e, lhs_o1->e, n);
+			Py_END_ALLOW_THREADS;
 			mpz_clear(n);
 			Py_DECREF(lhs_o1);
 		}
@@ -1041,6 +1136,7 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 #else
 			longObjToMPZ(n, (PyLongObject *) o2);
 #endif
+			Py_BEGIN_ALLOW_THREADS;
 			if(lhs_o1->elem_initPP == TRUE) {
 				// n = g ^ e where g has been pre-processed
 				element_pp_pow(newObject->e, n, lhs_o1->e_pp);
@@ -1048,6 +1144,7 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 			else {
 				element_pow_mpz(newObject->e, lhs_o1->e, n);
 			}
+			Py_END_ALLOW_THREADS;
 			mpz_clear(n);
 		}
 		else if(rhs == -1) {
@@ -1069,6 +1166,7 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 		if(rhs_o2->element_type == ZR) {
 			newObject = createNewElement(lhs_o1->element_type, lhs_o1->pairing);
 			//printf("Calling pp func: '%d'\n", lhs_o1->elem_initPP);
+			Py_BEGIN_ALLOW_THREADS;
 			if(lhs_o1->elem_initPP == TRUE) {
 				// n = g ^ e where g has been pre-processed
 				mpz_init(n);
@@ -1079,6 +1177,7 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 			else {
 				element_pow_zn(newObject->e, lhs_o1->e, rhs_o2->e);
 			}
+			Py_END_ALLOW_THREADS;
 		}
 		else {
 			// we have a problem
@@ -1210,7 +1309,9 @@ PyObject *multi_pairing(Pairing *groupObj, PyObject *listG1, PyObject *listG2) {
 		Element *newObject = NULL;
 		if(l == r) {
 			newObject = createNewElement(GT, groupObj);
+			Py_BEGIN_ALLOW_THREADS;
 			element_prod_pairing(newObject->e, g1, g2, l); // pairing product calculation
+			Py_END_ALLOW_THREADS;
 		}
 		else {
 			EXIT_IF(TRUE, "invalid pairing element types in list.");
@@ -1225,6 +1326,646 @@ PyObject *multi_pairing(Pairing *groupObj, PyObject *listG1, PyObject *listG2) {
 	EXIT_IF(TRUE, "list is empty.");
 }
 
+/* returns the w-bit digit of e starting at bit position pos */
+static int exp_digit(mpz_t e, int pos, int w)
+{
+	int j, d = 0;
+	for(j = w - 1; j >= 0; j--) {
+		d = (d << 1) | mpz_tstbit(e, pos + j);
+	}
+	return d;
+}
+
+/* Straus' interleaved fixed-window method: every base gets a table of its first
+ * 2^w powers and all bases share one chain of squarings. Suited to few terms. */
+static int element_multiexp_straus(element_t out, element_t *bases, mpz_t *exps, int n, int bits)
+{
+	const int w = 4, size = 1 << w;
+	int i, j, pos, d;
+	element_t *table;
+
+	if(n <= 0) {
+		element_set1(out);
+		return TRUE;
+	}
+	if((size_t) n > SIZE_MAX / (sizeof(element_t) * size))
+		return FALSE;
+	table = (element_t *) malloc(sizeof(element_t) * n * size);
+	if(table == NULL)
+		return FALSE;
+
+	for(i = 0; i < n; i++) {
+		element_t *row = table + i * size;
+		element_init_same_as(row[0], bases[i]);
+		element_set1(row[0]);
+		for(j = 1; j < size; j++) {
+			element_init_same_as(row[j], bases[i]);
+			element_mul(row[j], row[j-1], bases[i]);
+		}
+	}
+
+	element_set1(out);
+	for(pos = ((bits + w - 1) / w) * w - w; pos >= 0; pos -= w) {
+		for(j = 0; j < w; j++) element_square(out, out);
+		for(i = 0; i < n; i++) {
+			d = exp_digit(exps[i], pos, w);
+			if(d != 0) element_mul(out, out, table[i * size + d]);
+		}
+	}
+
+	for(i = 0; i < n * size; i++) element_clear(table[i]);
+	free(table);
+	return TRUE;
+}
+
+/* Pippenger's bucket method: per c-bit window, bases are added into the bucket of
+ * their digit and the buckets are combined with two running products. Suited to
+ * many terms, the cost per window is n + 2^(c+1) multiplications. */
+static int element_multiexp_pippenger(element_t out, element_t *bases, mpz_t *exps, int n, int bits, int c)
+{
+	int i, k, win, d, buckets = (1 << c) - 1;
+	element_t *bucket = (element_t *) malloc(sizeof(element_t) * buckets);
+	int *used = (int *) malloc(sizeof(int) * buckets);
+	element_t sum, acc;
+
+	if(bucket == NULL || used == NULL) {
+		free(bucket);
+		free(used);
+		return FALSE;
+	}
+	for(k = 0; k < buckets; k++) element_init_same_as(bucket[k], out);
+	element_init_same_as(sum, out);
+	element_init_same_as(acc, out);
+
+	element_set1(out);
+	for(win = (bits + c - 1) / c - 1; win >= 0; win--) {
+		for(k = 0; k < c; k++) element_square(out, out);
+		memset(used, 0, sizeof(int) * buckets);
+		for(i = 0; i < n; i++) {
+			d = exp_digit(exps[i], win * c, c);
+			if(d == 0) continue;
+			if(used[d-1]) element_mul(bucket[d-1], bucket[d-1], bases[i]);
+			else { element_set(bucket[d-1], bases[i]); used[d-1] = TRUE; }
+		}
+		/* acc = prod_d bucket[d]^d */
+		element_set1(sum);
+		element_set1(acc);
+		for(k = buckets - 1; k >= 0; k--) {
+			if(used[k]) element_mul(sum, sum, bucket[k]);
+			element_mul(acc, acc, sum);
+		}
+		element_mul(out, out, acc);
+	}
+
+	for(k = 0; k < buckets; k++) element_clear(bucket[k]);
+	element_clear(sum);
+	element_clear(acc);
+	free(bucket);
+	free(used);
+	return TRUE;
+}
+
+/* out = prod bases[i]^exps[i], exponents must be non-negative. The digit lookups
+ * depend on the exponents, so this is for public exponents only.
+ * Returns FALSE if the scratch tables could not be allocated. */
+int element_multiexp(element_t out, element_t *bases, mpz_t *exps, int n)
+{
+	int i, c, bits = 1;
+	for(i = 0; i < n; i++) {
+		int b = (int) mpz_sizeinbase(exps[i], 2);
+		if(b > bits) bits = b;
+	}
+
+	if(n < 32)
+		return element_multiexp_straus(out, bases, exps, n, bits);
+	/* window of about log2(n) - 2 bits balances bucket filling against combining */
+	for(c = 0; (1 << c) < n; c++) ;
+	c = c - 2;
+	if(c < 4) c = 4;
+	if(c > 16) c = 16;
+	return element_multiexp_pippenger(out, bases, exps, n, bits, c);
+}
+
+/* Takes a group object, a sequence of G1, G2 or GT elements and a sequence of ZR or int
+ * exponents and computes the product of the bases raised to the exponents. */
+PyObject *Element_multiexp(PyObject *self, PyObject *args)
+{
+	Pairing *group = NULL;
+	PyObject *listBases, *listExps, *seqBases = NULL, *seqExps = NULL, *tmp;
+	PyObject **itemBases, **itemExps;
+	Element *newObject = NULL, *base;
+	element_t *bases = NULL;
+	mpz_t *exps = NULL;
+	Py_ssize_t i, n, count = 0;
+	int type = -1, ok = TRUE;
+	char *error = NULL;
+
+	if(!PyArg_ParseTuple(args, "OOO:multiexp", &group, &listBases, &listExps)) {
+		return NULL;
+	}
+	EXIT_IF(!PyPairing_Check(group), "invalid group object.");
+	VERIFY_GROUP(group);
+	/* the fast sequences hold references to every item until they are released below */
+	seqBases = PySequence_Fast(listBases, "bases and exponents must be sequences.");
+	if(seqBases == NULL) return NULL;
+	seqExps = PySequence_Fast(listExps, "bases and exponents must be sequences.");
+	if(seqExps == NULL) {
+		Py_DECREF(seqBases);
+		return NULL;
+	}
+	n = PySequence_Fast_GET_SIZE(seqBases);
+	if(n != PySequence_Fast_GET_SIZE(seqExps))
+		error = "unequal number of bases and exponents.";
+	else if(n <= 0)
+		error = "list is empty.";
+	else if(n > INT_MAX)
+		error = "too many bases.";
+	else {
+		bases = (element_t *) malloc(sizeof(element_t) * n);
+		exps = (mpz_t *) malloc(sizeof(mpz_t) * n);
+		if(bases == NULL || exps == NULL)
+			error = ""; /* MemoryError is raised below */
+	}
+	itemBases = PySequence_Fast_ITEMS(seqBases);
+	itemExps = PySequence_Fast_ITEMS(seqExps);
+	for(i = 0; i < n && error == NULL; i++) {
+		tmp = itemBases[i];
+		if(!PyElement_Check(tmp)) {
+			error = "bases must be G1, G2 or GT elements.";
+		}
+		else {
+			base = (Element *) tmp;
+			if(base->element_type < G1 || base->element_type > GT || (type != -1 && base->element_type != type))
+				error = "bases must be elements of the same group: G1, G2 or GT.";
+			else if(strncmp((const char *) base->pairing->hash_id, (const char *) group->hash_id, ID_LEN) != 0)
+				error = "mixing group elements from different curves.";
+			else {
+				type = base->element_type;
+				element_init_same_as(bases[i], base->e);
+				element_set(bases[i], base->e);
+			}
+		}
+		if(error != NULL) break;
+
+		mpz_init(exps[i]);
+		count++;
+		tmp = itemExps[i];
+		if(PyElement_Check(tmp) && ((Element *) tmp)->element_type == ZR) {
+			element_to_mpz(exps[i], ((Element *) tmp)->e);
+		}
+		else if(_PyLong_Check(tmp)) {
+			longObjToMPZ(exps[i], (PyLongObject *) tmp);
+			mpz_mod(exps[i], exps[i], group->pair_obj->r);
+		}
+		else {
+			error = "exponents must be ZR elements or integers.";
+		}
+	}
+
+	if(error == NULL) {
+		newObject = createNewElement(type, group);
+		Py_BEGIN_ALLOW_THREADS;
+		ok = element_multiexp(newObject->e, bases, exps, n);
+		Py_END_ALLOW_THREADS;
+		if(!ok) {
+			Py_DECREF(newObject);
+			newObject = NULL;
+			PyErr_NoMemory();
+		}
+#ifdef BENCHMARK_ENABLED
+		else {
+			UPDATE_BENCH(EXPONENTIATION, newObject->element_type, newObject->pairing);
+		}
+#endif
+	}
+	else if(error[0] == '\0') {
+		PyErr_NoMemory();
+	}
+	else {
+		PyErr_SetString(ElementError, error);
+	}
+
+	for(i = 0; i < count; i++) {
+		element_clear(bases[i]);
+		mpz_clear(exps[i]);
+	}
+	free(bases);
+	free(exps);
+	Py_DECREF(seqBases);
+	Py_DECREF(seqExps);
+	return (PyObject *) newObject;
+}
+
+#if PY_MAJOR_VERSION >= 3
+/* ElementVector: a fixed-length array of ZR, G1, G2 or GT elements of one pairing group.
+ * Vectors are immutable, arithmetic returns new vectors, so the serialized form that is
+ * exported through the buffer protocol is computed at most once. */
+#define SAME_GROUP(a, b) (strncmp((const char *) (a)->hash_id, (const char *) (b)->hash_id, ID_LEN) == 0)
+#define RETURN_NOT_IMPLEMENTED { Py_INCREF(Py_NotImplemented); return Py_NotImplemented; }
+
+static ElementVector *createNewVector(GroupType element_type, Pairing *pairing, Py_ssize_t length)
+{
+	Py_ssize_t i;
+	ElementVector *vec = PyObject_New(ElementVector, &ElementVectorType);
+	if(vec == NULL)
+		return NULL;
+	vec->elems = (element_t *) PyMem_Malloc(sizeof(element_t) * length);
+	if(vec->elems == NULL) {
+		PyObject_Del(vec);
+		PyErr_NoMemory();
+		return NULL;
+	}
+	for(i = 0; i < length; i++) {
+		if(element_type == ZR) element_init_Zr(vec->elems[i], pairing->pair_obj);
+		else if(element_type == G1) element_init_G1(vec->elems[i], pairing->pair_obj);
+		else if(element_type == G2) element_init_G2(vec->elems[i], pairing->pair_obj);
+		else element_init_GT(vec->elems[i], pairing->pair_obj);
+	}
+	vec->element_type = element_type;
+	vec->length = length;
+	vec->pairing = pairing;
+	Py_INCREF(pairing);
+	vec->buf = NULL;
+	vec->buf_len = 0;
+	return vec;
+}
+
+void ElementVector_dealloc(ElementVector *self)
+{
+	Py_ssize_t i;
+	for(i = 0; i < self->length; i++)
+		element_clear(self->elems[i]);
+	PyMem_Free(self->elems);
+	if(self->buf != NULL)
+		PyMem_Free(self->buf);
+	Py_DECREF(self->pairing);
+	Py_TYPE(self)->tp_free((PyObject *) self);
+}
+
+/* vector(group, elements) copies a non-empty sequence of elements of one group into a vector. */
+PyObject *ElementVector_create(PyObject *self, PyObject *args)
+{
+	Pairing *group = NULL;
+	PyObject *seq = NULL, *fast = NULL, *item;
+	ElementVector *vec = NULL;
+	Py_ssize_t i, n;
+	int type = -1;
+
+	if(!PyArg_ParseTuple(args, "OO:vector", &group, &seq))
+		return NULL;
+	EXIT_IF(!PyPairing_Check(group), "invalid group object.");
+	VERIFY_GROUP(group);
+	fast = PySequence_Fast(seq, "elements must be a sequence.");
+	if(fast == NULL)
+		return NULL;
+
+	n = PySequence_Fast_GET_SIZE(fast);
+	for(i = 0; i < n; i++) {
+		item = PySequence_Fast_GET_ITEM(fast, i);
+		if(!PyElement_Check(item) || (type != -1 && ((Element *) item)->element_type != type)
+				|| !SAME_GROUP(((Element *) item)->pairing, group)) {
+			Py_DECREF(fast);
+			EXIT_IF(TRUE, "elements must belong to the same group: ZR, G1, G2 or GT.");
+		}
+		type = ((Element *) item)->element_type;
+	}
+	if(n == 0) {
+		Py_DECREF(fast);
+		EXIT_IF(TRUE, "vector is empty.");
+	}
+
+	vec = createNewVector(type, group, n);
+	if(vec != NULL) {
+		for(i = 0; i < n; i++)
+			element_set(vec->elems[i], ((Element *) PySequence_Fast_GET_ITEM(fast, i))->e);
+	}
+	Py_DECREF(fast);
+	return (PyObject *) vec;
+}
+
+static Py_ssize_t ElementVector_length(ElementVector *self)
+{
+	return self->length;
+}
+
+static PyObject *ElementVector_item(ElementVector *self, Py_ssize_t i)
+{
+	Element *newObject;
+	if(i < 0 || i >= self->length) {
+		PyErr_SetString(PyExc_IndexError, "vector index out of range.");
+		return NULL;
+	}
+	newObject = createNewElement(self->element_type, self->pairing);
+	element_set(newObject->e, self->elems[i]);
+	return (PyObject *) newObject;
+}
+
+/* elementwise product of two vectors, or of a vector and a single element (broadcast). */
+static PyObject *ElementVector_mul(PyObject *lhs, PyObject *rhs)
+{
+	ElementVector *vec = NULL, *other = NULL, *rop = NULL;
+	Element *scalar = NULL;
+	Py_ssize_t i;
+
+	if(PyElementVector_Check(lhs) && PyElementVector_Check(rhs)) {
+		vec = (ElementVector *) lhs;
+		other = (ElementVector *) rhs;
+	}
+	else if(PyElementVector_Check(lhs) && PyElement_Check(rhs)) {
+		vec = (ElementVector *) lhs;
+		scalar = (Element *) rhs;
+	}
+	else if(PyElement_Check(lhs) && PyElementVector_Check(rhs)) {
+		vec = (ElementVector *) rhs;
+		scalar = (Element *) lhs;
+	}
+	else RETURN_NOT_IMPLEMENTED;
+
+	if(other != NULL) {
+		EXIT_IF(other->element_type != vec->element_type || !SAME_GROUP(other->pairing, vec->pairing), "vectors must belong to the same group.");
+		EXIT_IF(other->length != vec->length, "vectors must have the same length.");
+	}
+	else {
+		EXIT_IF(scalar->element_type != vec->element_type || !SAME_GROUP(scalar->pairing, vec->pairing), "element and vector must belong to the same group.");
+	}
+
+	rop = createNewVector(vec->element_type, vec->pairing, vec->length);
+	if(rop == NULL)
+		return NULL;
+	Py_BEGIN_ALLOW_THREADS;
+	for(i = 0; i < vec->length; i++)
+		element_mul(rop->elems[i], vec->elems[i], (other != NULL) ? other->elems[i] : scalar->e);
+	Py_END_ALLOW_THREADS;
+#ifdef BENCHMARK_ENABLED
+	UPDATE_BENCH(MULTIPLICATION, vec->element_type, vec->pairing);
+#endif
+	return (PyObject *) rop;
+}
+
+/* vector ** ZR vector (elementwise), vector ** ZR element or int (broadcast exponent) and
+ * element ** ZR vector (broadcast base, using the fixed-base table of the element if any). */
+static PyObject *ElementVector_pow(PyObject *o1, PyObject *o2, PyObject *o3)
+{
+	ElementVector *vec = NULL, *exps = NULL, *rop = NULL;
+	Element *base = NULL, *exp = NULL;
+	Pairing *pairing;
+	Py_ssize_t i, n;
+	int use_mpz = FALSE;
+	mpz_t z;
+
+	if(PyElementVector_Check(o1)) {
+		vec = (ElementVector *) o1;
+		if(PyElementVector_Check(o2)) exps = (ElementVector *) o2;
+		else if(PyElement_Check(o2)) exp = (Element *) o2;
+		else if(_PyLong_Check(o2)) use_mpz = TRUE;
+		else RETURN_NOT_IMPLEMENTED;
+	}
+	else if(PyElement_Check(o1) && PyElementVector_Check(o2)) {
+		base = (Element *) o1;
+		exps = (ElementVector *) o2;
+	}
+	else RETURN_NOT_IMPLEMENTED;
+
+	pairing = (vec != NULL) ? vec->pairing : base->pairing;
+	EXIT_IF(exps != NULL && (exps->element_type != ZR || !SAME_GROUP(exps->pairing, pairing)), "exponents must be ZR elements of the same group.");
+	EXIT_IF(exp != NULL && (exp->element_type != ZR || !SAME_GROUP(exp->pairing, pairing)), "exponent must be a ZR element of the same group.");
+	EXIT_IF(vec != NULL && exps != NULL && vec->length != exps->length, "vectors must have the same length.");
+
+	if(use_mpz) {
+		mpz_init(z);
+		longObjToMPZ(z, (PyLongObject *) o2);
+		if(vec->element_type != ZR)
+			mpz_mod(z, z, pairing->pair_obj->r);
+		else if(mpz_sgn(z) < 0) {
+			mpz_clear(z);
+			EXIT_IF(TRUE, "negative integer exponents are only supported for G1, G2 and GT.");
+		}
+	}
+
+	n = (vec != NULL) ? vec->length : exps->length;
+	rop = createNewVector((vec != NULL) ? vec->element_type : base->element_type, pairing, n);
+	if(rop != NULL) {
+		Py_BEGIN_ALLOW_THREADS;
+		for(i = 0; i < n; i++) {
+			if(base != NULL && base->elem_initPP == TRUE)
+				element_pp_pow_zn(rop->elems[i], exps->elems[i], base->e_pp);
+			else if(base != NULL)
+				element_pow_zn(rop->elems[i], base->e, exps->elems[i]);
+			else if(exps != NULL)
+				element_pow_zn(rop->elems[i], vec->elems[i], exps->elems[i]);
+			else if(exp != NULL)
+				element_pow_zn(rop->elems[i], vec->elems[i], exp->e);
+			else
+				element_pow_mpz(rop->elems[i], vec->elems[i], z);
+		}
+		Py_END_ALLOW_THREADS;
+#ifdef BENCHMARK_ENABLED
+		UPDATE_BENCH(EXPONENTIATION, rop->element_type, pairing);
+#endif
+	}
+	if(use_mpz)
+		mpz_clear(z);
+	return (PyObject *) rop;
+}
+
+static PyObject *ElementVector_equals(PyObject *lhs, PyObject *rhs, int opid)
+{
+	ElementVector *a, *b;
+	Py_ssize_t i;
+	int equal;
+
+	if(!PyElementVector_Check(lhs) || !PyElementVector_Check(rhs) || (opid != Py_EQ && opid != Py_NE))
+		RETURN_NOT_IMPLEMENTED;
+	a = (ElementVector *) lhs;
+	b = (ElementVector *) rhs;
+	equal = a->element_type == b->element_type && a->length == b->length && SAME_GROUP(a->pairing, b->pairing);
+	for(i = 0; equal && i < a->length; i++)
+		equal = element_cmp(a->elems[i], b->elems[i]) == 0;
+	if(equal == (opid == Py_EQ))
+		Py_RETURN_TRUE;
+	Py_RETURN_FALSE;
+}
+
+/* v.multiexp(exps) computes prod_i v[i] ** exps[i] for a ZR vector or a sequence of ZR elements or ints. */
+static PyObject *ElementVector_multiexp(ElementVector *self, PyObject *args)
+{
+	PyObject *obj = NULL, *fast = NULL, *tmp;
+	ElementVector *vexps;
+	Element *newObject = NULL;
+	mpz_t *exps;
+	Py_ssize_t i, n = self->length;
+	int ok = TRUE;
+	char *error = NULL;
+
+	if(!PyArg_ParseTuple(args, "O:multiexp", &obj))
+		return NULL;
+	EXIT_IF(self->element_type == ZR, "bases must be G1, G2 or GT elements.");
+	exps = (mpz_t *) PyMem_Malloc(sizeof(mpz_t) * n);
+	if(exps == NULL)
+		return PyErr_NoMemory();
+	for(i = 0; i < n; i++)
+		mpz_init(exps[i]);
+
+	if(PyElementVector_Check(obj)) {
+		vexps = (ElementVector *) obj;
+		if(vexps->element_type != ZR || vexps->length != n || !SAME_GROUP(vexps->pairing, self->pairing))
+			error = "exponents must be a ZR vector of the same length.";
+		for(i = 0; i < n && error == NULL; i++)
+			element_to_mpz(exps[i], vexps->elems[i]);
+	}
+	else if((fast = PySequence_Fast(obj, "exponents must be a sequence.")) != NULL) {
+		if(PySequence_Fast_GET_SIZE(fast) != n)
+			error = "unequal number of bases and exponents.";
+		for(i = 0; i < n && error == NULL; i++) {
+			tmp = PySequence_Fast_GET_ITEM(fast, i);
+			if(PyElement_Check(tmp) && ((Element *) tmp)->element_type == ZR) {
+				element_to_mpz(exps[i], ((Element *) tmp)->e);
+			}
+			else if(_PyLong_Check(tmp)) {
+				longObjToMPZ(exps[i], (PyLongObject *) tmp);
+				mpz_mod(exps[i], exps[i], self->pairing->pair_obj->r);
+			}
+			else {
+				error = "exponents must be ZR elements or integers.";
+			}
+		}
+		Py_DECREF(fast);
+	}
+	else {
+		error = ""; /* exception already set by PySequence_Fast */
+	}
+
+	if(error == NULL) {
+		newObject = createNewElement(self->element_type, self->pairing);
+		Py_BEGIN_ALLOW_THREADS;
+		ok = element_multiexp(newObject->e, self->elems, exps, (int) n);
+		Py_END_ALLOW_THREADS;
+		if(!ok) {
+			Py_DECREF(newObject);
+			newObject = NULL;
+			PyErr_NoMemory();
+		}
+#ifdef BENCHMARK_ENABLED
+		else {
+			UPDATE_BENCH(EXPONENTIATION, newObject->element_type, newObject->pairing);
+		}
+#endif
+	}
+	else if(error[0] != '\0') {
+		PyErr_SetString(ElementError, error);
+	}
+
+	for(i = 0; i < n; i++)
+		mpz_clear(exps[i]);
+	PyMem_Free(exps);
+	return (PyObject *) newObject;
+}
+
+/* v.prod() multiplies all elements of the vector together. */
+static PyObject *ElementVector_prod(ElementVector *self, PyObject *args)
+{
+	Py_ssize_t i;
+	Element *newObject = createNewElement(self->element_type, self->pairing);
+	Py_BEGIN_ALLOW_THREADS;
+	element_set(newObject->e, self->elems[0]);
+	for(i = 1; i < self->length; i++)
+		element_mul(newObject->e, newObject->e, self->elems[i]);
+	Py_END_ALLOW_THREADS;
+	return (PyObject *) newObject;
+}
+
+/* computes the contiguous serialized form (fixed-length uncompressed encodings) once. */
+static int ElementVector_fillBuffer(ElementVector *self)
+{
+	Py_ssize_t i, elem_len, total;
+	uint8_t *buf;
+
+	if(self->buf != NULL)
+		return 0;
+	elem_len = element_length_in_bytes(self->elems[0]);
+	total = elem_len * self->length;
+	buf = (uint8_t *) PyMem_Malloc(total);
+	if(buf == NULL) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	Py_BEGIN_ALLOW_THREADS;
+	for(i = 0; i < self->length; i++)
+		element_to_bytes(buf + i * elem_len, self->elems[i]);
+	Py_END_ALLOW_THREADS;
+	// another thread may have filled the buffer while the GIL was released
+	if(self->buf != NULL) {
+		PyMem_Free(buf);
+		return 0;
+	}
+	self->buf = buf;
+	self->buf_len = total;
+	return 0;
+}
+
+static PyObject *ElementVector_serialize(ElementVector *self, PyObject *args)
+{
+	if(ElementVector_fillBuffer(self) < 0)
+		return NULL;
+	return PyBytes_FromStringAndSize((const char *) self->buf, self->buf_len);
+}
+
+static int ElementVector_getbuffer(ElementVector *self, Py_buffer *view, int flags)
+{
+	if(ElementVector_fillBuffer(self) < 0) {
+		view->obj = NULL;
+		return -1;
+	}
+	return PyBuffer_FillInfo(view, (PyObject *) self, self->buf, self->buf_len, 1, flags);
+}
+
+/* deserializeVector(group, type, data) is the inverse of ElementVector.serialize, data being
+ * any bytes-like object holding a whole number of encodings. */
+PyObject *ElementVector_deserialize(PyObject *self, PyObject *args)
+{
+	Pairing *group = NULL;
+	ElementVector *vec = NULL;
+	Py_buffer view;
+	Py_ssize_t i, elem_len;
+	element_t tmp;
+	int type;
+
+	if(!PyArg_ParseTuple(args, "Oiy*:deserializeVector", &group, &type, &view))
+		return NULL;
+	if(!PyPairing_Check(group) || type < ZR || type > GT) {
+		PyBuffer_Release(&view);
+		EXIT_IF(TRUE, "invalid group object or element type.");
+	}
+	VERIFY_GROUP(group);
+
+	if(type == ZR) element_init_Zr(tmp, group->pair_obj);
+	else if(type == G1) element_init_G1(tmp, group->pair_obj);
+	else if(type == G2) element_init_G2(tmp, group->pair_obj);
+	else element_init_GT(tmp, group->pair_obj);
+	elem_len = element_length_in_bytes(tmp);
+	element_clear(tmp);
+
+	if(view.len == 0 || view.len % elem_len != 0) {
+		PyBuffer_Release(&view);
+		EXIT_IF(TRUE, "buffer does not hold a whole number of elements.");
+	}
+	vec = createNewVector(type, group, view.len / elem_len);
+	if(vec != NULL) {
+		Py_BEGIN_ALLOW_THREADS;
+		for(i = 0; i < vec->length; i++)
+			element_from_bytes(vec->elems[i], (uint8_t *) view.buf + i * elem_len);
+		Py_END_ALLOW_THREADS;
+	}
+	PyBuffer_Release(&view);
+	return (PyObject *) vec;
+}
+
+static PyObject *ElementVector_print(ElementVector *self)
+{
+	return PyUnicode_FromFormat("<ElementVector type=%d length=%zd>", self->element_type, self->length);
+}
+#endif
+
 /* this is a type method that is visible on the global or class level. Therefore,
    the function prototype needs the self (element class) and the args (tuple of Element objects).
  */
@@ -1264,7 +2005,9 @@ PyObject *Apply_pairing(PyObject *self, PyObject *args)
 		debug_e("LHS: '%B'\n", lhs->e);
 		debug_e("RHS: '%B'\n", rhs->e);
 		newObject = createNewElement(GT, lhs->pairing);
+		Py_BEGIN_ALLOW_THREADS;
 		pairing_apply(newObject->e, lhs->e, rhs->e, rhs->pairing->pair_obj);
+		Py_END_ALLOW_THREADS;
 #ifdef BENCHMARK_ENABLED
 		UPDATE_BENCHMARK(PAIRINGS, newObject->pairing->dBench);
 #endif
@@ -1288,10 +2031,12 @@ PyObject *Apply_pairing(PyObject *self, PyObject *args)
 	debug_e("LHS: '%B'\n", lhs->e);
 	debug_e("RHS: '%B'\n", rhs->e);
 	newObject = createNewElement(GT, lhs->pairing);
+	Py_BEGIN_ALLOW_THREADS;
 	if(lhs->element_type == G1)
 		pairing_apply(newObject->e, lhs->e, rhs->e, rhs->pairing->pair_obj);
 	else if(lhs->element_type == G2)
 		pairing_apply(newObject->e, rhs->e, lhs->e, rhs->pairing->pair_obj);
+	Py_END_ALLOW_THREADS;
 
 #ifdef BENCHMARK_ENABLED
 	UPDATE_BENCHMARK(PAIRINGS, newObject->pairing->dBench);
@@ -1379,7 +2124,9 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 				goto cleanup; 
 			}			
 			newObject = createNewElement(type, group);
+			Py_BEGIN_ALLOW_THREADS;
 			element_from_hash(newObject->e, hash_buf, hash_len);
+			Py_END_ALLOW_THREADS;
 		}
 		else {
 			tmp = "cannot hash a string to that field. Only Zr or G1.";
@@ -1435,7 +2182,9 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 				goto cleanup;
 			}
 
+			Py_BEGIN_ALLOW_THREADS;
 			element_from_hash(newObject->e, hash_buf, hash_len);
+			Py_END_ALLOW_THREADS;
 		}
 	}
 	// third case: a tuple with one element and
@@ -1453,12 +2202,14 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 			newObject = createNewElement(G1, group);
 			debug_e("Hashing element '%B' to G1...\n", object->e);
 			// hash the element to the G1 field (uses sha1 as well)
+			Py_BEGIN_ALLOW_THREADS;
 			result = hash_element_to_bytes(&object->e, hash_len, (unsigned char *) hash_buf, 0);
+			if(result) element_from_hash(newObject->e, hash_buf, hash_len);
+			Py_END_ALLOW_THREADS;
 			if(!result) {
 				tmp = "could not hash to bytes";
 				goto cleanup;
 			}
-			element_from_hash(newObject->e, hash_buf, hash_len);
 		}
 		else {
 			tmp = "can only hash an element of Zr to G1. Random Oracle model.";
@@ -1608,11 +2359,13 @@ static PyObject *Serialize_cmp(PyObject *self, PyObject *args) {
 		if(data_buf == NULL)
 			return PyErr_NoMemory();
 		// write to char buffer
+		Py_BEGIN_ALLOW_THREADS;
 		if(compression){
 			bytes_written = element_to_bytes_compressed(data_buf, element->e);
 		} else {
 			bytes_written = element_to_bytes(data_buf, element->e);
 		}
+		Py_END_ALLOW_THREADS;
 	}
 	else {
 		PyErr_SetString(PyExc_TypeError, "Invalid element type.");
@@ -1669,11 +2422,13 @@ static PyObject *Deserialize_cmp(PyObject *self, PyObject *args) {
 	else if((type == G1 || type == G2) && deserialized_len > 0) {
 		// now convert element back to an element type (assume of type ZR for now)
 		origObject = createNewElement(type, group);
+		Py_BEGIN_ALLOW_THREADS;
 		if(compression) {
 			element_from_bytes_compressed(origObject->e, binary_buf);
 		} else {
 			element_from_bytes(origObject->e, binary_buf);
 		}
+		Py_END_ALLOW_THREADS;
 		free(binary_buf);
 		return (PyObject *) origObject;
 	}
@@ -1955,6 +2710,71 @@ PyTypeObject ElementType = {
   0,                         /* tp_alloc */
   Element_new,                 /* tp_new */
 };
+
+PySequenceMethods elementvector_sequence = {
+  (lenfunc)ElementVector_length,        /* sq_length */
+  0,                         /* sq_concat */
+  0,                         /* sq_repeat */
+  (ssizeargfunc)ElementVector_item,     /* sq_item */
+};
+
+PyNumberMethods elementvector_number = {
+  0,                         /* nb_add */
+  0,                         /* nb_subtract */
+  ElementVector_mul,         /* nb_multiply */
+  0,                         /* nb_remainder */
+  0,                         /* nb_divmod */
+  ElementVector_pow,         /* nb_power */
+};
+
+PyBufferProcs elementvector_buffer = {
+  (getbufferproc)ElementVector_getbuffer, /* bf_getbuffer */
+  0,                         /* bf_releasebuffer */
+};
+
+PyMemberDef ElementVector_members[] = {
+  {"type", T_INT, offsetof(ElementVector, element_type), READONLY, "group type"},
+  {NULL}  /* Sentinel */
+};
+
+PyMethodDef ElementVector_methods[] = {
+  {"multiexp", (PyCFunction)ElementVector_multiexp, METH_VARARGS, "Product of the elements raised to a vector or sequence of exponents."},
+  {"prod", (PyCFunction)ElementVector_prod, METH_NOARGS, "Product of all elements."},
+  {"serialize", (PyCFunction)ElementVector_serialize, METH_NOARGS, "Contiguous fixed-length encoding of all elements."},
+  {NULL}  /* Sentinel */
+};
+
+PyTypeObject ElementVectorType = {
+  PyVarObject_HEAD_INIT(NULL, 0)
+  "pairing.ElementVector",   /*tp_name*/
+  sizeof(ElementVector),     /*tp_basicsize*/
+  0,                         /*tp_itemsize*/
+  (destructor)ElementVector_dealloc, /*tp_dealloc*/
+  0,                         /*tp_print*/
+  0,                         /*tp_getattr*/
+  0,                         /*tp_setattr*/
+  0,                         /*tp_reserved*/
+  (reprfunc)ElementVector_print, /*tp_repr*/
+  &elementvector_number,     /*tp_as_number*/
+  &elementvector_sequence,   /*tp_as_sequence*/
+  0,                         /*tp_as_mapping*/
+  0,                         /*tp_hash */
+  0,                         /*tp_call*/
+  0,                         /*tp_str*/
+  0,                         /*tp_getattro*/
+  0,                         /*tp_setattro*/
+  &elementvector_buffer,     /*tp_as_buffer*/
+  Py_TPFLAGS_DEFAULT,        /*tp_flags*/
+  "Vectors of pairing elements",  /* tp_doc */
+  0,                         /* tp_traverse */
+  0,                         /* tp_clear */
+  ElementVector_equals,      /* tp_richcompare */
+  0,                         /* tp_weaklistoffset */
+  0,                         /* tp_iter */
+  0,                         /* tp_iternext */
+  ElementVector_methods,     /* tp_methods */
+  ElementVector_members,     /* tp_members */
+};
 #else
 /* python 2.x series */
 PyNumberMethods element_number = {
@@ -2061,7 +2881,7 @@ PyMemberDef Element_members[] = {
   "group type"},
   {"initialized", T_INT, offsetof(Element, elem_initialized), 0,
   "determine initialization status"},
-  {"preproc", T_INT, offsetof(Element, elem_initPP), 0,
+  {"preproc", T_INT, offsetof(Element, elem_initPP), READONLY,
   "determine pre-processing status"},
   {NULL}  /* Sentinel */
 };
@@ -2075,9 +2895,15 @@ PyMethodDef Element_methods[] = {
 PyMethodDef pairing_methods[] = {
 	{"init", (PyCFunction)Element_elem, METH_VARARGS, "Create an element in group Zr and optionally set value."},
 	{"pair", (PyCFunction)Apply_pairing, METH_VARARGS, "Apply pairing between an element of G1 and G2 and returns an element mapped to GT"},
+	{"multiexp", (PyCFunction)Element_multiexp, METH_VARARGS, "Compute the product of G1, G2 or GT bases raised to ZR exponents"},
+#if PY_MAJOR_VERSION >= 3
+	{"vector", (PyCFunction)ElementVector_create, METH_VARARGS, "Create a vector from a sequence of elements of one group"},
+	{"deserializeVector", (PyCFunction)ElementVector_deserialize, METH_VARARGS, "Create a vector from the output of ElementVector.serialize"},
+#endif
 	{"hashPair", (PyCFunction)sha2_hash, METH_VARARGS, "Compute a sha1 hash of an element type"},
 	{"H", (PyCFunction)Element_hash, METH_VARARGS, "Hash an element type to a specific field: Zr, G1, or G2"},
 	{"random", (PyCFunction)Element_random, METH_VARARGS, "Return a random element in a specific group: G1, G2, Zr"},
+	{"random_many", (PyCFunction)Element_random_many, METH_VARARGS, "Return a list of random elements in G1, G2 or Zr, optionally from a fixed seed"},
 	{"serialize", (PyCFunction)Serialize_cmp, METH_VARARGS, "Serialize an element type into bytes."},
 	{"deserialize", (PyCFunction)Deserialize_cmp, METH_VARARGS, "De-serialize an bytes object into an element object"},
 	{"ismember", (PyCFunction) Group_Check, METH_VARARGS, "Group membership test for element objects."},
@@ -2143,6 +2969,10 @@ void initpairing(void) 		{
         CLEAN_EXIT;
     if(PyType_Ready(&ElementType) < 0)
         CLEAN_EXIT;
+#if PY_MAJOR_VERSION >= 3
+    if(PyType_Ready(&ElementVectorType) < 0)
+        CLEAN_EXIT;
+#endif
 #ifdef BENCHMARK_ENABLED
     if(import_benchmark() < 0)
       CLEAN_EXIT;
@@ -2163,6 +2993,10 @@ void initpairing(void) 		{
   PyModule_AddObject(m, "pc_element", (PyObject *)&ElementType);
   Py_INCREF(&PairingType);
   PyModule_AddObject(m, "pairing", (PyObject *)&PairingType);
+#if PY_MAJOR_VERSION >= 3
+  Py_INCREF(&ElementVectorType);
+  PyModule_AddObject(m, "ElementVector", (PyObject *)&ElementVectorType);
+#endif
 
   PyModule_AddIntConstant(m, "ZR", ZR);
   PyModule_AddIntConstant(m, "G1", G1);
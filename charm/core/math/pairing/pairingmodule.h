@@ -41,6 +41,7 @@
 #include <fcntl.h>
 #include "benchmarkmodule.h"
 #include "base64.h"
+#include "drbg.h"
 #include <openssl/objects.h>
 #include <openssl/rand.h>
 #include <openssl/sha.h>
@@ -126,6 +127,19 @@ typedef struct {
   int elem_initPP;
 } Element;
 
+typedef struct {
+  PyObject_HEAD
+  Pairing *pairing;
+  element_t *elems;
+  Py_ssize_t length;
+  GroupType element_type;
+  uint8_t *buf;		/* serialized elements, filled on first serialize or buffer export */
+  Py_ssize_t buf_len;
+} ElementVector;
+
+PyTypeObject ElementVectorType;
+#define PyElementVector_Check(obj) PyObject_TypeCheck(obj, &ElementVectorType)
+
 #define Check_Elements(o1, o2)  PyElement_Check(o1) && PyElement_Check(o2)
 #define Check_Types2(o1, o2, lhs_o1, rhs_o2, longLHS_o1, longRHS_o2)  \
 	if(PyElement_Check(o1)) { \
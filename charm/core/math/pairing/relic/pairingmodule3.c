@@ -625,6 +625,12 @@ static PyObject *Element_mul(PyObject *lhs, PyObject *rhs)
 	integer_t z;
 	int found_int = FALSE;
 
+	// defer to the other operand (e.g. a vector of elements) for unsupported types
+	if(!(PyElement_Check(lhs) || _PyLong_Check(lhs)) || !(PyElement_Check(rhs) || _PyLong_Check(rhs))) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+
 	// lhs or rhs must be an element type
 	if(PyElement_Check(lhs)) {
 		self = (Element *) lhs;
@@ -815,6 +821,12 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 	int longFoundLHS = FALSE, longFoundRHS = FALSE;
 	integer_t n;
 
+	// defer to the other operand (e.g. a vector of exponents) for unsupported types
+	if(!(PyElement_Check(o1) || _PyLong_Check(o1)) || !(PyElement_Check(o2) || _PyLong_Check(o2))) {
+		Py_INCREF(Py_NotImplemented);
+		return Py_NotImplemented;
+	}
+
 	Check_Types2(o1, o2, lhs_o1, rhs_o2, longFoundLHS, longFoundRHS);
 
 	if(longFoundLHS) {
@@ -827,7 +839,9 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 			ConvertToInt2(n, o1);
 			newObject = createNewElement(rhs_o2->element_type, rhs_o2->pairing);
 			element_set_int(newObject->e, n);
+			RELIC_BEGIN_ALLOW_THREADS;
 			element_pow_zr(newObject->e, newObject->e, rhs_o2->e);
+			RELIC_END_ALLOW_THREADS;
 			bn_free(n);
 			Py_DECREF(lhs_o1);
 		}
@@ -847,12 +861,14 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 			newObject = createNewElement(lhs_o1->element_type, lhs_o1->pairing);
 			bn_inits(n);
 			ConvertToInt2(n, o2);
+			RELIC_BEGIN_ALLOW_THREADS;
 			if(lhs_o1->elem_initPP == TRUE) {
 				element_pp_pow_int(newObject->e, lhs_o1->e_pp, lhs_o1->element_type, n);
 			}
 			else {
 				element_pow_int(newObject->e, lhs_o1->e, n);
 			}
+			RELIC_END_ALLOW_THREADS;
 			bn_free(n);
 		}
 		else if(rhs == -1) {
@@ -872,12 +888,14 @@ static PyObject *Element_pow(PyObject *o1, PyObject *o2, PyObject *o3)
 		if(rhs_o2->element_type == ZR) {
 
 			newObject = createNewElement(lhs_o1->element_type, lhs_o1->pairing);
+			RELIC_BEGIN_ALLOW_THREADS;
 			if(lhs_o1->elem_initPP == TRUE) {
 				element_pp_pow(newObject->e, lhs_o1->e_pp, lhs_o1->element_type, rhs_o2->e);
 			}
 			else {
 				element_pow_zr(newObject->e, lhs_o1->e, rhs_o2->e);
 			}
+			RELIC_END_ALLOW_THREADS;
 		}
 		else {
 			// we have a problem
@@ -997,7 +1015,9 @@ PyObject *multi_pairing(Element *groupObj, PyObject *listG1, PyObject *listG2) {
 		Element *newObject = NULL;
 		if(l == r) {
 			newObject = createNewElement(GT, groupObj->pairing);
+			RELIC_BEGIN_ALLOW_THREADS;
 			element_prod_pairing(newObject->e, g1, g2, l); // pairing product calculation
+			RELIC_END_ALLOW_THREADS;
 		}
 		else {
 			EXIT_IF(TRUE, "invalid pairing element types in list.");
@@ -1044,12 +1064,14 @@ PyObject *Apply_pairing(Element *self, PyObject *args)
 			debug_e("RHS: '%B'\n", rhs->e);
 			//
 			newObject = createNewElement(GT, lhs->pairing);
+			RELIC_BEGIN_ALLOW_THREADS;
 			if(lhs->element_type == G1) {
 				pairing_apply(newObject->e, lhs->e, rhs->e);
 			}
 			else if(lhs->element_type == G2) {
 				pairing_apply(newObject->e, rhs->e, lhs->e);
 			}
+			RELIC_END_ALLOW_THREADS;
 			//
 #ifdef BENCHMARK_ENABLED
 			UPDATE_BENCHMARK(PAIRINGS, newObject->pairing->dBench);
@@ -1133,7 +1155,9 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 
 			newObject = createNewElement(type, group);
 			// hash bytes using SHA
+			RELIC_BEGIN_ALLOW_THREADS;
 			result = element_from_hash(newObject->e, (uint8_t *) str, strlen(str));
+			RELIC_END_ALLOW_THREADS;
 			if(result != ELEMENT_OK) {
 				tmp = "could not hash to bytes.";
 				goto cleanup;
@@ -1198,7 +1222,9 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 				goto cleanup;
 			}
 
+			RELIC_BEGIN_ALLOW_THREADS;
 			element_from_hash(newObject->e, hash_buf, SHA_LEN);
+			RELIC_END_ALLOW_THREADS;
 		}
 	}
 	// third case: a tuple with one element and
@@ -1220,7 +1246,9 @@ static PyObject *Element_hash(Element *self, PyObject *args) {
 				tmp = "could not hash to bytes";
 				goto cleanup;
 			}
+			RELIC_BEGIN_ALLOW_THREADS;
 			element_from_hash(newObject->e, hash_buf, HASH_LEN);
+			RELIC_END_ALLOW_THREADS;
 		}
 		else {
 			tmp = "can only hash an element of Zr to G1. Random Oracle model.";
@@ -1332,7 +1360,9 @@ static PyObject *Serialize_cmp(Element *o1, PyObject *args) {
 	uint8_t data_buf[elem_len + 1];
 	memset(data_buf, 0, elem_len);
 	// write to char buffer
+	RELIC_BEGIN_ALLOW_THREADS;
 	element_to_bytes(data_buf, elem_len, self->e);
+	RELIC_END_ALLOW_THREADS;
 	debug("result => ");
 	printf_buffer_as_hex(data_buf, elem_len);
 
@@ -1366,7 +1396,9 @@ static PyObject *Deserialize_cmp(Element *self, PyObject *args) {
 				debug("result => ");
 				printf_buffer_as_hex(binary_buf, deserialized_len);
 				origObject = createNewElement(type, group);
+				RELIC_BEGIN_ALLOW_THREADS;
 				element_from_bytes(origObject->e, binary_buf, deserialized_len);
+				RELIC_END_ALLOW_THREADS;
 				free(binary_buf);
 
 				return (PyObject *) origObject;
@@ -1716,6 +1748,8 @@ PyMemberDef Element_members[] = {
 		"group type"},
     {"initialized", T_INT, offsetof(Element, elem_initialized), 0,
 		"determine initialization status"},
+    {"preproc", T_INT, offsetof(Element, elem_initPP), READONLY,
+		"determine pre-processing status"},
     {NULL}  /* Sentinel */
 };
 
@@ -1820,6 +1854,9 @@ void initpairing(void) 		{
     PyModule_AddIntConstant(m, "G1", G1);
     PyModule_AddIntConstant(m, "G2", G2);
     PyModule_AddIntConstant(m, "GT", GT);
+    /* number of points in the fixed-base tables built by initPP */
+    PyModule_AddIntConstant(m, "G1_TABLE", G1_TABLE);
+    PyModule_AddIntConstant(m, "G2_TABLE", G2_TABLE);
 
 #ifdef BENCHMARK_ENABLED
 	ADD_BENCHMARK_OPTIONS(m);
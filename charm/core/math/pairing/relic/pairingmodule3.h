@@ -53,6 +53,17 @@
 #define ID_LEN   4
 #define MAX_BENCH_OBJECTS	2
 
+/* RELIC keeps its state in a process-wide context unless it was configured with
+ * MULTI=PTHREAD or MULTI=OPENMP, in which case every thread has its own context.
+ * Only then may other Python threads run while the library computes. */
+#if defined(MULTI) && (MULTI == PTHREAD || MULTI == OPENMP)
+#define RELIC_BEGIN_ALLOW_THREADS	Py_BEGIN_ALLOW_THREADS
+#define RELIC_END_ALLOW_THREADS		Py_END_ALLOW_THREADS
+#else
+#define RELIC_BEGIN_ALLOW_THREADS	{
+#define RELIC_END_ALLOW_THREADS		}
+#endif
+
 /* Index numbers for different hash functions.  These are all implemented as SHA1(index || message).	*/
 #define HASH_FUNCTION_ELEMENTS			0
 #define HASH_FUNCTION_STR_TO_Zr_CRH		1
@@ -0,0 +1,103 @@
+#include "drbg.h"
+#include <string.h>
+#include <limits.h>
+#include <openssl/evp.h>
+#include <openssl/rand.h>
+#include <openssl/sha.h>
+#include <openssl/crypto.h>
+
+#if defined(_WIN32)
+#include <process.h>
+#define drbg_getpid()	((long) _getpid())
+#define DRBG_THREAD_LOCAL	__declspec(thread)
+#else
+#include <unistd.h>
+#define drbg_getpid()	((long) getpid())
+#define DRBG_THREAD_LOCAL	__thread
+#endif
+
+static DRBG_THREAD_LOCAL drbg_t thread_state;
+
+static const EVP_CIPHER *drbg_cipher(void)
+{
+#if OPENSSL_VERSION_NUMBER >= 0x10100000L && !defined(OPENSSL_NO_CHACHA)
+	return EVP_chacha20();
+#else
+	return EVP_aes_256_ctr();
+#endif
+}
+
+int drbg_seed(drbg_t *d, const uint8_t *seed, size_t seed_len)
+{
+	if(seed != NULL) {
+		SHA256(seed, seed_len, d->key);
+		d->mode = DRBG_SEEDED_FIXED;
+	}
+	else {
+		if(RAND_bytes(d->key, DRBG_KEY_LEN) != 1) return 0;
+		d->mode = DRBG_SEEDED_OS;
+	}
+	d->requests = 0;
+	d->pid = drbg_getpid();
+	return 1;
+}
+
+/* encrypts zeros in place, in chunks EVP_EncryptUpdate can take */
+static int drbg_keystream(EVP_CIPHER_CTX *ctx, uint8_t *out, size_t len)
+{
+	int outl;
+	memset(out, 0, len);
+	while(len > 0) {
+		int chunk = len > (size_t) (INT_MAX / 2) ? INT_MAX / 2 : (int) len;
+		if(EVP_EncryptUpdate(ctx, out, &outl, out, chunk) != 1) return 0;
+		out += chunk;
+		len -= chunk;
+	}
+	return 1;
+}
+
+int drbg_generate(drbg_t *d, uint8_t *out, size_t len)
+{
+	uint8_t iv[16], next_key[DRBG_KEY_LEN];
+	EVP_CIPHER_CTX *ctx;
+	int ok;
+
+	if(d->mode == DRBG_UNSEEDED ||
+	  (d->mode == DRBG_SEEDED_OS && (d->requests >= DRBG_RESEED_INTERVAL || d->pid != drbg_getpid()))) {
+		if(!drbg_seed(d, NULL, 0)) return 0;
+	}
+
+	/* the key changes after every request, so a fixed IV never repeats a keystream */
+	memset(iv, 0, sizeof(iv));
+	ctx = EVP_CIPHER_CTX_new();
+	if(ctx == NULL) return 0;
+	ok = EVP_EncryptInit_ex(ctx, drbg_cipher(), NULL, d->key, iv) == 1 &&
+		 drbg_keystream(ctx, next_key, DRBG_KEY_LEN) &&
+		 drbg_keystream(ctx, out, len);
+	EVP_CIPHER_CTX_free(ctx);
+
+	if(ok) {
+		memcpy(d->key, next_key, DRBG_KEY_LEN);
+		d->requests++;
+	}
+	else {
+		/* next_key may be partial or zero: drop the state so the next request reseeds
+		 * from the OS instead of continuing from a key that may be known. A fixed-seed
+		 * stream does not resume after a failure. */
+		OPENSSL_cleanse(out, len);
+		drbg_cleanse(d);
+		d->mode = DRBG_UNSEEDED;
+	}
+	OPENSSL_cleanse(next_key, DRBG_KEY_LEN);
+	return ok;
+}
+
+drbg_t *drbg_thread_state(void)
+{
+	return &thread_state;
+}
+
+void drbg_cleanse(drbg_t *d)
+{
+	OPENSSL_cleanse(d, sizeof(drbg_t));
+}
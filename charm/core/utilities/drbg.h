@@ -0,0 +1,43 @@
+#ifndef __DRBG_H__
+#define __DRBG_H__
+
+#include <stdint.h>
+#include <stddef.h>
+
+/*
+ * Deterministic random bit generator for bulk element generation.
+ *
+ * Output is the keystream of ChaCha20 (AES-256-CTR on OpenSSL builds without
+ * ChaCha20) under a 256-bit key. After every request the first 32 bytes of the
+ * keystream replace the key ("fast key erasure"), so earlier output cannot be
+ * recomputed from the current state. A generator seeded from the OS is reseeded
+ * from RAND_bytes every DRBG_RESEED_INTERVAL requests and after a fork; a
+ * generator built from a caller-supplied seed is fully reproducible and is meant
+ * for benchmarks and tests only.
+ */
+
+#define DRBG_KEY_LEN	32
+#define DRBG_RESEED_INTERVAL	(1 << 16)
+/* extra bytes drawn per integer before reducing it mod n: bias below 2^-128 */
+#define DRBG_EXTRA_BYTES	16
+/* bytes of keystream used to derive one random curve point */
+#define DRBG_POINT_BYTES	32
+
+enum { DRBG_UNSEEDED = 0, DRBG_SEEDED_OS, DRBG_SEEDED_FIXED };
+
+typedef struct {
+	uint8_t key[DRBG_KEY_LEN];
+	uint64_t requests;
+	long pid;
+	int mode;
+} drbg_t;
+
+/* seeds d from seed (reproducible mode), or from the OS if seed is NULL. Returns 1 on success. */
+int drbg_seed(drbg_t *d, const uint8_t *seed, size_t seed_len);
+/* fills out with len pseudo-random bytes. Returns 1 on success. */
+int drbg_generate(drbg_t *d, uint8_t *out, size_t len);
+/* returns the calling thread's generator, seeded from the OS on first use. */
+drbg_t *drbg_thread_state(void);
+void drbg_cleanse(drbg_t *d);
+
+#endif
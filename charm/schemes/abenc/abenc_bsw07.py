@@ -13,7 +13,7 @@ John Bethencourt, Brent Waters (Pairing-based)
 :Authors:    J Ayo Akinyele
 :Date:            04/2011
 '''
-from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair
+from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair,PairingProduct
 from charm.toolbox.secretutil import SecretUtil
 from charm.toolbox.ABEnc import ABEnc, Input, Output
 
@@ -26,7 +26,7 @@ ct_t = { 'C_tilde':GT, 'C':G1, 'Cy':G1, 'Cyp':G2 }
 debug = False
 class CPabe_BSW07(ABEnc):
     """
-    >>> from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair
+    >>> from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair,PairingProduct
     >>> group = PairingGroup('SS512')
     >>> cpabe = CPabe_BSW07(group)
     >>> msg = group.random(GT)
@@ -51,10 +51,12 @@ class CPabe_BSW07(ABEnc):
         g, gp = group.random(G1), group.random(G2)
         alpha, beta = group.random(ZR), group.random(ZR)
         # initialize pre-processing for generators
-        g.initPP(); gp.initPP()
+        group.precompute(g); group.precompute(gp)
         
         h = g ** beta; f = g ** ~beta
         e_gg_alpha = pair(g, gp ** alpha)
+        # h and e(g,g)^alpha are raised to the secret of every encryption
+        group.precompute(h); group.precompute(e_gg_alpha)
         
         pk = { 'g':g, 'g2':gp, 'h':h, 'f':f, 'e_gg_alpha':e_gg_alpha }
         mk = {'beta':beta, 'g2_alpha':gp ** alpha }
@@ -63,15 +65,28 @@ class CPabe_BSW07(ABEnc):
     @Input(pk_t, mk_t, [str])
     @Output(sk_t)
     def keygen(self, pk, mk, S):
+        D, g_r = self.keygen_base(pk, mk)
+        D_j, D_j_pr = self.keygen_attributes(pk, g_r, S)
+        return { 'D':D, 'Dj':D_j, 'Djp':D_j_pr, 'S':S }
+
+    def keygen_base(self, pk, mk):
+        """returns the component D of a new key and the g2^r it was built with."""
         r = group.random() 
         g_r = (pk['g2'] ** r)    
         D = (mk['g2_alpha'] * g_r) ** (1 / mk['beta'])        
+        return D, g_r
+
+    def keygen_attributes(self, pk, g_r, S):
+        """returns the components Dj and Djp of the attributes in S for the key
+        built with g_r. Every attribute is independent of the others, so the
+        attributes of one key can be split over several calls."""
         D_j, D_j_pr = {}, {}
-        for j in S:
-            r_j = group.random()
-            D_j[j] = g_r * (group.hash(j, G2) ** r_j)
-            D_j_pr[j] = pk['g'] ** r_j
-        return { 'D':D, 'Dj':D_j, 'Djp':D_j_pr, 'S':S }
+        if S:
+            r_j = group.vector([group.random() for j in S])
+            H_j = group.vector([group.hash(j, G2) for j in S])
+            D_j = dict(zip(S, (H_j ** r_j) * g_r))
+            D_j_pr = dict(zip(S, pk['g'] ** r_j))
+        return D_j, D_j_pr
     
     @Input(pk_t, GT, str)
     @Output(ct_t)
@@ -82,11 +97,11 @@ class CPabe_BSW07(ABEnc):
         shares = util.calculateSharesDict(s, policy)      
 
         C = pk['h'] ** s
-        C_y, C_y_pr = {}, {}
-        for i in shares.keys():
-            j = util.strip_index(i)
-            C_y[i] = pk['g'] ** shares[i]
-            C_y_pr[i] = group.hash(j, G2) ** shares[i] 
+        keys = list(shares.keys())
+        s_y = group.vector([shares[i] for i in keys])
+        H_y = group.vector([group.hash(util.strip_index(i), G2) for i in keys])
+        C_y = dict(zip(keys, pk['g'] ** s_y))
+        C_y_pr = dict(zip(keys, H_y ** s_y))
         
         return { 'C_tilde':(pk['e_gg_alpha'] ** s) * M,
                  'C':C, 'Cy':C_y, 'Cyp':C_y_pr, 'policy':policy_str, 'attributes':a_list }
@@ -98,13 +113,15 @@ class CPabe_BSW07(ABEnc):
         pruned_list = util.prune(policy, sk['S'])
         if pruned_list == False:
             return False
-        z = util.getCoefficients(policy)
-        A = 1 
+        z = util.getCoefficients(policy, pruned_list)
+        # A / e(C, D) evaluated as a single multi-pairing
+        A = PairingProduct(group)
         for i in pruned_list:
             j = i.getAttributeAndIndex(); k = i.getAttribute()
-            A *= ( pair(ct['Cy'][j], sk['Dj'][k]) / pair(sk['Djp'][k], ct['Cyp'][j]) ) ** z[j]
+            A.add(ct['Cy'][j], sk['Dj'][k], z[j]).divide(sk['Djp'][k], ct['Cyp'][j], z[j])
+        A.divide(ct['C'], sk['D'])
         
-        return ct['C_tilde'] / (pair(ct['C'], sk['D']) / A)
+        return ct['C_tilde'] * A.evaluate()
 
 
 def main():   
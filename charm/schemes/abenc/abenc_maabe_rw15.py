@@ -208,12 +208,17 @@ class MaabeRW15(ABEncMultiAuth):
         if not pruned_list:
             raise Exception("You don't have the required attributes for decryption!")
 
-        B = self.group.init(GT, 1)
-        for i in range(len(pruned_list)):
-            x = pruned_list[i].getAttribute()  # without the underscore
-            y = pruned_list[i].getAttributeAndIndex()  # with the underscore
-            B *= (ct['C1'][y] * pair(ct['C2'][y], sk['keys'][x]['K']) * pair(ct['C3'][y], gp['H'](sk['GID'])) * pair(
-                sk['keys'][x]['KP'], ct['C4'][y])) ** coefficients[y]
+        h_gid = gp['H'](sk['GID'])
+        nodes = [(node.getAttribute(), node.getAttributeAndIndex()) for node in pruned_list]  # without and with the underscore
+        c = [coefficients[y] for (x, y) in nodes]
+        # prod e(C2, K) e(C3, H(GID)) e(KP, C4) over the attributes, each raised to the
+        # coefficient, as one multi-pairing: the coefficients move into the source groups and
+        # the e(C3, H(GID)) terms collapse into one pairing of a multi-exponentiation
+        prod = PairingProduct(self.group)
+        prod.add(self.group.multiexp([ct['C3'][y] for (x, y) in nodes], c), h_gid)
+        for ((x, y), c_y) in zip(nodes, c):
+            prod.add(ct['C2'][y], sk['keys'][x]['K'], c_y).add(sk['keys'][x]['KP'], ct['C4'][y], c_y)
+        B = self.group.multiexp([ct['C1'][y] for (x, y) in nodes], c) * prod.evaluate()
         if debug:
             print("Decrypt")
             print("SK:")
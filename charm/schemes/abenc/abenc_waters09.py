@@ -13,7 +13,7 @@ Brent Waters (Pairing-based)
 :Authors:    J Ayo Akinyele
 :Date:            11/2010
 '''
-from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair
+from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair,PairingProduct
 from charm.toolbox.secretutil import SecretUtil
 from charm.toolbox.ABEnc import ABEnc
 
@@ -77,7 +77,7 @@ class CPabe09(ABEnc):
             r = group.random()
             if shares[i][0] == p_list[i]:
                attr = shares[i][0].getAttribute() 
-               C[ p_list[i] ] = ((pk['g1^a'] ** shares[i][1]) * (group.hash(attr, G1) ** -r))
+               C[ p_list[i] ] = group.multiexp([pk['g1^a'], group.hash(attr, G1)], [shares[i][1], -r])
                D[ p_list[i] ] = (pk['g2'] ** r)
         
         if debug: print("SessionKey: %s" % C_tilde)
@@ -88,24 +88,18 @@ class CPabe09(ABEnc):
         pruned = util.prune(policy, sk['attributes'])
         if pruned == False:
             return False
-        coeffs = util.getCoefficients(policy)
-        numerator = pair(ct['C0'], sk['K'])
+        coeffs = util.getCoefficients(policy, pruned)
         
-        # create list for attributes in order...
-        k_x, w_i = {}, {}
-        for i in pruned:
-            j = i.getAttributeAndIndex()
-            k = i.getAttribute()
-            k_x[ j ] = sk['K_x'][k]
-            w_i[ j ] = coeffs[j]
-            #print('Attribute %s: coeff=%s, k_x=%s' % (j, w_i[j], k_x[j]))
-            
+        # denominator / numerator as a single multi-pairing, the e(C_j^w_j, L) terms
+        # share L and collapse into one pairing
         C, D = ct['C'], ct['D']
-        denominator = 1
+        prod = PairingProduct(group)
         for i in pruned:
             j = i.getAttributeAndIndex()
-            denominator *= ( pair(C[j] ** w_i[j], sk['L']) * pair(k_x[j] ** w_i[j], D[j]) )   
-        return ct['C_tilde'] / (numerator / denominator)
+            k = i.getAttribute()
+            prod.add(C[j], sk['L'], coeffs[j]).add(sk['K_x'][k], D[j], coeffs[j])
+        prod.divide(ct['C0'], sk['K'])
+        return ct['C_tilde'] * prod.evaluate()
 
 def main():
     #Get the eliptic curve with the bilinear mapping feature needed.
@@ -53,8 +53,8 @@ class YLLC15(ABEnc):
         g, gp = self.group.random(G1), self.group.random(G2)
         alpha, beta = self.group.random(ZR), self.group.random(ZR)
         # initialize pre-processing for generators
-        g.initPP()
-        gp.initPP()
+        self.group.precompute(g)
+        self.group.precompute(gp)
 
         h = g ** beta
         e_gg_alpha = pair(g, gp ** alpha)
@@ -14,19 +14,90 @@ Shashank Agrawal, Melissa Chase
 :Date:            05/2016
 '''
 
-from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair, PairingProduct
 from charm.toolbox.ABEnc import ABEnc
-from charm.toolbox.msp import MSP
+from charm.toolbox.msp import MSP, row_product
+from collections import OrderedDict
+import threading
 
 debug = False
 
 
+class AC17HashStore(object):
+    """
+    The hash-to-G1 points of AC17CPABE, computed once and kept with fixed-base
+    tables. Encryption hashes '0' + (j+1) + l + t for every MSP column j and
+    attr + l + t for every attribute, keygen hashes the same points for the key's
+    attributes and for column 1. None of them depends on the message or on the
+    key material, so the store of one scheme instance serves all of its public
+    keys. Column tables grow as wider MSPs come in, attribute tables are kept for
+    the maxsize most recently used attributes.
+
+    >>> group = PairingGroup('SS512')
+    >>> store = AC17HashStore(group, 2)
+    >>> store.columns(3)[2][1][0] == group.hash('0' + '3' + '1' + '0', G1)
+    True
+    >>> store.attribute('ONE')[2][1] == group.hash('ONE' + '2' + '1', G1)
+    True
+    >>> store.info()
+    {'columns': 3, 'attributes': 1, 'points': 24}
+    """
+    def __init__(self, group, assump_size, maxsize=4096):
+        self.group = group
+        self.assump_size = assump_size
+        self.maxsize = maxsize
+        self._columns = []
+        self._attributes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _table(self, prefix):
+        # table[l][t] = H(prefix + l + t) for l <= k and t < k
+        table = []
+        for l in range(self.assump_size + 1):
+            row = [self.group.hash(prefix + str(l) + str(t), G1) for t in range(self.assump_size)]
+            for point in row:
+                # points may come from the group's hash cache and carry a table already
+                self.group.precompute(point)
+            table.append(row)
+        return table
+
+    def columns(self, count):
+        """returns the tables of the first count MSP columns"""
+        with self._lock:
+            while len(self._columns) < count:
+                self._columns.append(self._table('0' + str(len(self._columns) + 1)))
+            return self._columns[:count]
+
+    def attribute(self, attr):
+        """returns the table of the attribute attr"""
+        with self._lock:
+            table = self._attributes.get(attr)
+            if table is not None:
+                self._attributes.move_to_end(attr)
+                return table
+        # hash outside of the lock, concurrent misses on one attribute hash it twice
+        table = self._table(attr)
+        with self._lock:
+            self._attributes[attr] = table
+            while len(self._attributes) > self.maxsize:
+                self._attributes.popitem(last=False)
+        return table
+
+    def info(self):
+        """returns the number of stored column and attribute tables and points"""
+        with self._lock:
+            tables = len(self._columns) + len(self._attributes)
+            return { 'columns':len(self._columns), 'attributes':len(self._attributes),
+                     'points':tables * (self.assump_size + 1) * self.assump_size }
+
+
 class AC17CPABE(ABEnc):
     def __init__(self, group_obj, assump_size, verbose=False):
         ABEnc.__init__(self)
         self.group = group_obj
         self.assump_size = assump_size  # size of linear assumption, at least 2
         self.util = MSP(self.group, verbose)
+        self.hashes = AC17HashStore(self.group, self.assump_size)
 
     def setup(self):
         """
@@ -37,16 +108,11 @@ class AC17CPABE(ABEnc):
             print('\nSetup algorithm:\n')
 
         # generate two instances of the k-linear assumption
-        A = []
-        B = []
-        for i in range(self.assump_size):
-            A.append(self.group.random(ZR))
-            B.append(self.group.random(ZR))  # note that A, B are vectors here
+        A = self.group.random_many(ZR, self.assump_size)
+        B = self.group.random_many(ZR, self.assump_size)  # note that A, B are vectors here
 
         # vector
-        k = []
-        for i in range(self.assump_size + 1):
-            k.append(self.group.random(ZR))
+        k = self.group.random_many(ZR, self.assump_size + 1)
 
         # pick a random element from the two source groups and pair them
         g = self.group.random(G1)
@@ -87,11 +153,9 @@ class AC17CPABE(ABEnc):
             print('\nKey generation algorithm:\n')
 
         # pick randomness
-        r = []
+        r = self.group.random_many(ZR, self.assump_size)
         sum = 0
-        for i in range(self.assump_size):
-            rand = self.group.random(ZR)
-            r.append(rand)
+        for rand in r:
             sum += rand
 
         # compute the [Br]_2 term
@@ -103,9 +167,7 @@ class AC17CPABE(ABEnc):
         Br.append(sum)
 
         # now compute [Br]_2
-        K_0 = []
-        for i in range(self.assump_size + 1):
-            K_0.append(msk['h'] ** Br[i])
+        K_0 = list(msk['h'] ** self.group.vector(Br))
 
         # compute [W_1 Br]_1, ...
         K = {}
@@ -114,13 +176,13 @@ class AC17CPABE(ABEnc):
         for attr in attr_list:
             key = []
             sigma_attr = self.group.random(ZR)
+            table = self.hashes.attribute(attr)
             for t in range(self.assump_size):
                 prod = 1
                 a_t = A[t]
                 for l in range(self.assump_size + 1):
-                    input_for_hash = attr + str(l) + str(t)
-                    prod *= (self.group.hash(input_for_hash, G1) ** (Br[l]/a_t))
-                prod *= (g ** (sigma_attr/a_t))
+                    prod *= (table[l][t] ** (Br[l] / a_t))
+                prod *= (g ** (sigma_attr / a_t))
                 key.append(prod)
             key.append(g ** (-sigma_attr))
             K[attr] = key
@@ -129,12 +191,12 @@ class AC17CPABE(ABEnc):
         Kp = []
         g_k = msk['g_k']
         sigma = self.group.random(ZR)
+        table = self.hashes.columns(1)[0]
         for t in range(self.assump_size):
             prod = g_k[t]
             a_t = A[t]
             for l in range(self.assump_size + 1):
-                input_for_hash = '01' + str(l) + str(t)
-                prod *= (self.group.hash(input_for_hash, G1) ** (Br[l] / a_t))
+                prod *= (table[l][t] ** (Br[l] / a_t))
             prod *= (g ** (sigma / a_t))
             Kp.append(prod)
         Kp.append(g_k[self.assump_size] * (g ** (-sigma)))
@@ -150,15 +212,13 @@ class AC17CPABE(ABEnc):
             print('\nEncryption algorithm:\n')
 
         policy = self.util.createPolicy(policy_str)
-        mono_span_prog = self.util.convert_policy_to_msp(policy)
+        mono_span_prog = self.util.convert_policy_to_sparse_msp(policy)
         num_cols = self.util.len_longest_row
 
         # pick randomness
-        s = []
+        s = self.group.random_many(ZR, self.assump_size)
         sum = 0
-        for i in range(self.assump_size):
-            rand = self.group.random(ZR)
-            s.append(rand)
+        for rand in s:
             sum += rand
 
         # compute the [As]_2 term
@@ -170,37 +230,19 @@ class AC17CPABE(ABEnc):
 
         # compute the [(V^T As||U^T_2 As||...) M^T_i + W^T_i As]_1 terms
 
-        # pre-compute hashes
-        hash_table = []
-        for j in range(num_cols):
-            x = []
-            input_for_hash1 = '0' + str(j + 1)
-            for l in range(self.assump_size + 1):
-                y = []
-                input_for_hash2 = input_for_hash1 + str(l)
-                for t in range(self.assump_size):
-                    input_for_hash3 = input_for_hash2 + str(t)
-                    hashed_value = self.group.hash(input_for_hash3, G1)
-                    y.append(hashed_value)
-                    # if debug: print ('Hash of', i+2, ',', j2, ',', j1, 'is', hashed_value)
-                x.append(y)
-            hash_table.append(x)
+        # the product over t of H(attr, l, t) ** s_t * prod_j H(0 j+1, l, t) ** (M_i,j s_t)
+        # is computed as prod_t H(attr, l, t) ** s_t * prod_j Q_j,l ** M_i,j, where
+        # Q_j,l = prod_t H(0 j+1, l, t) ** s_t is shared by all rows and M_i,j is 0, 1 or -1
+        Q = [[self._power(column[l], s) for column in self.hashes.columns(num_cols)]
+             for l in range(self.assump_size + 1)]
 
         C = {}
         for attr, row in mono_span_prog.items():
             ct = []
             attr_stripped = self.util.strip_index(attr)  # no need, re-use not allowed
+            table = self.hashes.attribute(attr_stripped)
             for l in range(self.assump_size + 1):
-                prod = 1
-                cols = len(row)
-                for t in range(self.assump_size):
-                    input_for_hash = attr_stripped + str(l) + str(t)
-                    prod1 = self.group.hash(input_for_hash, G1)
-                    for j in range(cols):
-                        # input_for_hash = '0' + str(j+1) + str(l) + str(t)
-                        prod1 *= (hash_table[j][l][t] ** row[j])
-                    prod *= (prod1 ** s[t])
-                ct.append(prod)
+                ct.append(row_product(Q[l], row, self._power(table[l], s)))
             C[attr] = ct
 
         # compute the e(g, h)^(k^T As) . m term
@@ -211,6 +253,13 @@ class AC17CPABE(ABEnc):
 
         return {'policy': policy, 'C_0': C_0, 'C': C, 'Cp': Cp}
 
+    def _power(self, points, exponents):
+        # product of fixed-base exponentiations points[t] ** exponents[t]
+        prod = points[0] ** exponents[0]
+        for t in range(1, len(points)):
+            prod *= (points[t] ** exponents[t])
+        return prod
+
     def decrypt(self, pk, ctxt, key):
         """
         Decrypt ciphertext ctxt with key key.
@@ -224,19 +273,20 @@ class AC17CPABE(ABEnc):
             print ("Policy not satisfied.")
             return None
 
-        prod1_GT = 1
-        prod2_GT = 1
+        # the rows of a satisfying set add up to (1, 0, ..., 0), so every coefficient is 1
+        K = [key['K'][self.util.strip_index(node.getAttributeAndIndex())] for node in nodes]  # no need, re-use not allowed
+        C = [ctxt['C'][node.getAttributeAndIndex()] for node in nodes]
+
+        # prod2_GT / prod1_GT evaluated as a single multi-pairing of 2(k+1) terms
+        prod_GT = PairingProduct(self.group)
         for i in range(self.assump_size + 1):
-            prod_H = 1
-            prod_G = 1
-            for node in nodes:
-                attr = node.getAttributeAndIndex()
-                attr_stripped = self.util.strip_index(attr)  # no need, re-use not allowed
-                # prod_H *= key['K'][attr_stripped][i] ** coeff[attr]
-                # prod_G *= ctxt['C'][attr][i] ** coeff[attr]
-                prod_H *= key['K'][attr_stripped][i]
-                prod_G *= ctxt['C'][attr][i]
-            prod1_GT *= pair(key['Kp'][i] * prod_H, ctxt['C_0'][i])
-            prod2_GT *= pair(prod_G, key['K_0'][i])
-
-        return ctxt['Cp'] * prod2_GT / prod1_GT
+            prod_H = key['Kp'][i]
+            prod_G = C[0][i]
+            for j in range(len(nodes)):
+                prod_H *= K[j][i]
+            for j in range(1, len(nodes)):
+                prod_G *= C[j][i]
+            prod_GT.divide(prod_H, ctxt['C_0'][i])
+            prod_GT.add(prod_G, key['K_0'][i])
+
+        return ctxt['Cp'] * prod_GT.evaluate()
@@ -14,9 +14,9 @@ John Bethencourt, Amit Sahai, Brent Waters
 :Date:            05/2016
 '''
 
-from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair, PairingProduct
 from charm.toolbox.ABEnc import ABEnc
-from charm.toolbox.msp import MSP
+from charm.toolbox.msp import MSP, row_sum
 
 debug = False
 
@@ -83,7 +83,7 @@ class BSW07(ABEnc):
             print('Encryption algorithm:\n')
 
         policy = self.util.createPolicy(policy_str)
-        mono_span_prog = self.util.convert_policy_to_msp(policy)
+        mono_span_prog = self.util.convert_policy_to_sparse_msp(policy)
         num_cols = self.util.len_longest_row
 
         # pick randomness
@@ -97,10 +97,7 @@ class BSW07(ABEnc):
 
         C = {}
         for attr, row in mono_span_prog.items():
-            cols = len(row)
-            sum = 0
-            for i in range(cols):
-                sum += row[i] * u[i]
+            sum = row_sum(u, row)
             attr_stripped = self.util.strip_index(attr)
             c_i1 = pk['g2'] ** sum
             c_i2 = self.group.hash(str(attr_stripped), G1) ** sum
@@ -123,13 +120,15 @@ class BSW07(ABEnc):
             print ("Policy not satisfied.")
             return None
 
-        prod = 1
+        # all pairings evaluated as a single multi-pairing
+        prod = PairingProduct(self.group)
 
         for node in nodes:
             attr = node.getAttributeAndIndex()
             attr_stripped = self.util.strip_index(attr)
             (c_attr1, c_attr2) = ctxt['C'][attr]
             (k_attr1, k_attr2) = key['K'][attr_stripped]
-            prod *= (pair(k_attr1, c_attr1) / pair(c_attr2, k_attr2))
+            prod.add(k_attr1, c_attr1).divide(c_attr2, k_attr2)
+        prod.divide(key['k0'], ctxt['c0'])
 
-        return (ctxt['c_m'] * prod) / (pair(key['k0'], ctxt['c0']))
+        return ctxt['c_m'] * prod.evaluate()
@@ -16,7 +16,7 @@ Jie Chen, Romain Gay, and Hoeteck Wee
 
 from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
 from charm.toolbox.ABEnc import ABEnc
-from charm.toolbox.msp import MSP
+from charm.toolbox.msp import MSP, row_product
 
 debug = False
 
@@ -177,7 +177,7 @@ class CGW15CPABE(ABEnc):
             print('Encryption algorithm:\n')
 
         policy = self.util.createPolicy(policy_str)
-        mono_span_prog = self.util.convert_policy_to_msp(policy)
+        mono_span_prog = self.util.convert_policy_to_sparse_msp(policy)
         num_cols = self.util.len_longest_row
 
         # pick randomness
@@ -216,20 +216,17 @@ class CGW15CPABE(ABEnc):
             VAs.append(prod)
 
         # compute the [(V^T As||U^T_2 As||...||U^T_cols As) M^T_i + W^T_i As]_1 terms
+        VUAs = [[VAs[j1]] + [UAs[j2][j1] for j2 in range(1, num_cols)] for j1 in range(self.assump_size + 1)]
         C = {}
         g_WA = pk['g_WA']
         for attr, row in mono_span_prog.items():
             attr_stripped = self.util.strip_index(attr)  # no need, re-use not allowed
             ct = []
             for j1 in range(self.assump_size + 1):
-                cols = len(row)
-                prod1 = VAs[j1] ** row[0]
-                for j2 in range(1, cols):
-                    prod1 *= UAs[j2][j1] ** row[j2]
                 prod2 = 1
                 for j2 in range(self.assump_size):
                     prod2 *= g_WA[int(attr_stripped)][j1][j2] ** s[j2]
-                ct.append(prod1 * prod2)
+                ct.append(row_product(VUAs[j1], row, prod2))
             C[attr] = ct
 
         # compute the e(g, h)^(k^T As) . m term
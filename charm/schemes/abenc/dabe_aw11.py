@@ -12,7 +12,7 @@ Lewko-Waters Decentralized Attribute-Based Encryption
 :Date:           06/2011 
 '''
 
-from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair
+from charm.toolbox.pairinggroup import PairingGroup,ZR,G1,G2,GT,pair,PairingProduct
 from charm.toolbox.secretutil import SecretUtil
 from charm.toolbox.ABEncMultiAuth import ABEncMultiAuth
 
@@ -123,13 +123,14 @@ class Dabe(ABEncMultiAuth):
     
         wshares = dict([(x[0].getAttributeAndIndex(), x[1]) for x in wshares])
         sshares = dict([(x[0].getAttributeAndIndex(), x[1]) for x in sshares])
+        egg = pair(gp['g'],gp['g'])
         for attr, s_share in sshares.items():
             k_attr = util.strip_index(attr)
             w_share = wshares[attr]
             r_x = group.random()
-            C1[attr] = (pair(gp['g'],gp['g']) ** s_share) * (pk[k_attr]['e(gg)^alpha_i'] ** r_x)
+            C1[attr] = group.multiexp([egg, pk[k_attr]['e(gg)^alpha_i']], [s_share, r_x])
             C2[attr] = gp['g'] ** r_x
-            C3[attr] = (pk[k_attr]['g^y_i'] ** r_x) * (gp['g'] ** w_share)
+            C3[attr] = group.multiexp([pk[k_attr]['g^y_i'], gp['g']], [r_x, w_share])
             
         return { 'C0':C0, 'C1':C1, 'C2':C2, 'C3':C3, 'policy':policy_str }
 
@@ -147,12 +148,14 @@ class Dabe(ABEncMultiAuth):
     
         h_gid = gp['H'](sk['gid'])  #find H(GID)
         egg_s = 1
+        # the e(h_gid, C3)/e(k, C2) terms as one multi-pairing, e(C3^c, h_gid) collapse into one pairing
+        prod = PairingProduct(group)
         for i in pruned:
             x = i.getAttributeAndIndex()
             y = i.getAttribute()
-            num = ct['C1'][x] * pair(h_gid, ct['C3'][x])
-            dem = pair(sk[y]['k'], ct['C2'][x])
-            egg_s *= ( (num / dem) ** coeffs[x] )
+            egg_s *= ct['C1'][x] ** coeffs[x]
+            prod.add(ct['C3'][x], h_gid, coeffs[x]).divide(sk[y]['k'], ct['C2'][x], coeffs[x])
+        egg_s *= prod.evaluate()
    
         if(debug): print("e(gg)^s: %s" % egg_s)
 
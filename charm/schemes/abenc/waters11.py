@@ -16,7 +16,7 @@ Brent Waters
 
 from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
 from charm.toolbox.ABEnc import ABEnc
-from charm.toolbox.msp import MSP
+from charm.toolbox.msp import MSP, row_sum
 
 debug = False
 
@@ -82,7 +82,7 @@ class Waters11(ABEnc):
             print('Encryption algorithm:\n')
 
         policy = self.util.createPolicy(policy_str)
-        mono_span_prog = self.util.convert_policy_to_msp(policy)
+        mono_span_prog = self.util.convert_policy_to_sparse_msp(policy)
         num_cols = self.util.len_longest_row
 
         # pick randomness
@@ -97,10 +97,7 @@ class Waters11(ABEnc):
         C = {}
         D = {}
         for attr, row in mono_span_prog.items():
-            cols = len(row)
-            sum = 0
-            for i in range(cols):
-                sum += row[i] * u[i]
+            sum = row_sum(u, row)
             attr_stripped = self.util.strip_index(attr)
             r_attr = self.group.random(ZR)
             c_attr = (pk['g1_a'] ** sum) / (pk['h'][int(attr_stripped)] ** r_attr)
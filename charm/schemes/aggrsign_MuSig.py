@@ -13,7 +13,7 @@ from functools import reduce
 
 from charm.toolbox.eccurve import secp256k1
 from charm.toolbox.ecgroup import ZR, G, ECGroup
-from charm.core.engine.util import objectToBytes
+from charm.core.engine.util import legacyObjectToBytes
 
 
 debug = False
@@ -84,7 +84,8 @@ class MuSig:
 
     @staticmethod
     def dump(obj):
-        return objectToBytes(obj, group)
+        # signatures hash this encoding, keep it stable across serialization formats
+        return legacyObjectToBytes(obj, group)
 
 
 def main():
@@ -13,7 +13,8 @@
 from functools import reduce
 
 from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, pair
-from charm.core.engine.util import objectToBytes
+from charm.core.engine.util import legacyObjectToBytes
+from charm.toolbox.batchverify import verifyBLSBatch
 
 debug = False
 
@@ -41,6 +42,10 @@ class BLSAggregation:
         h = group.hash(M, G1)
         return pair(pk['g'], sig) == pair(h, pk['g^x'])
 
+    def verify_batch(self, items):
+        """verifies a sequence of (pk, sig, message) tuples at once, see BLS01.verify_batch"""
+        return verifyBLSBatch(group, items, self.dump)
+
     def aggregate_sigs_vulnerable(self, signatures):
         """
         This method of aggregation is vulnerable to rogue public key attack
@@ -79,7 +84,8 @@ class BLSAggregation:
 
     @staticmethod
     def dump(obj):
-        return objectToBytes(obj, group)
+        # signatures hash this encoding, keep it stable across serialization formats
+        return legacyObjectToBytes(obj, group)
 
     @staticmethod
     def check_and_return_same_generator_in_public_keys(public_keys):
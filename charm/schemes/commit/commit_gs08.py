@@ -51,8 +51,8 @@ class Commitment_GS08(Commitment):
         (g1, g2, h1, h2) = params
         r1, r2 = group.random(ZR), group.random(ZR)
         
-        c1 = (g1 ** r1) * (h1 ** r2)
-        c2 = msg * (g2 ** r1) * (h2 ** r2)
+        c1 = group.multiexp([g1, h1], [r1, r2])
+        c2 = msg * group.multiexp([g2, h2], [r1, r2])
         
         return ({ 'c1':c1, 'c2':c2 }, { 'r1':r1, 'r2':r2 })
         
@@ -60,10 +60,10 @@ class Commitment_GS08(Commitment):
         # TODO: check that the message is in the same group as the params
         (g1, g2, h1, h2) = params
         
-        if (not (c['c1'] == ((g1 ** d['r1']) * (h1 ** d['r2'])))):
+        if (not (c['c1'] == group.multiexp([g1, h1], [d['r1'], d['r2']]))):
             return False
         
-        if (not ((c['c2'] / msg) == ((g2 ** d['r1']) * (h2 ** d['r2'])))):
+        if (not ((c['c2'] / msg) == group.multiexp([g2, h2], [d['r1'], d['r2']]))):
             return False
         
         return True
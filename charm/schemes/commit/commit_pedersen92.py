@@ -27,5 +27,5 @@ class CM_Ped92(Commitment):
         return (c,d)
 
     def decommit(self, pk, c, d, msg):
-        return c == (pk['g'] ** msg) * (pk['h'] ** d)
+        return c == group.multiexp([pk['g'], pk['h']], [msg, d])
 
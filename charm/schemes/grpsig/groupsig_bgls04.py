@@ -86,8 +86,8 @@ class ShortSig(PKSig):
         R1_ = (gpk['u'] ** s_alpha) * (t1 ** -c)
         R2_ = (gpk['v'] ** s_beta) * (t2 ** -c)
         R3_ = (pair(t3, gpk['g2']) ** s_x) * (pair(gpk['h'],gpk['w']) ** (-s_alpha - s_beta)) * (pair(gpk['h'], gpk['g2']) ** (-s_delta1 - s_delta2)) * ((pair(t3, gpk['w']) / pair(gpk['g1'], gpk['g2'])) ** c)
-        R4_ = (t1 ** s_x) * (gpk['u'] ** -s_delta1)
-        R5_ = (t2 ** s_x) * (gpk['v'] ** -s_delta2)
+        R4_ = group.multiexp([t1, gpk['u']], [s_x, -s_delta1])
+        R5_ = group.multiexp([t2, gpk['v']], [s_x, -s_delta2])
         
         c_prime = group.hash((M, t1, t2, t3, R1_, R2_, R3_, R4_, R5_), ZR)
         
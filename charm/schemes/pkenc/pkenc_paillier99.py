@@ -12,8 +12,10 @@ Pascal Paillier (Public-Key)
 :Authors:    J Ayo Akinyele
 :Date:       4/2011 (updated 2/2016)
 '''
-from charm.toolbox.integergroup import lcm,integer,toInt
+from charm.toolbox.integergroup import lcm,integer,toInt,powPublic
 from charm.toolbox.PKEnc import PKEnc
+from collections import deque
+import threading
 
 debug = False
 """A ciphertext class with homomorphic properties"""
@@ -68,11 +70,71 @@ class Ciphertext(dict):
         value = dict.__str__(self)
         return value # + ", pk =" + str(pk)
     
+class RandomnessPool:
+    """
+    Offline pool of the r^n mod n^2 factors used by Paillier encryption. With
+    background=True a daemon thread tops the pool up whenever it drops below
+    half of its size; when the pool runs dry the factor is computed inline.
+    """
+    def __init__(self, pk, size=1024, background=True):
+        self.n, self.n2, self.size = pk['n'], pk['n2'], size
+        self._values = deque()
+        self._low = threading.Event()
+        self._stop = False
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._refill, daemon=True)
+            self._thread.start()
+            self._low.set()
+        else:
+            self.fill()
+
+    def _compute(self):
+        r = group.random(self.n)
+        return powPublic(r % self.n2, self.n)
+
+    def fill(self):
+        while len(self._values) < self.size and not self._stop:
+            self._values.append(self._compute())
+
+    def _refill(self):
+        while not self._stop:
+            self._low.wait()
+            self._low.clear()
+            self.fill()
+
+    def get(self):
+        if len(self._values) < self.size // 2:
+            self._low.set()
+        try:
+            return self._values.popleft()
+        except IndexError:
+            return self._compute()
+
+    def stop(self):
+        self._stop = True
+        self._low.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __len__(self):
+        return len(self._values)
+
 class Pai99(PKEnc):
+    """
+    >>> from charm.toolbox.integergroup import RSAGroup
+    >>> group = RSAGroup()
+    >>> pai = Pai99(group)
+    >>> (public_key, secret_key) = pai.keygen()
+    >>> cts = pai.encrypt_many(public_key, [1, 2, 3, 4])
+    >>> pai.decrypt(public_key, secret_key, pai.sum_ciphertexts(public_key, cts))
+    10
+    """
     def __init__(self, groupObj):
         PKEnc.__init__(self)
         global group
         group = groupObj
+        self._pool = None
     
     def L(self, u, n):
         # computes L(u) => ((u - 1) / n)
@@ -81,26 +143,88 @@ class Pai99(PKEnc):
             return integer(0, n)
         return U / n
                 
-    def keygen(self, secparam=1024):
+    def keygen(self, secparam=1024, random_g=False):
+        """generates a key pair with g = n + 1, which turns g^m into 1 + m*n, or
+        with a random g when random_g is set. The secret key also holds the
+        factors and the CRT constants used by decrypt."""
         (p, q, n) = group.paramgen(secparam)
         lam = lcm(p - 1, q - 1)
         n2 = n ** 2
-        g = group.random(n2)
+        if random_g:
+            g = group.random(n2)
+        else:
+            g = (n + 1) % n2
         u = (self.L(((g % n2) ** lam), n) % n) ** -1
         pk, sk = {'n':n, 'g':g, 'n2':n2}, {'lamda':lam, 'u':u}
+        # CRT decryption: h_p = L_p(g^(p-1) mod p^2)^-1 mod p, likewise for q
+        p2, q2 = p ** 2, q ** 2
+        sk.update({'p':p, 'q':q, 'p2':p2, 'q2':q2,
+                   'hp':(self.L((g % p2) ** (p - 1), p) % p) ** -1,
+                   'hq':(self.L((g % q2) ** (q - 1), q) % q) ** -1,
+                   'qinv':(q % p) ** -1})
         return (pk, sk)
 
+    def enableRandomnessPool(self, pk, size=1024, background=True):
+        """precomputes size values of r^n mod n^2 for encryptions under pk,
+        refilled by a background thread unless background is False."""
+        self.disableRandomnessPool()
+        self._pool = RandomnessPool(pk, size, background)
+        return self._pool
+
+    def disableRandomnessPool(self):
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+
+    def _randomFactor(self, pk):
+        if self._pool is not None and self._pool.n == pk['n']:
+            return self._pool.get()
+        r = group.random(pk['n'])
+        return powPublic(r % pk['n2'], pk['n'])
+
     def encrypt(self, pk, m):
         g, n, n2 = pk['g'], pk['n'], pk['n2']
-        r = group.random(pk['n'])
-        c = ((g % n2) ** m) * ((r % n2) ** n)
+        if int(g) == int(n) + 1:
+            # (n + 1)^m = 1 + m*n mod n^2
+            gm = (n * (int(m) % int(n)) + 1) % n2
+        else:
+            gm = (g % n2) ** m
+        c = (gm * self._randomFactor(pk)) % n2
         return Ciphertext({'c':c}, pk, 'c')
+
+    def encrypt_many(self, pk, messages):
+        """encrypts every message of an iterable and returns the list of ciphertexts"""
+        return [self.encrypt(pk, m) for m in messages]
+
+    def sum_ciphertexts(self, pk, cts):
+        """homomorphically adds a non-empty iterable of ciphertexts in a single pass,
+        reducing modulo n^2 after every product"""
+        n2 = pk['n2']
+        cts = iter(cts)
+        first = next(cts)
+        acc = dict.__getitem__(first, first.key)
+        for ct in cts:
+            acc = (acc * dict.__getitem__(ct, ct.key)) % n2
+        return Ciphertext({first.key:acc}, pk, first.key)
     
     def decrypt(self, pk, sk, ct):
+        if 'p' in sk:
+            return self._decryptCRT(sk, ct['c'])
         n, n2 = pk['n'], pk['n2']
         m = ((self.L(ct['c'] ** sk['lamda'], n) % n) * sk['u']) % n
         return toInt(m)
 
+    def _decryptHalf(self, c, p, p2, h):
+        # m_p = L_p(c^(p-1) mod p^2) * h_p mod p
+        u = (c % p2) ** (p - 1)
+        return ((int(u) - 1) // int(p) * int(h)) % int(p)
+
+    def _decryptCRT(self, sk, c):
+        p, q = int(sk['p']), int(sk['q'])
+        mp = self._decryptHalf(c, sk['p'], sk['p2'], sk['hp'])
+        mq = self._decryptHalf(c, sk['q'], sk['q2'], sk['hq'])
+        return mq + q * (((mp - mq) * int(sk['qinv'])) % p)
+
     def encode(self, modulus, message):
         # takes a string and represents as a bytes object
         elem = integer(message)
@@ -10,7 +10,7 @@
 :Date:            07/2011
 '''
 
-from charm.core.math.integer import integer,isPrime,gcd,random,randomPrime,toInt
+from charm.core.math.integer import integer,isPrime,gcd,random,randomPrime,toInt,powPublic
 from charm.toolbox.PKEnc import PKEnc
 from charm.toolbox.PKSig import PKSig
 from charm.toolbox.paddingschemes import OAEPEncryptionPadding,PSSPadding
@@ -77,7 +77,7 @@ class RSA_Enc(RSA,PKEnc):
         if debug: print("EM == >", EM)
         i = Conversion.OS2IP(EM)
         ip = integer(i) % pk['N']  #Convert to modular integer
-        return (ip ** pk['e']) % pk['N']
+        return powPublic(ip, pk['e']) % pk['N']
     
     def decrypt(self, pk, sk, c):
         octetlen = int(ceil(int(pk['N']).bit_length() / 8.0))
@@ -132,7 +132,7 @@ class RSA_Sig(RSA, PKSig):
             return False
         s = Conversion.OS2IP(S)
         s = integer(s) % pk['N']  #Convert to modular integer
-        m = (s ** pk['e']) % pk['N']
+        m = powPublic(s, pk['e']) % pk['N']
         EM = Conversion.IP2OS(m, emLen)
         if debug:
             print("Verifying")
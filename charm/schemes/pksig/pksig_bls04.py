@@ -13,8 +13,9 @@
 :Date:       1/2011
  '''
 from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, pair
-from charm.core.engine.util import objectToBytes
+from charm.core.engine.util import legacyObjectToBytes
 from charm.toolbox.IBSig import *
+from charm.toolbox.batchverify import verifyBLSBatch
 
 
 debug = False
@@ -30,6 +31,8 @@ class BLS01(IBSig):
     >>> signature = ib.sign(secret_key['x'], messages)
     >>> ib.verify(public_key, signature, messages) 
     True
+    >>> ib.verify_batch([(public_key, signature, messages), (public_key, signature, 'other')])
+    [True, False]
     """
     def __init__(self, groupObj):
         IBSig.__init__(self)
@@ -37,7 +40,8 @@ class BLS01(IBSig):
         group = groupObj
         
     def dump(self, obj):
-        return objectToBytes(obj, group)
+        # signatures hash this encoding, keep it stable across serialization formats
+        return legacyObjectToBytes(obj, group)
             
     def keygen(self, secparam=None):
         g, x = group.random(G2), group.random()
@@ -58,6 +62,12 @@ class BLS01(IBSig):
             return True  
         return False 
 
+    def verify_batch(self, items):
+        """verifies a sequence of (pk, sig, message) tuples with one multi-pairing
+        and returns one boolean per tuple, bisecting the batch to locate
+        invalid signatures."""
+        return verifyBLSBatch(group, items, self.dump)
+
 
 def main():
     groupObj = PairingGroup('MNT224')
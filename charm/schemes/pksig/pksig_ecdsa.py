@@ -26,6 +26,8 @@ class ECDSA(PKSig):
     >>> signature = ecdsa.sign(public_key, secret_key, msg)
     >>> ecdsa.verify(public_key, signature, msg)
     True
+    >>> ecdsa.verify_batch([(public_key, signature, msg), (public_key, signature, "forged")])
+    [True, False]
     """
     def __init__(self, groupObj):
         PKSig.__init__(self)
@@ -62,3 +64,26 @@ class ECDSA(PKSig):
         else:
             return False
 
+    def verify_batch(self, items):
+        """verifies a sequence of (pk, sig, message) tuples and returns one boolean
+        per tuple. An ECDSA signature only carries the x-coordinate of its
+        commitment, so the equations cannot be combined; instead all s values
+        are inverted with a single field inversion and every check is one
+        two-term multi-scalar multiplication."""
+        items = list(items)
+        results = [sig['s'] != 0 for (pk, sig, M) in items]
+        valid = [i for i in range(len(items)) if results[i]]
+        if not valid:
+            return results
+        # Montgomery's trick: s_i^-1 = (s_0 ... s_i-1) * (s_0 ... s_i)^-1 * (s_i+1 ... s_n)
+        prefix = [items[valid[0]][1]['s']]
+        for i in valid[1:]:
+            prefix.append(prefix[-1] * items[i][1]['s'])
+        inv = prefix[-1] ** -1
+        for j in range(len(valid) - 1, -1, -1):
+            (pk, sig, M) = items[valid[j]]
+            w = inv * prefix[j - 1] if j > 0 else inv
+            inv = inv * sig['s']
+            v = group.multiexp([pk['g'], pk['y']], [group.hash(M) * w, sig['r'] * w])
+            results[valid[j]] = group.zr(v) == sig['r']
+        return results
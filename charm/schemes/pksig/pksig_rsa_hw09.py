@@ -15,7 +15,7 @@ Hohenberger-Waters Stateful Signatures (RSA-based)
 :Status:    Needs Improvement.
 """
 
-from charm.core.math.integer import integer,random,randomBits,isPrime,gcd,bitsize,serialize
+from charm.core.math.integer import integer,random,randomBits,isPrime,gcd,bitsize,serialize,powPublic
 from charm.toolbox.PKSig import PKSig
 from charm.schemes.chamhash_rsa_hw09 import ChamHash_HW09
 from charm.toolbox.conversion import Conversion
@@ -175,13 +175,13 @@ class Sig_RSA_Stateless_HW09(PKSig):
         
         # Compute Y = sigma1^{2*ceil(log2(s))}
         s1 = integer(2 ** (math.ceil(log[2](s))))
-        Y = (sigma1 ** s1) % N
+        Y = powPublic(sigma1, s1) % N
         
         # Hash the mesage using the chameleon hash with fixed randomness r
         (x, r2) = self.ChameleonHash.hash(L, message, r)
 
-        lhs = (Y ** ei) % N
-        rhs = ((u ** x) * h) % N
+        lhs = powPublic(Y, ei) % N
+        rhs = (powPublic(u, x) * h) % N
         if debug:
             print("lhs =>", lhs)
             print("rhs =>", rhs)
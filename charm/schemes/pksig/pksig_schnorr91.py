@@ -1,5 +1,6 @@
-from charm.toolbox.integergroup import IntegerGroupQ
+from charm.toolbox.integergroup import IntegerGroupQ, integer, powPublic
 from charm.toolbox.PKSig import PKSig
+from charm.toolbox.batchverify import smallExponents, findInvalid
 
 debug = False
 class SchnorrSig(PKSig):
@@ -14,6 +15,8 @@ class SchnorrSig(PKSig):
     >>> signature = pksig.sign(public_key, secret_key, msg)
     >>> pksig.verify(public_key, signature, msg)
     True
+    >>> pksig.verify_batch([(public_key, signature, msg), (public_key, signature, "forged")])
+    [True, False]
     """
     def __init__(self):
         PKSig.__init__(self)
@@ -39,11 +42,11 @@ class SchnorrSig(PKSig):
         e = group.hash(M, r)
         s = (k - x*e) % q
 
-        return {'e':e, 's':s }
+        return {'e':e, 's':s, 'r':r }
     
     def verify(self, pk, sig, M):
         p = group.p
-        r = ((pk['g'] ** sig['s']) * (pk['y'] ** sig['e'])) % p
+        r = (powPublic(pk['g'], sig['s']) * powPublic(pk['y'], sig['e'])) % p
         if debug: print("Verifying...")
         e = group.hash(M, r)
         if debug: print("e => %s" % e)
@@ -53,4 +56,46 @@ class SchnorrSig(PKSig):
         else:
             return False
         return None
+
+    def verify_batch(self, items):
+        """verifies a sequence of (pk, sig, message) tuples and returns one boolean
+        per tuple. Signatures carrying their commitment r are checked against
+        e = H(M, r) and then combined into
+
+            prod_g g^(sum 2 d_i s_i) * prod_y y^(sum 2 d_i e_i) == prod_i r_i^(2 d_i)
+
+        which costs one full exponentiation per distinct g and y plus one short
+        exponentiation per signature. The doubled exponents clear the order-2
+        component of Z_p^*, so r_i is only checked up to sign; as r_i is bound
+        by the hash, flipping it still requires the secret key. Signatures
+        without r fall back to verify()."""
+        items = list(items)
+        p, q = group.p, int(group.q)
+        results = [True] * len(items)
+        batch = []
+        for i, (pk, sig, M) in enumerate(items):
+            if 'r' not in sig:
+                results[i] = self.verify(pk, sig, M)
+            elif group.hash(M, sig['r']) != sig['e']:
+                results[i] = False
+            else:
+                batch.append(i)
+        deltas = dict(zip(batch, [2 * d for d in smallExponents(len(batch))]))
+
+        def check(subset):
+            exps, rhs = {}, integer(1, p)
+            for i in subset:
+                (pk, sig, M) = items[i]
+                for (base, x) in ((pk['g'], sig['s']), (pk['y'], sig['e'])):
+                    entry = exps.setdefault(int(base), [base, 0])
+                    entry[1] = (entry[1] + deltas[i] * int(x)) % q
+                rhs = (rhs * powPublic(sig['r'], deltas[i])) % p
+            lhs = integer(1, p)
+            for (base, x) in exps.values():
+                lhs = (lhs * powPublic(base, x)) % p
+            return int(lhs) == int(rhs)
+
+        for i in findInvalid(check, batch):
+            results[i] = False
+        return results
     
@@ -1,3 +1,5 @@
+import functools
+import io
 import unittest
 
 from charm.adapters.abenc_adapt_hybrid import HybridABEnc as HybridABEnc
@@ -7,6 +9,17 @@ from charm.toolbox.pairinggroup import PairingGroup
 debug = False
 
 
+class LabeledBSW07(CPabe_BSW07):
+    # a scheme with a constructor argument besides the group
+    def __init__(self, groupObj, label, verbose=False):
+        CPabe_BSW07.__init__(self, groupObj)
+        self.label = label
+
+class UnlabeledBSW07(CPabe_BSW07):
+    def __init__(self, groupObj, label):
+        CPabe_BSW07.__init__(self, groupObj)
+
+
 class HybridABEncTest(unittest.TestCase):
     def testHybridABEnc(self):
         groupObj = PairingGroup('SS512')
@@ -24,6 +37,54 @@ class HybridABEncTest(unittest.TestCase):
         assert mdec == message, "Failed Decryption!!!"
         if debug: print("Successful Decryption!!!")
 
+    def testStream(self):
+        groupObj = PairingGroup('SS512')
+        hyb_abe = HybridABEnc(CPabe_BSW07(groupObj), groupObj)
+        (pk, mk) = hyb_abe.setup()
+        sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO', 'THREE'])
+        message = b"streamed message " * 1000
+        c1, stream = hyb_abe.encrypt_stream(pk, io.BytesIO(message), '(one and two)', chunk_size=1024)
+        encrypted = b''.join(stream)
+        assert b''.join(hyb_abe.decrypt_stream(pk, sk, c1, io.BytesIO(encrypted))) == message, "Failed stream decryption!!!"
+
+    def testEnvelope(self):
+        groupObj = PairingGroup('SS512')
+        hyb_abe = HybridABEnc(CPabe_BSW07(groupObj), groupObj)
+        (pk, mk) = hyb_abe.setup()
+        sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO', 'THREE'])
+        (key, c1) = hyb_abe.encapsulate(pk, '(one and two)')
+        assert len(key) == 32 and hyb_abe.decapsulate(pk, sk, c1) == key
+        data = hyb_abe.encrypt_envelope(pk, b"small message", '(one and two)')
+        assert type(data) == bytes
+        assert hyb_abe.decrypt_envelope(pk, sk, data) == b"small message", "Failed envelope decryption!!!"
+        tampered = data[:-1] + bytes([data[-1] ^ 1])
+        self.assertRaises(ValueError, hyb_abe.decrypt_envelope, pk, sk, tampered)
+
+    def testDecryptMany(self):
+        groupObj = PairingGroup('SS512')
+        hyb_abe = HybridABEnc(CPabe_BSW07(groupObj), groupObj)
+        (pk, mk) = hyb_abe.setup()
+        sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO', 'THREE'])
+        policies = ['((four or three) and (two or one))', '(one and two)', 'three']
+        messages = [b"message %d" % i for i in range(20)]
+        cts = (hyb_abe.encrypt(pk, m, policies[i % len(policies)]) for i, m in enumerate(messages))
+        result = list(hyb_abe.decrypt_many(pk, sk, cts, workers=2, chunksize=3))
+        assert result == messages, "Failed batch decryption!!!"
+
+    def testDecryptManySchemeArguments(self):
+        groupObj = PairingGroup('SS512')
+        hyb_abe = HybridABEnc(LabeledBSW07(groupObj, 'label'), groupObj)
+        (pk, mk) = hyb_abe.setup()
+        sk = hyb_abe.keygen(pk, mk, ['ONE', 'TWO'])
+        cts = [hyb_abe.encrypt(pk, b"message %d" % i, '(one and two)') for i in range(4)]
+        assert list(hyb_abe.decrypt_many(pk, sk, cts, workers=2, chunksize=1)) == [b"message %d" % i for i in range(4)]
+        # the label is not kept, workers can only rebuild the scheme through a factory
+        hyb_abe = HybridABEnc(UnlabeledBSW07(groupObj, 'label'), groupObj)
+        self.assertRaises(ValueError, hyb_abe.decrypt_many, pk, sk, cts, workers=2)
+        self.assertRaises(ValueError, hyb_abe.decrypt_many, pk, sk, cts, workers=2, scheme_factory=lambda group: None)
+        factory = functools.partial(UnlabeledBSW07, label='label')
+        assert list(hyb_abe.decrypt_many(pk, sk, cts, workers=2, scheme_factory=factory)) == [b"message %d" % i for i in range(4)]
+
 
 if __name__ == "__main__":
     unittest.main()
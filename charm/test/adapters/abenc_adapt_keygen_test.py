@@ -0,0 +1,73 @@
+import functools
+import unittest
+
+from charm.adapters.abenc_adapt_keygen import KeygenExecutor
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.schemes.abenc.dabe_aw11 import Dabe
+from charm.schemes.abenc.abenc_maabe_rw15 import MaabeRW15
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.test.adapters.abenc_adapt_hybrid_test import UnlabeledBSW07
+
+debug = False
+
+
+class KeygenExecutorTest(unittest.TestCase):
+    def testBSW07(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = CPabe_BSW07(groupObj)
+        (pk, mk) = cpabe.setup()
+        users = [['ONE', 'TWO', 'THREE'], ['FOUR'], ['ONE', 'FOUR'], []] * 3
+        m = groupObj.random(GT)
+        ct = cpabe.encrypt(pk, m, '((four or three) and (two or one))')
+        for workers in (1, 2):
+            with KeygenExecutor(cpabe, groupObj, (pk, mk), workers=workers, chunksize=2) as executor:
+                keys = list(executor.keygen_many(users))
+            assert executor.stats['keys'] == len(users) and executor.stats['attributes'] == 18
+            if debug: print("%d workers: %.1f keys/s" % (workers, executor.stats['keys_per_second']))
+            for (S, sk) in zip(users, keys):
+                assert sk['S'] == S and sorted(sk['Dj']) == sorted(S) == sorted(sk['Djp'])
+            assert cpabe.decrypt(pk, keys[0], ct) == m, "Failed Decryption!!!"
+            assert cpabe.decrypt(pk, keys[2], ct) == m and cpabe.decrypt(pk, keys[1], ct) == False
+
+    def testDabe(self):
+        groupObj = PairingGroup('SS512')
+        dabe = Dabe(groupObj)
+        GP = dabe.setup()
+        (SK, PK) = dabe.authsetup(GP, ['ONE', 'TWO', 'THREE', 'FOUR'])
+        m = groupObj.random(GT)
+        CT = dabe.encrypt(GP, PK, m, '((one or three) and (TWO or FOUR))')
+        users = [("bob", ['THREE', 'ONE', 'TWO']), ("alice", ['FOUR', 'ONE'])]
+        with KeygenExecutor(dabe, groupObj, (GP, SK), workers=2, chunksize=1) as executor:
+            keys = list(executor.keygen_many(users))
+        assert keys[0]['gid'] == "bob" and sorted(keys[1]) == ['FOUR', 'ONE', 'gid']
+        for K in keys:
+            assert dabe.decrypt(GP, K, CT) == m, "Failed Decryption!!!"
+
+    def testRW15(self):
+        groupObj = PairingGroup('SS512')
+        maabe = MaabeRW15(groupObj)
+        gp = maabe.setup()
+        (pk, sk) = maabe.authsetup(gp, 'UT')
+        m = groupObj.random(GT)
+        ct = maabe.encrypt(gp, {'UT': pk}, m, 'STUDENT@UT and PHD@UT')
+        with KeygenExecutor(maabe, groupObj, (gp, sk), workers=2) as executor:
+            (keys,) = executor.keygen_many([("bob", ['STUDENT@UT', 'PHD@UT'])])
+        assert maabe.decrypt(gp, {'GID': "bob", 'keys': keys}, ct) == m, "Failed Decryption!!!"
+
+    def testUnsupportedScheme(self):
+        self.assertRaises(ValueError, KeygenExecutor, object(), PairingGroup('SS512'), ())
+
+    def testSchemeArguments(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = UnlabeledBSW07(groupObj, 'label')
+        (pk, mk) = cpabe.setup()
+        self.assertRaises(ValueError, KeygenExecutor, cpabe, groupObj, (pk, mk), workers=2)
+        factory = functools.partial(UnlabeledBSW07, label='label')
+        with KeygenExecutor(cpabe, groupObj, (pk, mk), workers=2, scheme_factory=factory) as executor:
+            (sk,) = executor.keygen_many([['ONE', 'TWO']])
+        m = groupObj.random(GT)
+        assert cpabe.decrypt(pk, sk, cpabe.encrypt(pk, m, 'one and two')) == m, "Failed Decryption!!!"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,4 +33,7 @@ class HybridIBEncTest(unittest.TestCase):
         decrypted_msg = hyb_ibe.decrypt(pk, sk, ct)
         if debug: print("Result =>", decrypted_msg)
         assert decrypted_msg == msg
+
+        data = hyb_ibe.encrypt_envelope(pk, kID, msg)
+        assert hyb_ibe.decrypt_envelope(pk, sk, data) == msg
         del groupObj
@@ -0,0 +1,47 @@
+'''
+Decryption time of CPabe_BSW07 versus policy size, comparing the multi-pairing
+decrypt path (PairingProduct) with the previous one-pairing-per-term loop.
+
+Run with: python -m charm.test.benchmark.abenc_decrypt_benchmark
+'''
+import time
+from charm.toolbox.pairinggroup import PairingGroup, GT, pair
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.toolbox.secretutil import SecretUtil
+
+def decrypt_per_pairing(group, sk, ct):
+    """the original BSW07 decryption: two pairings and a GT exponentiation per attribute"""
+    util = SecretUtil(group, verbose=False)
+    policy = util.createPolicy(ct['policy'])
+    pruned_list = util.prune(policy, sk['S'])
+    z = util.getCoefficients(policy)
+    A = 1
+    for i in pruned_list:
+        j = i.getAttributeAndIndex(); k = i.getAttribute()
+        A *= ( pair(ct['Cy'][j], sk['Dj'][k]) / pair(sk['Djp'][k], ct['Cyp'][j]) ) ** z[j]
+    return ct['C_tilde'] / (pair(ct['C'], sk['D']) / A)
+
+def time_call(func, trials):
+    start = time.time()
+    for i in range(trials):
+        result = func()
+    return (time.time() - start) / trials, result
+
+def main(curve='SS512', trials=10):
+    group = PairingGroup(curve)
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    print("%10s %14s %14s %8s" % ("attributes", "per-pair(ms)", "multi(ms)", "speedup"))
+    for n in [2, 4, 8, 16, 32, 64]:
+        attrs = ['ATTR%d' % i for i in range(n)]
+        policy = ' and '.join(attrs)
+        sk = cpabe.keygen(pk, mk, attrs)
+        msg = group.random(GT)
+        ct = cpabe.encrypt(pk, msg, policy)
+        old, m1 = time_call(lambda: decrypt_per_pairing(group, sk, ct), trials)
+        new, m2 = time_call(lambda: cpabe.decrypt(pk, sk, ct), trials)
+        assert m1 == msg and m2 == msg, "decryption failed"
+        print("%10d %14.2f %14.2f %7.1fx" % (n, old * 1e3, new * 1e3, old / new))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+'''
+AC17CPABE (FAME) encryption time across policy sizes: the first encryption of
+a policy, which fills the AC17HashStore, against steady-state encryptions that
+take every hash-to-G1 point from the store.
+
+Run with: python -m charm.test.benchmark.ac17_hash_store_benchmark [curve] [trials]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.ac17 import AC17CPABE
+
+def main(curve='SS512', trials=10):
+    trials = int(trials)
+    group = PairingGroup(curve)
+    print("%12s %14s %14s %8s" % ("attributes", "first(ms)", "steady(ms)", "speedup"))
+    for size in [2, 4, 8, 16, 32]:
+        cpabe = AC17CPABE(group, 2)
+        (pk, msk) = cpabe.setup()
+        # a balanced policy of ands and ors has about size/2 MSP columns
+        attrs = ['ATTR%d' % i for i in range(size)]
+        policy = ' and '.join('(%s or %s)' % pair for pair in zip(attrs[::2], attrs[1::2]))
+        msg = group.random(GT)
+        start = time.time()
+        cpabe.encrypt(pk, msg, policy)
+        first = time.time() - start
+        start = time.time()
+        for i in range(trials):
+            cpabe.encrypt(pk, msg, policy)
+        steady = (time.time() - start) / trials
+        print("%12d %14.2f %14.2f %7.1fx" % (size, first * 1e3, steady * 1e3, first / steady))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
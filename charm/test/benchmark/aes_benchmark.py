@@ -0,0 +1,40 @@
+'''
+AES throughput in GB/s: the raw modes through selectPRP, and the CBC+HMAC
+(version 1) against the AES-GCM (version 2) streams of
+SymmetricCryptoAbstraction.encrypt_stream. AES.hardware reports whether the
+AES-NI code path is in use.
+
+Run with: python -m charm.test.benchmark.aes_benchmark [megabytes] [trials]
+'''
+import sys, os, time
+from charm.core.crypto import AES as AESModule
+from charm.core.crypto.cryptobase import AES, MODE_ECB, MODE_CBC, MODE_GCM, selectPRP
+from charm.toolbox.symcrypto import SymmetricCryptoAbstraction
+from charm.toolbox.securerandom import OpenSSLRand
+
+def throughput(f, size, trials):
+    f()
+    start = time.time()
+    for i in range(trials):
+        f()
+    return size * trials / (time.time() - start) / 1e9
+
+def main(megabytes=64, trials=5):
+    size, trials = int(megabytes) << 20, int(trials)
+    data = os.urandom(size)
+    key = OpenSSLRand().getRandomBytes(16)
+    print("AES-NI: %s" % ("yes" if AESModule.hardware else "no"))
+    print("%24s %8s" % ("", "GB/s"))
+    modes = [("ECB", lambda: selectPRP(AES, (key, MODE_ECB))),
+             ("CBC", lambda: selectPRP(AES, (key, MODE_CBC, bytes(16)))),
+             ("GCM", lambda: selectPRP(AES, (key, MODE_GCM, bytes(12))))]
+    for (name, cipher) in modes:
+        print("%24s %8.3f" % ("%s encrypt" % name, throughput(lambda: cipher().encrypt(data), size, trials)))
+    for (name, mode) in [("CBC+HMAC", MODE_CBC), ("GCM", MODE_GCM)]:
+        s = SymmetricCryptoAbstraction(key, mode=mode)
+        stream = b''.join(s.encrypt_stream([data]))
+        print("%24s %8.3f" % ("%s stream encrypt" % name, throughput(lambda: b''.join(s.encrypt_stream([data])), size, trials)))
+        print("%24s %8.3f" % ("%s stream decrypt" % name, throughput(lambda: b''.join(s.decrypt_stream([stream])), size, trials)))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
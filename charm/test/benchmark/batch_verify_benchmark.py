@@ -0,0 +1,49 @@
+'''
+Time of verify_batch against a loop of verify calls for BLS, ECDSA and Schnorr
+signatures, for batches of 16, 128 and 1024 signatures under 4 keys.
+
+Run with: python -m charm.test.benchmark.batch_verify_benchmark [curve]
+'''
+import sys, time
+from charm.schemes.pksig.pksig_bls04 import BLS01
+from charm.schemes.pksig.pksig_ecdsa import ECDSA
+from charm.schemes.pksig.pksig_schnorr91 import SchnorrSig
+from charm.toolbox.pairinggroup import PairingGroup
+from charm.toolbox.ecgroup import ECGroup
+from charm.toolbox.eccurve import prime192v1
+
+sizes = [16, 128, 1024]
+
+def makeItems(keys, sign, count):
+    items = []
+    for i in range(count):
+        (pk, sk) = keys[i % len(keys)]
+        m = "log record %d" % i
+        items.append((pk, sign(pk, sk, m), m))
+    return items
+
+def measure(name, scheme, items):
+    start = time.time()
+    single = [scheme.verify(pk, sig, m) for (pk, sig, m) in items]
+    loop = time.time() - start
+    start = time.time()
+    batch = scheme.verify_batch(items)
+    batched = time.time() - start
+    assert single == batch, "verify_batch mismatch in %s" % name
+    print("%8s %6d %12.2f %12.2f %7.1fx" % (name, len(items), loop * 1e3, batched * 1e3, loop / batched))
+
+def main(curve='MNT224'):
+    bls = BLS01(PairingGroup(curve))
+    ecdsa = ECDSA(ECGroup(prime192v1))
+    schnorr = SchnorrSig()
+    schnorr.params(bits=1024)
+    schemes = [('BLS', bls, [bls.keygen() for i in range(4)], lambda pk, sk, m: bls.sign(sk['x'], m)),
+               ('ECDSA', ecdsa, [ecdsa.keygen(0) for i in range(4)], ecdsa.sign),
+               ('Schnorr', schnorr, [schnorr.keygen() for i in range(4)], schnorr.sign)]
+    print("%8s %6s %12s %12s %8s" % ("scheme", "sigs", "loop(ms)", "batch(ms)", "speedup"))
+    for (name, scheme, keys, sign) in schemes:
+        for n in sizes:
+            measure(name, scheme, makeItems(keys, sign, n))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,32 @@
+'''
+Per-element Python loops against ElementVector operations for the attribute
+loops of ABE schemes: g ** r_j, H_j ** r_j * g_r, multiexp and serialization,
+for 10, 100 and 1000 attributes.
+
+Run with: python -m charm.test.benchmark.element_vector_benchmark [curve]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2
+
+def timed(func):
+    start = time.time()
+    func()
+    return (time.time() - start) * 1e3
+
+def main(curve='SS512'):
+    group = PairingGroup(curve)
+    g, g_r = group.random(G1), group.random(G2)
+    print("%6s %-16s %12s %12s" % ("attrs", "operation", "loop(ms)", "vector(ms)"))
+    for n in [10, 100, 1000]:
+        rs = [group.random(ZR) for i in range(n)]
+        hs = [group.random(G2) for i in range(n)]
+        R, H = group.vector(rs), group.vector(hs)
+        rows = [("g ** r_j", lambda: [g ** r for r in rs], lambda: g ** R),
+                ("H_j ** r_j * g_r", lambda: [g_r * (h ** r) for (h, r) in zip(hs, rs)], lambda: (H ** R) * g_r),
+                ("multiexp", lambda: group.multiexp(hs, rs), lambda: H.multiexp(R)),
+                ("serialize", lambda: [group.serialize(h, compression=False) for h in hs], lambda: H.serialize())]
+        for (name, loop, vector) in rows:
+            print("%6d %-16s %12.2f %12.2f" % (n, name, timed(loop), timed(vector)))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,33 @@
+'''
+Exponentiation time of fresh versus precomputed (PairingGroup.precompute) bases
+in G1, G2 and GT, and the estimated memory used by the tables.
+
+Run with: python -m charm.test.benchmark.fixed_base_benchmark [curve]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+
+def time_exp(base, exponents):
+    start = time.time()
+    for e in exponents:
+        base ** e
+    return (time.time() - start) / len(exponents)
+
+def main(curve='SS512', trials=200):
+    group = PairingGroup(curve)
+    exponents = [group.random(ZR) for i in range(trials)]
+    bases = {'G1': group.random(G1), 'G2': group.random(G2)}
+    bases['GT'] = pair(bases['G1'], bases['G2'])
+    print("%4s %12s %12s %8s" % ("", "plain(ms)", "fixed(ms)", "speedup"))
+    for name, base in bases.items():
+        plain = time_exp(group.deserialize(group.serialize(base)), exponents)
+        if not group.precompute(base):
+            print("%4s %12.3f %12s" % (name, plain * 1e3, "n/a"))
+            continue
+        fixed = time_exp(base, exponents)
+        print("%4s %12.3f %12.3f %7.1fx" % (name, plain * 1e3, fixed * 1e3, plain / fixed))
+    info = group.precomputeInfo()
+    print("%d fixed bases, ~%.1f KiB of tables" % (info['bases'], info['bytes'] / 1024.0))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,35 @@
+'''
+CPabe_BSW07 keygen and encrypt time with and without PairingGroup.enableHashCache.
+
+Run with: python -m charm.test.benchmark.hash_cache_benchmark [curve]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+
+def run(group, attrs, policy, trials):
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    msg = group.random(GT)
+    start = time.time()
+    for i in range(trials):
+        cpabe.keygen(pk, mk, attrs)
+    keygen = (time.time() - start) / trials
+    start = time.time()
+    for i in range(trials):
+        cpabe.encrypt(pk, msg, policy)
+    return keygen, (time.time() - start) / trials
+
+def main(curve='SS512', trials=20):
+    attrs = ['ATTR%d' % i for i in range(16)]
+    policy = ' and '.join(attrs)
+    print("%24s %12s %12s" % ("", "keygen(ms)", "encrypt(ms)"))
+    for label, options in [("no cache", None), ("cache", {}), ("cache + precompute", {'precompute': True})]:
+        group = PairingGroup(curve)
+        if options is not None:
+            group.enableHashCache(**options)
+        keygen, encrypt = run(group, attrs, policy, trials)
+        print("%24s %12.2f %12.2f" % (label, keygen * 1e3, encrypt * 1e3))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
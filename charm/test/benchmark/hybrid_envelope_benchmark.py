@@ -0,0 +1,40 @@
+'''
+Hybrid ABE encryption of small messages: encrypt/decrypt (hex key, JSON
+ciphertext) against the KEM-based encrypt_envelope/decrypt_envelope, and the
+share of the time spent in the ABE scheme itself.
+
+Run with: python -m charm.test.benchmark.hybrid_envelope_benchmark [curve] [trials]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.adapters.abenc_adapt_hybrid import HybridABEnc
+
+def timed(f, trials):
+    start = time.time()
+    for i in range(trials):
+        result = f()
+    return result, (time.time() - start) / trials
+
+def main(curve='SS512', trials=50):
+    trials = int(trials)
+    group = PairingGroup(curve)
+    scheme = CPabe_BSW07(group)
+    hybrid = HybridABEnc(scheme, group)
+    (pk, mk) = hybrid.setup()
+    sk = hybrid.keygen(pk, mk, ['ONE', 'TWO', 'THREE'])
+    policy, msg = '((one or two) and three)', b'small message'
+    key = group.random(GT)
+    c1, abe_enc = timed(lambda: scheme.encrypt(pk, key, policy), trials)
+    _, abe_dec = timed(lambda: scheme.decrypt(pk, sk, c1), trials)
+    ct, enc = timed(lambda: hybrid.encrypt(pk, msg, policy), trials)
+    _, dec = timed(lambda: hybrid.decrypt(pk, sk, ct), trials)
+    data, env_enc = timed(lambda: hybrid.encrypt_envelope(pk, msg, policy), trials)
+    _, env_dec = timed(lambda: hybrid.decrypt_envelope(pk, sk, data), trials)
+    print("%20s %12s %12s" % ("", "encrypt(ms)", "decrypt(ms)"))
+    for (label, e, d) in [("ABE only", abe_enc, abe_dec), ("encrypt/decrypt", enc, dec), ("envelope", env_enc, env_dec)]:
+        print("%20s %12.3f %12.3f" % (label, e * 1e3, d * 1e3))
+    print("ciphertext size: %d bytes (JSON dict %d bytes of c2 alone)" % (len(data), len(ct['c2']['msg']) + len(ct['c2']['digest'])))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,32 @@
+'''
+Modular exponentiation with the constant-time ** operator, the public-exponent
+path (powPublic) and fixed-base comb tables (IntegerGroupQ.precompute/exp) for
+1024 and 2048-bit groups.
+
+Run with: python -m charm.test.benchmark.integer_pow_benchmark [trials]
+'''
+import sys, time
+from charm.toolbox.integergroup import IntegerGroupQ, powPublic
+
+def timed(func, exponents):
+    start = time.time()
+    for x in exponents:
+        func(x)
+    return (time.time() - start) / len(exponents) * 1e3
+
+def main(trials=100):
+    trials = int(trials)
+    print("%6s %12s %12s %12s" % ("bits", "secret(ms)", "public(ms)", "comb(ms)"))
+    for bits in [1024, 2048]:
+        group = IntegerGroupQ()
+        group.paramgen(bits)
+        g = group.randomGen()
+        exponents = [group.random() for i in range(trials)]
+        secret = timed(lambda x: g ** x, exponents)
+        public = timed(lambda x: powPublic(g, x), exponents)
+        group.precompute(g)
+        comb = timed(lambda x: group.exp(g, x), exponents)
+        print("%6d %12.3f %12.3f %12.3f" % (bits, secret, public, comb))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,59 @@
+'''
+Key generation throughput of an attribute authority in keys per second: the
+scheme's own keygen in a loop against KeygenExecutor over a process pool.
+
+Run with: python -m charm.test.benchmark.keygen_pool_benchmark [users] [attributes] [workers]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.schemes.abenc.dabe_aw11 import Dabe
+from charm.schemes.abenc.abenc_maabe_rw15 import MaabeRW15
+from charm.adapters.abenc_adapt_keygen import KeygenExecutor
+
+def rate(f, count):
+    start = time.time()
+    f()
+    return count / (time.time() - start)
+
+def report(label, loop, executor, jobs):
+    a = rate(loop, len(jobs))
+    with executor:
+        list(executor.keygen_many(jobs[:executor.workers]))  # start the workers
+        for key in executor.keygen_many(jobs):
+            pass
+    b = executor.stats['keys_per_second']
+    print("%16s %12.1f %12.1f %8.1fx" % (label, a, b, b / a))
+
+def main(users=64, attributes=20, workers=None):
+    (users, attributes) = (int(users), int(attributes))
+    workers = int(workers) if workers else None
+    names = ['ATTR%d' % i for i in range(attributes)]
+    group = PairingGroup('SS512')
+    print("%16s %12s %12s %9s" % ("", "loop(keys/s)", "pool(keys/s)", "speedup"))
+
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    jobs = [names] * users
+    report("CPabe_BSW07", lambda: [cpabe.keygen(pk, mk, S) for S in jobs],
+           KeygenExecutor(cpabe, group, (pk, mk), workers), jobs)
+
+    dabe = Dabe(group)
+    gp = dabe.setup()
+    (sk, _) = dabe.authsetup(gp, names)
+    jobs = [("user%d" % i, names) for i in range(users)]
+    def loop():
+        for (gid, S) in jobs:
+            K = {}
+            for i in S: dabe.keygen(gp, sk, i, gid, K)
+    report("Dabe", loop, KeygenExecutor(dabe, group, (gp, sk), workers), jobs)
+
+    maabe = MaabeRW15(group)
+    gp = maabe.setup()
+    (_, sk) = maabe.authsetup(gp, 'UT')
+    jobs = [("user%d" % i, [a + '@UT' for a in names]) for i in range(users)]
+    report("MaabeRW15", lambda: [maabe.multiple_attributes_keygen(gp, sk, gid, S) for (gid, S) in jobs],
+           KeygenExecutor(maabe, group, (gp, sk), workers), jobs)
+
+if __name__ == "__main__":
+    main(*sys.argv[1:4])
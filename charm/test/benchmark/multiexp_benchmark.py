@@ -0,0 +1,45 @@
+'''
+Time of group.multiexp against a product of separate exponentiations for 2, 8,
+64 and 1024 terms in G1, G2 and GT and on an elliptic curve group.
+
+Run with: python -m charm.test.benchmark.multiexp_benchmark [curve]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+from charm.toolbox.ecgroup import ECGroup, G
+from charm.toolbox.eccurve import prime192v1
+
+sizes = [2, 8, 64, 1024]
+
+def naive(bases, exps):
+    result = bases[0] ** exps[0]
+    for i in range(1, len(bases)):
+        result *= bases[i] ** exps[i]
+    return result
+
+def measure(group, name, bases, exps):
+    start = time.time()
+    expected = naive(bases, exps)
+    plain = time.time() - start
+    start = time.time()
+    result = group.multiexp(bases, exps)
+    multi = time.time() - start
+    assert result == expected, "multiexp mismatch in %s" % name
+    print("%4s %6d %12.2f %12.2f %7.1fx" % (name, len(bases), plain * 1e3, multi * 1e3, plain / multi))
+
+def main(curve='SS512'):
+    group = PairingGroup(curve)
+    print("%4s %6s %12s %12s %8s" % ("", "terms", "naive(ms)", "multi(ms)", "speedup"))
+    for name, _type in [('G1', G1), ('G2', G2), ('GT', GT)]:
+        for n in sizes:
+            if _type == GT:
+                bases = [pair(group.random(G1), group.random(G2)) for i in range(n)]
+            else:
+                bases = [group.random(_type) for i in range(n)]
+            measure(group, name, bases, [group.random(ZR) for i in range(n)])
+    ec = ECGroup(prime192v1)
+    for n in sizes:
+        measure(ec, 'EC', [ec.random(G) for i in range(n)], [ec.random(ZR) for i in range(n)])
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,39 @@
+'''
+Paillier encryption and decryption with and without the g = n + 1 fast path,
+CRT decryption and the precomputed r^n pool, plus batch encrypt/sum.
+
+Run with: python -m charm.test.benchmark.paillier_benchmark [bits]
+'''
+import sys, time
+from charm.schemes.pkenc.pkenc_paillier99 import Pai99
+from charm.toolbox.integergroup import RSAGroup
+
+def timed(func, trials):
+    start = time.time()
+    for i in range(trials):
+        func()
+    return (time.time() - start) / trials * 1e3
+
+def main(bits=1024, trials=50):
+    bits = int(bits)
+    pai = Pai99(RSAGroup())
+    m = 12345678987654321
+    print("%-28s %10s" % ("operation", "ms"))
+    for name, random_g in [('random g', True), ('g = n + 1', False)]:
+        (pk, sk) = pai.keygen(bits, random_g=random_g)
+        print("%-28s %10.3f" % ("encrypt (%s)" % name, timed(lambda: pai.encrypt(pk, m), trials)))
+    c = pai.encrypt(pk, m)
+    lam_sk = {'lamda':sk['lamda'], 'u':sk['u']}
+    print("%-28s %10.3f" % ("decrypt (lambda)", timed(lambda: pai.decrypt(pk, lam_sk, c), trials)))
+    print("%-28s %10.3f" % ("decrypt (CRT)", timed(lambda: pai.decrypt(pk, sk, c), trials)))
+    pai.enableRandomnessPool(pk, size=trials, background=False)
+    print("%-28s %10.3f" % ("encrypt (pooled r^n)", timed(lambda: pai.encrypt(pk, m), trials)))
+    pai.disableRandomnessPool()
+    messages = list(range(trials))
+    start = time.time()
+    cts = pai.encrypt_many(pk, messages)
+    print("%-28s %10.3f" % ("encrypt_many / msg", (time.time() - start) / trials * 1e3))
+    print("%-28s %10.3f" % ("sum_ciphertexts (%d)" % trials, timed(lambda: pai.sum_ciphertexts(pk, cts), 10)))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,28 @@
+'''
+Compares the hand-written PolicyParser with the original pyparsing grammar
+(PyParsingPolicyParser) on policies of increasing size.
+
+Run with: python -m charm.test.benchmark.policy_parser_benchmark
+'''
+import timeit
+from charm.toolbox.policytree import PolicyParser, PyParsingPolicyParser
+
+def make_policy(clauses):
+    """OR of 3-attribute AND clauses, e.g. '(A0 and B0 and C0) or ...'"""
+    return ' or '.join('(A%d and B%d and C%d)' % (i, i, i) for i in range(clauses))
+
+def time_parse(parser_class, policy, trials):
+    # a parser is created per call, as SecretUtil.createPolicy did
+    return timeit.timeit(lambda: parser_class().parse(policy), number=trials) / trials
+
+def main(trials=200):
+    print("%8s %14s %16s %8s" % ("leaves", "pyparsing(us)", "handwritten(us)", "speedup"))
+    for clauses in [1, 4, 16, 64]:
+        policy = make_policy(clauses)
+        assert str(PolicyParser().parse(policy)) == str(PyParsingPolicyParser().parse(policy))
+        old = time_parse(PyParsingPolicyParser, policy, trials)
+        new = time_parse(PolicyParser, policy, trials)
+        print("%8d %14.1f %16.1f %7.1fx" % (3 * clauses, old * 1e6, new * 1e6, old / new))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+'''
+Attributes selected for decryption by the left-to-right PolicyParser.requiredAttributes
+against the minimal set of PolicyParser.prune, with the pairings CPabe_BSW07.decrypt
+does for each (two per attribute), the time taken by the selection itself and the
+decryption time of CPabe_BSW07, which uses prune.
+
+Run with: python -m charm.test.benchmark.policy_prune_benchmark [trials]
+'''
+import sys, time
+from charm.toolbox.policytree import PolicyParser
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+
+# (policy, attributes held by the user)
+policies = [
+    ('(A and B and C) or D', ['A', 'B', 'C', 'D']),
+    ('(DOCTOR and CARDIOLOGY and HOSPITAL1 and ONCALL) or ADMIN', ['DOCTOR', 'CARDIOLOGY', 'HOSPITAL1', 'ONCALL', 'ADMIN']),
+    ('((STAFF and (HR or FINANCE) and LEVEL3) or MANAGER) and (REGION1 or (REGION2 and VPN))',
+     ['STAFF', 'HR', 'FINANCE', 'LEVEL3', 'MANAGER', 'REGION2', 'VPN', 'REGION1']),
+    (' or '.join('(%s)' % ' and '.join('R%dC%d' % (i, j) for j in range(8 - i)) for i in range(8)),
+     ['R%dC%d' % (i, j) for i in range(8) for j in range(8 - i)]),
+]
+
+def timed(f, trials):
+    start = time.time()
+    for i in range(trials):
+        result = f()
+    return result, (time.time() - start) / trials
+
+def main(trials=100):
+    trials = int(trials)
+    parser = PolicyParser()
+    group = PairingGroup('SS512')
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    print("%8s %14s %14s %12s %12s %12s" % ("policy", "first(pair.)", "minimal(pair.)", "first(us)", "minimal(us)", "decrypt(ms)"))
+    for (n, (policy, held)) in enumerate(policies):
+        tree = parser.parse(policy)
+        (first, t1) = timed(lambda: parser.requiredAttributes(tree, held)[1], trials)
+        (minimal, t2) = timed(lambda: parser.prune(tree, held), trials)
+        sk = cpabe.keygen(pk, mk, held)
+        ct = cpabe.encrypt(pk, group.random(GT), policy)
+        (_, t3) = timed(lambda: cpabe.decrypt(pk, sk, ct), max(trials // 10, 1))
+        print("%8d %14d %14d %12.1f %12.1f %12.2f" % (n, 2 * len(first), 2 * len(minimal), t1 * 1e6, t2 * 1e6, t3 * 1e3))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,30 @@
+'''
+Cost of drawing random GT elements, e.g. the session keys of the hybrid
+adapters: exponentiation of a plain GT element (the previous random(GT)),
+random(GT) with the fixed-base table of the cached GT generator, and batched
+random(GT, count=n).
+
+Run with: python -m charm.test.benchmark.random_gt_benchmark [curve] [count]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+
+def perElement(f, count):
+    start = time.time()
+    f()
+    return (time.time() - start) / count
+
+def main(curve='SS512', count=200):
+    count = int(count)
+    group = PairingGroup(curve)
+    plain = pair(group.random(G1), group.random(G2))
+    group.random(GT)  # builds the generator table outside the timed runs
+    rows = [("plain exponentiation", lambda: [plain ** group.random(ZR) for i in range(count)]),
+            ("random(GT)", lambda: [group.random(GT) for i in range(count)]),
+            ("random(GT, count=n)", lambda: group.random(GT, count=count))]
+    print("%24s %12s" % ("", "ms/element"))
+    for (label, f) in rows:
+        print("%24s %12.3f" % (label, perElement(f, count) * 1e3))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
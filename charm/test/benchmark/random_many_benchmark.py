@@ -0,0 +1,46 @@
+'''
+Throughput of random_many() against a Python loop over random() for pairing,
+elliptic curve and integer groups, in elements per second.
+
+Run with: python -m charm.test.benchmark.random_many_benchmark [curve] [count]
+'''
+import sys, time
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2
+from charm.toolbox.ecgroup import ECGroup, G, ZR as EC_ZR
+from charm.toolbox.eccurve import prime192v1
+from charm.toolbox.integergroup import IntegerGroupQ
+
+def rate(f, count, trials=5):
+    start = time.time()
+    for i in range(trials):
+        f()
+    return count * trials / (time.time() - start)
+
+def report(label, loop, bulk, seeded, count):
+    (a, b, c) = (rate(loop, count), rate(bulk, count), rate(seeded, count))
+    print("%16s %14.0f %14.0f %14.0f %8.1fx" % (label, a, b, c, b / a))
+
+def main(curve='SS512', count=1000):
+    count = int(count)
+    print("%16s %14s %14s %14s %9s" % ("", "loop(/s)", "random_many", "seeded", "speedup"))
+    group = PairingGroup(curve)
+    for (name, _type) in [("ZR", ZR), ("G1", G1), ("G2", G2)]:
+        report("%s %s" % (curve, name),
+               lambda: [group.random(_type) for i in range(count)],
+               lambda: group.random_many(_type, count),
+               lambda: group.random_many(_type, count, seed=b'benchmark'), count)
+    ec = ECGroup(prime192v1)
+    for (name, _type) in [("ZR", EC_ZR), ("G", G)]:
+        report("prime192v1 %s" % name,
+               lambda: [ec.random(_type) for i in range(count)],
+               lambda: ec.random_many(_type, count),
+               lambda: ec.random_many(_type, count, seed=b'benchmark'), count)
+    integers = IntegerGroupQ()
+    integers.paramgen(1024)
+    report("integer mod q",
+           lambda: [integers.random() for i in range(count)],
+           lambda: integers.random_many(count=count),
+           lambda: integers.random_many(count=count, seed=b'benchmark'), count)
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
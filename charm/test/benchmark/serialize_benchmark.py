@@ -0,0 +1,39 @@
+'''
+Size and speed of the compact binary objectToBytes format against the older
+JSON+zlib+base64 format on BSW07 ciphertexts with growing policies.
+
+Run with: python -m charm.test.benchmark.serialize_benchmark [curve]
+'''
+import sys, time
+from charm.core.engine.util import objectToBytes, bytesToObject, legacyObjectToBytes, legacyBytesToObject
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.toolbox.pairinggroup import PairingGroup, GT
+
+def measure(encode, decode, obj, group, trials):
+    start = time.time()
+    for i in range(trials):
+        data = encode(obj, group)
+    enc = (time.time() - start) / trials
+    start = time.time()
+    for i in range(trials):
+        decode(data, group)
+    dec = (time.time() - start) / trials
+    return len(data), enc, dec
+
+def main(curve='SS512', trials=50):
+    group = PairingGroup(curve)
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    codecs = [('legacy', legacyObjectToBytes, legacyBytesToObject),
+              ('compact', objectToBytes, bytesToObject),
+              ('uncompressed', lambda o, g: objectToBytes(o, g, compression=False), bytesToObject)]
+    print("%6s %14s %10s %10s %10s" % ("attrs", "format", "bytes", "enc(ms)", "dec(ms)"))
+    for n in [2, 10, 50]:
+        policy = ' and '.join('ATTR%d' % i for i in range(n))
+        ct = cpabe.encrypt(pk, group.random(GT), policy)
+        for name, encode, decode in codecs:
+            size, enc, dec = measure(encode, decode, ct, group, trials)
+            print("%6d %14s %10d %10.3f %10.3f" % (n, name, size, enc * 1e3, dec * 1e3))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,42 @@
+'''
+Throughput of pairings, exponentiations, hashing to G1 and (de)serialization
+from a thread pool of growing size. With the GIL released inside the pairing
+module the speedup should grow close to linearly up to the number of cores.
+
+Run with: python -m charm.test.benchmark.threaded_pairing_benchmark [curve] [ops]
+'''
+import os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, pair
+
+def workloads(group):
+    g, h = group.random(G1), group.random(G2)
+    x = group.random(ZR)
+    data = group.serialize(g)
+    return {
+        'pair': lambda i: pair(g, h),
+        'exp G1': lambda i: g ** x,
+        'hash G1': lambda i: group.hash('attribute %d' % i, G1),
+        'deserialize': lambda i: group.deserialize(data),
+    }
+
+def throughput(func, threads, ops):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.time()
+        list(pool.map(func, range(ops)))
+        return ops / (time.time() - start)
+
+def main(curve='SS512', ops=2000):
+    group = PairingGroup(curve)
+    ops = int(ops)
+    counts = [1, 2, 4, 8, os.cpu_count() or 1]
+    counts = sorted(set(c for c in counts if c <= (os.cpu_count() or 1)))
+    print("%12s" % "" + "".join("%10s" % ("%d thr" % c) for c in counts))
+    for name, func in workloads(group).items():
+        base = throughput(func, 1, ops)
+        row = [base] + [throughput(func, c, ops) for c in counts[1:]]
+        print("%12s" % name + "".join("%9.1fx" % (r / base) for r in row))
+    print("(speedup over one thread, %d operations each)" % ops)
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,40 @@
+'''
+CPabe_BSW07 with a native 'k of (A1, ..., An)' threshold gate against the same
+policy expanded into an or of the ands of all k-subsets: ciphertext leaves,
+serialized ciphertext size and encrypt/decrypt time.
+
+Run with: python -m charm.test.benchmark.threshold_policy_benchmark [trials]
+'''
+import sys, time
+from itertools import combinations
+from charm.toolbox.pairinggroup import PairingGroup, GT
+from charm.schemes.abenc.abenc_bsw07 import CPabe_BSW07
+from charm.core.engine.util import objectToBytes
+
+def timed(f, trials):
+    start = time.time()
+    for i in range(trials):
+        result = f()
+    return result, (time.time() - start) / trials
+
+def main(trials=5):
+    trials = int(trials)
+    group = PairingGroup('SS512')
+    cpabe = CPabe_BSW07(group)
+    (pk, mk) = cpabe.setup()
+    print("%10s %10s %8s %12s %12s %12s" % ("gate", "form", "leaves", "bytes", "encrypt(ms)", "decrypt(ms)"))
+    for (k, n) in [(2, 4), (3, 6), (3, 8), (4, 10)]:
+        attrs = ['DEPT%d' % i for i in range(n)]
+        sk = cpabe.keygen(pk, mk, attrs[-k:])
+        msg = group.random(GT)
+        native = '%d of (%s)' % (k, ', '.join(attrs))
+        expanded = ' or '.join('(%s)' % ' and '.join(c) for c in combinations(attrs, k))
+        for (form, policy) in [("native", native), ("expanded", expanded)]:
+            (ct, t1) = timed(lambda: cpabe.encrypt(pk, msg, policy), trials)
+            (result, t2) = timed(lambda: cpabe.decrypt(pk, sk, ct), trials)
+            assert result == msg
+            print("%10s %10s %8d %12d %12.2f %12.2f" % ("%d of %d" % (k, n), form, len(ct['Cy']),
+                  len(objectToBytes(ct, group)), t1 * 1e3, t2 * 1e3))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
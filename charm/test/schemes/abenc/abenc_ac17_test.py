@@ -0,0 +1,93 @@
+import random
+import unittest
+
+from charm.schemes.abenc.ac17 import AC17CPABE
+from charm.toolbox.pairinggroup import PairingGroup, GT, pair
+from charm.test.schemes.abenc.abenc_maabe_rw15_test import randomPolicy
+
+debug = False
+
+
+def referenceDecrypt(cpabe, pk, ctxt, key):
+    """decryption with 2(k+1) separate pairings"""
+    nodes = cpabe.util.prune(ctxt['policy'], key['attr_list'])
+    prod1_GT, prod2_GT = 1, 1
+    for i in range(cpabe.assump_size + 1):
+        prod_H, prod_G = 1, 1
+        for node in nodes:
+            attr = node.getAttributeAndIndex()
+            prod_H *= key['K'][cpabe.util.strip_index(attr)][i]
+            prod_G *= ctxt['C'][attr][i]
+        prod1_GT *= pair(key['Kp'][i] * prod_H, ctxt['C_0'][i])
+        prod2_GT *= pair(prod_G, key['K_0'][i])
+    return ctxt['Cp'] * prod2_GT / prod1_GT
+
+
+class AC17Test(unittest.TestCase):
+    def testAC17(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = AC17CPABE(groupObj, 2)
+        (pk, msk) = cpabe.setup()
+        attr_list = ['ONE', 'TWO', 'THREE']
+        key = cpabe.keygen(pk, msk, attr_list)
+        for policy in ['((ONE and THREE) and (TWO OR FOUR))', '(ONE or FOUR)', '((FOUR or (TWO and ONE)) and THREE)']:
+            if debug: print('Acces Policy: %s' % policy)
+            m = groupObj.random(GT)
+            ctxt = cpabe.encrypt(pk, m, policy)
+            assert cpabe.decrypt(pk, ctxt, key) == m, 'FAILED Decryption!!!'
+
+    def testRandomPolicies(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = AC17CPABE(groupObj, 3)
+        (pk, msk) = cpabe.setup()
+        universe = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+        rng = random.Random(17)
+        for trial in range(20):
+            key = cpabe.keygen(pk, msk, rng.sample(universe, rng.randrange(1, len(universe) + 1)))
+            policy = randomPolicy(rng.sample(universe, rng.randrange(1, len(universe) + 1)), rng)
+            if debug: print('%s with %s' % (policy, key['attr_list']))
+            m = groupObj.random(GT)
+            ctxt = cpabe.encrypt(pk, m, policy)
+            if not cpabe.util.prune(ctxt['policy'], key['attr_list']):
+                continue
+            result = cpabe.decrypt(pk, ctxt, key)
+            self.assertEqual(result, referenceDecrypt(cpabe, pk, ctxt, key))
+            self.assertEqual(result, m)
+
+    def testHashStore(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = AC17CPABE(groupObj, 2)
+        (pk, msk) = cpabe.setup()
+        key = cpabe.keygen(pk, msk, ['ONE', 'TWO'])
+        policy = '(ONE and (TWO or THREE))'
+        m = groupObj.random(GT)
+        cpabe.encrypt(pk, m, policy)
+        assert cpabe.hashes.info()['columns'] == 2 and cpabe.hashes.info()['attributes'] == 3
+
+        # once the store holds the policy's columns and attributes, encryption
+        # does no hashing into G1
+        hashed = []
+        hash = groupObj.hash
+        groupObj.hash = lambda *args: hashed.append(args) or hash(*args)
+        ctxt = cpabe.encrypt(pk, m, policy)
+        groupObj.hash = hash
+        assert hashed == []
+        assert cpabe.decrypt(pk, ctxt, key) == m, 'FAILED Decryption!!!'
+
+    def testHashCache(self):
+        # with the group's hash cache, both stores receive the same point objects
+        groupObj = PairingGroup('SS512')
+        groupObj.enableHashCache(precompute=True)
+        policy = '(ONE and (TWO or THREE))'
+        for trial in range(2):
+            cpabe = AC17CPABE(groupObj, 2)
+            (pk, msk) = cpabe.setup()
+            key = cpabe.keygen(pk, msk, ['ONE', 'TWO'])
+            m = groupObj.random(GT)
+            ctxt = cpabe.encrypt(pk, m, policy)
+            assert cpabe.decrypt(pk, ctxt, key) == m, 'FAILED Decryption!!!'
+        assert groupObj.hashCacheInfo()['hits'] > 0
+
+
+if __name__ == "__main__":
+    unittest.main()
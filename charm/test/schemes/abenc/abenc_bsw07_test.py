@@ -34,6 +34,21 @@ class CPabe_BSW07Test(unittest.TestCase):
         assert rand_msg == rec_msg, "FAILED Decryption: message is incorrect"
         if debug: print("Successful Decryption!!!")
 
+    def testThresholdPolicy(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = CPabe_BSW07(groupObj)
+        (pk, mk) = cpabe.setup()
+        access_policy = '3 of (one, two, three and four, five, six or seven) and eight'
+        rand_msg = groupObj.random(GT)
+        ct = cpabe.encrypt(pk, rand_msg, access_policy)
+        for attrs in [['ONE', 'TWO', 'SEVEN', 'EIGHT'], ['THREE', 'FOUR', 'FIVE', 'TWO', 'EIGHT'],
+                      ['ONE', 'TWO', 'FIVE', 'SIX', 'EIGHT']]:
+            sk = cpabe.keygen(pk, mk, attrs)
+            assert cpabe.decrypt(pk, sk, ct) == rand_msg, "FAILED Decryption: message is incorrect"
+        for attrs in [['ONE', 'TWO', 'THREE', 'EIGHT'], ['ONE', 'TWO', 'SIX']]:
+            sk = cpabe.keygen(pk, mk, attrs)
+            assert cpabe.decrypt(pk, sk, ct) == False
+
 
 if __name__ == "__main__":
     unittest.main()
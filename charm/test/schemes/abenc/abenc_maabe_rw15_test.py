@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from charm.schemes.abenc.abenc_maabe_rw15 import MaabeRW15
+from charm.toolbox.pairinggroup import PairingGroup, GT, pair
+
+debug = False
+
+
+def randomPolicy(attributes, rng):
+    """a random and/or formula over distinct attributes"""
+    if len(attributes) == 1:
+        return attributes[0]
+    split = rng.randrange(1, len(attributes))
+    return '(%s %s %s)' % (randomPolicy(attributes[:split], rng), rng.choice(['and', 'or']),
+                           randomPolicy(attributes[split:], rng))
+
+
+def referenceDecrypt(maabe, gp, sk, ct):
+    """decryption with three pairings and a GT exponentiation per attribute"""
+    policy = maabe.util.createPolicy(ct['policy'])
+    coefficients = maabe.util.getCoefficients(policy)
+    pruned_list = maabe.util.prune(policy, sk['keys'].keys())
+    B = maabe.group.init(GT, 1)
+    for node in pruned_list:
+        x, y = node.getAttribute(), node.getAttributeAndIndex()
+        B *= (ct['C1'][y] * pair(ct['C2'][y], sk['keys'][x]['K']) * pair(ct['C3'][y], gp['H'](sk['GID']))
+              * pair(sk['keys'][x]['KP'], ct['C4'][y])) ** coefficients[y]
+    return ct['C0'] / B
+
+
+class MaabeRW15Test(unittest.TestCase):
+    def testRandomPolicies(self):
+        groupObj = PairingGroup('SS512')
+        maabe = MaabeRW15(groupObj)
+        gp = maabe.setup()
+        (pk1, sk1) = maabe.authsetup(gp, 'UT')
+        (pk2, sk2) = maabe.authsetup(gp, 'OU')
+        pks = {'UT': pk1, 'OU': pk2}
+        universe = ['A@UT', 'B@UT', 'C@UT', 'D@OU', 'E@OU', 'F@OU']
+        rng = random.Random(17)
+        for trial in range(20):
+            held = rng.sample(universe, rng.randrange(1, len(universe) + 1))
+            keys = maabe.multiple_attributes_keygen(gp, sk1, "bob", [a for a in held if a.endswith('@UT')])
+            keys.update(maabe.multiple_attributes_keygen(gp, sk2, "bob", [a for a in held if a.endswith('@OU')]))
+            sk = {'GID': "bob", 'keys': keys}
+            policy = randomPolicy(rng.sample(universe, rng.randrange(1, len(universe) + 1)), rng)
+            if debug: print('%s with %s' % (policy, held))
+            m = groupObj.random(GT)
+            ct = maabe.encrypt(gp, pks, m, policy)
+            if not maabe.util.prune(maabe.util.createPolicy(policy), keys.keys()):
+                self.assertRaises(Exception, maabe.decrypt, gp, sk, ct)
+                continue
+            result = maabe.decrypt(gp, sk, ct)
+            self.assertEqual(result, referenceDecrypt(maabe, gp, sk, ct))
+            self.assertEqual(result, m)
+
+
+if __name__ == "__main__":
+    unittest.main()
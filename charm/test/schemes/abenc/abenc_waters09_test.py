@@ -33,6 +33,19 @@ class CPabe09Test(unittest.TestCase):
         if debug: print('Successful Decryption!')
         del groupObj
 
+    def testThresholdPolicy(self):
+        groupObj = PairingGroup('SS512')
+        cpabe = CPabe09(groupObj)
+        (msk, pk) = cpabe.setup()
+        pol = '2 of (ONE, TWO, THREE, FOUR and FIVE)'
+        m = groupObj.random(GT)
+        cipher = cpabe.encrypt(pk, m, pol)
+        for attr_list in [['ONE', 'THREE'], ['FIVE', 'FOUR', 'TWO'], ['ONE', 'TWO', 'THREE']]:
+            cpkey = cpabe.keygen(pk, msk, attr_list)
+            assert cpabe.decrypt(pk, cpkey, cipher) == m, 'FAILED Decryption!!!'
+        cpkey = cpabe.keygen(pk, msk, ['ONE', 'FOUR'])
+        assert cpabe.decrypt(pk, cpkey, cipher) == False
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -195,6 +195,29 @@ class Pai99Test(unittest.TestCase):
         tot_sum = sum(list(messages))
         assert rec_sum == tot_sum, "Failed to decrypt to correct sum"
 
+    def testPai99CRT(self):
+        group = RSAGroup()
+        pai = Pai99(group)
+        for random_g in (False, True):
+            (pk, sk) = pai.keygen(random_g=random_g)
+            lam_sk = {'lamda':sk['lamda'], 'u':sk['u']}
+            for m in (0, 1, 12345678987654321):
+                c = pai.encrypt(pk, m)
+                assert pai.decrypt(pk, sk, c) == m, "CRT decryption failed"
+                assert pai.decrypt(pk, lam_sk, c) == m, "lambda decryption failed"
+
+    def testPai99Batch(self):
+        group = RSAGroup()
+        pai = Pai99(group)
+        (pk, sk) = pai.keygen()
+        pool = pai.enableRandomnessPool(pk, size=8, background=False)
+        assert len(pool) == 8
+        messages = list(range(20))
+        cts = pai.encrypt_many(pk, messages)
+        pai.disableRandomnessPool()
+        assert [pai.decrypt(pk, sk, c) for c in cts] == messages
+        assert pai.decrypt(pk, sk, pai.sum_ciphertexts(pk, cts)) == sum(messages)
+
 class Rabin_EncTest(unittest.TestCase):
     def testRabin_Enc(self):
         rabin = Rabin_Enc()
@@ -17,7 +17,10 @@ from charm.schemes.pksig.pksig_schnorr91 import SchnorrSig
 from charm.schemes.pksig.pksig_waters05 import IBE_N04_Sig
 from charm.schemes.pksig.pksig_waters09 import IBEWaters09
 from charm.schemes.pksig.pksig_waters import WatersSig
-from charm.toolbox.pairinggroup import PairingGroup, ZR
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1
+from charm.core.engine.util import serializeObject, to_json
+from base64 import b64encode
+import json, zlib
 from charm.toolbox.ecgroup import ECGroup
 from charm.toolbox.eccurve import prime192v2
 from charm.toolbox.integergroup import integer
@@ -63,6 +66,33 @@ class BLS01Test(unittest.TestCase):
         assert bls.verify(pk, sig, m), "Failure!!!"
         if debug: print('SUCCESS!!!')
 
+    def testBLS04Batch(self):
+        groupObj = PairingGroup('MNT224')
+        bls = BLS01(groupObj)
+        keys = [bls.keygen(0) for i in range(3)]
+        items = []
+        for i in range(12):
+            (pk, sk) = keys[i % 3]
+            m = "message %d" % i
+            items.append((pk, bls.sign(sk['x'], m), m))
+        assert bls.verify_batch(items) == [True] * 12
+        # corrupt two signatures and check that bisection finds them
+        items[4] = (items[4][0], items[5][1], items[4][2])
+        items[9] = (items[9][0], items[9][1], "tampered")
+        expected = [i not in (4, 9) for i in range(12)]
+        assert bls.verify_batch(items) == expected
+
+    def testBLS04BaselineEncoding(self):
+        # signatures made over the original objectToBytes encoding still verify
+        groupObj = PairingGroup('MNT224')
+        bls = BLS01(groupObj)
+        (pk, sk) = bls.keygen(0)
+        m = { 'a':"hello world!!!" , 'b':"test message" }
+        encoded = b64encode(zlib.compress(json.dumps(serializeObject(m, groupObj), default=to_json).encode('utf-8')))
+        sig = groupObj.hash(encoded, G1) ** sk['x']
+        assert bls.verify(pk, sig, m), "Failure!!!"
+        assert bls.sign(sk['x'], m) == sig
+
 class BoyenTest(unittest.TestCase):
     def testBoyen(self):
        groupObj = PairingGroup('MNT224')
@@ -226,6 +256,15 @@ class ECDSATest(unittest.TestCase):
         assert ecdsa.verify(pk, sig, m), "Failed verification!"
         if debug: print("Signature Verified!!!")
 
+    def testECDSABatch(self):
+        groupObj = ECGroup(prime192v2)
+        ecdsa = ECDSA(groupObj)
+        (pk, sk) = ecdsa.keygen(0)
+        items = [(pk, ecdsa.sign(pk, sk, "msg %d" % i), "msg %d" % i) for i in range(8)]
+        assert ecdsa.verify_batch(items) == [True] * 8
+        items[3] = (pk, items[3][1], "msg 4")
+        assert ecdsa.verify_batch(items) == [i != 3 for i in range(8)]
+
 class HessTest(unittest.TestCase):
     def testHess(self):
        groupObj = PairingGroup('SS512')
@@ -314,6 +353,15 @@ class SchnorrSigTest(unittest.TestCase):
         assert pksig.verify(pk, sig, M), "Failed verification!"
         if debug: print("Signature verified!!!!")
 
+        items = [(pk, pksig.sign(pk, sk, "msg %d" % i), "msg %d" % i) for i in range(8)]
+        assert pksig.verify_batch(items) == [True] * 8
+        bad = dict(items[2][1])
+        bad['s'] = items[3][1]['s']
+        items[2] = (pk, bad, items[2][2])
+        # signatures without the commitment are verified one by one
+        items[5] = (pk, {'e':items[5][1]['e'], 's':items[5][1]['s']}, items[5][2])
+        assert pksig.verify_batch(items) == [i != 2 for i in range(8)]
+
 class IBE_N04_SigTest(unittest.TestCase):
     def testIBE_N04_Sig(self):
         # initialize the element object so that object references have global scope
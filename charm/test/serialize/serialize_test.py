@@ -1,6 +1,6 @@
-from charm.core.engine.util import objectToBytes,bytesToObject
+from charm.core.engine.util import objectToBytes,bytesToObject,legacyObjectToBytes
 from charm.toolbox.integergroup import IntegerGroup, integer
-from charm.toolbox.pairinggroup import PairingGroup
+from charm.toolbox.pairinggroup import PairingGroup,G1,GT
 from charm.toolbox.ecgroup import ECGroup
 from charm.toolbox.eccurve import prime192v1
 import unittest
@@ -35,6 +35,22 @@ class SerializeTest(unittest.TestCase):
         x=objectToBytes(data,groupObj)
         data2=bytesToObject(x,groupObj)
         self.assertEqual(data,data2)
+
+    def testPairingGroupUncompressed(self):
+        groupobj = PairingGroup('SS512')
+        data={'g1':groupobj.random(G1),'gt':groupobj.random(GT),'t':(1,-2**70,None,True)}
+
+        x=objectToBytes(data,groupobj,compression=False)
+        self.assertGreater(len(x), len(objectToBytes(data,groupobj)))
+        self.assertEqual(data,bytesToObject(x,groupobj))
+
+    def testLegacyFormat(self):
+        groupobj = PairingGroup('SS512')
+        p=groupobj.random(G1)
+        data={'p':p,'String':"foo",'list':[p,{},1,1.7, b'dfa',]}
+
+        x=legacyObjectToBytes(data,groupobj)
+        self.assertEqual(data,bytesToObject(x,groupobj))
     
 if __name__ == "__main__":
     unittest.main()
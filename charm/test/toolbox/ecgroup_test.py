@@ -2,7 +2,7 @@
 :Date: Aug 26, 2016
 :Authors: J. Ayo Akinyele
 '''
-from charm.toolbox.ecgroup import ECGroup,G
+from charm.toolbox.ecgroup import ECGroup,G,ZR
 from charm.toolbox.eccurve import prime192v1,prime192v2
 from charm.toolbox.securerandom import OpenSSLRand
 import unittest
@@ -49,5 +49,34 @@ class ECGroupEncodeAndDecode(unittest.TestCase):
         t = group.decode(g, True)
         assert s == t, "Failed to encode/decode properly"
 
+class ECGroupMultiExp(unittest.TestCase):
+    def testMultiExp(self):
+        group = ECGroup(prime192v1)
+        for n in [1, 2, 8]:
+            bases = [group.random(G) for i in range(n)]
+            exps = [group.random(ZR) for i in range(n)]
+            expected = bases[0] ** exps[0]
+            for i in range(1, n):
+                expected *= bases[i] ** exps[i]
+            assert group.multiexp(bases, exps) == expected, "multiexp of %d terms failed" % n
+
+    def testMultiExpIntegers(self):
+        group = ECGroup(prime192v1)
+        g, h = group.random(G), group.random(G)
+        assert group.multiexp([g, h], [3, 5]) == (g ** 3) * (h ** 5)
+        assert group.multiexp([g, h], [-3, 5]) == (g ** 3) ** -1 * (h ** 5)
+        assert group.multiexp([g, h], [0, -1]) == h ** -1
+
+class ECGroupRandomMany(unittest.TestCase):
+    def testRandomMany(self):
+        group = ECGroup(prime192v1)
+        for _type in [ZR, G]:
+            xs = group.random_many(_type, runs)
+            assert len(xs) == runs and len(set(group.serialize(x) for x in xs)) == runs
+            assert group.random_many(_type, 3, seed=b'seed') == group.random_many(_type, 3, seed=b'seed')
+            assert group.random_many(_type, 3, seed=b'seed') != group.random_many(_type, 3, seed=b'other')
+        for g in group.random_many(G, runs):
+            assert not g.isInf(), "random point is the identity"
+
 if __name__ == "__main__":
     unittest.main()
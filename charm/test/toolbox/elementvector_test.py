@@ -0,0 +1,103 @@
+from charm.toolbox.pairinggroup import PairingGroup, ZR, G1, G2, GT, pair
+from charm.toolbox.ecgroup import ECGroup, G
+from charm.toolbox.eccurve import prime192v1
+from charm.config import libs, pairing_lib
+import unittest
+
+class PairingVectorTest(unittest.TestCase):
+    def setUp(self):
+        self.group = PairingGroup('SS512')
+
+    def testArithmetic(self):
+        group = self.group
+        g = group.random(G1)
+        xs = [group.random(ZR) for i in range(5)]
+        hs = [group.random(G1) for i in range(5)]
+        X, H = group.vector(xs), group.vector(hs)
+        self.assertEqual(len(X), 5)
+        self.assertEqual(list(H ** X), [h ** x for (h, x) in zip(hs, xs)])
+        self.assertEqual(list(g ** X), [g ** x for x in xs])
+        self.assertEqual(list(H ** xs[0]), [h ** xs[0] for h in hs])
+        self.assertEqual(list(H * g), [h * g for h in hs])
+        self.assertEqual(list(g * H), [g * h for h in hs])
+        self.assertEqual(list(H * H), [h * h for h in hs])
+        self.assertEqual(H.multiexp(X), group.multiexp(hs, xs))
+        self.assertEqual(H.multiexp(xs), group.multiexp(hs, xs))
+        self.assertEqual(H.prod(), hs[0] * hs[1] * hs[2] * hs[3] * hs[4])
+        self.assertEqual(H[-1], hs[-1])
+
+    def testSerialize(self):
+        group = self.group
+        for t in (ZR, G1, G2):
+            v = group.vector([group.random(t) for i in range(4)])
+            self.assertEqual(group.deserializeVector(t, v.serialize()), v)
+        v = group.vector([pair(group.random(G1), group.random(G2)) for i in range(2)])
+        self.assertEqual(group.deserializeVector(GT, v.serialize()), v)
+        if pairing_lib == libs.pbc:
+            self.assertEqual(bytes(memoryview(v)), v.serialize())
+
+    def testMismatch(self):
+        group = self.group
+        v = group.vector([group.random(G1) for i in range(3)])
+        w = group.vector([group.random(ZR) for i in range(2)])
+        self.assertRaises(Exception, lambda: v ** w)
+        self.assertRaises(Exception, group.vector, [])
+
+class ECVectorTest(unittest.TestCase):
+    def setUp(self):
+        self.group = ECGroup(prime192v1)
+
+    def testArithmetic(self):
+        group = self.group
+        g = group.random(G)
+        xs = [group.random(ZR) for i in range(4)]
+        ps = [group.random(G) for i in range(4)]
+        P, X = group.vector(ps), group.vector(xs)
+        self.assertEqual(len(P), 4)
+        self.assertEqual(list(P ** X), [p ** x for (p, x) in zip(ps, xs)])
+        self.assertEqual(list(g ** X), [g ** x for x in xs])
+        self.assertEqual(list(P ** xs[0]), [p ** xs[0] for p in ps])
+        self.assertEqual(list(P ** -3), [(p ** 3) ** -1 for p in ps])
+        self.assertEqual(list(P * g), [p * g for p in ps])
+        self.assertEqual(list(g * P), [g * p for p in ps])
+        self.assertEqual(list(X * X), [x * x for x in xs])
+        self.assertEqual(list(X ** 2), [x ** 2 for x in xs])
+        self.assertEqual(P.multiexp(X), group.multiexp(ps, xs))
+        self.assertEqual(P.multiexp([3, -5, 0, xs[3]]), group.multiexp(ps, [3, -5, 0, xs[3]]))
+        self.assertEqual(P.prod(), ps[0] * ps[1] * ps[2] * ps[3])
+        self.assertEqual(X.prod(), xs[0] * xs[1] * xs[2] * xs[3])
+        self.assertEqual(P[-1], ps[-1])
+
+    def testSerialize(self):
+        # same layout as the pairing vectors: fixed-length encodings back to back
+        group = self.group
+        g = group.random(G)
+        points = [g, g ** 0, group.random(G)]
+        scalars = [group.random(ZR), group.init(ZR, 0), group.init(ZR, 1)]
+        for (t, elements, size) in [(G, points, 25), (ZR, scalars, 24)]:
+            v = group.vector(elements)
+            data = v.serialize()
+            self.assertEqual(len(data), size * len(elements))
+            self.assertEqual(bytes(memoryview(v)), data)
+            w = group.deserializeVector(t, data)
+            self.assertEqual(w, v)
+            self.assertEqual(list(w), elements)
+            self.assertEqual(group.deserializeVector(t, bytearray(data)), v)
+            self.assertRaises(Exception, group.deserializeVector, t, data[:-1])
+            self.assertRaises(Exception, group.deserializeVector, t, b'')
+        self.assertEqual(data[size:2 * size], bytes(size))
+        self.assertRaises(Exception, group.deserializeVector, ZR, b'\xff' * 24)
+
+    def testMismatch(self):
+        group = self.group
+        v = group.vector([group.random(G) for i in range(3)])
+        w = group.vector([group.random(ZR) for i in range(2)])
+        self.assertRaises(Exception, lambda: v ** w)
+        self.assertRaises(Exception, lambda: v * w)
+        self.assertRaises(Exception, v.multiexp, [1, 2])
+        self.assertRaises(Exception, w.multiexp, [1, 2])
+        self.assertRaises(Exception, group.vector, [])
+        self.assertRaises(Exception, group.vector, [group.random(G), group.random(ZR)])
+
+if __name__ == "__main__":
+    unittest.main()
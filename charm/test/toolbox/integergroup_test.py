@@ -0,0 +1,48 @@
+from charm.toolbox.integergroup import IntegerGroupQ, integer, powPublic, montgomeryContext
+import unittest
+
+runs = 10
+
+class IntegerExponentiation(unittest.TestCase):
+    def setUp(self):
+        self.group = IntegerGroupQ()
+        self.group.paramgen(512)
+
+    def testPublicExponent(self):
+        group = self.group
+        g = group.randomGen()
+        for i in range(runs):
+            x = group.random()
+            assert powPublic(g, x) == g ** x, "public exponent path differs from **"
+        assert powPublic(g, -1) == g ** -1
+        assert int(powPublic(g, 0)) == 1
+
+    def testEvenModulus(self):
+        assert int(integer(3, 16) ** 3) == 11
+        assert int(integer(3, 15) ** 0) == 1
+
+    def testFixedBase(self):
+        group = self.group
+        g = group.randomGen()
+        plain = [group.random() for i in range(runs)] + [integer(0), integer(1), group.q - 1]
+        expected = [g ** x for x in plain]
+        group.precompute(g)
+        assert [group.exp(g, x) for x in plain] == expected, "comb table result differs from **"
+        # exponents beyond the table size still give the right result
+        big = group.q * 4 + 3
+        assert group.exp(g, big) == g ** big
+
+    def testRandomMany(self):
+        group = self.group
+        xs = group.random_many(count=runs)
+        assert len(xs) == runs and len(set(int(x) for x in xs)) == runs
+        assert all(0 <= int(x) < int(group.q) for x in xs)
+        assert group.random_many(count=3, seed=b'seed') == group.random_many(count=3, seed=b'seed')
+        assert group.random_many(count=3, seed=b'seed') != group.random_many(count=3, seed=b'other')
+        assert group.random_many(count=0) == []
+
+    def testContextCache(self):
+        assert montgomeryContext(self.group.p) is montgomeryContext(integer(int(self.group.p)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+from charm.toolbox.msp import MSP, sparse_row, row_sum, row_product
+import unittest
+
+
+class SparseMSPTest(unittest.TestCase):
+    def testSparseRows(self):
+        util = MSP(None, verbose=False, cache=None)
+        policy = util.createPolicy('((A and B) or (C and (D or E))) and F')
+        dense = util.convert_policy_to_msp(policy)
+        sparse = util.convert_policy_to_sparse_msp(policy)
+        self.assertEqual(sorted(dense), sorted(sparse))
+        for attr, row in dense.items():
+            self.assertEqual(sparse[attr], [(j, e) for (j, e) in enumerate(row) if e != 0])
+            self.assertTrue(all(e in [1, -1] for (_, e) in sparse[attr]))
+
+    def testThresholdUnsupported(self):
+        util = MSP(None, verbose=False, cache=None)
+        self.assertRaises(ValueError, util.convert_policy_to_msp, util.createPolicy('2 of (A, B, C)'))
+
+    def testRowArithmetic(self):
+        row = [1, 0, -1, 0, 3]
+        values = [2, 3, 5, 7, 11]
+        self.assertEqual(row_sum(values, sparse_row(row)), sum(r * v for (r, v) in zip(row, values)))
+        self.assertEqual(row_product(values, sparse_row(row), 1), 2 / 5 * 11 ** 3)
+        self.assertEqual(row_product(values, sparse_row([0, -1])), 1 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+from charm.toolbox.pairinggroup import PairingGroup, PairingProduct, ZR, G1, G2, GT, pair
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+debug = False
+
+
+class PairingProductTest(unittest.TestCase):
+    def testProduct(self):
+        group = PairingGroup('SS512')
+        for n in [1, 2, 5]:
+            a = [group.random(G1) for i in range(n)]
+            b = [group.random(G2) for i in range(n)]
+            c = [group.random(ZR) for i in range(n)]
+            prod, expected = PairingProduct(group), group.init(GT, 1)
+            for i in range(n):
+                prod.add(a[i], b[i], c[i])
+                expected *= pair(a[i], b[i]) ** c[i]
+            assert prod.evaluate() == expected, "FAILED pairing product of %d terms!!!" % n
+
+    def testDivide(self):
+        group = PairingGroup('SS512')
+        (g, h, c) = (group.random(G1), group.random(G2), group.random(ZR))
+        prod = PairingProduct(group).add(g ** 3, h).divide(g, h, c)
+        assert prod.evaluate() == pair(g, h) ** (3 - c)
+        assert PairingProduct(group).add(g, h).divide(g, h).evaluate() == group.init(GT, 1)
+
+    def testAggregation(self):
+        # terms sharing their second argument are merged into one pairing
+        group = PairingGroup('SS512')
+        (g1, g2, h, k) = (group.random(G1), group.random(G1), group.random(G2), group.random(G2))
+        prod = PairingProduct(group).add(g1, h).add(g2, h, 2).add(g1, k)
+        assert len(prod.terms) == 2
+        assert prod.evaluate() == pair(g1, h) * pair(g2, h) ** 2 * pair(g1, k)
+        # equal but distinct objects are kept apart, with the same result
+        copy = group.deserialize(group.serialize(h))
+        prod = PairingProduct(group).add(g1, h).add(g2, copy)
+        assert len(prod.terms) == 2 and prod.evaluate() == pair(g1 * g2, h)
+
+    def testEmpty(self):
+        group = PairingGroup('SS512')
+        assert PairingProduct(group).evaluate() == group.init(GT, 1)
+
+
+class MultiexpTest(unittest.TestCase):
+    def naive(self, group, bases, exps):
+        result = group.init(bases[0].type, 1)
+        for (b, e) in zip(bases, exps):
+            result *= b ** e
+        return result
+
+    def testSizes(self):
+        # below 32 terms Straus' method is used, from 32 on Pippenger's buckets
+        group = PairingGroup('SS512')
+        for gtype in [G1, GT]:
+            for n in [1, 2, 31, 32, 33, 70]:
+                bases = [group.random(gtype) for i in range(n)]
+                exps = [group.random(ZR) for i in range(n)]
+                assert group.multiexp(bases, exps) == self.naive(group, bases, exps), "FAILED multiexp of %d terms!!!" % n
+                assert group.vector(bases).multiexp(exps) == self.naive(group, bases, exps), "FAILED vector multiexp of %d terms!!!" % n
+
+    def testSpecialExponents(self):
+        group = PairingGroup('SS512')
+        for n in [3, 40]:
+            bases = [group.random(G1) for i in range(n)]
+            a = group.random(ZR)
+            exps = [[0] * n, [group.init(ZR, 0)] * n, [-(i + 1) for i in range(n)], [-a] * n,
+                    [i if i % 2 else -a for i in range(n)]]
+            for e in exps:
+                assert group.multiexp(bases, e) == self.naive(group, bases, e), "FAILED multiexp with exponents %s!!!" % e
+            assert group.multiexp(bases, [0] * n) == group.init(G1, 1)
+
+    def testInvalidInput(self):
+        group = PairingGroup('SS512')
+        g, a = group.random(G1), group.random(ZR)
+        self.assertRaises(AssertionError, group.multiexp, [], [])
+        self.assertRaises(AssertionError, group.multiexp, [g, g], [a])
+        self.assertRaises(AssertionError, group.multiexp, [g], [a, a])
+        self.assertRaises(Exception, group.vector([g, g]).multiexp, [a])
+
+
+class PrecomputeTest(unittest.TestCase):
+    def testFixedBase(self):
+        group = PairingGroup('SS512')
+        g = group.random(G1)
+        plain = group.deserialize(group.serialize(g))
+        assert plain.preproc == 0
+        assert group.precompute(g) and g.preproc == 1
+        # registering the same element again is a no-op
+        assert group.precompute(g) and group.precomputeInfo()['bases'] == 1
+        for i in range(5):
+            a = group.random(ZR)
+            assert g ** a == plain ** a, "FAILED fixed-base exponentiation!!!"
+
+    def testDeserializedCopies(self):
+        group = PairingGroup('SS512')
+        (g, h) = (group.random(G1), group.random(G2))
+        assert group.precomputeKey({ 'g':g, 'list':[h, group.random(ZR)], 'name':'pk' }) == 2
+        for (element, compression) in [(g, True), (h, False)]:
+            copy = group.deserialize(group.serialize(element, compression), compression)
+            assert copy == element and copy.preproc == 1
+        assert group.deserialize(group.serialize(group.random(G1))).preproc == 0
+
+    def testUnsupportedTypes(self):
+        group = PairingGroup('SS512')
+        assert group.precompute(group.random(ZR)) == False
+        assert group.precomputeInfo() == { 'bases':0, 'bytes':0 }
+
+    def testReadOnly(self):
+        # preproc reports the table state, it cannot be used to set it
+        group = PairingGroup('SS512')
+        g = group.random(G1)
+        group.precompute(g)
+        with self.assertRaises(AttributeError):
+            g.preproc = 0
+        assert g.preproc == 1
+
+
+
+class HashCacheTest(unittest.TestCase):
+    def testHitsAndEviction(self):
+        group = PairingGroup('SS512')
+        group.enableHashCache(maxsize=2)
+        first = group.hash('ALICE', G1)
+        assert group.hash('ALICE', G1) is first
+        # entries are kept per target group
+        assert group.hash('ALICE', G2) is not first
+        group.hash('BOB', G1)
+        group.hash('CAROL', G1)
+        info = group.hashCacheInfo()
+        assert (info['hits'], info['misses'], info['size'], info['evictions']) == (1, 4, 2, 2)
+        # the evicted point is hashed again, to the same value
+        assert group.hash('ALICE', G1) is not first and group.hash('ALICE', G1) == first
+
+    def testMatchesUncached(self):
+        group = PairingGroup('SS512')
+        expected = [group.hash('ATTR%d' % i, G1) for i in range(4)]
+        group.enableHashCache(maxsize=8, precompute=True)
+        for i in range(2):
+            cached = [group.hash('ATTR%d' % i, G1) for i in range(4)]
+            assert cached == expected
+            assert all(h.preproc == 1 for h in cached)
+        # only string and bytes hashes into G1 and G2 are memoized
+        assert group.hash('ATTR0', ZR) == group.hash('ATTR0', ZR)
+        assert group.hashCacheInfo()['size'] == 4
+
+    def testDisable(self):
+        group = PairingGroup('SS512')
+        assert group.hashCacheInfo() is None
+        group.enableHashCache()
+        h = group.hash('ALICE', G1)
+        group.disableHashCache()
+        assert group.hashCacheInfo() is None
+        assert group.hash('ALICE', G1) == h and group.hash('ALICE', G1) is not h
+
+
+
+class ThreadTest(unittest.TestCase):
+    # pairings, exponentiations, hashing and serialization may run without the GIL,
+    # results computed from several threads must match the sequential ones
+    def testConcurrentOperations(self):
+        group = PairingGroup('SS512')
+        (g, h) = (group.random(G1), group.random(G2))
+        group.precompute(g)
+        exps = [group.random(ZR) for i in range(16)]
+
+        def work(i):
+            a = exps[i]
+            return (pair(g ** a, h), group.pair_prod([g, g ** a], [h, h]), group.hash('USER%d' % i, G1),
+                    group.deserialize(group.serialize(h ** a)))
+
+        expected = [work(i) for i in range(len(exps))]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(work, range(len(exps))))
+        assert results == expected, "FAILED concurrent group operations!!!"
+        assert all(r[0] == pair(g, h) ** a for (r, a) in zip(results, exps))
+
+
+
+class RandomGTTest(unittest.TestCase):
+    def testGenerator(self):
+        group = PairingGroup('SS512')
+        assert group.gt is None
+        k = group.random(GT)
+        # one generator per group, registered as a fixed base
+        gt = group.gt
+        assert gt is not None and gt.preproc == 1 and group.precomputeInfo()['bases'] == 1
+        assert k.type == GT and k != group.random(GT)
+        group.random(GT)
+        assert group.gt is gt
+
+    def testRandomMany(self):
+        group = PairingGroup('SS512')
+        ks = group.random_many(GT, 8)
+        assert len(ks) == 8 and len(set(group.serialize(k) for k in ks)) == 8
+        assert all(k.type == GT for k in ks)
+        assert group.random_many(GT, 0) == []
+        assert group.random_many(GT, 3, seed=b'seed') == group.random_many(GT, 3, seed=b'seed')
+        assert len(group.random(GT, count=3)) == 3
+
+    def testConcurrentFirstUse(self):
+        group = PairingGroup('SS512')
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: group.random(GT), range(8)))
+        assert group.precomputeInfo()['bases'] == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
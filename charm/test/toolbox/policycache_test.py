@@ -0,0 +1,111 @@
+from charm.toolbox.policycache import PolicyCache
+from charm.toolbox.policytree import PolicyParser
+from charm.toolbox.secretutil import SecretUtil
+from charm.toolbox.msp import MSP
+from charm.toolbox.pairinggroup import PairingGroup
+import threading
+import unittest
+
+
+class PolicyCacheTest(unittest.TestCase):
+    def testHitMiss(self):
+        cache = PolicyCache(maxsize=4)
+        p1 = cache.compile('(A or B) and C')
+        p2 = cache.compile('(A or B)  and C')
+        self.assertIs(p1, p2)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def testLabelsDuplicates(self):
+        cache = PolicyCache()
+        compiled = cache.compile('(A and B) or (A and C)')
+        self.assertEqual(compiled.attributes, ['A_0', 'B', 'A_1', 'C'])
+        self.assertIs(cache.lookup(compiled.tree), compiled)
+        self.assertIsNone(cache.lookup(PolicyParser().parse('A or B')))
+
+    def testEviction(self):
+        cache = PolicyCache(maxsize=2)
+        first = cache.compile('A or B')
+        cache.compile('B or C')
+        cache.compile('A or B')  # refresh, 'B or C' is now the oldest
+        cache.compile('C or D')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertIs(cache.compile('A or B'), first)
+        self.assertIsNone(cache.lookup(PolicyParser().parse('B or C')))
+
+    def testDerivedValuesComputedOnce(self):
+        cache = PolicyCache()
+        compiled = cache.compile('A and B')
+        calls = []
+        compute = lambda tree: calls.append(tree) or {'A': 1, 'B': 2}
+        compiled.getCoefficients('group', compute)
+        compiled.getCoefficients('group', compute)
+        self.assertEqual(len(calls), 1)
+
+    def testConcurrentFirstUse(self):
+        # racing first callers may all compute, but they all get the entry stored first
+        compiled = PolicyCache().compile('A and B')
+        barrier, results = threading.Barrier(4), []
+        def compute(tree):
+            barrier.wait()
+            return {'A': 1, 'B': 2}
+        def worker():
+            results.append(compiled.getCoefficients('group', compute))
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(len(results), 4)
+        for coeffs in results:
+            self.assertIs(coeffs, compiled._coefficients[('group', compute)])
+
+    def testEmptyCacheIsUsed(self):
+        # an empty cache must not be mistaken for cache=None
+        cache = PolicyCache()
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(cache)
+
+    def testSecretUtilHits(self):
+        cache = PolicyCache()
+        util = SecretUtil(PairingGroup('SS512'), verbose=False, cache=cache)
+        tree = util.createPolicy('(A or B) and C')
+        self.assertIs(util.createPolicy('(A or B) and C'), tree)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        coeffs = util.getCoefficients(tree)
+        self.assertEqual(util.getCoefficients(tree), coeffs)
+        self.assertEqual(len(cache.lookup(tree)._coefficients), 1)
+        # callers get copies of the shared coefficients
+        coeffs['A'] = 0
+        self.assertNotEqual(util.getCoefficients(tree)['A'], 0)
+        self.assertEqual(util.getAttributeList(tree), ['A', 'B', 'C'])
+
+    def testSharedWithMSP(self):
+        # SecretUtil and MSP keep separate coefficients for the same compiled tree
+        cache, group = PolicyCache(), PairingGroup('SS512')
+        util = SecretUtil(group, verbose=False, cache=cache)
+        msp = MSP(group, verbose=False, cache=cache)
+        tree = util.createPolicy('(A or B) and C')
+        self.assertIs(msp.createPolicy('(A or B) and C'), tree)
+        self.assertEqual(msp.getCoefficients(tree), util.getCoefficients(tree))
+        self.assertEqual(len(cache.lookup(tree)._coefficients), 2)
+
+        # MSP rejects threshold gates instead of caching an incomplete result
+        tree = util.createPolicy('3 of (A, B, C) and D')
+        self.assertRaises(ValueError, msp.getCoefficients, tree)
+        self.assertEqual(sorted(util.getCoefficients(tree)), ['A', 'B', 'C', 'D'])
+        self.assertEqual(len(cache.lookup(tree)._coefficients), 1)
+
+    def testMSPHits(self):
+        cache = PolicyCache()
+        util = MSP(PairingGroup('SS512'), verbose=False, cache=cache)
+        tree = util.createPolicy('(A or B) and C')
+        self.assertIs(util.createPolicy('(A or B) and C'), tree)
+        self.assertEqual(cache.stats()['hits'], 1)
+        msp = util.convert_policy_to_msp(tree)
+        self.assertIsNotNone(cache.lookup(tree)._msp)
+        self.assertEqual(util.convert_policy_to_msp(tree), msp)
+        self.assertEqual(util.getAttributeList(tree), ['A', 'B', 'C'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+from itertools import combinations
+from threading import Thread
+
+from hypothesis import given
+
+from charm.toolbox.policy_expression_spec import policy_expressions
+from charm.toolbox.policytree import PolicyParser, PyParsingPolicyParser
+
+
+class PolicyParserTest(unittest.TestCase):
+    @given(policy_expressions())
+    def testMatchesPyParsing(self, policy):
+        self.assertEqual(str(PolicyParser().parse(policy)), str(PyParsingPolicyParser().parse(policy)))
+
+    def testGrammar(self):
+        parser = PolicyParser()
+        self.assertEqual(str(parser.parse('A and B or C')), '((A and B) or C)')
+        self.assertEqual(str(parser.parse('A AND (b OR c)')), '(A and (B or C))')
+        self.assertEqual(str(parser.parse('! a or b_2')), '(!A or B_2)')
+        self.assertEqual(str(parser.parse('age >= 18 and (x.y@z or level<3)')), '(AGE and (X.Y@Z or LEVEL))')
+        self.assertRaises(ValueError, parser.parse, '')
+        self.assertRaises(ValueError, parser.parse, '(A and B')
+
+    def testThreshold(self):
+        parser = PolicyParser()
+        tree = parser.parse('2 of (A, B and C, D or E) and F')
+        self.assertEqual(str(tree), '((2 of (A, (B and C), (D or E))) and F)')
+        self.assertEqual(str(parser.parse(str(tree))), str(tree))
+        self.assertEqual([str(n) for n in parser.prune(tree, ['A', 'B', 'C', 'E', 'F'])], ['A', 'E', 'F'])
+        self.assertEqual([str(n) for n in parser.prune(tree, ['B', 'C', 'A', 'F'])], ['A', 'B', 'C', 'F'])
+        self.assertFalse(parser.prune(tree, ['A', 'B', 'F']))
+        self.assertEqual(parser.requiredAttributes(tree, ['B', 'C', 'E', 'F'])[0], True)
+        self.assertRaises(ValueError, parser.parse, '4 of (A, B, C)')
+        self.assertRaises(ValueError, parser.parse, '2 of (A, B')
+
+    def testReentrant(self):
+        parser = PolicyParser()
+        policies = ['(A%d and B%d) or C%d' % (i, i, i) for i in range(8)]
+        results = {}
+        def work(policy):
+            results[policy] = [str(parser.parse(policy)) for i in range(200)]
+        threads = [Thread(target=work, args=(p,)) for p in policies]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        for i, policy in enumerate(policies):
+            self.assertEqual(set(results[policy]), {'((A%d and B%d) or C%d)' % (i, i, i)})
+
+    def testMinimalAttributes(self):
+        parser = PolicyParser()
+        rng = random.Random(5)
+        universe = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+        def randomPolicy(attributes):
+            if len(attributes) == 1:
+                return attributes[0]
+            split = rng.randrange(1, len(attributes))
+            return '(%s %s %s)' % (randomPolicy(attributes[:split]), rng.choice(['and', 'or']), randomPolicy(attributes[split:]))
+        for trial in range(200):
+            tree = parser.parse(randomPolicy(rng.sample(universe, rng.randrange(1, len(universe) + 1))))
+            held = rng.sample(universe, rng.randrange(0, len(universe) + 1))
+            cost = {a: rng.randrange(1, 5) for a in universe}
+            # the cheapest satisfying subset of the held attributes, by brute force
+            subsets = [s for n in range(len(held) + 1) for s in combinations(held, n) if parser.requiredAttributes(tree, s)[0]]
+            result = parser.minimalAttributes(tree, held, cost)
+            if not subsets:
+                self.assertIsNone(result)
+                self.assertFalse(parser.prune(tree, held))
+                continue
+            self.assertEqual(result[0], min(sum(cost[a] for a in s) for s in subsets))
+            self.assertEqual(result[0], sum(cost[n.getAttribute()] for n in result[1]))
+            self.assertTrue(parser.requiredAttributes(tree, [n.getAttribute() for n in result[1]])[0])
+            self.assertEqual(len(parser.prune(tree, held)), min(len(s) for s in subsets))
+
+    def testDeepPolicy(self):
+        parser = PolicyParser()
+        tree = parser.parse(' and '.join('A%d' % i for i in range(5000)) + ' or B')
+        self.assertEqual(parser.prune(tree, ['B', 'A0']), [parser.parse('B')])
+
+
+if __name__ == "__main__":
+    unittest.main()
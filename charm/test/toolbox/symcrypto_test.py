@@ -1,7 +1,12 @@
+import io
+import struct
 import unittest 
 from charm.toolbox.symcrypto import SymmetricCryptoAbstraction,AuthenticatedCryptoAbstraction, MessageAuthenticator
 from charm.toolbox.pairinggroup import PairingGroup,GT
 from charm.core.math.pairing import hashPair as sha2
+from charm.core.crypto.cryptobase import Hash, HMAC, HKDF, AES, MODE_GCM, selectPRP
+from hashlib import sha256
+import hmac
 class SymmetricCryptoAbstractionTest(unittest.TestCase):
     
     def testAESCBC(self):
@@ -64,6 +69,98 @@ class AuthenticatedCryptoAbstractionTest(unittest.TestCase):
         dmsg = b.decrypt(ct);
         assert msg == dmsg , 'o: =>%s\nm: =>%s' % (msg, dmsg)
 
+class StreamCryptoTest(unittest.TestCase):
+    def setUp(self):
+        self.key = sha2(PairingGroup('SS512').random(GT))
+
+    def testRoundTrip(self):
+        a = SymmetricCryptoAbstraction(self.key)
+        for size in [0, 1, 16, 100, 4096, 5000]:
+            msg = bytes(i % 251 for i in range(size))
+            ct = b''.join(a.encrypt_stream(io.BytesIO(msg), chunk_size=1024, associatedData=b'header'))
+            pieces = [ct[i:i+100] for i in range(0, len(ct), 100)]
+            dmsg = b''.join(SymmetricCryptoAbstraction(self.key).decrypt_stream(pieces, associatedData=b'header'))
+            assert msg == dmsg, "stream round trip failed for %d bytes" % size
+
+    def testTamper(self):
+        a = SymmetricCryptoAbstraction(self.key)
+        ct = b''.join(a.encrypt_stream([b'x' * 3000], chunk_size=1024))
+        flipped = ct[:40] + bytes([ct[40] ^ 1]) + ct[41:]
+        for bad in [flipped, ct[:-1], ct + b'\x00']:
+            self.assertRaises(ValueError, lambda: b''.join(a.decrypt_stream([bad])))
+        self.assertRaises(ValueError, lambda: b''.join(a.decrypt_stream([ct], associatedData=b'other')))
+
+    def testTruncatedAtChunkBoundary(self):
+        a = SymmetricCryptoAbstraction(self.key)
+        ct = b''.join(a.encrypt_stream([b'x' * 4096], chunk_size=1024))
+        frame = 5 + 1024 + 32
+        header = len(ct) - 3 * frame - (5 + 1040 + 32)
+        self.assertRaises(ValueError, lambda: b''.join(a.decrypt_stream([ct[:header + 2 * frame]])))
+
+    def testChunkSizeLimits(self):
+        a = SymmetricCryptoAbstraction(self.key)
+        # argument errors surface at the call, not on the first next()
+        self.assertRaises(AssertionError, a.encrypt_stream, [b'x'], chunk_size=1000)
+        self.assertRaises(AssertionError, a.decrypt_stream, [b''], max_chunk_size=0)
+        ct = b''.join(a.encrypt_stream([b'x' * 3000], chunk_size=2048))
+        assert b''.join(a.decrypt_stream([ct], max_chunk_size=2048)) == b'x' * 3000
+        self.assertRaises(ValueError, lambda: b''.join(a.decrypt_stream([ct], max_chunk_size=1024)))
+        # a forged header announcing 2^32-1 byte chunks is rejected before any chunk is read
+        forged = ct[:4] + struct.pack('>I', 2**32 - 1) + ct[8:]
+        self.assertRaises(ValueError, lambda: b''.join(a.decrypt_stream([forged])))
+
+    def testGCMStream(self):
+        g = SymmetricCryptoAbstraction(self.key, mode=MODE_GCM)
+        for size in [0, 1, 1024, 5000]:
+            msg = bytes(i % 251 for i in range(size))
+            ct = b''.join(g.encrypt_stream([msg], chunk_size=1024, associatedData=b'header'))
+            # both kinds of object read both stream versions
+            for reader in [g, SymmetricCryptoAbstraction(self.key)]:
+                assert msg == b''.join(reader.decrypt_stream([ct], associatedData=b'header'))
+        flipped = ct[:40] + bytes([ct[40] ^ 1]) + ct[41:]
+        for bad in [flipped, ct[:-1], ct + b'\x00']:
+            self.assertRaises(ValueError, lambda: b''.join(g.decrypt_stream([bad], associatedData=b'header')))
+        self.assertRaises(ValueError, lambda: b''.join(g.decrypt_stream([ct])))
+
+class GCMTest(unittest.TestCase):
+    # test cases 4 and 6 of the GCM specification (McGrew and Viega)
+    key = bytes.fromhex('feffe9928665731c6d6a8f9467308308')
+    plaintext = bytes.fromhex('d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+                              '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39')
+    aad = bytes.fromhex('feedfacedeadbeeffeedfacedeadbeefabaddad2')
+
+    def check(self, nonce, ciphertext, tag):
+        c = selectPRP(AES, (self.key, MODE_GCM, nonce))
+        c.update(self.aad[:7])
+        c.update(self.aad[7:])
+        # odd piece sizes exercise the partial keystream and GHASH blocks
+        ct = c.encrypt(self.plaintext[:5]) + c.encrypt(self.plaintext[5:37]) + c.encrypt(self.plaintext[37:])
+        assert ct.hex() == ciphertext and c.digest().hex() == tag
+        d = selectPRP(AES, (self.key, MODE_GCM, nonce))
+        d.update(self.aad)
+        assert d.decrypt(ct) == self.plaintext and d.verify(bytes.fromhex(tag))
+        assert not d.verify(bytes(16))
+
+    def testNonce96(self):
+        self.check(bytes.fromhex('cafebabefacedbaddecaf888'),
+                   '42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+                   '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091',
+                   '5bc94fbc3221a5db94fae95ae7121a47')
+
+    def testLongNonce(self):
+        self.check(bytes.fromhex('9313225df88406e555909c5aff5269aa6a7a9538534f7da1e4c303d2a318a728'
+                                 'c3c0c95156809539fcf0e2429a6b525416aedbf5a0de6a57a637b39b'),
+                   '8ce24998625615b603a033aca13fb894be9112a5c3a211a8ba262a3cca7e2ca7'
+                   '01e4a9a4fba43c90ccdcb281d48c7c6fd62875d2aca417034c34aee5',
+                   '619cc5aefffe0bfa462af43c1699d050')
+
+    def testMisuse(self):
+        c = selectPRP(AES, (self.key, MODE_GCM, bytes(12)))
+        c.encrypt(b'data')
+        self.assertRaises(ValueError, c.update, b'late associated data')
+        self.assertRaises(ValueError, c.decrypt, b'data')
+        self.assertRaises(ValueError, selectPRP, AES, (self.key, MODE_GCM))
+
 class MessageAuthenticatorTest(unittest.TestCase):
     def testSelfVerify(self):
         key = sha2(PairingGroup('SS512').random(GT))
@@ -103,6 +200,26 @@ class MessageAuthenticatorTest(unittest.TestCase):
         a["alg"]= "alg" 
         assert not m1.verify(a), "expected message to verify";
 
+class DigestTest(unittest.TestCase):
+    def testIncrementalHMAC(self):
+        key, msg = b'k' * 100, b'hello world' * 1000
+        h = HMAC(key)
+        h.update(memoryview(msg)[:5000])
+        h.update(bytearray(msg[5000:]))
+        assert h.digest() == hmac.new(key, msg, sha256).digest()
+        assert h.verify(hmac.new(key, msg, sha256).digest()) and not h.verify(b'0' * 32)
+        c = h.copy()
+        c.update(b'more')
+        assert c.digest() != h.digest() and h.hexdigest() == hmac.new(key, msg, sha256).hexdigest()
+        assert Hash('sha256', msg).digest() == sha256(msg).digest()
+
+    def testHKDF(self):
+        # RFC 5869, test case 1
+        kdf = HKDF(bytes(range(13)))
+        kdf.update(b'\x0b' * 22)
+        okm = kdf.expand(42, bytes(range(0xf0, 0xfa)))
+        assert okm.hex() == '3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf34007208d5b887185865'
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,74 @@
+'''
+Helpers for batch signature verification.
+
+A batch of signatures is checked with the small-exponent test: every
+verification equation is raised to a short random exponent and all equations
+are multiplied together, so that a single (multi-)pairing or multi-exponentiation
+replaces one check per signature. A batch that contains an invalid signature
+passes with probability at most 2^-bits. When the combined check fails, the batch
+is bisected to find the offending signatures.
+'''
+from charm.core.math.integer import randomBits
+
+def smallExponents(count, bits=64):
+    """returns count random non-zero integers of at most bits bits."""
+    return [int(randomBits(bits)) | 1 for i in range(count)]
+
+def findInvalid(check, indices):
+    """returns the sublist of indices rejected by check, where check(subset)
+    returns True iff every signature in subset is valid. Halves of a failing
+    batch are checked recursively, so k bad signatures among n cost
+    O(k log n) calls."""
+    if not indices or check(indices):
+        return []
+    if len(indices) == 1:
+        return list(indices)
+    mid = len(indices) // 2
+    bad = findInvalid(check, indices[:mid])
+    right = indices[mid:]
+    # if the left half was clean the right half must contain a bad signature
+    if not bad and len(right) == 1:
+        return list(right)
+    return bad + findInvalid(check, right)
+
+def toResults(count, invalid):
+    """turns a list of invalid indices into one boolean per signature."""
+    results = [True] * count
+    for i in invalid:
+        results[i] = False
+    return results
+
+def verifyBLSBatch(group, items, dump):
+    """batch verification of BLS signatures, items being a sequence of
+    (pk, sig, message) tuples with pk holding 'g' and 'g^x'. Checks
+
+        prod_g e(prod_i sig_i^d_i, g) * prod_pk e(prod_i H(M_i)^-d_i, g^x) == 1
+
+    with a single multi-pairing and returns one boolean per item."""
+    # imported here so that non-pairing schemes using this module do not load the pairing library
+    from charm.toolbox.pairinggroup import G1, GT
+    items = list(items)
+    hashes = [group.hash(dump(m), G1) for (pk, sig, m) in items]
+    deltas = smallExponents(len(items))
+    one = group.init(GT, 1)
+
+    def check(subset):
+        # signatures sharing a generator and messages sharing a public key
+        # are combined into one pairing argument
+        sigs, msgs = {}, {}
+        for i in subset:
+            (pk, sig, m) = items[i]
+            for (table, g, base) in ((sigs, pk['g'], sig), (msgs, pk['g^x'], hashes[i])):
+                (_, bases, exps) = table.setdefault(str(g), (g, [], []))
+                bases.append(base)
+                exps.append(deltas[i])
+        lhs, rhs = [], []
+        for (g, bases, exps) in sigs.values():
+            lhs.append(group.multiexp(bases, exps))
+            rhs.append(g)
+        for (g_x, bases, exps) in msgs.values():
+            lhs.append(1 / group.multiexp(bases, exps))
+            rhs.append(g_x)
+        return group.pair_prod(lhs, rhs) == one
+
+    return toResults(len(items), findInvalid(check, list(range(len(items)))))
@@ -42,6 +42,14 @@ class ECGroup():
         if _type == ZR or _type == G:
             return random(self.ec_group, _type)
         return None
+
+    def random_many(self, _type=ZR, count=1, seed=None):
+        """returns a list of count random elements in ZR or G drawn in one call from a
+        per-thread ChaCha20 DRBG seeded from the OS, or reproducibly from seed (bytes),
+        which is meant for benchmarks and tests only"""
+        if _type == ZR or _type == G:
+            return ecc.random_many(self.ec_group, _type, count, seed)
+        return None
     
     def encode(self, message, include_ctr=False):
         """encode arbitrary string as a group element. Max size is dependent on the EC group order"""
@@ -84,6 +92,25 @@ class ECGroup():
             return hashEC(self.ec_group, args, target_type)
         raise Exception("ECGroup - invalid input for hash")
     
+    def multiexp(self, bases, exponents):
+        """computes the product of bases[i] ** exponents[i] for points in G and
+        exponents in ZR (or integers) in a single pass over the exponent bits.
+        Not constant time: use it for public exponents only, as in verification."""
+        assert len(bases) == len(exponents), "unequal number of bases and exponents"
+        assert len(bases) > 0, "multiexp of an empty list"
+        return ecc.multiexp(self.ec_group, bases, exponents)
+
+    def vector(self, elements):
+        """packs a non-empty sequence of points (or ZR elements) into a native
+        ElementVector, see PairingGroup.vector. The serialized form has the layout of
+        the PBC pairing vectors: fixed-length encodings back to back (compressed points,
+        ZR padded to the length of the order), also exported through the buffer protocol."""
+        return ecc.vector(self.ec_group, elements)
+
+    def deserializeVector(self, type, data):
+        """inverse of ElementVector.serialize for a vector of elements of the given type"""
+        return ecc.deserializeVector(self.ec_group, type, data)
+
     def zr(self, point):
         """get the X coordinate only"""
         if type(point) == ec_element:
@@ -0,0 +1,99 @@
+'''
+Vectors of group elements.
+
+With the PBC backend, PairingGroup.vector() returns the native
+charm.core.math.pairing.ElementVector, which keeps its elements in one C array
+and runs every operation in one call, and ECGroup.vector() returns its
+counterpart charm.core.math.elliptic_curve.ElementVector. Both serialize to the
+fixed-length encodings of their elements back to back. This module provides the
+same interface in Python for the RELIC and MIRACL pairing backends, so scheme
+code can be written once against ``group.vector()``. These backends have no
+fixed-length element encoding, so here the serialized elements are
+length-prefixed instead.
+
+>>> from charm.toolbox.pairinggroup import PairingGroup, ZR, G1
+>>> group = PairingGroup('SS512')
+>>> g = group.random(G1)
+>>> r = group.vector([group.random(ZR) for i in range(4)])
+>>> list(g ** r) == [g ** x for x in r]
+True
+'''
+import struct
+from functools import reduce
+
+_length = struct.Struct('>I')
+
+class ElementVector:
+    """immutable sequence of elements of one group supporting elementwise and
+    broadcast multiplication and exponentiation."""
+    def __init__(self, group, elements):
+        self.group = group
+        self._elements = list(elements)
+        assert len(self._elements) > 0, "vector is empty."
+        self.type = self._elements[0].type
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __getitem__(self, index):
+        return self._elements[index]
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __eq__(self, other):
+        if not isinstance(other, ElementVector):
+            return NotImplemented
+        return self._elements == other._elements
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _pairwise(self, other, op):
+        if isinstance(other, ElementVector):
+            assert len(other) == len(self), "vectors must have the same length."
+            return ElementVector(self.group, [op(a, b) for (a, b) in zip(self._elements, other._elements)])
+        return ElementVector(self.group, [op(a, other) for a in self._elements])
+
+    def __mul__(self, other):
+        return self._pairwise(other, lambda a, b: a * b)
+
+    def __rmul__(self, other):
+        return ElementVector(self.group, [other * a for a in self._elements])
+
+    def __pow__(self, other):
+        return self._pairwise(other, lambda a, b: a ** b)
+
+    def __rpow__(self, base):
+        return ElementVector(self.group, [base ** x for x in self._elements])
+
+    def multiexp(self, exponents):
+        """computes prod_i self[i] ** exponents[i], for public exponents only."""
+        return self.group.multiexp(self._elements, list(exponents))
+
+    def prod(self):
+        """multiplies all elements together."""
+        return reduce(lambda a, b: a * b, self._elements)
+
+    def serialize(self):
+        """concatenation of the length-prefixed serialized elements."""
+        return b''.join(_length.pack(len(data)) + data
+                        for data in (self.group.serialize(e) for e in self._elements))
+
+    def __bytes__(self):
+        return self.serialize()
+
+    def __repr__(self):
+        return "<ElementVector type=%s length=%d>" % (self.type, len(self._elements))
+
+def deserializeVector(group, data):
+    """inverse of ElementVector.serialize."""
+    data = memoryview(data)
+    elements, offset = [], 0
+    while offset < len(data):
+        (size,) = _length.unpack_from(data, offset)
+        offset += _length.size
+        elements.append(group.deserialize(bytes(data[offset:offset + size])))
+        offset += size
+    return ElementVector(group, elements)
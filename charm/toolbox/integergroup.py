@@ -4,10 +4,22 @@ try:
 except Exception as err:
   print(err)
   exit(-1)
+
+# Montgomery contexts are immutable, so one context per modulus is shared by every
+# group and fixed-base table that uses it
+_montgomery_contexts = {}
+
+def montgomeryContext(modulus):
+    """returns the Montgomery context of an odd modulus, creating it on first use."""
+    key = int(modulus)
+    ctx = _montgomery_contexts.get(key)
+    if ctx is None:
+        ctx = _montgomery_contexts[key] = montgomery(modulus)
+    return ctx
     
 class IntegerGroup:
     def __init__(self, start=0):
-        pass
+        self._fixed_bases = {}
 
     def setparam(self, p, q): 
         if p == (2 * q) + 1 and isPrime(p) and isPrime(q):
@@ -62,7 +74,33 @@ class IntegerGroup:
             return random(self.p)        
         else:
             return random(max)
+
+    def random_many(self, max=0, count=1, seed=None):
+        """returns a list of count random integers mod max (by default mod p) drawn
+        in one call from a per-thread ChaCha20 DRBG seeded from the OS, or reproducibly
+        from seed (bytes), which is meant for benchmarks and tests only."""
+        if max == 0:
+            return random_many(self.p, count, seed)
+        return random_many(max, count, seed)
     
+    def precompute(self, g, bits=None):
+        """builds a fixed-base comb table for a long-lived element g mod p, used by
+        exp() for exponents of up to bits bits (by default the size of p). Every
+        table is kept for the lifetime of the group, so only precompute generators
+        that are reused across many exponentiations."""
+        if bits is None:
+            bits = bitsize(self.p)
+        self._fixed_bases[(int(g), int(self.p))] = montgomeryContext(self.p).precompute(g, bits)
+
+    def exp(self, g, x):
+        """computes g ** x, using the comb table of g if it was precomputed. The comb
+        is not constant-time, so x must be public (e.g. a verification exponent);
+        raise secret exponents with g ** x instead."""
+        table = self._fixed_bases.get((int(g), int(self.p))) if self._fixed_bases else None
+        if table is None:
+            return g ** x
+        return table.pow(x)
+
     def encode(self, M):
         return encode(M, self.p, self.q)
      
@@ -107,7 +145,7 @@ class IntegerGroup:
 
 class IntegerGroupQ:
     def __init__(self, start=0):
-        pass
+        self._fixed_bases = {}
 
     def __str__(self):
         outStr = ""
@@ -166,7 +204,31 @@ class IntegerGroupQ:
             return random(self.q)
         else:
             return random(max)
+
+    def random_many(self, max=0, count=1, seed=None):
+        """as IntegerGroup.random_many, mod q by default."""
+        if max == 0:
+            return random_many(self.q, count, seed)
+        return random_many(max, count, seed)
     
+    def precompute(self, g, bits=None):
+        """builds a fixed-base comb table for a long-lived element g mod p, used by
+        exp() for exponents of up to bits bits (by default the size of q). Every
+        table is kept for the lifetime of the group, so only precompute generators
+        that are reused across many exponentiations."""
+        if bits is None:
+            bits = bitsize(self.q)
+        self._fixed_bases[(int(g), int(self.p))] = montgomeryContext(self.p).precompute(g, bits)
+
+    def exp(self, g, x):
+        """computes g ** x, using the comb table of g if it was precomputed. The comb
+        is not constant-time, so x must be public (e.g. a verification exponent);
+        raise secret exponents with g ** x instead."""
+        table = self._fixed_bases.get((int(g), int(self.p))) if self._fixed_bases else None
+        if table is None:
+            return g ** x
+        return table.pow(x)
+
     def encode(self, M):
         return encode(M, self.p, self.q)
      
@@ -258,6 +320,12 @@ class RSAGroup:
         else:
             return random(max)
 
+    def random_many(self, max=0, count=1, seed=None):
+        """as IntegerGroup.random_many, mod n by default."""
+        if max == 0:
+            return random_many(self.n, count, seed)
+        return random_many(max, count, seed)
+
     def groupSetting(self):
         return 'integer'
 
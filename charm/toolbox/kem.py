@@ -0,0 +1,75 @@
+'''
+Key encapsulation for the hybrid adapters.
+
+A hybrid scheme encrypts a random GT element under the public-key scheme and
+uses a key derived from that element to encrypt the message. This module
+derives the symmetric key directly as raw bytes with HKDF-SHA256 (RFC 5869)
+over the canonical encoding of the element. It also defines a binary envelope
+that holds the encapsulation and the symmetric ciphertext:
+
+    envelope: ENVELOPE_MAGIC | version (1) | length (4) | encapsulation | stream
+
+The encapsulation is written with objectToBytes. The stream is the AES-GCM output of
+SymmetricCryptoAbstraction.encrypt_stream, with everything before it passed as
+associated data, so an encapsulation cannot be moved to another envelope.
+
+>>> from charm.toolbox.pairinggroup import PairingGroup, GT
+>>> group = PairingGroup('SS512')
+>>> element = group.random(GT)
+>>> key = elementKey(group, element)
+>>> len(key), key == elementKey(group, group.deserialize(group.serialize(element)))
+(32, True)
+>>> data = sealEnvelope(group, {'c': element}, key, b'attack at dawn')
+>>> openEnvelope(group, data, lambda c1: elementKey(group, c1['c']))
+b'attack at dawn'
+'''
+import struct
+from base64 import b64decode
+from charm.core.crypto.cryptobase import HKDF, MODE_GCM
+from charm.core.engine.util import objectToBytes, bytesToObject
+from charm.toolbox.symcrypto import SymmetricCryptoAbstraction
+
+ENVELOPE_MAGIC = b'CHE'
+ENVELOPE_VERSION = 1
+_header = struct.Struct('>BI')
+
+def hkdf(ikm, length=32, salt=b'', info=b''):
+    """HKDF-SHA256 extract-and-expand of the input keying material ikm."""
+    kdf = HKDF(salt)
+    kdf.update(ikm)
+    return kdf.expand(length, info)
+
+def elementBytes(group, element):
+    """returns the canonical (uncompressed, unencoded) bytes of a group element."""
+    return b64decode(group.serialize(element, compression=False).split(b':', 1)[1])
+
+def elementKey(group, element, length=32, info=b''):
+    """derives a length-byte symmetric key from a group element, e.g. the GT
+    element encapsulated by a hybrid scheme."""
+    return hkdf(elementBytes(group, element), length, info=b'charm kem' + info)
+
+def sealEnvelope(group, c1, key, message, chunk_size=65536):
+    """returns the envelope of the encapsulation c1 and message encrypted under key."""
+    if type(message) != bytes:
+        message = bytes(message, 'utf-8')
+    c1_bytes = objectToBytes(c1, group)
+    header = ENVELOPE_MAGIC + _header.pack(ENVELOPE_VERSION, len(c1_bytes)) + c1_bytes
+    cipher = SymmetricCryptoAbstraction(key, mode=MODE_GCM)
+    return header + b''.join(cipher.encrypt_stream([message], chunk_size, associatedData=header))
+
+def openEnvelope(group, data, decapsulate, max_chunk_size=65536):
+    """decrypts an envelope written by sealEnvelope, where decapsulate(c1) returns
+    the key for the encapsulation c1. Raises ValueError on malformed or forged data,
+    including envelopes sealed with a chunk_size above max_chunk_size."""
+    data = bytes(data)
+    start = len(ENVELOPE_MAGIC) + _header.size
+    if len(data) < start or not data.startswith(ENVELOPE_MAGIC):
+        raise ValueError("not an envelope")
+    (version, length) = _header.unpack_from(data, len(ENVELOPE_MAGIC))
+    if version != ENVELOPE_VERSION:
+        raise ValueError("unsupported envelope version %d" % version)
+    if len(data) < start + length:
+        raise ValueError("truncated envelope")
+    header = data[:start + length]
+    cipher = SymmetricCryptoAbstraction(decapsulate(bytesToObject(header[start:], group)))
+    return b''.join(cipher.decrypt_stream([data[start + length:]], associatedData=header, max_chunk_size=max_chunk_size))
@@ -3,22 +3,81 @@ This class is adapted from the SecretUtil class in charm/toolbox/secretutil.py.
 It provides the following methods:
 - createPolicy: convert a Boolean formula encoded as a string into a policy represented like a tree;
 - convertPolicyToMSP: convert a policy into a monotone span program (MSP);
+- convert_policy_to_sparse_msp: the same MSP with every row as its non-zero (column, entry) pairs;
 - getCoefficients: given a policy, returns a coefficient for every attribute;
 - strip_index: remove the index from an attribute (i.e., x_y -> x);
 - prune: determine whether a given set of attributes satisfies the policy
-    (returns false if it doesn't, otherwise a good enough subset of attributes);
+    (returns false if it doesn't, otherwise the cheapest subset of attributes);
 - getAttributeList: retrieve the attributes that occur in a policy tree in order (left to right).
 """
 
 from charm.core.math.pairing import ZR
 from charm.toolbox.policytree import *
+from charm.toolbox.policycache import policy_cache, _labelPolicy
+
+
+def sparse_row(row):
+    """
+    Returns the non-zero (column, entry) pairs of an MSP row.
+    """
+
+    return [(j, e) for (j, e) in enumerate(row) if e != 0]
+
+
+def row_product(terms, row, prod=None):
+    """
+    Returns prod times the product of terms[j] ** e over the (j, e) pairs of a sparse
+    row, multiplying by terms[j] for e = 1 and dividing for e = -1, which are the only
+    entries convert_policy_to_msp produces. Other entries fall back to exponentiation.
+
+    >>> row_product([2, 3, 5, 7], sparse_row([1, 0, -1, 2]), 10)
+    196.0
+    """
+
+    for (j, e) in row:
+        if e == 1:
+            term = terms[j]
+        elif e == -1:
+            prod = prod / terms[j] if prod is not None else terms[j] ** -1
+            continue
+        else:
+            term = terms[j] ** e
+        prod = prod * term if prod is not None else term
+    return prod
+
+
+def row_sum(values, row):
+    """
+    Returns the inner product of an MSP row in sparse form with values, e.g. the share
+    of the row for the secret vector values, by adding and subtracting for the entries
+    1 and -1.
+
+    >>> row_sum([2, 3, 5, 7], sparse_row([1, 0, -1, 2]))
+    11
+    """
+
+    total = 0
+    for (j, e) in row:
+        if e == 1:
+            total += values[j]
+        elif e == -1:
+            total -= values[j]
+        else:
+            total += e * values[j]
+    return total
 
 
 class MSP:
 
-    def __init__(self, groupObj, verbose=True):
+    def __init__(self, groupObj, verbose=True, cache=policy_cache):
+        """
+        cache is the PolicyCache shared with SecretUtil (the module-wide cache by default),
+        or None to parse and convert policies on every call.
+        """
+
         self.len_longest_row = 1
         self.group = groupObj
+        self.cache = cache
 
     def createPolicy(self, policy_string):
         """
@@ -28,14 +87,10 @@ class MSP:
         assert type(policy_string) in [bytes, str], "invalid type for policy_string"
         if type(policy_string) == bytes:
             policy_string = policy_string.decode('utf-8')
-        parser = PolicyParser()
-        policy_obj = parser.parse(policy_string)
-        _dictCount, _dictLabel = {}, {}
-        parser.findDuplicates(policy_obj, _dictCount)
-        for i in _dictCount.keys():
-            if _dictCount[i] > 1: _dictLabel[i] = 0
-        parser.labelDuplicates(policy_obj, _dictLabel)
-        return policy_obj
+        if self.cache is not None:
+            # the returned tree is shared with other callers, do not modify it
+            return self.cache.compile(policy_string).tree
+        return _labelPolicy(PolicyParser(), policy_string)
 
     def convert_policy_to_msp(self, tree):
         """
@@ -43,10 +98,26 @@ class MSP:
         represented by a dictionary with (attribute, row) pairs
         """
 
+        compiled = self.cache.lookup(tree) if self.cache is not None else None
+        if compiled:
+            rows, self.len_longest_row = compiled.getMSP(self._compute_msp)
+            return dict(rows)
+        return self._compute_msp(tree)[0]
+
+    def convert_policy_to_sparse_msp(self, tree):
+        """
+        Convert a policy into an MSP like convert_policy_to_msp, with every row given
+        as the list of its non-zero (column, entry) pairs (see sparse_row, row_product and row_sum).
+        """
+
+        return {attr: sparse_row(row) for (attr, row) in self.convert_policy_to_msp(tree).items()}
+
+    def _compute_msp(self, tree):
         root_vector = [1]
         # listOfAttributeRowPairs = {}
         self.len_longest_row = 1
-        return self._convert_policy_to_msp(tree, root_vector)
+        rows = self._convert_policy_to_msp(tree, root_vector)
+        return rows, self.len_longest_row
 
     def _convert_policy_to_msp(self, subtree, curr_vector):
         """
@@ -84,6 +155,9 @@ class MSP:
             left_list.update(right_list)
             return left_list
 
+        if type == OpType.THRESHOLD:
+            raise ValueError("threshold gates are not supported by MSP: '%s'" % subtree)
+
         return None
 
     def getCoefficients(self, tree):
@@ -91,6 +165,12 @@ class MSP:
         Given a policy, returns a coefficient for every attribute.
         """
 
+        compiled = self.cache.lookup(tree) if self.cache is not None else None
+        if compiled:
+            return dict(compiled.getCoefficients(self.group, self._computeCoefficients))
+        return self._computeCoefficients(tree)
+
+    def _computeCoefficients(self, tree):
         coeffs = {}
         self._getCoefficientsDict(tree, coeffs)
         return coeffs
@@ -133,6 +213,8 @@ class MSP:
             elif (node == OpType.ATTR):
                 attr = tree.getAttributeAndIndex()
                 coeff_list[attr] = coeff
+            elif (node == OpType.THRESHOLD):
+                raise ValueError("threshold gates are not supported by MSP: '%s'" % tree)
             else:
                 return None
 
@@ -145,20 +227,24 @@ class MSP:
             return node_str.split('_')[0]
         return node_str
 
-    def prune(self, policy, attributes):
+    def prune(self, policy, attributes, cost=None):
         """
         Determine whether a given set of attributes satisfies the policy
-        (returns false if it doesn't, otherwise a good enough subset of attributes).
+        (returns false if it doesn't, otherwise the cheapest subset of attributes,
+        see PolicyParser.minimalAttributes).
         """
 
         parser = PolicyParser()
-        return parser.prune(policy, attributes)
+        return parser.prune(policy, attributes, cost)
 
     def getAttributeList(self, Node):
         """
          Retrieve the attributes that occur in a policy tree in order (left to right).
         """
 
+        compiled = self.cache.lookup(Node) if self.cache is not None else None
+        if compiled:
+            return list(compiled.attributes)
         aList = []
         self._getAttributeList(Node, aList)
         return aList
@@ -170,6 +256,6 @@ class MSP:
         if (Node.getNodeType() == OpType.ATTR):
             List.append(Node.getAttributeAndIndex())  # .getAttribute()
         else:
-            self._getAttributeList(Node.getLeft(), List)
-            self._getAttributeList(Node.getRight(), List)
+            for child in Node.getChildren():
+                self._getAttributeList(child, List)
         return None
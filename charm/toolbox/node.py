@@ -29,7 +29,10 @@ class BinNode:
           self.threshold = 1
       elif self.type == OpType.AND:
           self.threshold = 2
-#      elif self.type == OpType.THRESHOLD: 
+      elif self.type == OpType.THRESHOLD:
+          # k-of-n gate, see addSubNodes
+          self.threshold = None
+          self.children = []
       self.attribute = ''
     else:
       self.type = None
@@ -56,6 +59,8 @@ class BinNode:
         return ('('+ left + ' or ' + right + ')')
       elif(self.type == OpType.AND):
       	return ('(' + left + ' and ' + right + ')')
+      elif(self.type == OpType.THRESHOLD):
+        return ('(' + str(self.threshold) + ' of (' + ', '.join([str(c) for c in self.children]) + '))')
     return None
   
   def getAttribute(self):
@@ -99,22 +104,30 @@ class BinNode:
         
   def getNodeType(self):
     return self.type
+
+  def getChildren(self):
+    if self.type == OpType.THRESHOLD:
+      return self.children
+    return [child for child in (self.left, self.right) if child is not None]
     
   def addSubNode(self, left, right):
     # set subNodes appropriately
     self.left = left if left != None else None
     self.right = right if left != None else None
 
+  def addSubNodes(self, threshold, children):
+    # children of a k-of-n threshold gate, which has no left and right node
+    assert self.type == OpType.THRESHOLD, "not a threshold gate"
+    assert 1 <= threshold <= len(children), "threshold must be between 1 and the number of children"
+    self.threshold = threshold
+    self.children = list(children)
+
   # only applies function on leaf nodes
   def traverse(self, function):
     # visit node then traverse left and right
     function(self.type, self)
-    if(self.left == None):
-      return None
-    self.left.traverse(function)
-    if(self.right == None):
-      return None
-    self.right.traverse(function)
+    for child in self.getChildren():
+      child.traverse(function)
     return None	
 
 
@@ -1,3 +1,7 @@
+from base64 import b64decode
+from collections import OrderedDict
+import struct
+import threading
 try:
   from charm.toolbox.pairingcurves import params as param_info
   from charm.core.math.pairing import pairing,pc_element,ZR,G1,G2,GT,init,pair,hashPair,H,random,serialize,deserialize,ismember,order
@@ -6,6 +10,7 @@ try:
 except Exception as err:
   print(err)
   exit(-1)
+from charm.toolbox.elementvector import ElementVector, deserializeVector
 
 class PairingGroup():
     def __init__(self, param_id, param_file=False, secparam=512, verbose=False):
@@ -27,6 +32,13 @@ class PairingGroup():
  
         self.secparam = secparam # number of bits
         self._verbose = verbose
+        # fixed bases registered with precompute(): serialized form => compressed form,
+        # and compressed form => (type, table entries, bytes per entry)
+        self._fixed_bases = {}
+        self._fixed_base_info = {}
+        self._hash_cache = None
+        self.gt = None
+        self._gt_lock = threading.Lock()
     
     def __str__(self):
         return str(self.Pairing)
@@ -71,21 +83,57 @@ class PairingGroup():
             
     def random(self, _type=ZR, count=1, seed=None):
         """selects a random element in ZR, G1, G2 and GT"""
+        if _type not in [ZR, G1, G2, GT]: return None
+        if count > 1:
+            return tuple(self.random_many(_type, count))
         if _type == GT: return self.__randomGT()
-        elif _type in [ZR, G1, G2]:
-            if seed != None and count == 1:
-                return random(self.Pairing, _type, seed)
-            elif count > 1:
-                return tuple([random(self.Pairing, _type) for i in range(count)])                
-            return random(self.Pairing, _type)
-        return None
+        if seed != None:
+            return random(self.Pairing, _type, seed)
+        return random(self.Pairing, _type)
+
+    def random_many(self, _type=ZR, count=1, seed=None):
+        """returns a list of count random elements of ZR, G1, G2 or GT. With PBC the
+        elements are derived in one call from a per-thread ChaCha20 DRBG seeded from
+        the OS. Passing seed (bytes) selects a generator keyed by that seed instead,
+        so that the same seed always yields the same elements; this is meant for
+        benchmarks and tests and must not be used for keys. GT elements are powers
+        of a fixed random element of GT, so they only repeat for the same group object.
+
+            >>> group = PairingGroup('SS512')
+            >>> len(group.random_many(ZR, 5))
+            5
+            >>> group.random_many(G1, 3, seed=b'bench') == group.random_many(G1, 3, seed=b'bench')
+            True
+            >>> (k1, k2) = group.random(GT, count=2)
+            >>> k1 != k2 and k1.type == GT
+            True
+        """
+        if _type == GT:
+            gt, exponents = self.__generatorGT(), self.random_many(ZR, count, seed)
+            if pairing_lib == libs.pbc and count > 0:
+                return list(gt ** self.vector(exponents))
+            return [gt ** z for z in exponents]
+        if pairing_lib == libs.pbc:
+            return pg.random_many(self.Pairing, _type, count, seed)
+        if seed is None:
+            return [random(self.Pairing, _type) for i in range(count)]
+        return [H(self.Pairing, seed + struct.pack('>I', i), _type) for i in range(count)]
 
         
+    def __generatorGT(self):
+        """returns the fixed random element of GT that random GT elements are powers
+        of. It is computed with one pairing on first use and registered as a fixed
+        base, so that every random(GT) afterwards costs a table exponentiation."""
+        if self.gt is None:
+            with self._gt_lock:
+                if self.gt is None:
+                    gt = pair(self.random(G1), self.random(G2))
+                    self.precompute(gt)
+                    self.gt = gt
+        return self.gt
+
     def __randomGT(self):
-        if not hasattr(self, 'gt'):
-            self.gt = pair(self.random(G1), self.random(G2))
-        z = self.random(ZR)
-        return self.gt ** z
+        return self.__generatorGT() ** self.random(ZR)
     
     def encode(self, message):
         raise NotImplementedException
@@ -95,7 +143,36 @@ class PairingGroup():
     
     def hash(self, args, type=ZR):
         """hashes objects into ZR, G1 or G2 depending on the pairing curve"""
+        if self._hash_cache is not None and type in [G1, G2] and isinstance(args, (str, bytes)):
+            return self._hash_cache.get(self.Pairing, args, type)
         return H(self.Pairing, args, type)
+
+    def enableHashCache(self, maxsize=1024, precompute=False):
+        """Memoizes hash(s, G1) and hash(s, G2) for strings s, e.g. attributes and
+        identities that are hashed again on every keygen and encrypt call. The cache
+        keeps the maxsize most recently used points. With precompute=True every cached
+        point also carries a fixed-base table, which speeds up the exponentiations that
+        usually follow at the cost of memory (see precomputeInfo for table sizes).
+        Cached points are shared between callers and must not be modified with set().
+
+            >>> group = PairingGroup('SS512')
+            >>> group.enableHashCache(maxsize=2)
+            >>> group.hash('ALICE', G1) == group.hash('ALICE', G1)
+            True
+            >>> info = group.hashCacheInfo()
+            >>> (info['hits'], info['misses'], info['size'])
+            (1, 1, 1)
+        """
+        self._hash_cache = HashCache(maxsize, precompute)
+
+    def disableHashCache(self):
+        self._hash_cache = None
+
+    def hashCacheInfo(self):
+        """returns the hash cache counters, or None if the cache is disabled"""
+        if self._hash_cache is None:
+            return None
+        return self._hash_cache.stats()
     
     def serialize(self, obj, compression=True):
         """Serialize a pairing object into bytes.
@@ -125,8 +202,76 @@ class PairingGroup():
            :param compression: must be used for objects serialized with the
                 compression parameter set to True. Default is True for
                 compatibility with previous versions of charm.
+
+           Elements registered with precompute() get their pre-processing
+           tables rebuilt when deserialized.
         """
-        return deserialize(self.Pairing, obj, compression)
+        element = deserialize(self.Pairing, obj, compression)
+        if self._fixed_bases and obj in self._fixed_bases:
+            element.initPP()
+        return element
+
+    def precompute(self, element):
+        """Marks a long-lived element of G1, G2 or GT as a fixed base. The backend
+        builds a pre-processing table used by every later exponentiation of the
+        element, and copies obtained through deserialize() get a table as well, so
+        bases survive serialization of the public parameters. Returns False if the
+        backend has no table for the element's group (e.g. GT on RELIC).
+
+            >>> group = PairingGroup('SS512')
+            >>> g = group.random(G1)
+            >>> group.precompute(g)
+            True
+            >>> h = group.deserialize(group.serialize(g))
+            >>> h.preproc == 1 and h == g
+            True
+            >>> g ** 3 == g * g * g
+            True
+            >>> group.precomputeInfo()['bases']
+            1
+        """
+        if element.type not in [G1, G2, GT]:
+            return False
+        if not element.preproc and not element.initPP():
+            return False
+        key = self.serialize(element, compression=True)
+        if key not in self._fixed_base_info:
+            entry_size = len(b64decode(self.serialize(element, compression=False).split(b':', 1)[1]))
+            self._fixed_base_info[key] = (element.type, self._tableEntries(element.type), entry_size)
+            self._fixed_bases[key] = key
+            self._fixed_bases[self.serialize(element, compression=False)] = key
+        return True
+
+    def precomputeKey(self, key):
+        """Marks every G1, G2 and GT element of a (possibly nested) dict, list or
+        tuple as a fixed base, e.g. a public key loaded with bytesToObject.
+        Returns the number of elements with a pre-processing table."""
+        if type(key) == dict:
+            return sum([self.precomputeKey(v) for v in key.values()])
+        elif type(key) in [list, tuple]:
+            return sum([self.precomputeKey(v) for v in key])
+        elif isinstance(key, pc_element) and key.type in [G1, G2, GT]:
+            return 1 if self.precompute(key) else 0
+        return 0
+
+    def precomputeInfo(self):
+        """Returns the number of registered fixed bases and an estimate of the memory
+        used by their pre-processing tables (per element, whatever the number of copies)."""
+        total = 0
+        for (_type, entries, entry_size) in self._fixed_base_info.values():
+            total += entries * entry_size
+        return { 'bases':len(self._fixed_base_info), 'bytes':total }
+
+    def _tableEntries(self, _type):
+        """approximate number of group elements stored in one pre-processing table"""
+        if pairing_lib == libs.relic:
+            return pg.G1_TABLE if _type == G1 else pg.G2_TABLE
+        elif pairing_lib == libs.miracl:
+            # MIRACL's PFC precomputes a comb table of roughly one point per 8-bit window
+            return 1 << 8
+        # PBC's default table: one row of 2^5 elements per 5-bit window of the exponent
+        bits = int(self.order()).bit_length()
+        return ((bits + 4) // 5) * (1 << 5)
     
     def debug(self, data, prefix=None):
         if not self._verbose:
@@ -146,8 +291,63 @@ class PairingGroup():
     
     def pair_prod(self, lhs, rhs):
         """takes two lists of G1 & G2 and computes a pairing product"""
+        if pairing_lib == libs.relic:
+            # the RELIC module has no multi-pairing, fall back to a product of pairings
+            result = pair(lhs[0], rhs[0])
+            for i in range(1, len(lhs)):
+                result *= pair(lhs[i], rhs[i])
+            return result
         return pair(lhs, rhs, self.Pairing)
 
+    def multiexp(self, bases, exponents):
+        """computes the product of bases[i] ** exponents[i] for bases in G1, G2 or GT
+        and exponents in ZR (or integers). With PBC the squarings are shared
+        between all terms (Straus for few terms, Pippenger buckets for many), the
+        other backends fall back to a product of single exponentiations.
+        The running time depends on the exponents, so only pass public values
+        (as in encryption, verification and decryption); key generation and
+        signing keep their secret exponents on **.
+
+        >>> group = PairingGroup('SS512')
+        >>> g, h = group.random(G1), group.random(G1)
+        >>> a, b = group.random(ZR), group.random(ZR)
+        >>> group.multiexp([g, h], [a, b]) == (g ** a) * (h ** b)
+        True
+        """
+        assert len(bases) == len(exponents), "unequal number of bases and exponents"
+        assert len(bases) > 0, "multiexp of an empty list"
+        if pairing_lib == libs.pbc:
+            return pg.multiexp(self.Pairing, bases, exponents)
+        result = bases[0] ** exponents[0]
+        for i in range(1, len(bases)):
+            result *= bases[i] ** exponents[i]
+        return result
+
+    def vector(self, elements):
+        """packs a non-empty sequence of elements of one group (ZR, G1, G2 or GT) into
+        an ElementVector. Vectors support elementwise and broadcast * and **, including
+        g ** v for a ZR vector v, as well as multiexp(), prod() and serialize(). With
+        PBC the vector is a native object whose operations run in a single call and
+        which also exports its serialized form through the buffer protocol.
+
+        >>> group = PairingGroup('SS512')
+        >>> g, a, b = group.random(G1), group.random(ZR), group.random(ZR)
+        >>> v = group.vector([g, g ** 2]) ** group.vector([a, b])
+        >>> list(v) == [g ** a, (g ** 2) ** b]
+        True
+        >>> group.deserializeVector(G1, v.serialize()) == v
+        True
+        """
+        if pairing_lib == libs.pbc:
+            return pg.vector(self.Pairing, elements)
+        return ElementVector(self, elements)
+
+    def deserializeVector(self, type, data):
+        """inverse of ElementVector.serialize for a vector of elements of the given type"""
+        if pairing_lib == libs.pbc:
+            return pg.deserializeVector(self.Pairing, type, data)
+        return deserializeVector(self, data)
+
     def InitBenchmark(self):
         """initiates the benchmark state"""
         return pg.InitBenchmark(self.Pairing)
@@ -175,6 +375,94 @@ class PairingGroup():
         return pg.GetBenchmark(self.Pairing, option)
 
 
+class HashCache:
+    """thread-safe LRU cache of hashed G1/G2 points, see PairingGroup.enableHashCache"""
+    def __init__(self, maxsize=1024, precompute=False):
+        assert maxsize > 0, "maxsize must be positive"
+        self.maxsize = maxsize
+        self.precompute = precompute
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, pairing, args, _type):
+        key = (args, _type)
+        with self._lock:
+            element = self._entries.get(key)
+            if element is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return element
+            self.misses += 1
+        # hash outside of the lock, concurrent misses on one key hash it twice
+        element = H(pairing, args, _type)
+        if self.precompute:
+            element.initPP()
+        with self._lock:
+            self._entries[key] = element
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return element
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return { 'size':len(self._entries), 'maxsize':self.maxsize, 'hits':self.hits,
+                     'misses':self.misses, 'evictions':self.evictions, 'precompute':self.precompute }
+
+
+class PairingProduct:
+    """Accumulates a product of pairings prod e(a_i, b_i)^c_i and evaluates it with a single
+    multi-pairing (see PairingGroup.pair_prod) instead of one pairing per term.
+
+    Exponents are folded into the first argument, e(a, b)^c = e(a^c, b), so a source group
+    exponentiation replaces a GT exponentiation. Terms whose second argument is the same
+    element object are aggregated, e(a1, b) * e(a2, b) = e(a1 * a2, b), which saves a Miller
+    loop per repeated element.
+
+    >>> group = PairingGroup('SS512')
+    >>> g, h, c = group.random(G1), group.random(G2), group.random(ZR)
+    >>> prod = PairingProduct(group).add(g, h, c).add(g ** 2, h).divide(g, h)
+    >>> prod.evaluate() == pair(g, h) ** (c + 1)
+    True
+    """
+    def __init__(self, group):
+        self.group = group
+        self.terms = {}
+
+    def add(self, a, b, exponent=None):
+        """multiplies the product by e(a, b)^exponent"""
+        if exponent is not None and not (type(exponent) == int and exponent == 1):
+            a = a ** exponent
+        term = self.terms.get(id(b))
+        if term is None:
+            self.terms[id(b)] = [a, b]
+        else:
+            term[0] = term[0] * a
+        return self
+
+    def divide(self, a, b, exponent=None):
+        """multiplies the product by e(a, b)^-exponent"""
+        if exponent is not None and not (type(exponent) == int and exponent == 1):
+            a = a ** exponent
+        return self.add(~a, b)
+
+    def evaluate(self):
+        """computes the product, returning the identity of GT if no terms were added"""
+        if not self.terms:
+            return self.group.init(GT, 1)
+        lhs, rhs = [], []
+        for (a, b) in self.terms.values():
+            # asymmetric backends expect the G1 argument on the left
+            if a.type == G2 and b.type == G1: a, b = b, a
+            lhs.append(a); rhs.append(b)
+        return self.group.pair_prod(lhs, rhs)
+
+
 def extract_key(g):
     """
     Given a group element, extract a symmetric key
@@ -0,0 +1,166 @@
+'''
+Bounded LRU cache of compiled access policies.
+
+Parsing a policy string, labeling duplicate attributes and recovering the
+Lagrange coefficients of every leaf is repeated by ABE schemes on every encrypt
+and decrypt call even though most deployments only use a small set of distinct
+policies. A compiled policy keeps the results of that work around:
+
+- the labeled policy tree;
+- the ordered attribute list;
+- the per-leaf coefficients (computed lazily, once per group and algorithm);
+- the MSP share layout, i.e. the rows and number of columns (computed lazily).
+
+The cache is shared by :class:`charm.toolbox.secretutil.SecretUtil` and
+:class:`charm.toolbox.msp.MSP`. Compiled policies are shared between callers and
+are immutable once built: the tree, the attribute list, the coefficient dicts and
+the MSP rows must be treated as read-only. Callers copy the coefficients and rows
+they hand out, but get the cached tree itself, since SecretUtil matches the nodes
+returned by prune back to the tree by identity.
+
+>>> cache = PolicyCache(maxsize=2)
+>>> p1 = cache.compile('(A and B) or C')
+>>> p2 = cache.compile(' (A and B)   or C ')
+>>> p1 is p2
+True
+>>> p1.attributes
+['A', 'B', 'C']
+>>> cache.stats()['hits'], cache.stats()['misses']
+(1, 1)
+'''
+import threading
+from collections import OrderedDict
+from charm.toolbox.policytree import PolicyParser, OpType
+
+def normalize(policy_string):
+    """collapses runs of whitespace so that cosmetically different spellings
+    of the same policy share a cache entry."""
+    if type(policy_string) == bytes:
+        policy_string = policy_string.decode('utf-8')
+    return ' '.join(policy_string.split())
+
+def _labelPolicy(parser, policy_string):
+    policy_obj = parser.parse(policy_string)
+    _dictCount, _dictLabel = {}, {}
+    parser.findDuplicates(policy_obj, _dictCount)
+    for i in _dictCount.keys():
+        if _dictCount[ i ] > 1: _dictLabel[ i ] = 0
+    parser.labelDuplicates(policy_obj, _dictLabel)
+    return policy_obj
+
+class CompiledPolicy:
+    """parsed and labeled policy together with everything derived from it.
+    All of it is shared by every caller compiling the same policy string and
+    must not be modified."""
+    def __init__(self, policy_string, tree):
+        self.policy = policy_string
+        self.tree = tree
+        self.attributes = []
+        # whether the tree has k-of-n gates with 1 < k < n, whose leaf coefficients
+        # depend on the children used for decryption
+        self.partial = False
+        self._collectAttributes(tree)
+        self._coefficients = {}
+        self._msp = None
+        self._lock = threading.Lock()
+
+    def _collectAttributes(self, node):
+        if node == None: return
+        if node.getNodeType() == OpType.ATTR:
+            self.attributes.append(node.getAttributeAndIndex())
+            return
+        children = node.getChildren()
+        if 1 < node.threshold < len(children):
+            self.partial = True
+        for child in children:
+            self._collectAttributes(child)
+
+    def getCoefficients(self, group, compute):
+        """returns the leaf coefficients over group, calling compute(tree) on
+        first use. Entries are keyed by group and by the function behind compute,
+        as SecretUtil and MSP derive them differently (MSP has no threshold gates)."""
+        key = (group, getattr(compute, '__func__', compute))
+        with self._lock:
+            coeffs = self._coefficients.get(key)
+        if coeffs is None:
+            # computed outside the lock; concurrent first callers all get the entry stored first
+            coeffs = compute(self.tree)
+            with self._lock:
+                coeffs = self._coefficients.setdefault(key, coeffs)
+        return coeffs
+
+    def getMSP(self, compute):
+        """returns the MSP share layout as produced by compute(tree), which is
+        expected to return a (rows, number of columns) pair."""
+        with self._lock:
+            msp = self._msp
+        if msp is None:
+            msp = compute(self.tree)
+            with self._lock:
+                if self._msp is None:
+                    self._msp = msp
+                msp = self._msp
+        return msp
+
+class PolicyCache:
+    """thread-safe LRU mapping of normalized policy strings to CompiledPolicy
+    objects with hit/miss counters."""
+    def __init__(self, maxsize=1024):
+        assert maxsize > 0, "maxsize must be positive"
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._by_tree = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def compile(self, policy_string):
+        """returns the CompiledPolicy for policy_string, parsing it on a miss."""
+        key = normalize(policy_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = CompiledPolicy(key, _labelPolicy(PolicyParser(), key))
+            self._entries[key] = entry
+            self._by_tree[id(entry.tree)] = entry
+            while len(self._entries) > self.maxsize:
+                _, old = self._entries.popitem(last=False)
+                del self._by_tree[id(old.tree)]
+                self.evictions += 1
+        return entry
+
+    def lookup(self, tree):
+        """returns the cached CompiledPolicy owning tree, or None if the tree
+        was not produced by this cache (or has been evicted)."""
+        with self._lock:
+            entry = self._by_tree.get(id(tree))
+        if entry is not None and entry.tree is tree:
+            return entry
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tree.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """returns a dictionary with the cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return { 'size':len(self._entries), 'maxsize':self.maxsize, 'hits':self.hits,
+                     'misses':self.misses, 'evictions':self.evictions }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        # an empty cache is still a cache
+        return True
+
+# default cache shared by SecretUtil and MSP instances
+policy_cache = PolicyCache()
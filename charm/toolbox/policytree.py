@@ -1,11 +1,19 @@
 #!/usr/bin/python
 
-from pyparsing import *
 from charm.toolbox.node import *
-import string
+import string, re
 
 objStack = []
 
+# token patterns of the policy grammar, each consuming trailing whitespace
+_ws = '[ \\t\\n\\r]*'
+whitespaceRE = re.compile(_ws)
+operatorRE = re.compile('(OR|or|AND|and)' + _ws)
+conditionalRE = re.compile('([A-Za-z0-9]+)' + _ws + '(?:<=|>=|==|[<>](?![<>]))' + _ws + '[0-9]+' + _ws)
+thresholdRE = re.compile('([0-9]+)' + _ws + '(?:of|OF)' + _ws + '\\(' + _ws)
+separatorRE = re.compile(',' + _ws)
+attributeRE = re.compile('([A-Za-z0-9\\-_./\\\\?!@#$^&*%]+)' + _ws)
+
 def createAttribute(s, loc, toks):
     if toks[0] == '!':
         newtoks = ""
@@ -36,37 +44,86 @@ def createTree(op, node1, node2):
     node.addSubNode(node1, node2)
     return node
 
+def createThreshold(threshold, children):
+    node = BinNode(OpType.THRESHOLD)
+    node.addSubNodes(threshold, children)
+    return node
+
 class PolicyParser:
+    """parses policy strings such as '(A and B) or !C_1' into BinNode trees.
+
+    Operands are attributes (optionally negated with '!' and indexed with '_n'), numerical
+    comparisons 'attr < value' (which reduce to the attribute) or threshold gates
+    'k of (expr, expr, ...)' satisfied by any k of their n operands, combined with 'and'/'or' gates.
+    Gates have equal precedence and group to the left, i.e. 'A and B or C' is
+    '((A and B) or C)'. Like pyparsing's parseString, trailing text that cannot extend the
+    expression is ignored. The parser keeps no state between calls and is safe to share
+    across threads.
+    """
     def __init__(self, verbose=False):
-        self.finalPol = self.getBNF()
         self.verbose = verbose
 
-    def getBNF(self):
-        # supported operators => (OR, AND, <
-        OperatorOR = Literal("OR").setParseAction(downcaseTokens) | Literal("or")
-        OperatorAND = Literal("AND").setParseAction(downcaseTokens) | Literal("and")
-        Operator = OperatorAND | OperatorOR
-        lpar = Literal("(").suppress()
-        rpar = Literal(")").suppress()
+    def parse(self, string):
+        node, loc = self._expr(string, whitespaceRE.match(string).end())
+        if node is None:
+            raise ValueError("invalid policy: '%s'" % string)
+        return node
 
-        BinOperator = Literal("<=") | Literal(">=") | Literal("==") | Word("<>", max=1)
+    def _expr(self, s, loc):
+        """expr := atom (operator atom)*, grouped to the left."""
+        tree, loc = self._atom(s, loc)
+        if tree is None:
+            return None, loc
+        while True:
+            # operators are matched as prefixes, as with pyparsing's Literal
+            op = operatorRE.match(s, loc)
+            if op is None: break
+            node, loc2 = self._atom(s, op.end())
+            if node is None: break
+            tree = createTree(op.group(1).lower(), tree, node)
+            loc = loc2
+        return tree, loc
 
-        # describes an individual leaf node
-        leafNode =  (Optional("!") + Word(alphanums+'-_./\?!@#$^&*%')).setParseAction( createAttribute )
-        # describes expressions such as (attr < value)
-        leafConditional = (Word(alphanums) + BinOperator + Word(nums)).setParseAction( parseNumConditional )
+    def _atom(self, s, loc):
+        if s.startswith('(', loc):
+            node, loc2 = self._expr(s, whitespaceRE.match(s, loc + 1).end())
+            if node is not None and s.startswith(')', loc2):
+                return node, whitespaceRE.match(s, loc2 + 1).end()
+            return None, loc
+        m = thresholdRE.match(s, loc)
+        if m is not None:
+            return self._threshold(s, m)
+        # 'attr < value' reduces to the attribute itself
+        m = conditionalRE.match(s, loc)
+        if m is not None:
+            return BinNode(m.group(1)), m.end()
+        prefix = ''
+        if s.startswith('!', loc):
+            prefix = '!'
+            loc = whitespaceRE.match(s, loc + 1).end()
+        m = attributeRE.match(s, loc)
+        if m is None:
+            return None, loc
+        return BinNode(prefix + m.group(1)), m.end()
 
-        # describes the node concept
-        node = leafConditional | leafNode 
+    def _threshold(self, s, m):
+        """threshold := k 'of' '(' expr (',' expr)* ')'"""
+        children, loc = [], m.end()
+        while True:
+            node, loc = self._expr(s, loc)
+            if node is None:
+                return None, m.start()
+            children.append(node)
+            sep = separatorRE.match(s, loc)
+            if sep is None: break
+            loc = sep.end()
+        if not s.startswith(')', loc):
+            return None, m.start()
+        threshold = int(m.group(1))
+        if not 1 <= threshold <= len(children):
+            raise ValueError("invalid threshold %d of %d in policy: '%s'" % (threshold, len(children), s))
+        return createThreshold(threshold, children), whitespaceRE.match(s, loc + 1).end()
 
-        expr = Forward()
-        term = Forward()
-        atom = lpar + expr + rpar | (node).setParseAction( pushFirst )
-        term = atom + ZeroOrMore((Operator + term).setParseAction( pushFirst ))
-        expr << term + ZeroOrMore((Operator + term).setParseAction( pushFirst ))
-        finalPol = expr#.setParseAction( printStuff )
-        return finalPol
-    
     def evalStack(self, stack):
         op = stack.pop()
         if op in ["or", "and"]:
@@ -76,48 +133,89 @@ class PolicyParser:
         else:
             # Node value (attribute)
             return op
-    
-    def parse(self, string):
-        global objStack
-        del objStack[:]
-        self.finalPol.parseString(string)
-        return self.evalStack(objStack)
 
     def findDuplicates(self, tree, _dict):
-        if tree.left: self.findDuplicates(tree.left, _dict)
-        if tree.right: self.findDuplicates(tree.right, _dict)
+        for child in tree.getChildren(): self.findDuplicates(child, _dict)
         if tree.getNodeType() == OpType.ATTR:
             key = tree.getAttribute()
             if _dict.get(key) == None: _dict[ key ] = 1
             else: _dict[ key ] += 1
 
     def labelDuplicates(self, tree, _dictLabel):
-        if tree.left: self.labelDuplicates(tree.left, _dictLabel)
-        if tree.right: self.labelDuplicates(tree.right, _dictLabel)
+        for child in tree.getChildren(): self.labelDuplicates(child, _dictLabel)
         if tree.getNodeType() == OpType.ATTR:
             key = tree.getAttribute()
             if _dictLabel.get(key) != None: 
                 tree.index = _dictLabel[ key ]
                 _dictLabel[ key ] += 1
                 
-    def prune(self, tree, attributes):
+    def prune(self, tree, attributes, cost=None):
         """given policy tree and attributes, determine whether the attributes satisfy the policy.
-           if not enough attributes to satisfy policy, return None otherwise, a pruned list of
-           attributes to potentially recover the associated secret.
+           if not enough attributes to satisfy policy, return False otherwise, the cheapest
+           list of attribute nodes that recovers the associated secret (see minimalAttributes).
         """
-        (policySatisfied, prunedList) = self.requiredAttributes(tree, attributes)
-#        print("pruned attrs: ", prunedList)
-#        if prunedList:
-#            for i in prunedList:
-#                print("node: ", i)
-        if not policySatisfied:
-            return policySatisfied        
-        return prunedList
+        result = self.minimalAttributes(tree, attributes, cost)
+        if result is None:
+            return False
+        return result[1]
+
+    def minimalAttributes(self, tree, attributes, cost=None):
+        """finds the cheapest set of leaves that satisfies the policy tree with the given
+        attributes in a single bottom-up pass. A held attribute costs cost[attribute] (cost
+        is a dict, missing attributes cost 1) or cost(attribute), 1 if cost is None, so the
+        default minimizes the number of leaves and with it the pairings of decryption. A gate
+        that needs k of its children (1 for or, 2 for and, k for 'k of') costs its k cheapest satisfied
+        children, ties going to the leftmost. Returns a (cost, list of BinNode) pair with the
+        nodes in policy order, or None if the attributes do not satisfy the policy.
+
+        >>> parser = PolicyParser()
+        >>> tree = parser.parse('(A and B and C) or D')
+        >>> parser.requiredAttributes(tree, ['A', 'B', 'C', 'D'])[1]
+        [A, B, C]
+        >>> parser.minimalAttributes(tree, ['A', 'B', 'C', 'D'])
+        (1, [D])
+        >>> parser.minimalAttributes(tree, ['A', 'B', 'C', 'D'], {'D': 5})
+        (3, [A, B, C])
+        """
+        if tree is None:
+            return None
+        if cost is None:
+            weight = lambda attribute: 1
+        elif type(cost) == dict:
+            weight = lambda attribute: cost.get(attribute, 1)
+        else:
+            weight = cost
+        attributes = set(attributes)
+        # post-order traversal with an explicit stack, best maps a visited node to its result
+        best, stack = {}, [(tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if node.getNodeType() == OpType.ATTR:
+                attribute = node.getAttribute()
+                best[id(node)] = (weight(attribute), [node]) if attribute in attributes else None
+            elif not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.getChildren())
+            else:
+                results = [best.pop(id(child)) for child in node.getChildren()]
+                satisfied = sorted((r[0], i) for (i, r) in enumerate(results) if r is not None)
+                if len(satisfied) < node.threshold:
+                    best[id(node)] = None
+                    continue
+                chosen = sorted(i for (_, i) in satisfied[:node.threshold])
+                best[id(node)] = (sum(results[i][0] for i in chosen), [leaf for i in chosen for leaf in results[i][1]])
+        return best[id(tree)]
 
     def requiredAttributes(self, tree, attrList):
         """ determines the required attributes to satisfy policy tree and returns a list of BinNode
         objects."""
         if tree == None: return 0
+        if(tree.getNodeType() == OpType.THRESHOLD):
+            # the first k children that are satisfied from left to right
+            results = [self.requiredAttributes(child, attrList) for child in tree.getChildren()]
+            satisfied = [attrs for (result, attrs) in results if result][:tree.threshold]
+            if len(satisfied) < tree.threshold: return (False, None)
+            return (True, [node for attrs in satisfied for node in attrs])
         Left = tree.getLeft()
         Right = tree.getRight()
         if Left: resultLeft, leftAttr = self.requiredAttributes(Left, attrList)
@@ -150,6 +248,47 @@ class PolicyParser:
             
         return
     
+class PyParsingPolicyParser(PolicyParser):
+    """the original pyparsing based parser, kept as a reference implementation for
+    benchmarks and tests. It builds a new grammar per instance and shares a module-level
+    stack, so it is neither fast nor reentrant."""
+    def __init__(self, verbose=False):
+        self.finalPol = self.getBNF()
+        self.verbose = verbose
+
+    def getBNF(self):
+        from pyparsing import Literal, Word, Optional, Forward, ZeroOrMore, alphanums, nums, downcaseTokens
+        # supported operators => (OR, AND, <
+        OperatorOR = Literal("OR").setParseAction(downcaseTokens) | Literal("or")
+        OperatorAND = Literal("AND").setParseAction(downcaseTokens) | Literal("and")
+        Operator = OperatorAND | OperatorOR
+        lpar = Literal("(").suppress()
+        rpar = Literal(")").suppress()
+
+        BinOperator = Literal("<=") | Literal(">=") | Literal("==") | Word("<>", max=1)
+
+        # describes an individual leaf node
+        leafNode =  (Optional("!") + Word(alphanums+'-_./\?!@#$^&*%')).setParseAction( createAttribute )
+        # describes expressions such as (attr < value)
+        leafConditional = (Word(alphanums) + BinOperator + Word(nums)).setParseAction( parseNumConditional )
+
+        # describes the node concept
+        node = leafConditional | leafNode 
+
+        expr = Forward()
+        term = Forward()
+        atom = lpar + expr + rpar | (node).setParseAction( pushFirst )
+        term = atom + ZeroOrMore((Operator + term).setParseAction( pushFirst ))
+        expr << term + ZeroOrMore((Operator + term).setParseAction( pushFirst ))
+        finalPol = expr#.setParseAction( printStuff )
+        return finalPol
+
+    def parse(self, string):
+        global objStack
+        del objStack[:]
+        self.finalPol.parseString(string)
+        return self.evalStack(objStack)
+
 if __name__ == "__main__":
     # policy parser test cases 
     parser = PolicyParser()
@@ -16,8 +16,7 @@ class SecretShare:
     def genShares(self, secret, k=0, n=0, q=None, x_points=None):
         if(k <= n):
             if q == None: 
-                q = [self.elem.random(ZR) for i in range(0, k)]
-                q[0] = secret
+                q = [secret] + list(self.elem.random_many(ZR, k - 1))
 
             if x_points == None: # just go from 0 to n
                 shares = [self.P(q, i) for i in range(0, n+1)] # evaluating poly. q at i for all i
@@ -1,13 +1,18 @@
 '''
 Contains all the auxillary functions to do linear secret sharing (LSS) over an access structure. Mainly, we represent the 
-access structure as a binary tree. This could also support matrices for representing access structures.
+access structure as a tree of OR (1-of-2), AND (2-of-2) and k-of-n threshold gates. This could also support matrices
+for representing access structures.
 '''
 from charm.core.math.pairing import ZR
 from charm.toolbox.policytree import *
+from charm.toolbox.policycache import policy_cache, _labelPolicy
 
 class SecretUtil:
-    def __init__(self, groupObj, verbose=True):
+    def __init__(self, groupObj, verbose=True, cache=policy_cache):
+        """cache is the PolicyCache used to share compiled policies across calls
+        (the module-wide cache by default), or None to parse policies on every call."""
         self.group = groupObj        
+        self.cache = cache
 #        self.parser = PolicyParser()
 
     def P(self, coeff, x):
@@ -19,11 +24,8 @@ class SecretUtil:
 
     def genShares(self, secret, k, n):
         if(k <= n):
-            rand = self.group.random
-            a = [] # will hold polynomial coefficients
-            for i in range(0, k):
-                if (i == 0): a.append(secret) # a[0]
-                else: a.append(rand(ZR))
+            # polynomial coefficients, a[0] being the secret
+            a = [secret] + list(self.group.random_many(ZR, k - 1))
             Pfunc = self.P 
             shares = [Pfunc(a, i) for i in range(0, n+1)]
         return shares
@@ -55,26 +57,67 @@ class SecretUtil:
 
         return secret
 
-    def getCoefficients(self, tree):
-        coeffs = {}
-        self._getCoefficientsDict(tree, coeffs)
+    def getCoefficients(self, tree, nodes=None):
+        """returns the coefficient of every leaf of the policy tree. Below a k-of-n threshold
+        gate with 1 < k < n the coefficients depend on which k children are used, so for such
+        trees nodes must be the attribute nodes returned by prune, and only the leaves below
+        the children they use get a coefficient."""
+        compiled = self.cache.lookup(tree) if self.cache is not None else None
+        if compiled and not (compiled.partial and nodes is not None):
+            return dict(compiled.getCoefficients(self.group, self._computeCoefficients))
+        return self._computeCoefficients(tree, nodes)
+
+    def _computeCoefficients(self, tree, nodes=None):
+        coeffs, used = {}, None
+        if nodes is not None:
+            used = set()
+            self._markUsed(tree, set(id(node) for node in nodes), used)
+        self._getCoefficientsDict(tree, coeffs, used=used)
         return coeffs
+
+    def _markUsed(self, tree, leaves, used):
+        """adds the ids of the leaves in leaves and of the gates above them to used"""
+        if tree.getNodeType() == OpType.ATTR:
+            found = id(tree) in leaves
+        else:
+            found = any([self._markUsed(child, leaves, used) for child in tree.getChildren()])
+        if found:
+            used.add(id(tree))
+        return found
     
-    def _getCoefficientsDict(self, tree, coeff_list, coeff=1):
-        """recover coefficient over a binary tree where possible node types are OR = (1 of 2)
-        and AND = (2 of 2) secret sharing. The leaf nodes are attributes and the coefficients are
-        recorded in a coeff-list dictionary.""" 
+    def _getCoefficientsDict(self, tree, coeff_list, coeff=1, used=None):
+        """recover coefficient over a tree where possible node types are OR = (1 of 2),
+        AND = (2 of 2) and THRESHOLD = (k of n) secret sharing. The leaf nodes are attributes and
+        the coefficients are recorded in a coeff-list dictionary. used holds the ids of the
+        leaves used for decryption and of the gates above them (see getCoefficients).""" 
         if tree:
             node = tree.getNodeType()
             if(node == OpType.AND):
                 this_coeff = self.recoverCoefficients([1,2])
                 # left child => coeff[1], right child => coeff[2]
-                self._getCoefficientsDict(tree.getLeft(), coeff_list, coeff * this_coeff[1])
-                self._getCoefficientsDict(tree.getRight(), coeff_list, coeff * this_coeff[2])
+                self._getCoefficientsDict(tree.getLeft(), coeff_list, coeff * this_coeff[1], used)
+                self._getCoefficientsDict(tree.getRight(), coeff_list, coeff * this_coeff[2], used)
             elif(node == OpType.OR):
                 this_coeff = self.recoverCoefficients([1])
-                self._getCoefficientsDict(tree.getLeft(), coeff_list, coeff * this_coeff[1])
-                self._getCoefficientsDict(tree.getRight(), coeff_list, coeff * this_coeff[1])
+                self._getCoefficientsDict(tree.getLeft(), coeff_list, coeff * this_coeff[1], used)
+                self._getCoefficientsDict(tree.getRight(), coeff_list, coeff * this_coeff[1], used)
+            elif(node == OpType.THRESHOLD):
+                children, k = tree.getChildren(), tree.threshold
+                if k == 1:
+                    # any child recovers the secret on its own
+                    this_coeff = self.recoverCoefficients([1])
+                    for child in children:
+                        self._getCoefficientsDict(child, coeff_list, coeff * this_coeff[1], used)
+                    return None
+                if k == len(children):
+                    indices = list(range(1, k + 1))
+                elif used is None:
+                    raise ValueError("coefficients of '%s' depend on the attributes used, pass the pruned nodes" % tree)
+                else:
+                    indices = [i + 1 for (i, child) in enumerate(children) if id(child) in used][:k]
+                this_coeff = self.recoverCoefficients(indices)
+                for i in indices:
+                    self._getCoefficientsDict(children[i - 1], coeff_list, coeff * this_coeff[i], used)
             elif(node == OpType.ATTR):
                 attr = tree.getAttributeAndIndex()
                 coeff_list[ attr ] = coeff
@@ -104,7 +147,8 @@ class SecretUtil:
         return self._calculateShares(secret, tree, dict)
     
     def _compute_shares(self, secret, subtree, List):
-        """computes recursive secret sharing over the binary tree. Start by splitting 1-of-2 (OR) or 2-of-2 (AND nodes).
+        """computes recursive secret sharing over the tree. Start by splitting 1-of-2 (OR), 2-of-2 (AND nodes) or
+         k-of-n (THRESHOLD nodes, with a polynomial of degree k-1 over the n children).
          Continues recursively down the tree doing a round of secret sharing at each boolean node type."""
         k = 0
         if(subtree == None):
@@ -117,17 +161,18 @@ class SecretUtil:
             t = (subtree, secret)
             List.append(t)
             return None
-        elif(type == OpType.OR or type == OpType.AND):
-            k = subtree.threshold # 1-of-2 or 2-of-2
+        elif(type == OpType.OR or type == OpType.AND or type == OpType.THRESHOLD):
+            k = subtree.threshold # 1-of-2, 2-of-2 or k-of-n
 #        elif(type == OpType.AND):
 #            k = 2 # 2-of-2
         else:
             return None
         # generate shares for k and n        
-        shares = self.genShares(secret, k, n=2)
+        children = subtree.getChildren()
+        shares = self.genShares(secret, k, n=len(children))
         # recursively generate shares for children nodes
-        self._compute_shares(shares[1], subtree.getLeft(), List)
-        self._compute_shares(shares[2], subtree.getRight(), List)
+        for i in range(len(children)):
+            self._compute_shares(shares[i + 1], children[i], List)
     
     def strip_index(self, node_str):
         if node_str.find('_') != -1: return node_str.split('_')[0]
@@ -136,21 +181,21 @@ class SecretUtil:
     
     def createPolicy(self, policy_string):
         assert type(policy_string) == str, "invalid type for policy_string"
-        parser = PolicyParser()        
-        policy_obj = parser.parse(policy_string)
-        _dictCount, _dictLabel = {}, {}
-        parser.findDuplicates(policy_obj, _dictCount)
-        for i in _dictCount.keys(): 
-            if _dictCount[ i ] > 1: _dictLabel[ i ] = 0
-        parser.labelDuplicates(policy_obj, _dictLabel)
-        return policy_obj
+        if self.cache is not None:
+            # the returned tree is shared with other callers, do not modify it
+            return self.cache.compile(policy_string).tree
+        return _labelPolicy(PolicyParser(), policy_string)
         
-    def prune(self, policy, attributes):
-        """determine whether a given set of attributes satisfies the policy"""
+    def prune(self, policy, attributes, cost=None):
+        """determine whether a given set of attributes satisfies the policy, returning the
+        cheapest satisfying list of attribute nodes (see PolicyParser.minimalAttributes)"""
         parser = PolicyParser()        
-        return parser.prune(policy, attributes)
+        return parser.prune(policy, attributes, cost)
     
     def getAttributeList(self, Node):
+        compiled = self.cache.lookup(Node) if self.cache is not None else None
+        if compiled:
+            return list(compiled.attributes)
         aList = []
         self._getAttributeList(Node, aList)
         return aList
@@ -163,8 +208,8 @@ class SecretUtil:
         if(Node.getNodeType() == OpType.ATTR):
             List.append(Node.getAttributeAndIndex()) # .getAttribute()
         else:
-            self._getAttributeList(Node.getLeft(), List)
-            self._getAttributeList(Node.getRight(), List)
+            for child in Node.getChildren():
+                self._getAttributeList(child, List)
         return None
 
 # TODO: add test cases here for SecretUtil
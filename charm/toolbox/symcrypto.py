@@ -1,11 +1,29 @@
 from charm.toolbox.paddingschemes import PKCS7Padding
 from charm.toolbox.securerandom import OpenSSLRand
-from charm.core.crypto.cryptobase import MODE_CBC,AES,selectPRP
+from charm.core.crypto.cryptobase import MODE_CBC,MODE_GCM,AES,selectPRP,HMAC
 from hashlib import sha256 as sha2
 import json
 import hmac
+import struct
 from base64 import b64encode, b64decode
 
+class _StreamReader(object):
+    """read(n) over a file-like object or an iterable of byte strings; returns
+    fewer than n bytes only at the end of the input."""
+    def __init__(self, source):
+        self._file = source if hasattr(source, 'read') else None
+        self._pieces = None if self._file else iter(source)
+        self._buf = bytearray()
+
+    def read(self, n):
+        while len(self._buf) < n:
+            piece = self._file.read(n - len(self._buf)) if self._file else next(self._pieces, b'')
+            if not piece: break
+            self._buf += piece
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
 class MessageAuthenticator(object):
     """ Abstraction for constructing and verifying authenticated messages
 
@@ -49,15 +67,20 @@ class MessageAuthenticator(object):
         dict
             Dictionary composed of the MAC algorithm, the MACed message (or ciphertext), and the digest computed by MACing HMAC_algorithm + associatedData + msg.
         """
-        # Ensure the associated data is in byte format, convert if necessary.
-        if type(associatedData) != bytes :
-            associatedData = bytes(associatedData, "utf-8")
         return {
                 "alg": self._algorithm,
                 "msg": msg,
-                "digest": hmac.new(self._key, bytes(self._algorithm, "utf-8") + associatedData + bytes(msg, "utf-8"), digestmod=sha2).hexdigest()
+                "digest": self._hmac(msg, associatedData).hexdigest()
                }
 
+    def _hmac(self, msg, associatedData):
+        # the three parts are fed to the MAC one after the other instead of being
+        # concatenated, so msg (usually the whole ciphertext) is not copied again
+        h = HMAC(self._key, data=bytes(self._algorithm, "utf-8"))
+        for part in (associatedData, msg):
+            h.update(bytes(part, "utf-8") if type(part) == str else part)
+        return h
+
     def verify(self, msgAndDigest, associatedData=b''):
         """
         Verifies whether the MAC digest from input ciphertext and digest matches the computed one over ciphertext and associated data.
@@ -82,10 +105,8 @@ class MessageAuthenticator(object):
         """
         if msgAndDigest['alg'] != self._algorithm:
             raise ValueError("Currently only HMAC_SHA2 is supported as an algorithm")
-        expected = bytes(self.mac(msgAndDigest['msg'], associatedData=associatedData)['digest'], 'utf-8')
-        received = bytes(msgAndDigest['digest'], 'utf-8')
-        # we compare the hash instead of the direct value to avoid a timing attack
-        return sha2(expected).digest() == sha2(received).digest()
+        expected = self._hmac(msgAndDigest['msg'], associatedData).hexdigest()
+        return hmac.compare_digest(expected, str(msgAndDigest['digest']))
 
 class SymmetricCryptoAbstraction(object):
     """
@@ -165,6 +186,157 @@ class SymmetricCryptoAbstraction(object):
         msg = cipher.decrypt(cipherText['CipherText'])
         return self._padding.decode(msg)
 
+    # Streaming AEAD. The stream is a binary header followed by frames:
+    #
+    #   header: STREAM_MAGIC | version (1) | chunk size (4) | nonce (16)
+    #   frame:  final flag (1) | length (4) | ciphertext | tag
+    #
+    # Version 1 (the block modes) CBC encrypts every chunk on its own, only the
+    # final one padded, and tags it with HMAC-SHA256 (32 bytes). Version 2
+    # (mode=MODE_GCM) encrypts every chunk with AES-GCM under its own nonce, the
+    # 16-byte GCM tag authenticating it. The chunk IV or nonce is derived from
+    # the stream nonce and the chunk index and the tag covers the header, the
+    # associated data, the chunk index, the final flag and the ciphertext, so
+    # chunks cannot be reordered, dropped, truncated or moved between streams.
+    # decrypt_stream reads both versions whatever the mode of the object.
+    STREAM_MAGIC = b'CHS'
+    STREAM_VERSION = 1
+    STREAM_VERSION_GCM = 2
+    _frame = struct.Struct('>BI')
+    _tag_len = {STREAM_VERSION: 32, STREAM_VERSION_GCM: 16}
+    _nonce_size = 12
+
+    def _streamKeys(self, header, associatedData):
+        if type(associatedData) != bytes:
+            associatedData = bytes(associatedData, "utf-8")
+        # warning only valid in the random oracle
+        mac_key = sha2(b'Poor Mans Key Extractor'+self._key).digest()
+        iv_key = sha2(b'Stream IV'+self._key).digest()
+        # MAC and IV states after the per-stream prefix; every chunk continues a copy
+        mac = HMAC(mac_key, data=header)
+        mac.update(sha2(associatedData).digest())
+        return mac, HMAC(iv_key, data=header[-16:])
+
+    def _streamCipher(self, iv_state, index, version):
+        iv = iv_state.copy()
+        iv.update(struct.pack('>Q', index))
+        if version == self.STREAM_VERSION_GCM:
+            return selectPRP(self._alg,(self._key,MODE_GCM,iv.digest()[:self._nonce_size]))
+        # version 1 streams are read with CBC by objects set up for GCM
+        mode = MODE_CBC if self._mode == MODE_GCM else self._mode
+        return selectPRP(self._alg,(self._key,mode,iv.digest()[:self._block_size]))
+
+    def _chunkTag(self, mac_state, index, frame, ct):
+        mac = mac_state.copy()
+        for part in (struct.pack('>Q', index), frame, ct):
+            mac.update(part)
+        return mac
+
+    def _sealChunk(self, version, states, index, final, chunk):
+        mac_state, iv_state = states
+        cipher = self._streamCipher(iv_state, index, version)
+        if version == self.STREAM_VERSION_GCM:
+            frame = self._frame.pack(final, len(chunk))
+            # the per-stream MAC state digest binds the header and associated data
+            cipher.update(mac_state.digest() + struct.pack('>Q', index) + frame)
+            ct = cipher.encrypt(chunk)
+            return frame + ct + cipher.digest()
+        ct = cipher.encrypt(self._padding.encode(chunk) if final else chunk)
+        frame = self._frame.pack(final, len(ct))
+        return frame + ct + self._chunkTag(mac_state, index, frame, ct).digest()
+
+    def _openChunk(self, version, states, index, frame, ct, tag):
+        mac_state, iv_state = states
+        cipher = self._streamCipher(iv_state, index, version)
+        if version == self.STREAM_VERSION_GCM:
+            cipher.update(mac_state.digest() + struct.pack('>Q', index) + frame)
+            msg = cipher.decrypt(ct)
+            valid = cipher.verify(tag)
+        else:
+            valid = self._chunkTag(mac_state, index, frame, ct).verify(tag)
+            msg = cipher.decrypt(ct) if valid else None
+        if not valid:
+            raise ValueError("Invalid mac. Your data was tampered with or your key is wrong")
+        return msg
+
+    def encrypt_stream(self, source, chunk_size=65536, associatedData=b''):
+        """encrypts a file-like object or an iterable of byte strings chunk by
+        chunk and yields the binary stream, holding at most two plaintext chunks
+        in memory. chunk_size must be a multiple of the block size. Objects
+        created with mode=MODE_GCM write version 2 (AES-GCM) streams.
+
+        >>> from hashlib import sha256
+        >>> a = SymmetricCryptoAbstraction(sha256(b'key').digest())
+        >>> stream = b''.join(a.encrypt_stream([b'hello ', b'streaming ', b'world'], chunk_size=16))
+        >>> b''.join(a.decrypt_stream([stream]))
+        b'hello streaming world'
+        >>> g = SymmetricCryptoAbstraction(sha256(b'key').digest(), mode=MODE_GCM)
+        >>> stream = b''.join(g.encrypt_stream([b'hello ', b'streaming ', b'world'], chunk_size=16))
+        >>> b''.join(a.decrypt_stream([stream]))
+        b'hello streaming world'
+        """
+        # checked here rather than in the generator, so bad arguments fail at the call
+        assert chunk_size > 0 and chunk_size % self._block_size == 0, "chunk_size must be a positive multiple of %d" % self._block_size
+        return self._encryptStream(source, chunk_size, associatedData)
+
+    def _encryptStream(self, source, chunk_size, associatedData):
+        version = self.STREAM_VERSION_GCM if self._mode == MODE_GCM else self.STREAM_VERSION
+        nonce = OpenSSLRand().getRandomBytes(16)
+        header = self.STREAM_MAGIC + struct.pack('>BI', version, chunk_size) + nonce
+        states = self._streamKeys(header, associatedData)
+        yield header
+        reader = _StreamReader(source)
+        chunk, index = reader.read(chunk_size), 0
+        while True:
+            following = reader.read(chunk_size)
+            final = len(following) == 0
+            yield self._sealChunk(version, states, index, final, chunk)
+            if final: return
+            chunk, index = following, index + 1
+
+    def decrypt_stream(self, source, associatedData=b'', max_chunk_size=65536):
+        """decrypts a stream written by encrypt_stream and yields the plaintext
+        chunks. Every chunk is authenticated before it is released; a ValueError
+        is raised on a bad tag or when the stream ends before its final chunk.
+        The chunk size in the header is read before anything is authenticated,
+        so streams with chunks larger than max_chunk_size are rejected rather
+        than buffered."""
+        assert max_chunk_size > 0, "max_chunk_size must be positive"
+        return self._decryptStream(source, associatedData, max_chunk_size)
+
+    def _decryptStream(self, source, associatedData, max_chunk_size):
+        stream = _StreamReader(source)
+        header = stream.read(len(self.STREAM_MAGIC) + 5 + 16)
+        if len(header) < len(self.STREAM_MAGIC) + 5 + 16 or not header.startswith(self.STREAM_MAGIC):
+            raise ValueError("not an encrypted stream")
+        version, chunk_size = struct.unpack_from('>BI', header, len(self.STREAM_MAGIC))
+        if version not in self._tag_len:
+            raise ValueError("unsupported stream version %d" % version)
+        if chunk_size > max_chunk_size:
+            raise ValueError("stream chunk size %d exceeds max_chunk_size %d" % (chunk_size, max_chunk_size))
+        gcm = version == self.STREAM_VERSION_GCM
+        states = self._streamKeys(header, associatedData)
+        index = 0
+        while True:
+            frame = stream.read(self._frame.size)
+            if len(frame) < self._frame.size:
+                raise ValueError("truncated stream")
+            final, length = self._frame.unpack(frame)
+            if gcm and length > chunk_size or not gcm and (length > chunk_size + self._block_size or length % self._block_size != 0):
+                raise ValueError("invalid chunk length")
+            ct = stream.read(length)
+            tag = stream.read(self._tag_len[version])
+            if len(ct) < length or len(tag) < self._tag_len[version]:
+                raise ValueError("truncated stream")
+            msg = self._openChunk(version, states, index, frame, ct, tag)
+            if final:
+                yield msg if gcm else self._padding.decode(msg)
+                if stream.read(1):
+                    raise ValueError("trailing data after final chunk")
+                return
+            yield msg
+            index += 1
+
 class AuthenticatedCryptoAbstraction(SymmetricCryptoAbstraction):
     """
     Implements Authenticated Encryption with Associated Data (AEAD) abstraction. The associated data is optional, and this version is backwards compatible
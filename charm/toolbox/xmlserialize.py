@@ -1,7 +1,8 @@
 from charm.toolbox.pairinggroup import PairingGroup
 from charm.toolbox.ecgroup import ECGroup
 from charm.toolbox.integergroup import IntegerGroup
-from charm.core.engine.util import bytesToObject,objectToBytes
+from charm.core.engine.util import bytesToObject,objectToBytes,COMPACT_MAGIC
+from base64 import b64encode,b64decode
 from xml.dom.minidom import *
 
 def writeToXML(object, groupObj, name=None):
@@ -44,7 +45,7 @@ def writeToXML(object, groupObj, name=None):
     # Give the <p> elemenet some text
 #    ptext = doc.createTextNode("This is a test!")
     serializedObject = objectToBytes(object, groupObj)
-    ptext = doc.createTextNode(bytes.decode(serializedObject, 'utf8'))
+    ptext = doc.createTextNode(bytes.decode(b64encode(serializedObject), 'utf8'))
     paragraph1.appendChild(ptext)
     
     # Print our newly created XML
@@ -91,4 +92,7 @@ def parseFromXML(xmlObjectString, group=None):
     elif structure['setting'] == 'integer':
         # TODO: this is a special case
         pass 
-    return bytesToObject(bytesObj, group)
+    data = b64decode(bytesObj)
+    if not data.startswith(COMPACT_MAGIC):
+        data = bytesObj # written by an older version
+    return bytesToObject(data, group)
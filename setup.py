@@ -157,7 +157,7 @@ if opt.get('PAIR_MOD') == 'yes':
                             include_dirs = [utils_path,
                                             benchmark_path] + inc_dirs,
                             sources = [math_path+'pairing/pairingmodule.c', 
-                                        utils_path+'base64.c'],
+                                        utils_path+'base64.c', utils_path+'drbg.c'],
                             libraries=['pbc', 'gmp', 'crypto'], define_macros=_macros, undef_macros=_undef_macro,
                             library_dirs=library_dirs, runtime_library_dirs=runtime_library_dirs)
 
@@ -200,7 +200,7 @@ if opt.get('INT_MOD') == 'yes':
                             include_dirs = [utils_path,
                                             benchmark_path] + inc_dirs,
                             sources = [math_path + 'integer/integermodule.c', 
-                                        utils_path + 'base64.c'], 
+                                        utils_path + 'base64.c', utils_path + 'drbg.c'], 
                             libraries=['gmp', 'crypto'], define_macros=_macros, undef_macros=_undef_macro,
                             library_dirs=library_dirs, runtime_library_dirs=runtime_library_dirs)
    _ext_modules.append(integer_module)
@@ -211,14 +211,16 @@ if opt.get('ECC_MOD') == 'yes':
                 include_dirs = [utils_path,
                                 benchmark_path] + inc_dirs,
 				sources = [math_path + 'elliptic_curve/ecmodule.c',
-                            utils_path + 'base64.c'], 
+                            utils_path + 'base64.c', utils_path + 'drbg.c'], 
 				libraries=['gmp', 'crypto'], define_macros=_macros, undef_macros=_undef_macro,
                 library_dirs=library_dirs, runtime_library_dirs=runtime_library_dirs)
    _ext_modules.append(ecc_module)
 
 benchmark_module = Extension(core_prefix + '.benchmark', sources = [benchmark_path + 'benchmarkmodule.c'])
 
-cryptobase = Extension(crypto_prefix+'.cryptobase', sources = [cryptobase_path + 'cryptobasemodule.c'])
+cryptobase = Extension(crypto_prefix+'.cryptobase', sources = [cryptobase_path + 'cryptobasemodule.c'],
+                    include_dirs = inc_dirs, libraries=['crypto'],
+                    library_dirs=library_dirs, runtime_library_dirs=runtime_library_dirs)
 
 aes = Extension(crypto_prefix + '.AES',
                     include_dirs = [cryptobase_path],